@@ -42,6 +42,21 @@ options:
         description:
             - Should https certificates be validated?
         type: bool
+    keep_alive:
+        required: false
+        default: true
+        description:
+            - Whether to reuse persistent (keep-alive) connections to the web services for all requests made during the module run.
+            - Disable to open a new connection for every request.
+        type: bool
+    about_cache_ttl:
+        required: false
+        default: 0
+        description:
+            - Number of seconds that web services about information and storage system identifier resolutions are cached on disk.
+            - The cache is shared by all modules run on the same host and avoids probing the web services before each task.
+            - The cache is kept in a directory of the system temporary directory that only the current user can access. Set to 0 to disable the on-disk cache.
+        type: int
 
 notes:
     - The E-Series Ansible modules require either an instance of the Web Services Proxy (WSP), to be available to manage
@@ -76,6 +91,21 @@ options:
         description:
             - Should https certificates be validated?
         type: bool
+    keep_alive:
+        required: false
+        default: true
+        description:
+            - Whether to reuse persistent (keep-alive) connections to the web services for all requests made during the module run.
+            - Disable to open a new connection for every request.
+        type: bool
+    about_cache_ttl:
+        required: false
+        default: 0
+        description:
+            - Number of seconds that web services about information and storage system identifier resolutions are cached on disk.
+            - The cache is shared by all modules run on the same host and avoids probing the web services before each task.
+            - The cache is kept in a directory of the system temporary directory that only the current user can access. Set to 0 to disable the on-disk cache.
+        type: int
     ssid:
         required: false
         type: str
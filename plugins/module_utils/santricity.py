@@ -4,27 +4,66 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
+import atexit
+import base64
+import binascii
+import copy
+import errno
+import functools
+import hashlib
 import json
+import mmap
+import os
 import random
+import re
 import mimetypes
+import select
+import socket
+import ssl
+import tempfile
+import threading
+import time
 
 from pprint import pformat
+from stat import S_ISDIR
 from ansible.module_utils import six
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.six.moves import http_client, queue
 from ansible.module_utils.six.moves.urllib.error import HTTPError
+from ansible.module_utils.six.moves.urllib.request import getproxies, proxy_bypass
 from ansible.module_utils.urls import open_url
 from ansible.module_utils.api import basic_auth_argument_spec
-from ansible.module_utils._text import to_native
+from ansible.module_utils._text import to_bytes, to_native
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity_graph import NetAppESeriesGraph
 try:
     from ansible.module_utils.ansible_release import __version__ as ansible_version
 except ImportError:
     ansible_version = 'unknown'
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 try:
     from urlparse import urlparse
 except ImportError:
     from urllib.parse import urlparse
 
+try:
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.backends import default_backend
+except ImportError:
+    HAS_CRYPTOGRAPHY = False
+else:
+    HAS_CRYPTOGRAPHY = True
+
+FIRMWARE_METADATA_SEARCH_LIMIT = 16 * 1024 ** 2
+PEM_BLOCK_PATTERN = re.compile(b"^-+BEGIN ([A-Z0-9 ]+)-+\\r?$.*?^-+END \\1-+\\r?$", re.MULTILINE | re.DOTALL)
+CERTIFICATE_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+CERTIFICATE_CACHE_TTL_SEC = 7 * 24 * 60 * 60
+
 
 def eseries_host_argument_spec():
     """Retrieve a base argument specification common to all NetApp E-Series modules"""
@@ -34,7 +73,9 @@ def eseries_host_argument_spec():
         api_password=dict(type="str", required=True, no_log=True),
         api_url=dict(type="str", required=True),
         ssid=dict(type="str", required=False, default="1"),
-        validate_certs=dict(type="bool", required=False, default=True)
+        validate_certs=dict(type="bool", required=False, default=True),
+        keep_alive=dict(type="bool", required=False, default=True),
+        about_cache_ttl=dict(type="int", required=False, default=0)
     ))
     return argument_spec
 
@@ -46,11 +87,745 @@ def eseries_proxy_argument_spec():
         api_username=dict(type="str", required=True),
         api_password=dict(type="str", required=True, no_log=True),
         api_url=dict(type="str", required=True),
-        validate_certs=dict(type="bool", required=False, default=True)
+        validate_certs=dict(type="bool", required=False, default=True),
+        keep_alive=dict(type="bool", required=False, default=True),
+        about_cache_ttl=dict(type="int", required=False, default=0)
     ))
     return argument_spec
 
 
+def eseries_max_workers_argument_spec(default=8):
+    """Retrieve the argument specification of the max_workers option for modules that issue requests concurrently"""
+    return dict(max_workers=dict(type="int", required=False, default=default))
+
+
+class NetAppESeriesSessionResponse(object):
+    """Minimal file-like response returned for requests served by NetAppESeriesSession."""
+
+    def __init__(self, url, status, reason, headers, body):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.position = 0
+
+    def getcode(self):
+        return self.status
+
+    def geturl(self):
+        return self.url
+
+    def info(self):
+        return self.headers
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = len(self.body) - self.position
+        data = self.body[self.position:self.position + size]
+        self.position += len(data)
+        return data
+
+    def close(self):
+        pass
+
+
+class NetAppESeriesSession(object):
+    """Pool of persistent (keep-alive) HTTP connections shared by every request issued during a module run.
+
+    Idle connections are pooled per scheme, host, port, certificate validation and credential set so that a connection
+    is never reused for a different user. Requests that cannot be served by a plain persistent connection (proxied
+    requests, conditional requests and redirects of idempotent requests) are handed back to open_url by returning None.
+    Idle connections that the server has closed are discarded before they are reused. Only idempotent requests are
+    retried when a reused connection fails since the server may have already acted on the request before the connection
+    was lost.
+    """
+    MAX_IDLE_CONNECTIONS = 8
+    IDEMPOTENT_METHODS = ["GET", "HEAD", "OPTIONS"]
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.idle_connections = dict()
+        self.statistics = dict(new=0, reused=0, fallback=0)
+
+    @staticmethod
+    def _key(url_parts, validate_certs, url_username, url_password):
+        """Determine the pool key for a request."""
+        return (url_parts.scheme, url_parts.netloc, bool(validate_certs), url_username, url_password)
+
+    @staticmethod
+    def _is_proxied(url_parts):
+        """Determine whether the environment routes the request through an http proxy."""
+        if url_parts.scheme not in getproxies():
+            return False
+        return not proxy_bypass(url_parts.hostname)
+
+    @staticmethod
+    def _connect(url_parts, timeout, validate_certs):
+        """Create a new connection for the url's host."""
+        if url_parts.scheme == "https":
+            context = ssl.create_default_context()
+            if not validate_certs:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            return http_client.HTTPSConnection(url_parts.hostname, port=url_parts.port, timeout=timeout, context=context)
+        return http_client.HTTPConnection(url_parts.hostname, port=url_parts.port, timeout=timeout)
+
+    @staticmethod
+    def _is_closed(connection):
+        """Determine whether the server has closed an idle connection.
+
+        An idle connection has no response pending so it only becomes readable once the server closes it.
+        """
+        if connection.sock is None:
+            return False
+        try:
+            readable, writable, errors = select.select([connection.sock], [], [], 0)
+        except (ValueError, socket.error, select.error):
+            return True
+        return bool(readable)
+
+    def _checkout(self, key, url_parts, timeout, validate_certs):
+        """Retrieve an open idle connection from the pool or create a new one.
+
+        :return tuple(connection, bool): connection and whether it has been used before.
+        """
+        with self.lock:
+            connections = self.idle_connections.get(key)
+            while connections:
+                connection = connections.pop()
+                if self._is_closed(connection):
+                    connection.close()
+                    continue
+                self.statistics["reused"] += 1
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+                return connection, True
+            self.statistics["new"] += 1
+
+        return self._connect(url_parts, timeout, validate_certs), False
+
+    def _checkin(self, key, connection):
+        """Return a connection to the pool so it can be reused."""
+        with self.lock:
+            connections = self.idle_connections.setdefault(key, [])
+            if len(connections) < self.MAX_IDLE_CONNECTIONS:
+                connections.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        """Close every idle connection."""
+        with self.lock:
+            for connections in self.idle_connections.values():
+                for connection in connections:
+                    connection.close()
+            self.idle_connections = dict()
+
+    def open(self, url, data=None, headers=None, method=None, use_proxy=True, force=False, last_mod_time=None, timeout=10,
+             validate_certs=True, url_username=None, url_password=None, http_agent=None, force_basic_auth=False):
+        """Issue a request over a persistent connection.
+
+        :raise HTTPError: raised when the response status code is 400 or greater (mirrors open_url) or when a
+                          non-idempotent request is redirected since it must not be sent again.
+        :return NetAppESeriesSessionResponse: response or None when the request must be issued by open_url instead.
+        """
+        url_parts = urlparse(url)
+        if (url_parts.scheme not in ["http", "https"] or force or last_mod_time is not None or
+                (use_proxy and self._is_proxied(url_parts))):
+            self.statistics["fallback"] += 1
+            return None
+
+        method = (method or ("POST" if data else "GET")).upper()
+        idempotent = method in self.IDEMPOTENT_METHODS
+        path = url_parts.path or "/"
+        if url_parts.query:
+            path += "?" + url_parts.query
+        if data is not None and not isinstance(data, six.binary_type) and not hasattr(data, "read"):
+            data = to_bytes(data, errors="surrogate_or_strict")
+
+        request_headers = dict(headers or {})
+        request_headers.update({"Connection": "keep-alive"})
+        if http_agent:
+            request_headers.update({"User-Agent": http_agent})
+        authorization = None
+        if url_username:
+            authorization = "Basic %s" % to_native(base64.b64encode(to_bytes("%s:%s" % (url_username, url_password or ""),
+                                                                             errors="surrogate_or_strict")))
+            if force_basic_auth:
+                request_headers.update({"Authorization": authorization})
+
+        key = self._key(url_parts, validate_certs, url_username, url_password)
+        while True:
+            connection, reused = self._checkout(key, url_parts, timeout, validate_certs)
+            if hasattr(data, "seek"):
+                data.seek(0)    # File-like bodies must be resent from the beginning when the request is retried.
+            try:
+                connection.request(method, path, body=data, headers=request_headers)
+                response = connection.getresponse()
+                body = response.read()
+            except socket.timeout:
+                connection.close()
+                raise
+            except (http_client.HTTPException, socket.error):
+                connection.close()
+                if reused and idempotent:
+                    continue    # The server closed the idle connection; retry on a fresh connection.
+                raise
+
+            if response.will_close:
+                connection.close()
+            else:
+                self._checkin(key, connection)
+
+            if response.status == 401 and authorization and "Authorization" not in request_headers:
+                request_headers.update({"Authorization": authorization})
+                continue
+            break
+
+        result = NetAppESeriesSessionResponse(url, response.status, response.reason, response.msg, body)
+        if 300 <= response.status < 400 and idempotent:
+            self.statistics["fallback"] += 1
+            return None
+
+        if response.status >= 300:
+            raise HTTPError(url, response.status, response.reason, response.msg, result)
+        return result
+
+
+keep_alive_session = NetAppESeriesSession()
+atexit.register(keep_alive_session.close)
+
+
+def session_open_url(url, keep_alive=True, **kwargs):
+    """Issue a request using the persistent session when keep_alive is enabled, otherwise use open_url."""
+    if hasattr(kwargs.get("data"), "seek"):
+        kwargs["data"].seek(0)
+    if keep_alive:
+        response = keep_alive_session.open(url, **kwargs)
+        if response is not None:
+            return response
+    return open_url(url=url, **kwargs)
+
+
+def get_cache_path(filename):
+    """Determine the path of a persistent cache file in the current user's cache directory.
+
+    The directory, in the system temporary directory, is only created once a cache is persisted (see NetAppESeriesCache).
+
+    :param str filename: cache file name.
+    :return str: cache file path or None when caches cannot be persisted on this platform.
+    """
+    if not hasattr(os, "getuid"):
+        return None
+    return os.path.join(tempfile.gettempdir(), "netapp_eseries_santricity_%s" % os.getuid(), filename)
+
+
+def _is_private_directory(directory, create=False):
+    """Determine whether a directory is exclusively owned by the current user, such that no other user created it first.
+
+    :param bool create: whether to create the directory, readable only by the current user, when it does not exist.
+    """
+    if create:
+        try:
+            os.mkdir(directory, 0o700)
+        except OSError as error:
+            if error.errno != errno.EEXIST:
+                return False
+
+    try:
+        stat = os.lstat(directory)
+    except OSError:
+        return False
+    if hasattr(os, "getuid") and stat.st_uid != os.getuid():
+        return False
+    return S_ISDIR(stat.st_mode) and not stat.st_mode & 0o077
+
+
+class NetAppESeriesCache(object):
+    """Cache of json serializable values keyed by string.
+
+    Entries are memoized for the life of the process. When a time-to-live is provided, entries are also persisted to a
+    json file, along with their time-to-live, so that subsequent module runs can reuse them. Persisted files are only
+    trusted when they and their directory are owned by the current user and are not writable by anyone else, and updates
+    are serialized between processes with an exclusive lock on a companion lock file.
+
+    :param str path: path of the json file used to persist entries or None to disable persistence (see get_cache_path()).
+    """
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.entries = dict()
+        self.path = path
+
+    @staticmethod
+    def _is_valid(entry, ttl, now):
+        """Determine whether a persisted entry is younger than both ttl and its own time-to-live."""
+        if not isinstance(entry, dict) or not isinstance(entry.get("timestamp"), (int, float)) or not isinstance(entry.get("ttl"), (int, float)):
+            return False
+        return now - entry["timestamp"] < min(ttl, entry["ttl"])
+
+    def _load(self):
+        """Load the persisted cache entries."""
+        if self.path is None or not _is_private_directory(os.path.dirname(self.path)):
+            return dict()
+
+        try:
+            fd = os.open(self.path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+        except OSError:
+            return dict()
+
+        try:
+            with os.fdopen(fd, "r") as fh:
+                stat = os.fstat(fh.fileno())
+                if hasattr(os, "getuid") and (stat.st_uid != os.getuid() or stat.st_mode & 0o022):
+                    return dict()
+                entries = json.load(fh)
+            if isinstance(entries, dict):
+                return entries
+        except (IOError, OSError, ValueError):
+            pass
+        return dict()
+
+    def _save(self, entries):
+        """Atomically persist cache entries, discarding the cache on failure."""
+        temporary_path = None
+        try:
+            fd, temporary_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=os.path.basename(self.path) + ".")
+            with os.fdopen(fd, "w") as fh:
+                json.dump(entries, fh)
+            os.rename(temporary_path, self.path)
+        except (IOError, OSError, TypeError, ValueError):
+            if temporary_path is not None:
+                try:
+                    os.remove(temporary_path)
+                except OSError:
+                    pass
+
+    def _update(self, update):
+        """Apply update to the persisted entries while holding the cache's inter-process lock."""
+        if not _is_private_directory(os.path.dirname(self.path), create=True):
+            return
+
+        try:
+            fd = os.open(self.path + ".lock", os.O_WRONLY | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+        except OSError:
+            return
+
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            self._save(update(self._load()))
+        finally:
+            os.close(fd)    # Closing the file releases the lock.
+
+    def get(self, key, ttl=0):
+        """Retrieve a cached value.
+
+        :param str key: cache key.
+        :param int ttl: number of seconds a persisted entry remains valid. Persisted entries are ignored when ttl is zero.
+        :return: cached value or None when no valid entry exists.
+        """
+        with self.lock:
+            if key in self.entries:
+                return self.entries[key]
+
+            if ttl > 0:
+                entry = self._load().get(key)
+                if self._is_valid(entry, ttl, time.time()):
+                    self.entries[key] = entry.get("value")
+                    return self.entries[key]
+        return None
+
+    def set(self, key, value, ttl=0):
+        """Cache a value and persist it when ttl is greater than zero; persisted entries are discarded once their own ttl expires."""
+        with self.lock:
+            self.entries[key] = value
+
+            if ttl > 0 and self.path is not None:
+                def update(entries):
+                    now = time.time()
+                    entries = dict((entry_key, entry) for entry_key, entry in entries.items()
+                                   if self._is_valid(entry, float("inf"), now))
+                    entries[key] = dict(timestamp=now, ttl=ttl, value=value)
+                    return entries
+                self._update(update)
+
+    def clear(self):
+        """Forget every memoized entry."""
+        with self.lock:
+            self.entries = dict()
+
+
+# Web services about information and storage system identifier resolutions keyed by web services url.
+about_cache = NetAppESeriesCache(get_cache_path("about_cache.json"))
+
+# Local file digests, directory listings, firmware file metadata and the digests of files uploaded to web services proxies.
+file_manifest_cache = NetAppESeriesCache(get_cache_path("file_manifest.json"))
+
+# Parsed certificate information keyed by the sha256 digest of the certificate file's content.
+certificate_cache = NetAppESeriesCache(get_cache_path("certificate_cache.json"))
+
+# Storage systems found by na_santricity_discover keyed by the proxy and subnets searched.
+discovery_cache = NetAppESeriesCache(get_cache_path("discovery_cache.json"))
+
+# Snapshot consistency groups and their member volumes prefetched by na_santricity_snapshot keyed by web services url and storage system.
+snapshot_cache = NetAppESeriesCache(get_cache_path("snapshot_cache.json"))
+
+
+class NetAppESeriesFileManifest(object):
+    """Manifest of the content of local files and of the files uploaded to a web services proxy file repository.
+
+    File digests are only recomputed when a file's size or modification time changes and directories are only listed
+    again when their modification time changes. The digest of every file uploaded to the repository is recorded so that a
+    file whose content changed can be uploaded again even though its name did not.
+
+    :param str url: web services proxy url.
+    :param str repository: name of the proxy file repository (for example, firmware/cfw-files).
+    :param int ttl: number of seconds manifest entries are persisted; 0 disables the on-disk manifest.
+    :param bool refresh: ignore the recorded directory listings and file digests and determine them again.
+    """
+    TTL_SEC = 30 * 24 * 60 * 60
+    HASH_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, url, repository, ttl=TTL_SEC, refresh=False):
+        self.url = url
+        self.repository = repository
+        self.ttl = ttl
+        self.refresh = refresh
+
+    def list_files(self, paths, extension=".dlp"):
+        """Determine the files named by a list of file and directory paths.
+
+        :param list paths: file and directory paths.
+        :param str extension: only files whose name contains the extension are included.
+        :raise IOError: when a path does not exist; the error's filename is the path.
+        :return dict: file paths keyed by file name.
+        """
+        files = dict()
+        for path in paths:
+            if not os.path.exists(path):
+                raise IOError(errno.ENOENT, "File does not exist", path)
+            elif os.path.isdir(path):
+                if not path.endswith("/"):
+                    path = path + "/"
+
+                key = "listing|%s" % os.path.abspath(path)
+                mtime = os.path.getmtime(path)
+                listing = None if self.refresh else file_manifest_cache.get(key, self.ttl)
+                if listing is None or listing["mtime"] != mtime:
+                    listing = dict(mtime=mtime, filenames=sorted(filename for filename in os.listdir(path) if extension in filename))
+                    file_manifest_cache.set(key, listing, self.ttl)
+
+                for filename in listing["filenames"]:
+                    files.update({filename: path + filename})
+            elif extension in path:
+                files.update({os.path.basename(path): path})
+        return files
+
+    def get_digest(self, path):
+        """Retrieve the size and sha256 digest of a file, hashing it only when it changed since it was last hashed.
+
+        :return dict: file size and sha256 digest.
+        """
+        stat = os.stat(path)
+        key = "file|%s" % os.path.abspath(path)
+        entry = None if self.refresh else file_manifest_cache.get(key, self.ttl)
+        if entry is None or entry["size"] != stat.st_size or entry["mtime"] != stat.st_mtime:
+            digest = hashlib.sha256()
+            with open(path, "rb") as fh:
+                for chunk in iter(lambda: fh.read(self.HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            entry = dict(size=stat.st_size, mtime=stat.st_mtime, sha256=digest.hexdigest())
+            file_manifest_cache.set(key, entry, self.ttl)
+        return dict(size=entry["size"], sha256=entry["sha256"])
+
+    def get_uploaded_digest(self, filename):
+        """Retrieve the digest recorded when a file was uploaded to the repository or None when it is unknown."""
+        return file_manifest_cache.get("upload|%s|%s|%s" % (self.url, self.repository, filename), self.ttl)
+
+    def set_uploaded_digest(self, filename, digest):
+        """Record the digest of a file uploaded to the repository; use None when the file is removed."""
+        file_manifest_cache.set("upload|%s|%s|%s" % (self.url, self.repository, filename), digest, self.ttl)
+
+    def is_changed(self, filename, path):
+        """Determine whether a local file's content differs from the content uploaded to the repository with the same name.
+
+        Files that were not uploaded using the manifest are assumed to be unchanged.
+        """
+        uploaded = self.get_uploaded_digest(filename)
+        return uploaded is not None and uploaded != self.get_digest(path)
+
+
+def _find_line(data, marker, limit):
+    """Find the first line containing marker within the first limit bytes of data; return None when it is not found."""
+    index = data.find(marker, 0, limit)
+    if index == -1:
+        return None
+    start = data.rfind(b"\n", 0, index) + 1
+    end = data.find(b"\n", index, limit)
+    if end == -1:
+        end = min(len(data), limit)
+    return data[start:end]
+
+
+def get_firmware_metadata(path, kind, ttl=NetAppESeriesFileManifest.TTL_SEC, refresh=False):
+    """Extract the version information of a controller firmware, firmware bundle or NVSRAM file.
+
+    Only the first FIRMWARE_METADATA_SEARCH_LIMIT bytes of the memory-mapped file are searched so that large bundles are not
+    read into memory. Results are recorded in the file manifest (see NetAppESeriesFileManifest) and are only extracted
+    again when the file's size or modification time changes.
+
+    :param str path: file path.
+    :param str kind: either firmware or nvsram.
+    :param int ttl: number of seconds the result is persisted in the file manifest; 0 disables the on-disk manifest.
+    :param bool refresh: ignore any recorded result and extract the version information again.
+    :raise IOError: when the file cannot be read.
+    :return dict: the file type (bundle, firmware or None when the firmware signature is unknown; nvsram for NVSRAM files)
+                  and version (None when it cannot be determined).
+    """
+    stat = os.stat(path)
+    key = "metadata|%s|%s" % (kind, os.path.abspath(path))
+    entry = None if refresh else file_manifest_cache.get(key, ttl)
+    if entry is not None and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+        return dict(type=entry["type"], version=entry["version"])
+
+    with open(path, "rb") as fh:
+        try:
+            data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            data = b""  # Empty files cannot be memory-mapped.
+
+        try:
+            file_type = None
+            version = None
+            if kind == "nvsram":
+                file_type = "nvsram"
+                line = _find_line(data, b".NVSRAM Configuration Number", FIRMWARE_METADATA_SEARCH_LIMIT)
+                if line is not None and line.count(b'"') >= 2:
+                    version = line.split(b'"')[-2]
+            else:
+                signature = data[:16].lower()
+                if b"firmware" in signature:
+                    file_type = "firmware"
+                    line = _find_line(data, b"Version:", FIRMWARE_METADATA_SEARCH_LIMIT)
+                    if line is not None:
+                        version = line.split()[-1]
+                elif b"combined_content" in signature:
+                    file_type = "bundle"
+                    marker = b"displayableAttributeList="
+                    line = _find_line(data, marker, FIRMWARE_METADATA_SEARCH_LIMIT)
+                    if line is not None:
+                        for item in line[line.index(marker) + len(marker):].split(b","):
+                            name, separator, value = item.partition(b"|")
+                            if name == b"VERSION":
+                                version = value.strip(b"\r\n")
+        finally:
+            if not isinstance(data, bytes):
+                data.close()
+
+    if version is not None:
+        version = to_native(version)
+    file_manifest_cache.set(key, dict(size=stat.st_size, mtime=stat.st_mtime, type=file_type, version=version), ttl)
+    return dict(type=file_type, version=version)
+
+
+def _certificate_info(certificate, data):
+    """Describe a cryptography x509 certificate with json serializable values.
+
+    The fingerprint uses the certificate's signature hash algorithm, sha256 when it has none, which is how the storage
+    system's shaFingerprint or sha256Fingerprint is determined.
+    """
+    if not isinstance(certificate, x509.Certificate):
+        raise ValueError("Failed to open certificate file or invalid certificate object type.")
+
+    algorithm = certificate.signature_hash_algorithm or hashes.SHA256()
+    not_valid_before = getattr(certificate, "not_valid_before_utc", None) or certificate.not_valid_before
+    not_valid_after = getattr(certificate, "not_valid_after_utc", None) or certificate.not_valid_after
+    return dict(fingerprint=to_native(binascii.hexlify(certificate.fingerprint(algorithm))),
+                sha256_fingerprint=to_native(binascii.hexlify(certificate.fingerprint(hashes.SHA256()))),
+                subject=certificate.subject.rfc4514_string(),
+                issuer=certificate.issuer.rfc4514_string(),
+                subject_values=[to_native(attribute.value) for attribute in certificate.subject],
+                issuer_values=[to_native(attribute.value) for attribute in certificate.issuer],
+                not_valid_before=not_valid_before.strftime(CERTIFICATE_DATE_FORMAT),
+                not_valid_after=not_valid_after.strftime(CERTIFICATE_DATE_FORMAT),
+                certificate=to_native(data))
+
+
+def _pem_to_der(block):
+    """Decode a PEM block; return None when it cannot be decoded."""
+    try:
+        return base64.b64decode(b"".join(line.strip() for line in to_bytes(block).strip().splitlines()[1:-1]))
+    except (TypeError, ValueError):
+        return None
+
+
+def load_certificate_file(path):
+    """Load the certificates and private keys from a PEM bundle or a DER encoded certificate or private key.
+
+    PEM bundles are split into their certificate and private key blocks in a single pass. The parsed certificates are
+    recorded in certificate_cache keyed by the file content's digest, so files shared by many storage systems are only
+    parsed once, while private keys are never persisted and are extracted from the file each time. Cached certificates
+    are only used when their PEM encoding matches the certificates in the file.
+
+    :param str path: file path.
+    :raise IOError: when the file cannot be read.
+    :raise ValueError: when the file contains neither a certificate nor a private key.
+    :return dict: certificates, a list of certificate information (see _certificate_info()) whose certificate is PEM
+                  encoded, and private_keys, a list of (block type, data) tuples where the block type is None for DER
+                  encoded private keys.
+    """
+    if not HAS_CRYPTOGRAPHY:
+        raise ValueError("Python cryptography package is missing!")
+
+    with open(path, "rb") as fh:
+        data = fh.read()
+    key = "certificate|%s" % hashlib.sha256(data).hexdigest()
+
+    blocks = [(to_native(match.group(1)), match.group(0)) for match in PEM_BLOCK_PATTERN.finditer(data)]
+    private_keys = [(block_type, block) for block_type, block in blocks if block_type.endswith("PRIVATE KEY")]
+
+    if blocks:
+        expected = [_pem_to_der(block) for block_type, block in blocks if block_type == "CERTIFICATE"]
+    else:
+        expected = [data]
+
+    certificates = certificate_cache.get(key, CERTIFICATE_CACHE_TTL_SEC)
+    if (not isinstance(certificates, list) or not certificates or
+            [_pem_to_der(entry.get("certificate")) if isinstance(entry, dict) else None for entry in certificates] != expected):
+        certificates = []
+        if blocks:
+            for block_type, block in blocks:
+                if block_type == "CERTIFICATE":
+                    certificates.append(_certificate_info(x509.load_pem_x509_certificate(block, default_backend()), block))
+        else:
+            try:
+                certificate = x509.load_der_x509_certificate(data, default_backend())
+                certificates.append(_certificate_info(certificate, certificate.public_bytes(serialization.Encoding.PEM)))
+            except ValueError:
+                serialization.load_der_private_key(data, password=None, backend=default_backend())
+                private_keys.append((None, data))
+
+        if not certificates and not private_keys:
+            raise ValueError("Failed to discover a valid PEM or DER encoded certificate or private key!")
+        if certificates:
+            certificate_cache.set(key, certificates, CERTIFICATE_CACHE_TTL_SEC)
+
+    return dict(certificates=certificates, private_keys=private_keys)
+
+
+def memoize(func):
+    """Memoize the results of a NetAppESeriesModule method for each instance and set of arguments.
+
+    Results are kept until NetAppESeriesModule.invalidate_memoized() is called which must follow any request that changes
+    the storage system information the method depends on. Callers must not modify the returned results.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        memo = self.__dict__.setdefault("_memoized", dict())
+        key = (func.__name__, repr(args), repr(sorted(kwargs.items())))
+        if key not in memo:
+            memo[key] = func(self, *args, **kwargs)
+        return memo[key]
+
+    return wrapper
+
+
+def iter_concurrently(func, items, max_workers):
+    """Call func for each item using no more than max_workers threads, yielding each result as soon as it completes.
+
+    Items are consumed lazily so large iterables, such as every address in a subnet, are never held in memory. Exceptions
+    raised by func are yielded with the item rather than raised; see run_concurrently(). SystemExit and KeyboardInterrupt,
+    such as those raised by exit_json() or fail_json(), stop the remaining items from being started and are raised in the
+    calling thread once every running call has returned.
+
+    :return generator: (item, result, error) tuples in the order func completes; error is None when func succeeded.
+    """
+    if hasattr(items, "__len__"):
+        max_workers = min(max_workers, len(items))
+    items = iter(items)
+    items_lock = threading.Lock()
+    completed = queue.Queue()
+    finished = object()
+    aborted = []
+
+    def worker():
+        try:
+            while not aborted:
+                with items_lock:
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        break
+                try:
+                    completed.put((item, func(item), None))
+                except Exception as error:
+                    completed.put((item, None, error))
+        except BaseException as error:
+            aborted.append(error)
+        finally:
+            completed.put(finished)
+
+    threads = [threading.Thread(target=worker) for count in range(max(1, max_workers))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    running = len(threads)
+    while running:
+        result = completed.get()
+        if result is finished:
+            running -= 1
+        elif not aborted:
+            yield result
+
+    if aborted:
+        raise aborted[0]
+
+
+def run_concurrently(func, items, max_workers):
+    """Call func for each item using no more than max_workers threads.
+
+    Exceptions raised by func are returned with the item's result rather than raised so that one failure does not prevent
+    the remaining items from being processed. Use NetAppESeriesDeferredFailureModule when func may call fail_json().
+
+    :return list: (item, result, error) tuples in the order the items were given; error is None when func succeeded.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    for index, result, error in iter_concurrently(lambda index: func(items[index]), range(len(items)), max_workers):
+        results[index] = (items[index], result, error)
+
+    return results
+
+
+class NetAppESeriesModuleError(Exception):
+    """Failure raised by NetAppESeriesDeferredFailureModule.fail_json(); kwargs holds the fail_json() arguments."""
+
+    def __init__(self, msg, **kwargs):
+        super(NetAppESeriesModuleError, self).__init__(msg)
+        self.kwargs = kwargs
+
+
+class NetAppESeriesDeferredFailureModule(object):
+    """AnsibleModule wrapper whose fail_json() raises NetAppESeriesModuleError instead of ending the module.
+
+    Used when work is performed for one of many items, such as by run_concurrently() workers, so that a failure can be
+    reported with that item's result. Every other attribute is taken from the wrapped module.
+    """
+
+    def __init__(self, module):
+        self._module = module
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+    def fail_json(self, msg, **kwargs):
+        raise NetAppESeriesModuleError(msg, **kwargs)
+
+
 class NetAppESeriesModule(object):
     """Base class for all NetApp E-Series modules.
 
@@ -71,6 +846,9 @@ class NetAppESeriesModule(object):
     :param list(list) required_together: list containing list(s) of options that are required together. (optional)
     :param bool log_requests: controls whether to log each request (default: True)
     :param bool proxy_specific_task: controls whether ssid is a default option (default: False)
+
+    Requests are issued over persistent connections unless the keep_alive option is disabled; see
+    NetAppESeriesSession.
     """
     DEFAULT_TIMEOUT = 300
     DEFAULT_SECURE_PORT = "8443"
@@ -110,6 +888,8 @@ class NetAppESeriesModule(object):
             self.ssid = args["ssid"]
         self.url = args["api_url"]
         self.log_requests = log_requests
+        self.keep_alive = args["keep_alive"]
+        self.about_cache_ttl = args["about_cache_ttl"]
         self.creds = dict(url_username=args["api_username"],
                           url_password=args["api_password"],
                           validate_certs=args["validate_certs"])
@@ -120,19 +900,89 @@ class NetAppESeriesModule(object):
         self.is_proxy_used_cache = None
         self.is_embedded_available_cache = None
         self.is_web_services_valid_cache = None
+        self.graph_cache = None
+
+        # See eseries_max_workers_argument_spec().
+        if args.get("max_workers") is not None and args["max_workers"] < 1:
+            self.module.fail_json(msg="max_workers must be greater than zero.")
+
+        if self.keep_alive:
+            atexit.register(self._log_connection_statistics)
+
+    def _log_connection_statistics(self):
+        """Log the number of new and reused persistent connections made during the module run."""
+        self.module.log("Web services connections: new [%(new)s], reused [%(reused)s], open_url fallback [%(fallback)s]."
+                        % keep_alive_session.statistics)
+
+    def _get_web_services_about(self):
+        """Retrieve the web services about information.
+
+        This helper function will update the supplied api url if secure http is not used for embedded web services.
+        Results are cached by url for the life of the process and, when about_cache_ttl is set, on disk (see
+        NetAppESeriesCache).
+
+        :raise AnsibleFailJson: raised when web services about endpoint failed to be contacted.
+        :return dict: web services about information.
+        """
+        url_parts = urlparse(self.url)
+        if not url_parts.scheme or not url_parts.netloc:
+            self.module.fail_json(msg="Failed to provide valid API URL. "
+                                      "Example: https://192.168.1.100:8443/devmgr/v2. URL [%s]." % self.url)
+
+        if url_parts.scheme not in ["http", "https"]:
+            self.module.fail_json(msg="Protocol must be http or https. URL [%s]." % self.url)
+
+        self.url = "%s://%s/" % (url_parts.scheme, url_parts.netloc)
+        secure_url = "https://%s:8443/" % url_parts.netloc.split(":")[0]
+
+        # Only whether the secure port fallback was needed is cached; the request target is always derived from api_url.
+        cache_key = "about|%s|%s" % (self.url, self.creds["url_username"])
+        cached_about = about_cache.get(cache_key, self.about_cache_ttl)
+        if isinstance(cached_about, dict) and isinstance(cached_about.get("about"), dict):
+            if cached_about.get("secure_port_fallback"):
+                self.url = secure_url
+            return cached_about["about"]
+
+        secure_port_fallback = False
+        about_url = self.url + self.DEFAULT_REST_API_ABOUT_PATH
+        rc, data = request(about_url, timeout=self.DEFAULT_TIMEOUT, headers=self.DEFAULT_HEADERS, ignore_errors=True, force_basic_auth=False,
+                           keep_alive=self.keep_alive, **self.creds)
+
+        if rc != 200:
+            self.module.warn("Failed to retrieve web services about information! Retrying with secure ports. "
+                             "Array Id [%s]." % self.ssid)
+            self.url = secure_url
+            secure_port_fallback = True
+            about_url = self.url + self.DEFAULT_REST_API_ABOUT_PATH
+            try:
+                rc, data = request(about_url, timeout=self.DEFAULT_TIMEOUT, headers=self.DEFAULT_HEADERS, keep_alive=self.keep_alive, **self.creds)
+            except Exception as error:
+                self.module.fail_json(msg="Failed to retrieve the webservices about information! Array Id [%s]. "
+                                          "Error [%s]." % (self.ssid, to_native(error)))
+
+        about_cache.set(cache_key, dict(secure_port_fallback=secure_port_fallback, about=data), self.about_cache_ttl)
+        return data
 
     def _check_ssid(self):
         """Verify storage system identifier exist on the proxy and, if not, then update to match storage system name."""
         try:
-            rc, data = self._request(url=self.url + self.DEFAULT_REST_API_ABOUT_PATH, **self.creds)
+            data = self._get_web_services_about()
 
             if data["runningAsProxy"]:
                 if self.ssid.lower() not in ["proxy", "0"]:
+                    cache_key = "ssid|%s|%s|%s" % (self.url, self.creds["url_username"], self.ssid)
+                    cached_ssid = about_cache.get(cache_key, self.about_cache_ttl)
+                    if cached_ssid:
+                        self.ssid = cached_ssid
+                        return
+
                     try:
-                        rc, systems = self._request(url=self.url + self.DEFAULT_REST_API_PATH + "storage-systems", **self.creds)
+                        rc, systems = self._request(url=self.url + self.DEFAULT_REST_API_PATH + "storage-systems",
+                                                    keep_alive=self.keep_alive, **self.creds)
                         alternates = []
                         for system in systems:
                             if system["id"] == self.ssid:
+                                about_cache.set(cache_key, self.ssid, self.about_cache_ttl)
                                 break
                             elif system["name"] == self.ssid:
                                 alternates.append(system["id"])
@@ -141,6 +991,7 @@ class NetAppESeriesModule(object):
                                 self.module.warn("Array Id does not exist on Web Services Proxy instance! "
                                                  "However, there is a storage system with a matching name. "
                                                  "Updating Identifier. Array Name: [%s], Array Id [%s]." % (self.ssid, alternates[0]))
+                                about_cache.set(cache_key, alternates[0], self.about_cache_ttl)
                                 self.ssid = alternates[0]
                             else:
                                 self.module.fail_json(msg="Array identifier does not exist on Web Services Proxy "
@@ -165,29 +1016,7 @@ class NetAppESeriesModule(object):
         :raise AnsibleFailJson: raised when the contacted api service does not meet the minimum required version.
         """
         if not self.is_web_services_valid_cache:
-
-            url_parts = urlparse(self.url)
-            if not url_parts.scheme or not url_parts.netloc:
-                self.module.fail_json(msg="Failed to provide valid API URL. "
-                                          "Example: https://192.168.1.100:8443/devmgr/v2. URL [%s]." % self.url)
-
-            if url_parts.scheme not in ["http", "https"]:
-                self.module.fail_json(msg="Protocol must be http or https. URL [%s]." % self.url)
-
-            self.url = "%s://%s/" % (url_parts.scheme, url_parts.netloc)
-            about_url = self.url + self.DEFAULT_REST_API_ABOUT_PATH
-            rc, data = request(about_url, timeout=self.DEFAULT_TIMEOUT, headers=self.DEFAULT_HEADERS, ignore_errors=True, force_basic_auth=False, **self.creds)
-
-            if rc != 200:
-                self.module.warn("Failed to retrieve web services about information! Retrying with secure ports. "
-                                 "Array Id [%s]." % self.ssid)
-                self.url = "https://%s:8443/" % url_parts.netloc.split(":")[0]
-                about_url = self.url + self.DEFAULT_REST_API_ABOUT_PATH
-                try:
-                    rc, data = request(about_url, timeout=self.DEFAULT_TIMEOUT, headers=self.DEFAULT_HEADERS, **self.creds)
-                except Exception as error:
-                    self.module.fail_json(msg="Failed to retrieve the webservices about information! Array Id [%s]. "
-                                              "Error [%s]." % (self.ssid, to_native(error)))
+            data = self._get_web_services_about()
 
             if len(data["version"].split(".")) == 4:
                 major, minor, other, revision = data["version"].split(".")
@@ -212,28 +1041,7 @@ class NetAppESeriesModule(object):
         if len(split_version) != 4 or not split_version[0].isdigit() or not split_version[1].isdigit() or not split_version[3].isdigit():
             self.module.fail_json(msg="Version is not a valid Web Services version. Version [%s]." % version)
 
-        url_parts = urlparse(self.url)
-        if not url_parts.scheme or not url_parts.netloc:
-            self.module.fail_json(msg="Failed to provide valid API URL. "
-                                      "Example: https://192.168.1.100:8443/devmgr/v2. URL [%s]." % self.url)
-
-        if url_parts.scheme not in ["http", "https"]:
-            self.module.fail_json(msg="Protocol must be http or https. URL [%s]." % self.url)
-
-        self.url = "%s://%s/" % (url_parts.scheme, url_parts.netloc)
-        about_url = self.url + self.DEFAULT_REST_API_ABOUT_PATH
-        rc, data = request(about_url, timeout=self.DEFAULT_TIMEOUT, headers=self.DEFAULT_HEADERS, ignore_errors=True, **self.creds)
-
-        if rc != 200:
-            self.module.warn("Failed to retrieve web services about information! Retrying with secure ports. "
-                             "Array Id [%s]." % self.ssid)
-            self.url = "https://%s:8443/" % url_parts.netloc.split(":")[0]
-            about_url = self.url + self.DEFAULT_REST_API_ABOUT_PATH
-            try:
-                rc, data = request(about_url, timeout=self.DEFAULT_TIMEOUT, headers=self.DEFAULT_HEADERS, **self.creds)
-            except Exception as error:
-                self.module.fail_json(msg="Failed to retrieve the webservices about information! Array Id [%s]. "
-                                          "Error [%s]." % (self.ssid, to_native(error)))
+        data = self._get_web_services_about()
 
         if len(data["version"].split(".")) == 4:
             major, minor, other, revision = data["version"].split(".")
@@ -284,9 +1092,8 @@ class NetAppESeriesModule(object):
         self._check_web_services_version()
 
         if self.is_proxy_used_cache is None:
-            about_url = self.url + self.DEFAULT_REST_API_ABOUT_PATH
             try:
-                rc, data = request(about_url, timeout=self.DEFAULT_TIMEOUT, headers=self.DEFAULT_HEADERS, force_basic_auth=False, **self.creds)
+                data = self._get_web_services_about()
                 self.is_proxy_used_cache = data["runningAsProxy"]
 
                 self.module.log("proxy: [%s]" % ("True" if self.is_proxy_used_cache else "False"))
@@ -296,6 +1103,117 @@ class NetAppESeriesModule(object):
 
         return self.is_proxy_used_cache
 
+    def get_graph(self, refresh=False):
+        """Retrieve an indexed snapshot of the storage system graph.
+
+        The graph is retrieved once per module run and shared by every caller. Modules that define the graph_file option
+        load the graph from that file instead so that check mode planning can be done without contacting the storage system.
+
+        :param bool refresh: retrieve the graph again (for example, after the storage system has been modified).
+        :raise AnsibleFailJson: raised when the graph cannot be retrieved.
+        :return NetAppESeriesGraph: storage system graph.
+        """
+        if self.graph_cache is None or refresh:
+            graph_file = self.module.params.get("graph_file")
+            if graph_file:
+                if not self.module.check_mode:
+                    self.module.fail_json(msg="The graph_file option can only be used in check mode. Array Id [%s]." % self.ssid)
+                try:
+                    self.graph_cache = NetAppESeriesGraph.load(graph_file)
+                except Exception as error:
+                    self.module.fail_json(msg="Failed to load storage array graph. File [%s]. Array Id [%s]. Error [%s]."
+                                              % (graph_file, self.ssid, to_native(error)))
+            else:
+                try:
+                    rc, graph = self.request("storage-systems/%s/graph" % self.ssid)
+                    self.graph_cache = NetAppESeriesGraph(graph)
+                except Exception as error:
+                    self.module.fail_json(msg="Failed to retrieve storage array graph. Array Id [%s]. Error [%s]." % (self.ssid, to_native(error)))
+
+        return self.graph_cache
+
+    def invalidate_memoized(self, *names):
+        """Discard memoized method results (see memoize) so that they are retrieved again when next used.
+
+        :param names: names of the memoized methods to invalidate. When no names are given every memoized result and the
+                      storage system graph are discarded.
+        """
+        memo = self.__dict__.get("_memoized", dict())
+        if names:
+            for key in [key for key in memo.keys() if key[0] in names]:
+                memo.pop(key)
+        else:
+            memo.clear()
+            if not self.module.params.get("graph_file"):
+                self.graph_cache = None
+
+    def get_bulk_entry_args(self, entry):
+        """Determine the options of an entry in a list option such as hosts or volumes.
+
+        Entries inherit any option they do not specify from the module parameters.
+        """
+        args = dict(self.module.params)
+        args.update(dict((key, value) for key, value in entry.items() if value is not None))
+        return args
+
+    def get_bulk_entry(self, result, connection=None):
+        """Create the instance that applies an entry in a list option such as hosts or volumes.
+
+        The instance shares everything this instance has retrieved, records its outcome in result and reports failures by
+        raising NetAppESeriesModuleError rather than ending the module.
+
+        :param dict result: result of the entry; it must include a changed key (see exit_bulk_results()).
+        :param dict connection: ssid, api_url, api_username, api_password and validate_certs options of an entry for another
+                                storage system. Options that are None are taken from the module parameters. The instance
+                                discards the web services information and memoized results that belong to this storage system.
+        """
+        instance = copy.copy(self)
+        instance.module = NetAppESeriesDeferredFailureModule(self.module)
+        instance.result = result
+
+        if connection is not None:
+            instance.ssid = connection["ssid"]
+            instance.url = connection["api_url"] or self.module.params["api_url"]
+            if not instance.url.endswith("/"):
+                instance.url += "/"
+            instance.creds = dict(url_username=connection["api_username"] or self.creds["url_username"],
+                                  url_password=connection["api_password"] or self.creds["url_password"],
+                                  validate_certs=self.creds["validate_certs"] if connection["validate_certs"] is None else connection["validate_certs"])
+
+            instance.is_proxy_used_cache = None
+            instance.is_embedded_available_cache = None
+            instance.is_web_services_valid_cache = None
+            instance.graph_cache = None
+            instance._memoized = dict()
+
+        return instance
+
+    def exit_bulk_results(self, results, description, label=None, name_key="name", changed_key="changed", changes="changes", action=None, **kwargs):
+        """Summarize the results of every entry in a list option, failing when any entry failed.
+
+        :param list results: results of the entries (see get_bulk_entry()); failed entries include failed=True.
+        :param str description: plural description of the entries, such as "host groups".
+        :param str label: label of the failed entry names; defaults to the capitalized description.
+        :param str name_key: result key that names the entry. Entries named by ssid are storage systems so the module's ssid
+                             is not reported.
+        :param str changed_key: result key that indicates the entry required changes; it determines the changed return value.
+        :param str changes: description of the required changes.
+        :param str action: description of the failed action; defaults to applying the changes.
+        :param kwargs: additional return values, such as the results themselves.
+        :raise AnsibleExitJson when every entry completes successfully"""
+        change = any(result[changed_key] for result in results)
+        failures = [result for result in results if result.get("failed")]
+        if failures:
+            names = ", ".join(result[name_key] for result in failures)
+            msg = "Failed to %s %s of %s %s. %s [%s]." % (action or "apply %s to" % changes, len(failures), len(results), description,
+                                                          label or description.capitalize(), names)
+            if name_key != "ssid":
+                msg += " Array [%s]." % self.ssid
+            self.module.fail_json(msg=msg, changed=change, **kwargs)
+
+        self.module.exit_json(msg="%s of %s %s required %s." % (len([result for result in results if result[changed_key]]), len(results), description, changes),
+                              changed=change, **kwargs)
+
     def request(self, path, rest_api_path=DEFAULT_REST_API_PATH, rest_api_url=None, data=None, method='GET', headers=None, ignore_errors=False, timeout=None,
                 force_basic_auth=True, log_request=None, json_response=True):
         """Issue an HTTP request to a url, retrieving an optional JSON response.
@@ -337,7 +1255,7 @@ class NetAppESeriesModule(object):
 
         response = self._request(url=request_url, data=data, method=method, headers=headers, last_mod_time=None,
                                  timeout=timeout, http_agent=self.HTTP_AGENT, force_basic_auth=force_basic_auth,
-                                 ignore_errors=ignore_errors, json_response=json_response, **self.creds)
+                                 ignore_errors=ignore_errors, json_response=json_response, keep_alive=self.keep_alive, **self.creds)
         if log_request:
             self.module.log(pformat(response))
 
@@ -346,7 +1264,7 @@ class NetAppESeriesModule(object):
     @staticmethod
     def _request(url, data=None, headers=None, method='GET', use_proxy=True, force=False, last_mod_time=None,
                  timeout=10, validate_certs=True, url_username=None, url_password=None, http_agent=None,
-                 force_basic_auth=True, ignore_errors=False, json_response=True):
+                 force_basic_auth=True, ignore_errors=False, json_response=True, keep_alive=False):
         """Issue an HTTP request to a url, retrieving an optional JSON response."""
 
         if headers is None:
@@ -357,10 +1275,10 @@ class NetAppESeriesModule(object):
             http_agent = "Ansible / %s" % ansible_version
 
         try:
-            r = open_url(url=url, data=data, headers=headers, method=method, use_proxy=use_proxy, force=force,
-                         last_mod_time=last_mod_time, timeout=timeout, validate_certs=validate_certs,
-                         url_username=url_username, url_password=url_password, http_agent=http_agent,
-                         force_basic_auth=force_basic_auth)
+            r = session_open_url(url=url, data=data, headers=headers, method=method, use_proxy=use_proxy, force=force,
+                                 last_mod_time=last_mod_time, timeout=timeout, validate_certs=validate_certs,
+                                 url_username=url_username, url_password=url_password, http_agent=http_agent,
+                                 force_basic_auth=force_basic_auth, keep_alive=keep_alive)
             rc = r.getcode()
             response = r.read()
             if json_response and response:
@@ -383,59 +1301,142 @@ class NetAppESeriesModule(object):
         return rc, response
 
 
-def create_multipart_formdata(files, fields=None, send_8kb=False):
+class NetAppESeriesMultipartFormData(object):
+    """File-like multipart/form-data request body that reads files in chunks as the request is sent.
+
+    The length of every part is determined up front so the Content-Length is known without reading the files into memory.
+    The body can be rewound with seek(0) so that a request can be reissued.
+
+    :param list parts: list containing bytes or (path, length) tuples for the portion of a file to send.
+    :param log: optional callable used to report the upload progress and throughput (for example, AnsibleModule.log).
+    """
+    PROGRESS_REPORT_PERCENT = 10
+
+    def __init__(self, parts, log=None):
+        self.parts = parts
+        self.length = sum(len(part) if isinstance(part, six.binary_type) else part[1] for part in parts)
+        self.log = log
+        self.fh = None
+        self.seek(0)
+
+    def __len__(self):
+        return self.length
+
+    def __repr__(self):
+        return "<multipart/form-data body of %s bytes>" % self.length
+
+    def _report_progress(self, size):
+        """Log the upload progress each time another PROGRESS_REPORT_PERCENT of the body has been read."""
+        if self.start_time is None:
+            self.start_time = time.time()
+        self.position += size
+
+        if self.log and self.length:
+            percent = int(self.position * 100 / self.length)
+            if percent >= self.reported_percent + self.PROGRESS_REPORT_PERCENT or (self.position == self.length and percent > self.reported_percent):
+                self.reported_percent = percent
+                elapsed = max(time.time() - self.start_time, 0.001)
+                self.log("Uploaded %s%% (%.1f of %.1f MB) at %.2f MB/s."
+                         % (percent, self.position / 1024.0 ** 2, self.length / 1024.0 ** 2, self.position / 1024.0 ** 2 / elapsed))
+
+    def seek(self, offset, whence=0):
+        """Rewind the body to the beginning.
+
+        :raise IOError: raised when attempting to seek anywhere other than the beginning of the body.
+        """
+        if offset != 0 or whence != 0:
+            raise IOError("Multipart form data can only be rewound to the beginning.")
+        self.close()
+        self.index = 0
+        self.part_offset = 0
+        self.position = 0
+        self.start_time = None
+        self.reported_percent = 0
+        return 0
+
+    def tell(self):
+        return self.position
+
+    def close(self):
+        if self.fh is not None:
+            self.fh.close()
+            self.fh = None
+
+    def read(self, size=-1):
+        """Read up to size bytes of the body (the remainder of the body when size is negative or None).
+
+        :raise IOError: raised when a file is shorter than when the body was created.
+        """
+        if size is None or size < 0:
+            size = self.length - self.position
+
+        chunks = []
+        remaining = size
+        while remaining > 0 and self.index < len(self.parts):
+            part = self.parts[self.index]
+            if isinstance(part, six.binary_type):
+                part_length = len(part)
+                chunk = part[self.part_offset:self.part_offset + remaining]
+            else:
+                path, part_length = part
+                chunk = b""
+                if part_length:     # Empty files have nothing to read.
+                    if self.fh is None:
+                        self.fh = open(path, "rb")
+                    chunk = self.fh.read(min(remaining, part_length - self.part_offset))
+                    if not chunk:
+                        raise IOError("File changed while it was being uploaded. File [%s]." % path)
+
+            chunks.append(chunk)
+            remaining -= len(chunk)
+            self.part_offset += len(chunk)
+            if self.part_offset >= part_length:
+                self.close()
+                self.index += 1
+                self.part_offset = 0
+
+        data = b"".join(chunks)
+        if data:
+            self._report_progress(len(data))
+        return data
+
+
+def create_multipart_formdata(files, fields=None, send_8kb=False, log=None):
     """Create the data for a multipart/form request.
 
+    The files are not read into memory; they are streamed in chunks as the request is sent (see
+    NetAppESeriesMultipartFormData).
+
     :param list(list) files: list of lists each containing (name, filename, path).
     :param list(list) fields: list of lists each containing (key, value).
     :param bool send_8kb: only sends the first 8kb of the files (default: False).
+    :param log: optional callable used to report the upload progress and throughput (for example, AnsibleModule.log).
+    :return tuple(dict, NetAppESeriesMultipartFormData): request headers and file-like request body.
     """
     boundary = "---------------------------" + "".join([str(random.randint(0, 9)) for x in range(27)])
-    data_parts = list()
-    data = None
-
-    if six.PY2:  # Generate payload for Python 2
-        newline = "\r\n"
-        if fields is not None:
-            for key, value in fields:
-                data_parts.extend(["--%s" % boundary,
-                                   'Content-Disposition: form-data; name="%s"' % key,
-                                   "",
-                                   value])
-
-        for name, filename, path in files:
-            with open(path, "rb") as fh:
-                value = fh.read(8192) if send_8kb else fh.read()
-
-                data_parts.extend(["--%s" % boundary,
-                                   'Content-Disposition: form-data; name="%s"; filename="%s"' % (name, filename),
-                                   "Content-Type: %s" % (mimetypes.guess_type(path)[0] or "application/octet-stream"),
-                                   "",
-                                   value])
-        data_parts.extend(["--%s--" % boundary, ""])
-        data = newline.join(data_parts)
-
-    else:
-        newline = six.b("\r\n")
-        if fields is not None:
-            for key, value in fields:
-                data_parts.extend([six.b("--%s" % boundary),
-                                   six.b('Content-Disposition: form-data; name="%s"' % key),
-                                   six.b(""),
-                                   six.b(value)])
-
-        for name, filename, path in files:
-            with open(path, "rb") as fh:
-                value = fh.read(8192) if send_8kb else fh.read()
-
-                data_parts.extend([six.b("--%s" % boundary),
-                                   six.b('Content-Disposition: form-data; name="%s"; filename="%s"' % (name, filename)),
-                                   six.b("Content-Type: %s" % (mimetypes.guess_type(path)[0] or "application/octet-stream")),
-                                   six.b(""),
-                                   value])
-        data_parts.extend([six.b("--%s--" % boundary), b""])
-        data = newline.join(data_parts)
-
+    newline = b"\r\n"
+    parts = list()
+
+    if fields is not None:
+        for key, value in fields:
+            parts.append(newline.join([to_bytes("--%s" % boundary),
+                                       to_bytes('Content-Disposition: form-data; name="%s"' % key),
+                                       b"",
+                                       to_bytes(value),
+                                       b""]))
+
+    for name, filename, path in files:
+        size = os.path.getsize(path)
+        parts.append(newline.join([to_bytes("--%s" % boundary),
+                                   to_bytes('Content-Disposition: form-data; name="%s"; filename="%s"' % (name, filename)),
+                                   to_bytes("Content-Type: %s" % (mimetypes.guess_type(path)[0] or "application/octet-stream")),
+                                   b"",
+                                   b""]))
+        parts.append((path, min(size, 8192) if send_8kb else size))
+        parts.append(newline)
+    parts.append(to_bytes("--%s--" % boundary) + newline)
+
+    data = NetAppESeriesMultipartFormData(parts, log=log)
     headers = {
         "Content-Type": "multipart/form-data; boundary=%s" % boundary,
         "Content-Length": str(len(data))}
@@ -445,7 +1446,7 @@ def create_multipart_formdata(files, fields=None, send_8kb=False):
 
 def request(url, data=None, headers=None, method='GET', use_proxy=True,
             force=False, last_mod_time=None, timeout=10, validate_certs=True,
-            url_username=None, url_password=None, http_agent=None, force_basic_auth=True, ignore_errors=False):
+            url_username=None, url_password=None, http_agent=None, force_basic_auth=True, ignore_errors=False, keep_alive=False):
     """Issue an HTTP request to a url, retrieving an optional JSON response."""
 
     if headers is None:
@@ -456,10 +1457,10 @@ def request(url, data=None, headers=None, method='GET', use_proxy=True,
         http_agent = "Ansible / %s" % ansible_version
 
     try:
-        r = open_url(url=url, data=data, headers=headers, method=method, use_proxy=use_proxy,
-                     force=force, last_mod_time=last_mod_time, timeout=timeout, validate_certs=validate_certs,
-                     url_username=url_username, url_password=url_password, http_agent=http_agent,
-                     force_basic_auth=force_basic_auth)
+        r = session_open_url(url=url, data=data, headers=headers, method=method, use_proxy=use_proxy,
+                             force=force, last_mod_time=last_mod_time, timeout=timeout, validate_certs=validate_certs,
+                             url_username=url_username, url_password=url_password, http_agent=http_agent,
+                             force_basic_auth=force_basic_auth, keep_alive=keep_alive)
     except HTTPError as err:
         r = err.fp
 
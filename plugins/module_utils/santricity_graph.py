@@ -0,0 +1,188 @@
+# (c) 2024, NetApp, Inc
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import json
+
+
+class NetAppESeriesGraph(object):
+    """Indexed snapshot of a storage system's object graph (storage-systems/{ssid}/graph).
+
+    The graph is retrieved once and each index is built the first time it is used so that modules can share a
+    consistent view of the storage system without issuing additional requests. Use NetAppESeriesModule.get_graph() to
+    retrieve the graph for the module's storage system.
+
+    :param dict graph: storage system graph as returned by the web services rest api.
+    """
+    DEFAULT_HOSTGROUP_REF = "0000000000000000000000000000000000000000"
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.indexes = dict()
+
+    @classmethod
+    def load(cls, path):
+        """Load a previously saved storage system graph.
+
+        :raise IOError: raised when the file cannot be read.
+        :raise ValueError: raised when the file does not contain json.
+        """
+        with open(path, "r") as fh:
+            return cls(json.load(fh))
+
+    def save(self, path):
+        """Save the storage system graph so that it can be loaded later with NetAppESeriesGraph.load()."""
+        with open(path, "w") as fh:
+            json.dump(self.graph, fh)
+
+    def _index(self, name, objects, key):
+        """Build and memoize a dictionary of objects keyed by the value of key."""
+        if name not in self.indexes:
+            self.indexes[name] = dict((obj[key], obj) for obj in objects)
+        return self.indexes[name]
+
+    def _group(self, name, objects, key):
+        """Build and memoize a dictionary of object lists grouped by the value of key."""
+        if name not in self.indexes:
+            groups = dict()
+            for obj in objects:
+                groups.setdefault(obj[key], []).append(obj)
+            self.indexes[name] = groups
+        return self.indexes[name]
+
+    @property
+    def storage_array(self):
+        return self.graph["sa"]
+
+    @property
+    def access_volume(self):
+        return self.graph["sa"]["accessVolume"]
+
+    @property
+    def controllers(self):
+        return self.graph["controller"]
+
+    @property
+    def drives(self):
+        return self.graph["drive"]
+
+    @property
+    def drives_by_ref(self):
+        return self._index("drives_by_ref", self.drives, "driveRef")
+
+    @property
+    def trays(self):
+        return self.graph["tray"]
+
+    @property
+    def trays_by_ref(self):
+        return self._index("trays_by_ref", self.trays, "trayRef")
+
+    @property
+    def storage_pools(self):
+        return self.graph["volumeGroup"]
+
+    @property
+    def storage_pools_by_id(self):
+        return self._index("storage_pools_by_id", self.storage_pools, "id")
+
+    @property
+    def storage_pools_by_name(self):
+        return self._index("storage_pools_by_name", self.storage_pools, "name")
+
+    @property
+    def thick_volumes(self):
+        return self.graph["volume"]
+
+    @property
+    def thin_volumes(self):
+        return self.graph["highLevelVolBundle"]["thinVolume"]
+
+    @property
+    def volumes(self):
+        """List of all thick and thin volumes."""
+        if "volumes" not in self.indexes:
+            self.indexes["volumes"] = list(self.thick_volumes + self.thin_volumes)
+        return self.indexes["volumes"]
+
+    @property
+    def volumes_by_id(self):
+        return self._index("volumes_by_id", self.volumes, "id")
+
+    @property
+    def volumes_by_ref(self):
+        return self._index("volumes_by_ref", self.volumes, "volumeRef")
+
+    @property
+    def volumes_by_name(self):
+        return self._index("volumes_by_name", self.volumes, "name")
+
+    @property
+    def hosts(self):
+        return self.graph["storagePoolBundle"]["host"]
+
+    @property
+    def hosts_by_ref(self):
+        return self._index("hosts_by_ref", self.hosts, "hostRef")
+
+    @property
+    def hosts_by_name(self):
+        return self._index("hosts_by_name", self.hosts, "name")
+
+    @property
+    def hosts_by_group_ref(self):
+        """Dictionary of host lists keyed by their host group reference."""
+        return self._group("hosts_by_group_ref", self.hosts, "clusterRef")
+
+    @property
+    def host_groups(self):
+        return self.graph["storagePoolBundle"]["cluster"]
+
+    @property
+    def host_groups_by_ref(self):
+        return self._index("host_groups_by_ref", self.host_groups, "clusterRef")
+
+    @property
+    def host_groups_by_name(self):
+        return self._index("host_groups_by_name", self.host_groups, "name")
+
+    @property
+    def mappings(self):
+        return self.graph["storagePoolBundle"]["lunMapping"]
+
+    @property
+    def mappings_by_ref(self):
+        return self._index("mappings_by_ref", self.mappings, "lunMappingRef")
+
+    @property
+    def mappings_by_volume_ref(self):
+        """Dictionary of lun mapping lists keyed by the mapped volume reference."""
+        return self._group("mappings_by_volume_ref", self.mappings, "volumeRef")
+
+    @property
+    def mappings_by_map_ref(self):
+        """Dictionary of lun mapping lists keyed by the host or host group reference."""
+        return self._group("mappings_by_map_ref", self.mappings, "mapRef")
+
+    @property
+    def pit_groups(self):
+        return self.graph["highLevelVolBundle"]["pitGroup"]
+
+    @property
+    def pits(self):
+        return self.graph["highLevelVolBundle"]["pit"]
+
+    @property
+    def pit_views(self):
+        return self.graph["highLevelVolBundle"]["pitView"]
+
+    @property
+    def pit_views_by_base_volume(self):
+        """Dictionary of snapshot volume lists keyed by their base volume reference."""
+        return self._group("pit_views_by_base_volume", self.pit_views, "baseVol")
+
+    @property
+    def consistency_groups(self):
+        return self.graph["highLevelVolBundle"]["pitConsistencyGroup"]
@@ -0,0 +1,139 @@
+# (c) 2024, NetApp, Inc
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import time
+
+
+def get_poll_interval(previous=None, remaining=None, minimum=5, maximum=60):
+    """Determine how long to wait before polling the progress of an operation again.
+
+    The interval is a quarter of the estimated time remaining when it is known; otherwise the previous interval is
+    doubled (exponential backoff) starting from the minimum.
+
+    :param float previous: previous poll interval in seconds.
+    :param float remaining: estimated time remaining in seconds.
+    :param float minimum: shortest interval in seconds.
+    :param float maximum: longest interval in seconds.
+    :return float: poll interval in seconds.
+    """
+    if remaining is not None:
+        interval = remaining / 4.0
+    elif previous is not None:
+        interval = previous * 2
+    else:
+        interval = minimum
+    return max(minimum, min(maximum, interval))
+
+
+class NetAppESeriesLongLivedOperations(object):
+    """Track the long-lived operations (initialization, expansion, etc) of any number of volumes.
+
+    A single storage-systems/{ssid}/symbol/getLongLivedOpsProgress request is issued per poll for every watched volume and
+    the interval between polls adapts to the reported percent complete and estimated time to completion.
+
+    :param NetAppESeriesModule module: module used to issue requests.
+    """
+    MINIMUM_POLL_INTERVAL_SEC = 5
+    MAXIMUM_POLL_INTERVAL_SEC = 60
+
+    def __init__(self, module):
+        self.module = module
+        self.references = dict()
+        self.progress = dict()
+        self.first_progress = dict()
+        self.elapsed = 0
+        self.interval = None
+
+    def watch(self, name, volume):
+        """Watch the long-lived operations of a volume.
+
+        :param str name: name used to report the volume's progress.
+        :param dict volume: volume details containing the id and, for thin volumes, the storageVolumeRef.
+        """
+        for key in ["id", "storageVolumeRef"]:
+            if key in volume:
+                self.references[volume[key]] = name
+        self.progress[name] = dict(action="unknown", percent_complete=None, time_to_completion=None)
+
+    def in_progress(self):
+        """List the names of the watched volumes whose operations are incomplete."""
+        return sorted(name for name, progress in self.progress.items() if progress["action"] != "complete")
+
+    def poll(self):
+        """Retrieve the progress of every watched volume's operation.
+
+        A watched volume that is not listed in the response has no operation in progress.
+
+        :raise Exception: when the request fails.
+        :return list: names of the watched volumes whose operations are incomplete.
+        """
+        rc, operations = self.module.request("storage-systems/%s/symbol/getLongLivedOpsProgress" % self.module.ssid)
+
+        progress = dict((name, dict(action="complete", percent_complete=None, time_to_completion=None)) for name in self.progress.keys())
+        for operation in operations["longLivedOpsProgress"]:
+            if operation["volAction"] is None:
+                continue
+            for key in operation.keys():
+                if isinstance(operation[key], dict) and operation[key].get("volumeRef") in self.references:
+                    name = self.references[operation[key]["volumeRef"]]
+                    progress[name] = dict(action=operation["volAction"],
+                                          percent_complete=operation[key].get("percentComplete"),
+                                          time_to_completion=operation[key].get("timeToCompletion"))
+
+        for name, entry in progress.items():
+            if entry["percent_complete"] is not None:
+                self.first_progress.setdefault(name, (self.elapsed, entry["percent_complete"]))
+        self.progress = progress
+        return self.in_progress()
+
+    def estimate_remaining(self, name):
+        """Estimate the seconds remaining for a volume's operation.
+
+        The storage system's estimated time to completion (minutes) is used when reported; otherwise the estimate is based
+        on the rate of progress observed since the volume was first polled.
+
+        :return float: seconds remaining or None when it cannot be estimated.
+        """
+        progress = self.progress[name]
+        if progress["time_to_completion"] is not None and progress["time_to_completion"] >= 0:
+            return progress["time_to_completion"] * 60.0
+
+        if name in self.first_progress and progress["percent_complete"] is not None:
+            first_elapsed, first_percent_complete = self.first_progress[name]
+            if progress["percent_complete"] > first_percent_complete and self.elapsed > first_elapsed:
+                rate = (progress["percent_complete"] - first_percent_complete) / float(self.elapsed - first_elapsed)
+                return (100 - progress["percent_complete"]) / rate
+        return None
+
+    def get_poll_interval(self):
+        """Determine the interval before the next poll from the operation expected to complete first."""
+        estimates = [estimate for estimate in [self.estimate_remaining(name) for name in self.in_progress()] if estimate is not None]
+        self.interval = get_poll_interval(self.interval, min(estimates) if estimates else None,
+                                          self.MINIMUM_POLL_INTERVAL_SEC, self.MAXIMUM_POLL_INTERVAL_SEC)
+        return self.interval
+
+    def wait(self, timeout=None):
+        """Wait until the operations of every watched volume are complete.
+
+        :param int timeout: wait duration measured in seconds. Waits indefinitely when None.
+        :raise Exception: when a progress request fails.
+        :return list: names of the watched volumes whose operations did not complete before the timeout.
+        """
+        while True:
+            interval = self.get_poll_interval()
+            if timeout is not None:
+                if self.elapsed >= timeout:
+                    return self.in_progress()
+                interval = min(interval, timeout - self.elapsed)
+
+            time.sleep(interval)
+            self.elapsed += interval
+            if not self.poll():
+                return []
+
+            for name in self.in_progress():
+                self.module.module.log("Volume [%s] action, %s, is %s complete."
+                                       % (name, self.progress[name]["action"], self.progress[name]["percent_complete"]))
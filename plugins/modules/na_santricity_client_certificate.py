@@ -36,8 +36,56 @@ options:
     type: bool
     default: true
     required: false
+  arrays:
+    description:
+      - List of storage systems whose remote server certificates are compared and updated in a single task.
+      - The certificate files are parsed once and the storage systems are compared and updated concurrently using no more than
+        I(max_workers) threads.
+      - Each entry inherits any option it does not specify from the corresponding module option.
+    type: list
+    elements: dict
+    required: false
+    suboptions:
+      ssid:
+        description:
+          - The storage system identifier.
+        type: str
+        required: true
+      api_url:
+        description:
+          - See I(api_url).
+        type: str
+      api_username:
+        description:
+          - See I(api_username).
+        type: str
+      api_password:
+        description:
+          - See I(api_password).
+        type: str
+      validate_certs:
+        description:
+          - See I(validate_certs).
+        type: bool
+      certificates:
+        description:
+          - See I(certificates).
+        type: list
+        elements: str
+      remove_unspecified_user_certificates:
+        description:
+          - See I(remove_unspecified_user_certificates).
+        type: bool
+  max_workers:
+    description:
+      - Maximum number of storage systems compared and updated concurrently when I(arrays) is specified.
+    type: int
+    default: 8
+    required: false
 notes:
   - Set I(ssid=="0") or I(ssid=="proxy") to specifically reference SANtricity Web Services Proxy.
+  - Parsed certificate files are cached on the Ansible controller keyed by the digest of their content so that the same
+    certificate bundles are only parsed once; private keys are never cached.
 requirements:
   - cryptography
 """
@@ -55,6 +103,18 @@ EXAMPLES = """
     api_url: https://192.168.1.100:8443/devmgr/v2
     api_username: admin
     api_password: adminpass
+- name: Ensure the same certificates are installed on many storage systems
+  na_santricity_client_certificate:
+    api_url: https://192.168.1.100:8443/devmgr/v2
+    api_username: admin
+    api_password: adminpass
+    certificates: ["/path/to/ca_bundle.pem"]
+    remove_unspecified_user_certificates: true
+    arrays:
+      - ssid: array1
+      - ssid: array2
+      - ssid: "1"
+        api_url: https://192.168.1.200:8443/devmgr/v2
 """
 RETURN = """
 changed:
@@ -72,25 +132,25 @@ removed_certificates:
     type: list
     returned: always
     sample: ["removed_cerificiate.crt"]
+arrays:
+    description: Result for each storage system when I(arrays) is specified.
+    type: list
+    elements: dict
+    returned: when I(arrays) is specified
+    sample: [{"ssid": "array1", "api_url": "https://192.168.1.100:8443/", "changed": true, "msg": "Certificates updated.",
+              "add_certificates": ["/path/to/ca_bundle.pem"], "removed_certificates": []}]
 """
 
-import binascii
 import os
 import re
 from time import sleep
 
-from datetime import datetime
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule, create_multipart_formdata
+from datetime import datetime, timezone
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import (
+    CERTIFICATE_DATE_FORMAT, NetAppESeriesModule, create_multipart_formdata, eseries_max_workers_argument_spec, load_certificate_file,
+    run_concurrently)
 from ansible.module_utils._text import to_native
 
-try:
-    from cryptography import x509
-    from cryptography.hazmat.backends import default_backend
-except ImportError:
-    HAS_CRYPTOGRAPHY = False
-else:
-    HAS_CRYPTOGRAPHY = True
-
 
 class NetAppESeriesClientCertificate(NetAppESeriesModule):
     RELOAD_TIMEOUT_SEC = 3 * 60
@@ -98,7 +158,16 @@ class NetAppESeriesClientCertificate(NetAppESeriesModule):
     def __init__(self):
         ansible_options = dict(certificates=dict(type="list", elements="str", required=False),
                                remove_unspecified_user_certificates=dict(type="bool", default=False, required=False),
-                               reload_certificates=dict(type="bool", default=True, required=False))
+                               reload_certificates=dict(type="bool", default=True, required=False),
+                               arrays=dict(type="list", elements="dict", required=False,
+                                           options=dict(ssid=dict(type="str", required=True),
+                                                        api_url=dict(type="str"),
+                                                        api_username=dict(type="str"),
+                                                        api_password=dict(type="str", no_log=True),
+                                                        validate_certs=dict(type="bool"),
+                                                        certificates=dict(type="list", elements="str"),
+                                                        remove_unspecified_user_certificates=dict(type="bool"))))
+        ansible_options.update(eseries_max_workers_argument_spec())
 
         super(NetAppESeriesClientCertificate, self).__init__(ansible_options=ansible_options,
                                                              web_services_version="02.00.0000.0000",
@@ -108,16 +177,37 @@ class NetAppESeriesClientCertificate(NetAppESeriesModule):
         self.certificates = args["certificates"] if args["certificates"] else []
         self.remove_unspecified_user_certificates = args["remove_unspecified_user_certificates"]
         self.apply_reload_certificates = args["reload_certificates"]
+        self.arrays = args["arrays"]
+        self.max_workers = args["max_workers"]
 
         # Check whether request needs to be forwarded on to the controller web services rest api.
         self.url_path_prefix = ""
-        if self.is_proxy() and self.ssid != "0" and self.ssid.lower() != "proxy":
-            self.url_path_prefix = "storage-systems/%s/forward/devmgr/v2/" % self.ssid
+        if self.arrays is None:
+            self.set_url_path_prefix()
 
         self.remove_certificates = list()
         self.add_certificates = list()
         self.certificate_fingerprint_cache = None
         self.certificate_info_cache = None
+        self.loaded_certificates = dict()   # Shared by the instance of every storage system in the arrays list.
+
+    def set_url_path_prefix(self):
+        """Determine whether requests need to be forwarded on to the storage system's web services rest api."""
+        self.url_path_prefix = ""
+        if self.is_proxy() and self.ssid != "0" and self.ssid.lower() != "proxy":
+            self.url_path_prefix = "storage-systems/%s/forward/devmgr/v2/" % self.ssid
+
+    def load_certificate(self, path):
+        """Load the first certificate in a PEM or DER encoded certificate file; each file is only loaded once per module run.
+
+        :raise Exception: when the file cannot be read or does not contain a certificate.
+        """
+        if path not in self.loaded_certificates:
+            certificates = load_certificate_file(path)["certificates"]
+            if not certificates:
+                raise ValueError("Failed to open certificate file or invalid certificate object type.")
+            self.loaded_certificates[path] = certificates[0]
+        return self.loaded_certificates[path]
 
     def certificate_info(self, path):
         """Determine the pertinent certificate information: alias, subjectDN, issuerDN, start and expire.
@@ -125,40 +215,23 @@ class NetAppESeriesClientCertificate(NetAppESeriesModule):
         Note: Use only when certificate/remote-server endpoints do not exist. Used to identify certificates through
         the sslconfig/ca endpoint.
         """
-        certificate = None
-        with open(path, "rb") as fh:
-            data = fh.read()
-            try:
-                certificate = x509.load_pem_x509_certificate(data, default_backend())
-            except Exception as error:
-                try:
-                    certificate = x509.load_der_x509_certificate(data, default_backend())
-                except Exception as error:
-                    self.module.fail_json(msg="Failed to load certificate. Array [%s]. Error [%s]." % (self.ssid, to_native(error)))
+        try:
+            certificate = self.load_certificate(path)
+        except Exception as error:
+            self.module.fail_json(msg="Failed to load certificate. Array [%s]. Error [%s]." % (self.ssid, to_native(error)))
 
-        if not isinstance(certificate, x509.Certificate):
-            self.module.fail_json(msg="Failed to open certificate file or invalid certificate object type. Array [%s]." % self.ssid)
-
-        return dict(start_date=certificate.not_valid_before_utc,
-                    expire_date=certificate.not_valid_after_utc,
-                    subject_dn=[attr.value for attr in certificate.subject],
-                    issuer_dn=[attr.value for attr in certificate.issuer])
+        return dict(start_date=datetime.strptime(certificate["not_valid_before"], CERTIFICATE_DATE_FORMAT).replace(tzinfo=timezone.utc),
+                    expire_date=datetime.strptime(certificate["not_valid_after"], CERTIFICATE_DATE_FORMAT).replace(tzinfo=timezone.utc),
+                    subject_dn=certificate["subject_values"],
+                    issuer_dn=certificate["issuer_values"])
 
     def certificate_fingerprint(self, path):
         """Load x509 certificate that is either encoded DER or PEM encoding and return the certificate fingerprint."""
-        certificate = None
-        with open(path, "rb") as fh:
-            data = fh.read()
-            try:
-                certificate = x509.load_pem_x509_certificate(data, default_backend())
-            except Exception as error:
-                try:
-                    certificate = x509.load_der_x509_certificate(data, default_backend())
-                except Exception as error:
-                    self.module.fail_json(msg="Failed to determine certificate fingerprint. File [%s]. Array [%s]. Error [%s]."
-                                              % (path, self.ssid, to_native(error)))
-
-        return binascii.hexlify(certificate.fingerprint(certificate.signature_hash_algorithm)).decode("utf-8")
+        try:
+            return self.load_certificate(path)["fingerprint"]
+        except Exception as error:
+            self.module.fail_json(msg="Failed to determine certificate fingerprint. File [%s]. Array [%s]. Error [%s]."
+                                      % (path, self.ssid, to_native(error)))
 
     def determine_changes(self):
         """Search for remote server certificate that goes by the alias or has a matching fingerprint."""
@@ -174,12 +247,12 @@ class NetAppESeriesClientCertificate(NetAppESeriesModule):
             existing_certificates = []
 
             for path in self.certificates:
+                info = self.certificate_info(path)
                 for current_certificate in user_installed_certificates:
-                    info = self.certificate_info(path)
                     tmp = dict(subject_dn=[re.sub(r".*=", "", item) for item in current_certificate["subjectDN"].split(", ")],
                                issuer_dn=[re.sub(r".*=", "", item) for item in current_certificate["issuerDN"].split(", ")],
-                               start_date=datetime.strptime(current_certificate["start"].split(".")[0], "%Y-%m-%dT%H:%M:%S"),
-                               expire_date=datetime.strptime(current_certificate["expire"].split(".")[0], "%Y-%m-%dT%H:%M:%S"))
+                               start_date=datetime.strptime(current_certificate["start"].split(".")[0], CERTIFICATE_DATE_FORMAT).replace(tzinfo=timezone.utc),
+                               expire_date=datetime.strptime(current_certificate["expire"].split(".")[0], CERTIFICATE_DATE_FORMAT).replace(tzinfo=timezone.utc))
                     if (all((attr in info["subject_dn"] for attr in tmp["subject_dn"])) and
                             all((attr in info["issuer_dn"] for attr in tmp["issuer_dn"])) and
                             tmp["start_date"] == info["start_date"] and
@@ -251,8 +324,75 @@ class NetAppESeriesClientCertificate(NetAppESeriesModule):
         else:
             self.module.fail_json(msg="Failed to retrieve server certificates. Array [%s]." % self.ssid)
 
+    def apply_changes(self):
+        """Remove and upload the certificates determined by determine_changes()."""
+        for info in self.remove_certificates:
+            self.delete_certificate(info)
+
+        for path in self.add_certificates:
+            self.upload_certificate(path)
+
+        if self.apply_reload_certificates:
+            self.reload_certificates()
+
+    def get_array_certificate(self, entry):
+        """Create the client certificate instance for an arrays list entry.
+
+        Entries inherit any option they do not specify from the module parameters. The instance reports failures by raising
+        NetAppESeriesModuleError rather than ending the module.
+        """
+        array = self.get_bulk_entry(dict(ssid=entry["ssid"], changed=False, msg=None), connection=entry)
+        if entry["certificates"] is not None:
+            array.certificates = entry["certificates"]
+        if entry["remove_unspecified_user_certificates"] is not None:
+            array.remove_unspecified_user_certificates = entry["remove_unspecified_user_certificates"]
+
+        array.remove_certificates = list()
+        array.add_certificates = list()
+        array.result.update(api_url=array.url, add_certificates=array.add_certificates, removed_certificates=array.remove_certificates)
+        return array
+
+    def apply_array(self, array):
+        """Compare and update the remote server certificates of a storage system in the arrays list."""
+        array.set_url_path_prefix()
+        array.determine_changes()
+        array.result["changed"] = bool(array.remove_certificates or array.add_certificates)
+        if array.result["changed"] and not self.module.check_mode:
+            array.apply_changes()
+            array.result["msg"] = "Certificates updated."
+        else:
+            array.result["msg"] = "Certificate changes required." if array.result["changed"] else "Certificates are up to date."
+
+    def apply_arrays(self):
+        """Compare and update the remote server certificates of every storage system in the arrays list.
+
+        Every certificate file is parsed before the storage systems are compared and updated concurrently using no more
+        than max_workers threads.
+
+        :raise AnsibleExitJson when every storage system completes successfully"""
+        arrays = []
+        for entry in self.arrays:
+            arrays.append(self.get_array_certificate(entry))
+        results = [array.result for array in arrays]
+
+        # Parse every certificate file once so that the information is shared by every storage system.
+        for path in sorted(set(path for array in arrays for path in array.certificates)):
+            try:
+                self.load_certificate(path)
+            except Exception as error:
+                self.module.fail_json(msg="Failed to load certificate. File [%s]. Error [%s]." % (path, to_native(error)))
+
+        for array, result, error in run_concurrently(self.apply_array, arrays, self.max_workers):
+            if error:
+                array.result.update(failed=True, msg=to_native(error))
+
+        self.exit_bulk_results(results, "storage systems", label="Arrays", name_key="ssid", changes="certificate changes", arrays=results)
+
     def apply(self):
         """Apply state changes to the storage array's truststore."""
+        if self.arrays is not None:
+            self.apply_arrays()
+
         changed = False
 
         self.determine_changes()
@@ -260,14 +400,7 @@ class NetAppESeriesClientCertificate(NetAppESeriesModule):
             changed = True
 
         if changed and not self.module.check_mode:
-            for info in self.remove_certificates:
-                self.delete_certificate(info)
-
-            for path in self.add_certificates:
-                self.upload_certificate(path)
-
-            if self.apply_reload_certificates:
-                self.reload_certificates()
+            self.apply_changes()
 
         self.module.exit_json(changed=changed, removed_certificates=self.remove_certificates, add_certificates=self.add_certificates)
 
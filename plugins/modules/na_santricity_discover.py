@@ -10,7 +10,7 @@ DOCUMENTATION = """
 ---
 module: na_santricity_discover
 short_description: NetApp E-Series discover E-Series storage systems
-description: Module searches a subnet range and returns any available E-Series storage systems.
+description: Module searches one or more subnet ranges and returns any available E-Series storage systems.
 author:
     - Nathan Swartz (@swartzn)
     - Vu Tran (@VuTran007)
@@ -19,8 +19,10 @@ options:
         description:
             - This is the IPv4 search range for discovering E-Series storage arrays.
             - IPv4 subnet mask specified in CIDR form. Example 192.168.1.0/24 would search the range 192.168.1.0 to 192.168.1.255.
+            - Multiple subnets may be given as a list or a comma-separated string; overlapping subnets are only searched once.
             - Be sure to include all management paths in the search range.
-        type: str
+        type: list
+        elements: str
         required: true
     ports:
         description:
@@ -58,6 +60,49 @@ options:
         type: bool
         default: false
         required: false
+    max_workers:
+        description:
+            - Maximum number of addresses probed concurrently when searching without Web Services Proxy.
+        type: int
+        default: 256
+        required: false
+    connect_timeout:
+        description:
+            - Seconds to wait for a TCP connection before a port is considered closed.
+            - Only addresses with an open port are probed with REST requests.
+        type: float
+        default: 1
+        required: false
+    probe_timeout:
+        description:
+            - Seconds to wait for the REST requests used to identify a storage system once its port is open.
+        type: int
+        default: 10
+        required: false
+    serials:
+        description:
+            - Chassis serial numbers of the storage systems expected in the search range.
+            - When every serial is confirmed from the discovery cache, the subnet search is skipped.
+        type: list
+        elements: str
+        required: false
+    cache_ttl:
+        description:
+            - Number of seconds that discovered storage systems are cached on disk for the same proxy and search range.
+            - Cached api urls are re-validated before use and the subnet is only searched again when a cached system can no
+              longer be reached or one of I(serials) was not previously found.
+            - Storage systems that require Web Services Proxy are only refreshed when the cache expires.
+            - The cache is kept in the system temporary directory. Set to 0 to disable the cache.
+        type: int
+        default: 0
+        required: false
+    refresh_cache:
+        description:
+            - Ignore any cached storage systems and search the entire range.
+            - The cache is updated with the results when I(cache_ttl) is greater than 0.
+        type: bool
+        default: false
+        required: false
 notes:
     - Only available for platforms E2800 or later (SANtricity Web Services Embedded REST API must be available).
     - All E-Series storage systems with SANtricity version 11.62 or later will be discovered.
@@ -71,6 +116,19 @@ EXAMPLES = """
 - name: Discover all E-Series storage systems on the network.
   na_santricity_discover:
     subnet_mask: 192.168.1.0/24
+
+- name: Discover all E-Series storage systems on multiple management networks.
+  na_santricity_discover:
+    subnet_mask:
+      - 10.10.0.0/16
+      - 192.168.1.0/24
+    max_workers: 512
+
+- name: Discover storage systems, reusing the results of previous searches for up to a day.
+  na_santricity_discover:
+    subnet_mask: 192.168.1.0/24
+    serials: ["012341234123", "012341234567"]
+    cache_ttl: 86400
 """
 
 RETURN = """
@@ -90,15 +148,20 @@ systems_found:
                 "label": "ExampleArray02",
                 "proxy_ssid": "array_ssid",
                 "proxy_required": true}}'
+searched:
+    description: Whether the search range was searched; false when every storage system was confirmed from the discovery cache.
+    returned: on success
+    type: bool
+    sample: false
 """
 
 import json
-import multiprocessing
+import socket
 import threading
 from time import sleep
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import request
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import discovery_cache, iter_concurrently, request, run_concurrently
 from ansible.module_utils._text import to_native
 
 try:
@@ -116,20 +179,24 @@ except ImportError:
 
 class NetAppESeriesDiscover:
     """Discover E-Series storage systems."""
-    MAX_THREAD_POOL_SIZE = 256
-    CPU_THREAD_MULTIPLE = 32
     SEARCH_TIMEOUT = 30
     DEFAULT_CONNECTION_TIMEOUT_SEC = 30
     DEFAULT_DISCOVERY_TIMEOUT_SEC = 300
 
     def __init__(self):
-        ansible_options = dict(subnet_mask=dict(type="str", required=True),
+        ansible_options = dict(subnet_mask=dict(type="list", elements="str", required=True),
                                ports=dict(type="list", elements="int", required=False, default=[8443]),
                                proxy_url=dict(type="str", required=False),
                                proxy_username=dict(type="str", required=False),
                                proxy_password=dict(type="str", required=False, no_log=True),
                                proxy_validate_certs=dict(type="bool", default=True, required=False),
-                               prefer_embedded=dict(type="bool", default=False, required=False))
+                               prefer_embedded=dict(type="bool", default=False, required=False),
+                               max_workers=dict(type="int", default=256, required=False),
+                               connect_timeout=dict(type="float", default=1, required=False),
+                               probe_timeout=dict(type="int", default=10, required=False),
+                               serials=dict(type="list", elements="str", required=False, default=[]),
+                               cache_ttl=dict(type="int", default=0, required=False),
+                               refresh_cache=dict(type="bool", default=False, required=False))
 
         required_together = [["proxy_url", "proxy_username", "proxy_password"]]
         self.module = AnsibleModule(argument_spec=ansible_options, required_together=required_together)
@@ -137,6 +204,12 @@ class NetAppESeriesDiscover:
 
         self.subnet_mask = args["subnet_mask"]
         self.prefer_embedded = args["prefer_embedded"]
+        self.max_workers = args["max_workers"]
+        self.connect_timeout = args["connect_timeout"]
+        self.probe_timeout = args["probe_timeout"]
+        self.serials = args["serials"]
+        self.cache_ttl = args["cache_ttl"]
+        self.refresh_cache = args["refresh_cache"]
         self.ports = []
         self.proxy_url = args["proxy_url"]
         if args["proxy_url"]:
@@ -160,17 +233,47 @@ class NetAppESeriesDiscover:
                 self.module.fail_json(msg="Invalid port! Ports must be positive numbers between 0 and 65536.")
 
         self.systems_found = {}
+        self.searched = False
 
-    def check_ip_address(self, systems_found, address):
+    def get_subnets(self):
+        """Return the non-overlapping networks described by subnet_mask."""
+        networks = []
+        for subnet in self.subnet_mask:
+            try:
+                networks.append(ipaddress.ip_network(u"%s" % subnet.strip()))
+            except ValueError as error:
+                self.module.fail_json(msg="Invalid subnet! Subnet [%s]. Error [%s]." % (subnet, to_native(error)))
+
+        return [network for version in (4, 6) for network in ipaddress.collapse_addresses([network for network in networks if network.version == version])]
+
+    def is_port_open(self, address, port):
+        """Determine whether a TCP connection can be established with the address and port."""
+        try:
+            connection = socket.create_connection((str(address), int(port)), timeout=self.connect_timeout)
+        except socket.error:
+            return False
+        connection.close()
+        return True
+
+    def probe_address(self, address):
+        """Return the E-Series storage systems available at a specific ip address, only probing ports accepting connections."""
+        systems_found = {}
+        ports = [port for port in self.ports if self.is_port_open(address, port)]
+        if ports:
+            self.check_ip_address(systems_found, address, ports)
+        return systems_found
+
+    def check_ip_address(self, systems_found, address, ports=None):
         """Determine where an E-Series storage system is available at a specific ip address."""
-        for port in self.ports:
+        for port in self.ports if ports is None else ports:
             if port == "8080":
                 url = "http://%s:%s/" % (address, port)
             else:
                 url = "https://%s:%s/" % (address, port)
 
             try:
-                rc, about = request(url + "devmgr/v2/storage-systems/1/about", validate_certs=False, force_basic_auth=False, ignore_errors=True)
+                rc, about = request(url + "devmgr/v2/storage-systems/1/about", validate_certs=False, force_basic_auth=False, ignore_errors=True,
+                                    timeout=self.probe_timeout)
                 if about["serialNumber"] in systems_found:
                     systems_found[about["serialNumber"]]["api_urls"].append(url)
                 else:
@@ -180,7 +283,7 @@ class NetAppESeriesDiscover:
             except Exception as error:
                 try:
                     rc, sa_data = request(url + "devmgr/v2/storage-systems/1/symbol/getSAData", validate_certs=False, force_basic_auth=False,
-                                          ignore_errors=True)
+                                          ignore_errors=True, timeout=self.probe_timeout)
                     if rc == 401:  # Unauthorized
                         self.module.warn(
                             "Fail over and discover any storage system without a set admin password. This will discover systems without a set password"
@@ -200,20 +303,19 @@ class NetAppESeriesDiscover:
 
     def no_proxy_discover(self):
         """Discover E-Series storage systems using embedded web services."""
-        thread_pool_size = min(multiprocessing.cpu_count() * self.CPU_THREAD_MULTIPLE, self.MAX_THREAD_POOL_SIZE)
-        subnet = list(ipaddress.ip_network(u"%s" % self.subnet_mask))
+        subnets = self.get_subnets()
+        addresses = (address for subnet in subnets for address in subnet)
 
-        thread_pool = []
-        search_count = len(subnet)
-        for start in range(0, search_count, thread_pool_size):
-            end = search_count if (search_count - start) < thread_pool_size else start + thread_pool_size
+        for address, systems_found, error in iter_concurrently(self.probe_address, addresses, self.max_workers):
+            if error:
+                self.module.warn("Failed to probe address. Address [%s]. Error [%s]." % (address, to_native(error)))
+                continue
 
-            for address in subnet[start:end]:
-                thread = threading.Thread(target=self.check_ip_address, args=(self.systems_found, address))
-                thread_pool.append(thread)
-                thread.start()
-            for thread in thread_pool:
-                thread.join()
+            for serial, system in systems_found.items():
+                if serial in self.systems_found:
+                    self.systems_found[serial]["api_urls"].extend(system["api_urls"])
+                else:
+                    self.systems_found.update({serial: system})
 
     def verify_proxy_service(self):
         """Verify proxy url points to a web services proxy."""
@@ -249,52 +351,85 @@ class NetAppESeriesDiscover:
     def proxy_discover(self):
         """Search for array using it's chassis serial from web services proxy."""
         self.verify_proxy_service()
-        subnet = ipaddress.ip_network(u"%s" % self.subnet_mask)
-
-        try:
-            rc, request_id = request(self.proxy_url + "discovery", method="POST", validate_certs=self.proxy_validate_certs,
-                                     force_basic_auth=True, url_username=self.proxy_username, url_password=self.proxy_password,
-                                     data=json.dumps({"startIP": str(subnet[0]), "endIP": str(subnet[-1]),
-                                                      "connectionTimeout": self.DEFAULT_CONNECTION_TIMEOUT_SEC}))
-
-            # Wait for discover to complete
+        for subnet in self.get_subnets():
             try:
-                for iteration in range(self.DEFAULT_DISCOVERY_TIMEOUT_SEC):
-                    rc, discovered_systems = request(self.proxy_url + "discovery?requestId=%s" % request_id["requestId"],
-                                                     validate_certs=self.proxy_validate_certs,
-                                                     force_basic_auth=True, url_username=self.proxy_username, url_password=self.proxy_password)
-                    if not discovered_systems["discoverProcessRunning"]:
-                        thread_pool = []
-                        for discovered_system in discovered_systems["storageSystems"]:
-                            addresses = []
-                            for controller in discovered_system["controllers"]:
-                                addresses.extend(controller["ipAddresses"])
-
-                            # Storage systems with embedded web services.
-                            if "https" in discovered_system["supportedManagementPorts"] and self.prefer_embedded:
-
-                                thread = threading.Thread(target=self.test_systems_found,
-                                                          args=(self.systems_found, discovered_system["serialNumber"], discovered_system["label"], addresses))
-                                thread_pool.append(thread)
-                                thread.start()
-
-                            # Storage systems without embedded web services.
-                            else:
-                                self.systems_found.update({discovered_system["serialNumber"]: {"api_urls": [self.proxy_url],
-                                                                                               "label": discovered_system["label"],
-                                                                                               "addresses": addresses,
-                                                                                               "proxy_ssid": "",
-                                                                                               "proxy_required": True}})
-                        for thread in thread_pool:
-                            thread.join()
-                        break
-                    sleep(1)
-                else:
-                    self.module.fail_json(msg="Timeout waiting for array discovery process. Subnet [%s]" % self.subnet_mask)
+                rc, request_id = request(self.proxy_url + "discovery", method="POST", validate_certs=self.proxy_validate_certs,
+                                         force_basic_auth=True, url_username=self.proxy_username, url_password=self.proxy_password,
+                                         data=json.dumps({"startIP": str(subnet[0]), "endIP": str(subnet[-1]),
+                                                          "connectionTimeout": self.DEFAULT_CONNECTION_TIMEOUT_SEC}))
+
+                # Wait for discover to complete
+                try:
+                    for iteration in range(self.DEFAULT_DISCOVERY_TIMEOUT_SEC):
+                        rc, discovered_systems = request(self.proxy_url + "discovery?requestId=%s" % request_id["requestId"],
+                                                         validate_certs=self.proxy_validate_certs,
+                                                         force_basic_auth=True, url_username=self.proxy_username, url_password=self.proxy_password)
+                        if not discovered_systems["discoverProcessRunning"]:
+                            thread_pool = []
+                            for discovered_system in discovered_systems["storageSystems"]:
+                                addresses = []
+                                for controller in discovered_system["controllers"]:
+                                    addresses.extend(controller["ipAddresses"])
+
+                                # Storage systems with embedded web services.
+                                if "https" in discovered_system["supportedManagementPorts"] and self.prefer_embedded:
+
+                                    thread = threading.Thread(target=self.test_systems_found,
+                                                              args=(self.systems_found, discovered_system["serialNumber"],
+                                                                    discovered_system["label"], addresses))
+                                    thread_pool.append(thread)
+                                    thread.start()
+
+                                # Storage systems without embedded web services.
+                                else:
+                                    self.systems_found.update({discovered_system["serialNumber"]: {"api_urls": [self.proxy_url],
+                                                                                                   "label": discovered_system["label"],
+                                                                                                   "addresses": addresses,
+                                                                                                   "proxy_ssid": "",
+                                                                                                   "proxy_required": True}})
+                            for thread in thread_pool:
+                                thread.join()
+                            break
+                        sleep(1)
+                    else:
+                        self.module.fail_json(msg="Timeout waiting for array discovery process. Subnet [%s]" % subnet)
+                except Exception as error:
+                    self.module.fail_json(msg="Failed to get the discovery results. Error [%s]." % to_native(error))
             except Exception as error:
-                self.module.fail_json(msg="Failed to get the discovery results. Error [%s]." % to_native(error))
-        except Exception as error:
-            self.module.fail_json(msg="Failed to initiate array discovery. Error [%s]." % to_native(error))
+                self.module.fail_json(msg="Failed to initiate array discovery. Error [%s]." % to_native(error))
+
+    def get_cache_key(self):
+        """Return the discovery cache key for the proxy and search range."""
+        return "discovery|%s|%s|%s" % (self.proxy_url or "", self.prefer_embedded, ",".join(str(subnet) for subnet in self.get_subnets()))
+
+    def validate_cached_system(self, cached_system):
+        """Return the cached api urls that still reach the cached storage system."""
+        serial, system = cached_system
+        if system["proxy_required"]:
+            return system["api_urls"]
+
+        api_urls = []
+        for api_url in system["api_urls"]:
+            url = urlparse.urlparse(api_url)
+            port = url.port or (443 if url.scheme == "https" else 80)
+            systems_found = {}
+            if self.is_port_open(url.hostname, port):
+                self.check_ip_address(systems_found, url.hostname, [str(port)])
+            if serial in systems_found:
+                api_urls.append(api_url)
+        return api_urls
+
+    def validate_cached_systems(self, cached_systems):
+        """Return the cached storage systems that can still be reached and whether any could not."""
+        systems_found = {}
+        stale = False
+        for (serial, system), api_urls, error in run_concurrently(self.validate_cached_system, cached_systems.items(), self.max_workers):
+            if api_urls:
+                system.update({"api_urls": api_urls})
+                systems_found.update({serial: system})
+            else:
+                stale = True
+        return systems_found, stale
 
     def update_proxy_with_proxy_ssid(self):
         """Determine the current proxy ssid for all discovered-proxy_required storage systems."""
@@ -321,13 +456,30 @@ class NetAppESeriesDiscover:
         if missing_packages:
             self.module.fail_json(msg="Python packages are missing! Packages [%s]." % ", ".join(missing_packages))
 
+        cache_key = self.get_cache_key()
+        cached_systems = {}
+        stale = False
+        if self.cache_ttl > 0 and not self.refresh_cache:
+            cached_systems, stale = self.validate_cached_systems(discovery_cache.get(cache_key, self.cache_ttl) or {})
+
+        if not cached_systems or stale or [serial for serial in self.serials if serial not in cached_systems]:
+            self.searched = True
+            if self.proxy_url:
+                self.proxy_discover()
+            else:
+                self.no_proxy_discover()
+
+        for serial, system in cached_systems.items():
+            if serial not in self.systems_found:
+                self.systems_found.update({serial: system})
+
         if self.proxy_url:
-            self.proxy_discover()
             self.update_proxy_with_proxy_ssid()
-        else:
-            self.no_proxy_discover()
 
-        self.module.exit_json(msg="Discover process complete.", systems_found=self.systems_found, changed=False)
+        if self.cache_ttl > 0:
+            discovery_cache.set(cache_key, self.systems_found, self.cache_ttl)
+
+        self.module.exit_json(msg="Discover process complete.", systems_found=self.systems_found, searched=self.searched, changed=False)
 
 
 def main():
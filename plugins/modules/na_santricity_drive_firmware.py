@@ -60,6 +60,16 @@ msg:
     returned: always
     sample:
         { changed: True, upgrade_in_process: True }
+upgrade_plan:
+    description:
+        - Drives that require firmware upgrades grouped by firmware file, current and target firmware version, tray and online
+          upgrade capability.
+        - Use check mode to plan drive firmware upgrades without applying them.
+    type: list
+    elements: dict
+    returned: always
+    sample: [{"filename": "D_PX04SVQ160_DOWNGRADE_MS00toMSB6_801.dlp", "current_firmware": "MS00", "target_firmware": "MSB6", "tray": 99,
+              "online_upgrade_capable": true, "drive_count": 3, "slots": [1, 2, 3]}]
 """
 import os
 
@@ -89,6 +99,7 @@ class NetAppESeriesDriveFirmware(NetAppESeriesModule):
         self.upgrade_drives_online = args["upgrade_drives_online"]
 
         self.upgrade_list_cache = None
+        self.upgrade_plan_cache = None
 
         self.upgrade_required_cache = None
         self.upgrade_in_progress = False
@@ -99,55 +110,74 @@ class NetAppESeriesDriveFirmware(NetAppESeriesModule):
         for firmware in self.firmware_list:
             firmware_name = os.path.basename(firmware)
             files = [("file", firmware_name, firmware)]
-            headers, data = create_multipart_formdata(files)
+            headers, data = create_multipart_formdata(files, log=self.module.log)
             try:
                 rc, response = self.request("/files/drive", method="POST", headers=headers, data=data)
             except Exception as error:
                 self.module.fail_json(msg="Failed to upload drive firmware [%s]. Array [%s]. Error [%s]." % (firmware_name, self.ssid, to_native(error)))
 
     def upgrade_list(self):
-        """Determine whether firmware is compatible with the specified drives."""
+        """Determine whether firmware is compatible with the specified drives.
+
+        Drive information is taken from the storage system graph rather than requested for each drive. The drives that
+        will be upgraded are also summarized in the upgrade plan (see upgrade_plan).
+        """
         if self.upgrade_list_cache is None:
             self.upgrade_list_cache = list()
             try:
                 rc, response = self.request("storage-systems/%s/firmware/drives" % self.ssid)
+            except Exception as error:
+                self.module.fail_json(msg="Failed to complete compatibility and health check. Array [%s]. Error [%s]." % (self.ssid, to_native(error)))
 
-                # Create upgrade list, this ensures only the firmware uploaded is applied
-                for firmware in self.firmware_list:
-                    filename = os.path.basename(firmware)
+            graph = self.get_graph()
+            plan = dict()
 
-                    for uploaded_firmware in response["compatibilities"]:
-                        if uploaded_firmware["filename"] == filename:
+            # Create upgrade list, this ensures only the firmware uploaded is applied
+            for firmware in self.firmware_list:
+                filename = os.path.basename(firmware)
 
-                            # Determine whether upgrade is required
-                            drive_reference_list = []
-                            for drive in uploaded_firmware["compatibleDrives"]:
-                                try:
-                                    rc, drive_info = self.request("storage-systems/%s/drives/%s" % (self.ssid, drive["driveRef"]))
+                for uploaded_firmware in response["compatibilities"]:
+                    if uploaded_firmware["filename"] == filename:
 
-                                    # Add drive references that are supported and differ from current firmware
-                                    if (drive_info["firmwareVersion"] != uploaded_firmware["firmwareVersion"] and
-                                            uploaded_firmware["firmwareVersion"] in uploaded_firmware["supportedFirmwareVersions"]):
+                        # Determine whether upgrade is required
+                        drive_reference_list = []
+                        for drive in uploaded_firmware["compatibleDrives"]:
+                            drive_info = graph.drives_by_ref.get(drive["driveRef"])
+                            if drive_info is None:
+                                self.module.fail_json(msg="Failed to retrieve drive information. Array [%s]. Drive [%s]. Error [Drive does not exist.]."
+                                                          % (self.ssid, drive["driveRef"]))
 
-                                        if self.ignore_inaccessible_drives or not drive_info["offline"]:
-                                            drive_reference_list.append(drive["driveRef"])
+                            # Add drive references that are supported and differ from current firmware
+                            if (drive_info["firmwareVersion"] != uploaded_firmware["firmwareVersion"] and
+                                    uploaded_firmware["firmwareVersion"] in uploaded_firmware["supportedFirmwareVersions"]):
 
-                                        if not drive["onlineUpgradeCapable"] and self.upgrade_drives_online:
-                                            self.module.fail_json(msg="Drive is not capable of online upgrade. Array [%s]. Drive [%s]."
-                                                                      % (self.ssid, drive["driveRef"]))
+                                if self.ignore_inaccessible_drives or not drive_info["offline"]:
+                                    drive_reference_list.append(drive["driveRef"])
 
-                                except Exception as error:
-                                    self.module.fail_json(msg="Failed to retrieve drive information. Array [%s]. Drive [%s]. Error [%s]."
-                                                              % (self.ssid, drive["driveRef"], to_native(error)))
+                                    location = drive_info.get("physicalLocation", {})
+                                    tray = graph.trays_by_ref.get(location.get("trayRef"), {}).get("trayId")
+                                    key = (filename, drive_info["firmwareVersion"], uploaded_firmware["firmwareVersion"], tray,
+                                           drive["onlineUpgradeCapable"])
+                                    plan.setdefault(key, []).append(location.get("slot"))
 
-                            if drive_reference_list:
-                                self.upgrade_list_cache.extend([{"filename": filename, "driveRefList": drive_reference_list}])
+                                if not drive["onlineUpgradeCapable"] and self.upgrade_drives_online:
+                                    self.module.fail_json(msg="Drive is not capable of online upgrade. Array [%s]. Drive [%s]."
+                                                              % (self.ssid, drive["driveRef"]))
 
-            except Exception as error:
-                self.module.fail_json(msg="Failed to complete compatibility and health check. Array [%s]. Error [%s]." % (self.ssid, to_native(error)))
+                        if drive_reference_list:
+                            self.upgrade_list_cache.extend([{"filename": filename, "driveRefList": drive_reference_list}])
+
+            self.upgrade_plan_cache = [dict(filename=filename, current_firmware=current_firmware, target_firmware=target_firmware, tray=tray,
+                                            online_upgrade_capable=online_upgrade_capable, drive_count=len(slots), slots=slots)
+                                       for (filename, current_firmware, target_firmware, tray, online_upgrade_capable), slots in plan.items()]
 
         return self.upgrade_list_cache
 
+    def upgrade_plan(self):
+        """Summarize the drives that require upgrades grouped by firmware file, current and target firmware, tray and online upgrade capability."""
+        self.upgrade_list()
+        return self.upgrade_plan_cache
+
     def wait_for_upgrade_completion(self):
         """Wait for drive firmware upgrade to complete."""
         drive_references = [reference for drive in self.upgrade_list() for reference in drive["driveRefList"]]
@@ -197,7 +227,7 @@ class NetAppESeriesDriveFirmware(NetAppESeriesModule):
             self.upgrade()
 
         self.module.exit_json(changed=True if self.upgrade_list() else False,
-                              upgrade_in_process=self.upgrade_in_progress)
+                              upgrade_in_process=self.upgrade_in_progress, upgrade_plan=self.upgrade_plan())
 
 
 def main():
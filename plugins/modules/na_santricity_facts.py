@@ -17,6 +17,55 @@ author:
     - Vu Tran (@VuTran007)
 extends_documentation_fragment:
     - netapp_eseries.santricity.santricity.santricity_doc
+options:
+  gather_subset:
+    description:
+      - Limit the facts that are gathered to the listed subsets.
+      - Prefix a subset with C(!) to exclude it. When only excluded subsets are listed all other subsets are gathered, so
+        C(!all) gathers only I(ssid) and I(facts_from_proxy).
+      - Subsets needed to determine a requested subset are gathered as well. I(lun_mappings) also gathers I(hosts) and
+        I(volumes), and I(volumes_by_initiators) also gathers I(hosts), I(interfaces), I(storage_pools), I(volumes) and I(workloads).
+      - When the requested subsets need no more than four storage array graph sections, each section is retrieved with an
+        xpath-filter query; otherwise the full storage array graph is retrieved once. The full graph grows with the number of
+        drives, volumes, hosts and snapshots and is the most expensive request made.
+      - C(array) - storage array identity and enabled features. Retrieves the /sa graph section.
+      - C(controllers) - controllers, management, host side and drive side interfaces. Retrieves the /controller graph section and
+        the controller list.
+      - C(disks) - drives. Retrieves the /drive graph section.
+      - C(hosts) - hosts, host groups and host types. Retrieves the /sa, /storagePoolBundle/host and /storagePoolBundle/cluster
+        graph sections.
+      - C(interfaces) - host side io interfaces. Retrieves the /controller, /ioInterface and /storagePoolBundle/target graph sections,
+        the controller list and the hardware inventory.
+      - C(lun_mappings) - lun mappings by host and host group and the default host group access volume lun. Retrieves the
+        /storagePoolBundle/lunMapping graph section.
+      - C(snapshots) - snapshot images and consistency groups. Retrieves the /volume and /highLevelVolBundle/pit, pitGroup, pitView and
+        pitConsistencyGroup graph sections and the key-value store.
+      - C(storage_pools) - storage pools. Retrieves the /volumeGroup graph section.
+      - C(volumes) - volumes. Retrieves the /sa, /volume and /highLevelVolBundle/thinVolume graph sections.
+      - C(volumes_by_initiators) - volumes mapped to each host along with their host side io interfaces. Retrieves the
+        /storagePoolBundle/lunMapping and /highLevelVolBundle/pitView graph sections.
+      - C(workloads) - workload tags. Retrieves the workloads list.
+    type: list
+    elements: str
+    required: false
+    default: ["all"]
+  incremental:
+    description:
+      - Return the facts gathered by a previous run against the same storage system when no storage system events have been
+        reported since.
+      - The facts and the last known storage system event number are cached in a file in the temporary directory of the
+        host running the module. Subsequent runs only request the events reported since the facts were cached.
+      - Facts are gathered again when any event has been reported, since every event may reflect a configuration change, when the
+        cached facts are older than I(facts_cache_ttl), or when the events cannot be retrieved.
+    type: bool
+    required: false
+    default: false
+  facts_cache_ttl:
+    description:
+      - Maximum number of seconds that cached facts are returned when I(incremental=true).
+    type: int
+    required: false
+    default: 86400
 '''
 
 EXAMPLES = """
@@ -28,6 +77,32 @@ EXAMPLES = """
     api_username: "admin"
     api_password: "adminpass"
     validate_certs: true
+- name: Get host and lun mapping facts
+  na_santricity_facts:
+    ssid: "1"
+    api_url: "https://192.168.1.100:8443/devmgr/v2"
+    api_username: "admin"
+    api_password: "adminpass"
+    validate_certs: true
+    gather_subset:
+      - lun_mappings
+- name: Get all facts except snapshot facts
+  na_santricity_facts:
+    ssid: "1"
+    api_url: "https://192.168.1.100:8443/devmgr/v2"
+    api_username: "admin"
+    api_password: "adminpass"
+    validate_certs: true
+    gather_subset:
+      - "!snapshots"
+- name: Get array facts, reusing the previous facts when no storage system events have been reported
+  na_santricity_facts:
+    ssid: "1"
+    api_url: "https://192.168.1.100:8443/devmgr/v2"
+    api_username: "admin"
+    api_password: "adminpass"
+    validate_certs: true
+    incremental: true
 """
 
 RETURN = """
@@ -38,9 +113,16 @@ RETURN = """
         sample:
             - Gathered facts for storage array. Array ID [1].
             - Gathered facts for web services proxy.
+    facts_cached:
+        description: Whether the facts were returned from the facts cache. See I(incremental).
+        returned: on success
+        type: bool
+        sample: false
     storage_array_facts:
-        description: provides details about the array, controllers, management interfaces, hostside interfaces,
-                     driveside interfaces, disks, storage pools, volumes, snapshots, and features.
+        description:
+            - provides details about the array, controllers, management interfaces, hostside interfaces,
+              driveside interfaces, disks, storage pools, volumes, snapshots, and features.
+            - Only the facts that belong to the gathered subsets are returned. See I(gather_subset).
         returned: on successful inquiry from from embedded web services rest api
         type: complex
         contains:
@@ -292,8 +374,11 @@ RETURN = """
 """
 
 from datetime import datetime
+import hashlib
+import json
 import re
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule, NetAppESeriesCache, get_cache_path
+from ansible.module_utils._text import to_bytes
 try:
     from ansible.module_utils.ansible_release import __version__ as ansible_version
 except ImportError:
@@ -301,11 +386,43 @@ except ImportError:
 
 
 class Facts(NetAppESeriesModule):
+    HOST_PORT_TYPE_PROTOCOLS = {"iscsi": ["iscsi", "ib_iser"],
+                                "fc": ["fc"],
+                                "sas": ["sas"],
+                                "ib": ["ib_iser", "ib_srp"],
+                                "nvmeof": ["nvme_ib", "nvme_fc", "nvme_roce"]}
+
+    # Storage array graph sections required by each fact subset.
+    SUBSET_GRAPH_PATHS = {"array": ["/sa"],
+                          "controllers": ["/controller"],
+                          "disks": ["/drive"],
+                          "hosts": ["/sa", "/storagePoolBundle/host", "/storagePoolBundle/cluster"],
+                          "interfaces": ["/controller", "/ioInterface", "/storagePoolBundle/target"],
+                          "lun_mappings": ["/storagePoolBundle/lunMapping"],
+                          "snapshots": ["/volume", "/highLevelVolBundle/pit", "/highLevelVolBundle/pitGroup", "/highLevelVolBundle/pitView",
+                                        "/highLevelVolBundle/pitConsistencyGroup"],
+                          "storage_pools": ["/volumeGroup"],
+                          "volumes": ["/sa", "/volume", "/highLevelVolBundle/thinVolume"],
+                          "volumes_by_initiators": ["/storagePoolBundle/lunMapping", "/highLevelVolBundle/pitView"],
+                          "workloads": []}
+    SUBSET_DEPENDENCIES = {"lun_mappings": ["hosts", "volumes"],
+                           "volumes_by_initiators": ["hosts", "interfaces", "storage_pools", "volumes", "workloads"]}
+    GRAPH_OBJECT_PATHS = ["/sa"]
+    GRAPH_XPATH_FILTER_LIMIT = 4
+
     def __init__(self):
         web_services_version = "02.00.0000.0000"
-        super(Facts, self).__init__(ansible_options={},
+        ansible_options = dict(gather_subset=dict(type="list", elements="str", required=False, default=["all"]),
+                               incremental=dict(type="bool", required=False, default=False),
+                               facts_cache_ttl=dict(type="int", required=False, default=86400))
+        super(Facts, self).__init__(ansible_options=ansible_options,
                                     web_services_version=web_services_version,
                                     supports_check_mode=True)
+        args = self.module.params
+        self.gather_subset = args["gather_subset"]
+        self.incremental = args["incremental"]
+        self.facts_cache_ttl = args["facts_cache_ttl"]
+        self.facts_cache = None
 
     def get_controllers(self):
         """Retrieve a mapping of controller references to their labels."""
@@ -328,224 +445,330 @@ class Facts(NetAppESeriesModule):
 
         return controllers_dict
 
+    def get_subsets(self):
+        """Determine the requested fact subsets along with the subsets they depend on."""
+        subsets = set()
+        excluded_subsets = set()
+        for subset in self.gather_subset:
+            exclude = subset.startswith("!")
+            name = subset[1:] if exclude else subset
+            if name == "all":
+                names = self.SUBSET_GRAPH_PATHS.keys()
+            elif name in self.SUBSET_GRAPH_PATHS:
+                names = [name]
+            else:
+                self.module.fail_json(msg="Invalid gather_subset! Subset [%s]. Choices [%s]. Array [%s]."
+                                          % (subset, ", ".join(["all"] + sorted(self.SUBSET_GRAPH_PATHS.keys())), self.ssid))
+
+            if exclude:
+                excluded_subsets.update(names)
+            else:
+                subsets.update(names)
+
+        # Only excluded subsets were listed so exclude them from all subsets.
+        if not subsets:
+            subsets.update(self.SUBSET_GRAPH_PATHS.keys())
+        subsets.difference_update(excluded_subsets)
+
+        for subset in list(subsets):
+            subsets.update(self.SUBSET_DEPENDENCIES.get(subset, []))
+        return subsets
+
+    def get_array_graph(self, paths):
+        """Retrieve the storage array graph sections found at the given paths.
+
+        A few sections are retrieved individually with xpath-filter queries; otherwise the full graph is retrieved.
+        """
+        if not paths:
+            return dict()
+        if self.graph_cache is not None or len(paths) > self.GRAPH_XPATH_FILTER_LIMIT:
+            return self.get_graph().graph
+
+        graph = dict()
+        for path in sorted(paths):
+            objects = []
+            try:
+                rc, objects = self.request("storage-systems/%s/graph/xpath-filter?query=%s" % (self.ssid, path))
+            except Exception as error:
+                self.module.fail_json(msg="Failed to retrieve storage array graph. Query [%s]. Array Id [%s]. Error [%s]." % (path, self.ssid, str(error)))
+
+            keys = path.strip("/").split("/")
+            section = graph
+            for key in keys[:-1]:
+                section = section.setdefault(key, dict())
+            section[keys[-1]] = objects[0] if path in self.GRAPH_OBJECT_PATHS else objects
+        return graph
+
     def get_array_facts(self):
         """Extract particular facts from the storage array graph"""
         facts = dict(facts_from_proxy=(not self.is_embedded()), ssid=self.ssid)
-        controller_reference_label = self.get_controllers()
-        array_facts = None
-        hardware_inventory_facts = None
-
-        # Get the storage array graph
-        try:
-            rc, array_facts = self.request("storage-systems/%s/graph" % self.ssid)
-        except Exception as error:
-            self.module.fail_json(msg="Failed to obtain facts from storage array with id [%s]. Error [%s]" % (self.ssid, str(error)))
+        subsets = self.get_subsets()
+
+        # Get the storage array graph sections required by the requested subsets
+        graph_paths = set()
+        for subset in subsets:
+            graph_paths.update(self.SUBSET_GRAPH_PATHS[subset])
+        array_facts = self.get_array_graph(graph_paths)
+
+        controller_reference_label = dict()
+        if "controllers" in subsets or "interfaces" in subsets:
+            controller_reference_label = self.get_controllers()
+
+        if "array" in subsets:
+            facts['netapp_storage_array'] = dict(
+                name=array_facts['sa']['saData']['storageArrayLabel'],
+                chassis_serial=array_facts['sa']['saData']['chassisSerialNumber'],
+                firmware=array_facts['sa']['saData']['fwVersion'],
+                wwn=array_facts['sa']['saData']['saId']['worldWideName'],
+                segment_sizes=array_facts['sa']['featureParameters']['supportedSegSizes'],
+                cache_block_sizes=array_facts['sa']['featureParameters']['cacheBlockSizes'])
+
+            features = list(feature for feature in array_facts['sa']['capabilities'])
+            features.extend([feature['capability'] for feature in array_facts['sa']['premiumFeatures']
+                             if feature['isEnabled']])
+            features = list(set(features))  # ensure unique
+            features.sort()
+            facts['netapp_enabled_features'] = features
+
+        if "controllers" in subsets:
+            facts['netapp_controllers'] = [
+                dict(
+                    name=controller_reference_label[controller['controllerRef']],
+                    serial=controller['serialNumber'].strip(),
+                    status=controller['status'],
+                ) for controller in array_facts['controller']]
+
+            facts['netapp_management_interfaces'] = [
+                dict(controller=controller_reference_label[controller['controllerRef']],
+                     name=iface['ethernet']['interfaceName'],
+                     alias=iface['ethernet']['alias'],
+                     channel=iface['ethernet']['channel'],
+                     mac_address=iface['ethernet']['macAddr'],
+                     remote_ssh_access=iface['ethernet']['rloginEnabled'],
+                     link_status=iface['ethernet']['linkStatus'],
+                     ipv4_enabled=iface['ethernet']['ipv4Enabled'],
+                     ipv4_address_config_method=iface['ethernet']['ipv4AddressConfigMethod'].lower().replace("config", ""),
+                     ipv4_address=iface['ethernet']['ipv4Address'],
+                     ipv4_subnet_mask=iface['ethernet']['ipv4SubnetMask'],
+                     ipv4_gateway=iface['ethernet']['ipv4GatewayAddress'],
+                     ipv6_enabled=iface['ethernet']['ipv6Enabled'],
+                     dns_config_method=iface['ethernet']['dnsProperties']['acquisitionProperties']['dnsAcquisitionType'],
+                     dns_servers=(iface['ethernet']['dnsProperties']['acquisitionProperties']['dnsServers']
+                                  if iface['ethernet']['dnsProperties']['acquisitionProperties']['dnsServers'] else []),
+                     ntp_config_method=iface['ethernet']['ntpProperties']['acquisitionProperties']['ntpAcquisitionType'],
+                     ntp_servers=(iface['ethernet']['ntpProperties']['acquisitionProperties']['ntpServers']
+                                  if iface['ethernet']['ntpProperties']['acquisitionProperties']['ntpServers'] else [])
+                     ) for controller in array_facts['controller'] for iface in controller['netInterfaces']]
+
+            facts['netapp_hostside_interfaces'] = [
+                dict(
+                    fc=[dict(controller=controller_reference_label[controller['controllerRef']],
+                             channel=iface['fibre']['channel'],
+                             link_status=iface['fibre']['linkStatus'],
+                             current_interface_speed=strip_interface_speed(iface['fibre']['currentInterfaceSpeed']),
+                             maximum_interface_speed=strip_interface_speed(iface['fibre']['maximumInterfaceSpeed']))
+                        for controller in array_facts['controller']
+                        for iface in controller['hostInterfaces']
+                        if iface['interfaceType'] == 'fc'],
+                    ib=[dict(controller=controller_reference_label[controller['controllerRef']],
+                             channel=iface['ib']['channel'],
+                             link_status=iface['ib']['linkState'],
+                             mtu=iface['ib']['maximumTransmissionUnit'],
+                             current_interface_speed=strip_interface_speed(iface['ib']['currentSpeed']),
+                             maximum_interface_speed=strip_interface_speed(iface['ib']['supportedSpeed']))
+                        for controller in array_facts['controller']
+                        for iface in controller['hostInterfaces']
+                        if iface['interfaceType'] == 'ib'],
+                    iscsi=[dict(controller=controller_reference_label[controller['controllerRef']],
+                                iqn=iface['iscsi']['iqn'],
+                                link_status=iface['iscsi']['interfaceData']['ethernetData']['linkStatus'],
+                                ipv4_enabled=iface['iscsi']['ipv4Enabled'],
+                                ipv4_address=iface['iscsi']['ipv4Data']['ipv4AddressData']['ipv4Address'],
+                                ipv4_subnet_mask=iface['iscsi']['ipv4Data']['ipv4AddressData']['ipv4SubnetMask'],
+                                ipv4_gateway=iface['iscsi']['ipv4Data']['ipv4AddressData']['ipv4GatewayAddress'],
+                                ipv6_enabled=iface['iscsi']['ipv6Enabled'],
+                                mtu=iface['iscsi']['interfaceData']['ethernetData']['maximumFramePayloadSize'],
+                                current_interface_speed=strip_interface_speed(iface['iscsi']['interfaceData']
+                                                                              ['ethernetData']['currentInterfaceSpeed']),
+                                supported_interface_speeds=strip_interface_speed(iface['iscsi']['interfaceData']
+                                                                                 ['ethernetData']
+                                                                                 ['supportedInterfaceSpeeds']))
+                           for controller in array_facts['controller']
+                           for iface in controller['hostInterfaces']
+                           if iface['interfaceType'] == 'iscsi' and iface['iscsi']['interfaceData']['type'] == 'ethernet'],
+                    sas=[dict(controller=controller_reference_label[controller['controllerRef']],
+                              channel=iface['sas']['channel'],
+                              current_interface_speed=strip_interface_speed(iface['sas']['currentInterfaceSpeed']),
+                              maximum_interface_speed=strip_interface_speed(iface['sas']['maximumInterfaceSpeed']),
+                              link_status=iface['sas']['iocPort']['state'])
+                         for controller in array_facts['controller']
+                         for iface in controller['hostInterfaces']
+                         if iface['interfaceType'] == 'sas'])]
+
+            facts['netapp_driveside_interfaces'] = [
+                dict(
+                    controller=controller_reference_label[controller['controllerRef']],
+                    interface_type=interface['interfaceType'],
+                    interface_speed=strip_interface_speed(
+                        interface[interface['interfaceType']]['maximumInterfaceSpeed']
+                        if (interface['interfaceType'] == 'sata' or
+                            interface['interfaceType'] == 'sas' or
+                            interface['interfaceType'] == 'fibre')
+                        else (
+                            interface[interface['interfaceType']]['currentSpeed']
+                            if interface['interfaceType'] == 'ib'
+                            else (
+                                interface[interface['interfaceType']]['interfaceData']['maximumInterfaceSpeed']
+                                if interface['interfaceType'] == 'iscsi' else 'unknown'
+                            ))),
+                )
+                for controller in array_facts['controller']
+                for interface in controller['driveInterfaces']]
+
+        if "hosts" in subsets:
+            facts['netapp_hosts'] = [
+                dict(
+                    group_id=host['clusterRef'],
+                    hosts_reference=host['hostRef'],
+                    id=host['id'],
+                    name=host['name'],
+                    host_type_index=host['hostTypeIndex'],
+                    ports=host['hostSidePorts']
+                ) for host in array_facts['storagePoolBundle']['host']]
+
+            facts['netapp_host_groups'] = [
+                dict(
+                    id=group['id'],
+                    name=group['name'],
+                    hosts=[host['name'] for host in facts['netapp_hosts'] if host['group_id'] == group['id']]
+                ) for group in array_facts['storagePoolBundle']['cluster']]
+            facts['netapp_host_groups'].append(dict(
+                id='0000000000000000000000000000000000000000',
+                name='default_hostgroup',
+                hosts=[host["name"] for host in facts['netapp_hosts'] if host['group_id'] == '0000000000000000000000000000000000000000']))
+
+            facts['netapp_host_types'] = [
+                dict(
+                    type=host_type['hostType'],
+                    index=host_type['index']
+                ) for host_type in array_facts['sa']['hostSpecificVals']
+                if 'hostType' in host_type.keys() and host_type['hostType']
+                # This conditional ignores zero-length strings which indicates that the associated host-specific NVSRAM region has been cleared.
+            ]
+
+        if "disks" in subsets:
+            facts['netapp_disks'] = [
+                dict(
+                    id=disk['id'],
+                    available=disk['available'],
+                    media_type=disk['driveMediaType'],
+                    status=disk['status'],
+                    usable_bytes=disk['usableCapacity'],
+                    tray_ref=disk['physicalLocation']['trayRef'],
+                    product_id=disk['productID'],
+                    firmware_version=disk['firmwareVersion'],
+                    serial_number=disk['serialNumber'].lstrip()
+                ) for disk in array_facts['drive']]
+
+        if "storage_pools" in subsets:
+            facts['netapp_storage_pools'] = [
+                dict(
+                    id=storage_pool['id'],
+                    name=storage_pool['name'],
+                    available_capacity=storage_pool['freeSpace'],
+                    total_capacity=storage_pool['totalRaidedSpace'],
+                    used_capacity=storage_pool['usedSpace']
+                ) for storage_pool in array_facts['volumeGroup']]
+
+        if "volumes" in subsets:
+            all_volumes = list(array_facts['volume'] + array_facts['highLevelVolBundle']['thinVolume'])
+
+            facts['netapp_volumes'] = [
+                dict(
+                    id=v['id'],
+                    name=v['name'],
+                    parent_storage_pool_id=v['volumeGroupRef'],
+                    capacity=v['capacity'],
+                    is_thin_provisioned=v['thinProvisioned'],
+                    workload=v['metadata'],
+
+                ) for v in all_volumes]
+
+            # Add access volume information to volumes when enabled.
+            if array_facts['sa']['accessVolume']['enabled']:
+                facts['netapp_volumes'].append(dict(
+                    id=array_facts['sa']['accessVolume']['id'],
+                    name="access_volume",
+                    parent_storage_pool_id="",
+                    capacity=array_facts['sa']['accessVolume']['capacity'],
+                    is_thin_provisioned=False,
+                    workload=""))
+
+        if "snapshots" in subsets:
+            facts['snapshot_images'] = [
+                dict(
+                    id=snapshot['id'],
+                    status=snapshot['status'],
+                    pit_capacity=snapshot['pitCapacity'],
+                    creation_method=snapshot['creationMethod'],
+                    reposity_cap_utilization=snapshot['repositoryCapacityUtilization'],
+                    active_cow=snapshot['activeCOW'],
+                    rollback_source=snapshot['isRollbackSource']
+                ) for snapshot in array_facts['highLevelVolBundle']['pit']]
+
+            # Get storage system specific key-value pairs
+            key_value_url = "key-values"
+            key_values = []
+            if not self.is_embedded() and self.ssid.lower() not in ["0", "proxy"]:
+                key_value_url = "storage-systems/%s/forward/devmgr/v2/key-values" % self.ssid
+            try:
+                rc, key_values = self.request(key_value_url)
+            except Exception as error:
+                self.module.fail_json(msg="Failed to obtain embedded key-value database. Array [%s]. Error [%s]" % (self.ssid, str(error)))
+
+            facts['netapp_snapshot_consistency_groups'] = self.get_snapshot_consistency_groups(array_facts, key_values)
+
+        if "lun_mappings" in subsets:
+            facts['netapp_default_hostgroup_access_volume_lun'] = None
+            for lun in [a['lun'] for a in array_facts['storagePoolBundle']['lunMapping']
+                        if a['type'] == 'all' and a['mapRef'] == '0000000000000000000000000000000000000000']:
+                facts['netapp_default_hostgroup_access_volume_lun'] = lun
+
+            facts['netapp_luns_by_target'] = self.get_luns_by_target(array_facts, facts)
+
+        if "workloads" in subsets:
+            workload_tags = None
+            try:
+                rc, workload_tags = self.request("storage-systems/%s/workloads" % self.ssid)
+            except Exception as error:
+                self.module.fail_json(msg="Failed to retrieve workload tags. Array [%s]." % self.ssid)
+
+            facts['netapp_workload_tags'] = [
+                dict(
+                    id=workload_tag['id'],
+                    name=workload_tag['name'],
+                    attributes=workload_tag['workloadAttributes']
+                ) for workload_tag in workload_tags]
+
+        if "interfaces" in subsets:
+            # Get the storage array hardware inventory
+            hardware_inventory_facts = None
+            try:
+                rc, hardware_inventory_facts = self.request("storage-systems/%s/hardware-inventory" % self.ssid)
+            except Exception as error:
+                self.module.fail_json(msg="Failed to obtain hardware inventory from storage array with id [%s]. Error [%s]" % (self.ssid, str(error)))
+
+            facts['netapp_hostside_io_interfaces'] = self.get_hostside_io_interfaces(array_facts, hardware_inventory_facts, controller_reference_label)
+
+        if "volumes_by_initiators" in subsets:
+            # Create a dictionary of volume lists keyed by host names
+            facts['netapp_volumes_by_initiators'] = self.get_volumes_by_initiators(array_facts, facts)
 
-        # Get the storage array hardware inventory
-        try:
-            rc, hardware_inventory_facts = self.request("storage-systems/%s/hardware-inventory" % self.ssid)
-        except Exception as error:
-            self.module.fail_json(msg="Failed to obtain hardware inventory from storage array with id [%s]. Error [%s]" % (self.ssid, str(error)))
+        return facts
 
-        # Get storage system specific key-value pairs
-        key_value_url = "key-values"
-        key_values = []
-        if not self.is_embedded() and self.ssid.lower() not in ["0", "proxy"]:
-            key_value_url = "storage-systems/%s/forward/devmgr/v2/key-values" % self.ssid
-        try:
-            rc, key_values = self.request(key_value_url)
-        except Exception as error:
-            self.module.fail_json(msg="Failed to obtain embedded key-value database. Array [%s]. Error [%s]" % (self.ssid, str(error)))
-
-        facts['netapp_storage_array'] = dict(
-            name=array_facts['sa']['saData']['storageArrayLabel'],
-            chassis_serial=array_facts['sa']['saData']['chassisSerialNumber'],
-            firmware=array_facts['sa']['saData']['fwVersion'],
-            wwn=array_facts['sa']['saData']['saId']['worldWideName'],
-            segment_sizes=array_facts['sa']['featureParameters']['supportedSegSizes'],
-            cache_block_sizes=array_facts['sa']['featureParameters']['cacheBlockSizes'])
-
-        facts['netapp_controllers'] = [
-            dict(
-                name=controller_reference_label[controller['controllerRef']],
-                serial=controller['serialNumber'].strip(),
-                status=controller['status'],
-            ) for controller in array_facts['controller']]
-
-        facts['netapp_hosts'] = [
-            dict(
-                group_id=host['clusterRef'],
-                hosts_reference=host['hostRef'],
-                id=host['id'],
-                name=host['name'],
-                host_type_index=host['hostTypeIndex'],
-                ports=host['hostSidePorts']
-            ) for host in array_facts['storagePoolBundle']['host']]
-
-        facts['netapp_host_groups'] = [
-            dict(
-                id=group['id'],
-                name=group['name'],
-                hosts=[host['name'] for host in facts['netapp_hosts'] if host['group_id'] == group['id']]
-            ) for group in array_facts['storagePoolBundle']['cluster']]
-        facts['netapp_host_groups'].append(dict(
-            id='0000000000000000000000000000000000000000',
-            name='default_hostgroup',
-            hosts=[host["name"] for host in facts['netapp_hosts'] if host['group_id'] == '0000000000000000000000000000000000000000']))
-
-        facts['netapp_host_types'] = [
-            dict(
-                type=host_type['hostType'],
-                index=host_type['index']
-            ) for host_type in array_facts['sa']['hostSpecificVals']
-            if 'hostType' in host_type.keys() and host_type['hostType']
-            # This conditional ignores zero-length strings which indicates that the associated host-specific NVSRAM region has been cleared.
-        ]
-
-        facts['snapshot_images'] = [
-            dict(
-                id=snapshot['id'],
-                status=snapshot['status'],
-                pit_capacity=snapshot['pitCapacity'],
-                creation_method=snapshot['creationMethod'],
-                reposity_cap_utilization=snapshot['repositoryCapacityUtilization'],
-                active_cow=snapshot['activeCOW'],
-                rollback_source=snapshot['isRollbackSource']
-            ) for snapshot in array_facts['highLevelVolBundle']['pit']]
-
-        facts['netapp_disks'] = [
-            dict(
-                id=disk['id'],
-                available=disk['available'],
-                media_type=disk['driveMediaType'],
-                status=disk['status'],
-                usable_bytes=disk['usableCapacity'],
-                tray_ref=disk['physicalLocation']['trayRef'],
-                product_id=disk['productID'],
-                firmware_version=disk['firmwareVersion'],
-                serial_number=disk['serialNumber'].lstrip()
-            ) for disk in array_facts['drive']]
-
-        facts['netapp_management_interfaces'] = [
-            dict(controller=controller_reference_label[controller['controllerRef']],
-                 name=iface['ethernet']['interfaceName'],
-                 alias=iface['ethernet']['alias'],
-                 channel=iface['ethernet']['channel'],
-                 mac_address=iface['ethernet']['macAddr'],
-                 remote_ssh_access=iface['ethernet']['rloginEnabled'],
-                 link_status=iface['ethernet']['linkStatus'],
-                 ipv4_enabled=iface['ethernet']['ipv4Enabled'],
-                 ipv4_address_config_method=iface['ethernet']['ipv4AddressConfigMethod'].lower().replace("config", ""),
-                 ipv4_address=iface['ethernet']['ipv4Address'],
-                 ipv4_subnet_mask=iface['ethernet']['ipv4SubnetMask'],
-                 ipv4_gateway=iface['ethernet']['ipv4GatewayAddress'],
-                 ipv6_enabled=iface['ethernet']['ipv6Enabled'],
-                 dns_config_method=iface['ethernet']['dnsProperties']['acquisitionProperties']['dnsAcquisitionType'],
-                 dns_servers=(iface['ethernet']['dnsProperties']['acquisitionProperties']['dnsServers']
-                              if iface['ethernet']['dnsProperties']['acquisitionProperties']['dnsServers'] else []),
-                 ntp_config_method=iface['ethernet']['ntpProperties']['acquisitionProperties']['ntpAcquisitionType'],
-                 ntp_servers=(iface['ethernet']['ntpProperties']['acquisitionProperties']['ntpServers']
-                              if iface['ethernet']['ntpProperties']['acquisitionProperties']['ntpServers'] else [])
-                 ) for controller in array_facts['controller'] for iface in controller['netInterfaces']]
-
-        facts['netapp_hostside_interfaces'] = [
-            dict(
-                fc=[dict(controller=controller_reference_label[controller['controllerRef']],
-                         channel=iface['fibre']['channel'],
-                         link_status=iface['fibre']['linkStatus'],
-                         current_interface_speed=strip_interface_speed(iface['fibre']['currentInterfaceSpeed']),
-                         maximum_interface_speed=strip_interface_speed(iface['fibre']['maximumInterfaceSpeed']))
-                    for controller in array_facts['controller']
-                    for iface in controller['hostInterfaces']
-                    if iface['interfaceType'] == 'fc'],
-                ib=[dict(controller=controller_reference_label[controller['controllerRef']],
-                         channel=iface['ib']['channel'],
-                         link_status=iface['ib']['linkState'],
-                         mtu=iface['ib']['maximumTransmissionUnit'],
-                         current_interface_speed=strip_interface_speed(iface['ib']['currentSpeed']),
-                         maximum_interface_speed=strip_interface_speed(iface['ib']['supportedSpeed']))
-                    for controller in array_facts['controller']
-                    for iface in controller['hostInterfaces']
-                    if iface['interfaceType'] == 'ib'],
-                iscsi=[dict(controller=controller_reference_label[controller['controllerRef']],
-                            iqn=iface['iscsi']['iqn'],
-                            link_status=iface['iscsi']['interfaceData']['ethernetData']['linkStatus'],
-                            ipv4_enabled=iface['iscsi']['ipv4Enabled'],
-                            ipv4_address=iface['iscsi']['ipv4Data']['ipv4AddressData']['ipv4Address'],
-                            ipv4_subnet_mask=iface['iscsi']['ipv4Data']['ipv4AddressData']['ipv4SubnetMask'],
-                            ipv4_gateway=iface['iscsi']['ipv4Data']['ipv4AddressData']['ipv4GatewayAddress'],
-                            ipv6_enabled=iface['iscsi']['ipv6Enabled'],
-                            mtu=iface['iscsi']['interfaceData']['ethernetData']['maximumFramePayloadSize'],
-                            current_interface_speed=strip_interface_speed(iface['iscsi']['interfaceData']
-                                                                          ['ethernetData']['currentInterfaceSpeed']),
-                            supported_interface_speeds=strip_interface_speed(iface['iscsi']['interfaceData']
-                                                                             ['ethernetData']
-                                                                             ['supportedInterfaceSpeeds']))
-                       for controller in array_facts['controller']
-                       for iface in controller['hostInterfaces']
-                       if iface['interfaceType'] == 'iscsi' and iface['iscsi']['interfaceData']['type'] == 'ethernet'],
-                sas=[dict(controller=controller_reference_label[controller['controllerRef']],
-                          channel=iface['sas']['channel'],
-                          current_interface_speed=strip_interface_speed(iface['sas']['currentInterfaceSpeed']),
-                          maximum_interface_speed=strip_interface_speed(iface['sas']['maximumInterfaceSpeed']),
-                          link_status=iface['sas']['iocPort']['state'])
-                     for controller in array_facts['controller']
-                     for iface in controller['hostInterfaces']
-                     if iface['interfaceType'] == 'sas'])]
-
-        facts['netapp_driveside_interfaces'] = [
-            dict(
-                controller=controller_reference_label[controller['controllerRef']],
-                interface_type=interface['interfaceType'],
-                interface_speed=strip_interface_speed(
-                    interface[interface['interfaceType']]['maximumInterfaceSpeed']
-                    if (interface['interfaceType'] == 'sata' or
-                        interface['interfaceType'] == 'sas' or
-                        interface['interfaceType'] == 'fibre')
-                    else (
-                        interface[interface['interfaceType']]['currentSpeed']
-                        if interface['interfaceType'] == 'ib'
-                        else (
-                            interface[interface['interfaceType']]['interfaceData']['maximumInterfaceSpeed']
-                            if interface['interfaceType'] == 'iscsi' else 'unknown'
-                        ))),
-            )
-            for controller in array_facts['controller']
-            for interface in controller['driveInterfaces']]
-
-        facts['netapp_storage_pools'] = [
-            dict(
-                id=storage_pool['id'],
-                name=storage_pool['name'],
-                available_capacity=storage_pool['freeSpace'],
-                total_capacity=storage_pool['totalRaidedSpace'],
-                used_capacity=storage_pool['usedSpace']
-            ) for storage_pool in array_facts['volumeGroup']]
-
-        all_volumes = list(array_facts['volume'] + array_facts['highLevelVolBundle']['thinVolume'])
-
-        facts['netapp_volumes'] = [
-            dict(
-                id=v['id'],
-                name=v['name'],
-                parent_storage_pool_id=v['volumeGroupRef'],
-                capacity=v['capacity'],
-                is_thin_provisioned=v['thinProvisioned'],
-                workload=v['metadata'],
-
-            ) for v in all_volumes]
-
-        # Add access volume information to volumes when enabled.
-        if array_facts['sa']['accessVolume']['enabled']:
-            facts['netapp_volumes'].append(dict(
-                id=array_facts['sa']['accessVolume']['id'],
-                name="access_volume",
-                parent_storage_pool_id="",
-                capacity=array_facts['sa']['accessVolume']['capacity'],
-                is_thin_provisioned=False,
-                workload=""))
-
-        facts['netapp_snapshot_consistency_groups'] = []
+    def get_snapshot_consistency_groups(self, array_facts, key_values):
+        """Determine the snapshot consistency groups along with their base volumes, images and views."""
+        consistency_groups = []
         for group in array_facts["highLevelVolBundle"]["pitConsistencyGroup"]:
             reserve_capacity_full_policy = "purge" if group["repFullPolicy"] == "purgepit" else "reject"
             group_info = {"id": group["id"],
@@ -612,19 +835,18 @@ class Facts(NetAppESeriesModule):
                                                                                       "reserve_capacity_pct": reserve_capacity_pct,
                                                                                       "status": view["status"]}]}})
 
-            facts['netapp_snapshot_consistency_groups'].append(group_info)
+            consistency_groups.append(group_info)
+
+        return consistency_groups
 
+    def get_luns_by_target(self, array_facts, facts):
+        """Create a dictionary of (volume name, lun) lists keyed by host and host group names."""
         lun_mappings = dict()
         for host in facts['netapp_hosts']:
             lun_mappings.update({host["name"]: []})
         for host in facts['netapp_host_groups']:
             lun_mappings.update({host["name"]: []})
 
-        facts['netapp_default_hostgroup_access_volume_lun'] = None
-        for lun in [a['lun'] for a in array_facts['storagePoolBundle']['lunMapping']
-                    if a['type'] == 'all' and a['mapRef'] == '0000000000000000000000000000000000000000']:
-            facts['netapp_default_hostgroup_access_volume_lun'] = lun
-
         # Get all host mappings
         host_mappings = dict()
         for host_mapping in [h for h in array_facts['storagePoolBundle']['lunMapping'] if h['type'] == 'host']:
@@ -651,39 +873,30 @@ class Facts(NetAppESeriesModule):
                         else:
                             host_mappings[host_name] = [(volume, group_mapping['lun'])]
 
-        facts['netapp_luns_by_target'] = lun_mappings
+        luns_by_target = lun_mappings
         if host_mappings:
-            facts['netapp_luns_by_target'].update(host_mappings)
+            luns_by_target.update(host_mappings)
         if group_mappings:
-            facts['netapp_luns_by_target'].update(group_mappings)
+            luns_by_target.update(group_mappings)
 
         # Add all host mappings to respective groups mappings
         for host_group in facts['netapp_host_groups']:
             group_name = host_group['name']
             for host in host_group['hosts']:
-                facts['netapp_luns_by_target'][group_name].extend(facts['netapp_luns_by_target'][host])
+                luns_by_target[group_name].extend(luns_by_target[host])
 
         # Remove duplicate entries
-        for obj in facts['netapp_luns_by_target'].keys():
-            tmp = dict(facts['netapp_luns_by_target'][obj])
-            facts['netapp_luns_by_target'][obj] = [(k, tmp[k]) for k in tmp.keys()]
-
-        workload_tags = None
-        try:
-            rc, workload_tags = self.request("storage-systems/%s/workloads" % self.ssid)
-        except Exception as error:
-            self.module.fail_json(msg="Failed to retrieve workload tags. Array [%s]." % self.ssid)
+        for obj in luns_by_target.keys():
+            tmp = dict(luns_by_target[obj])
+            luns_by_target[obj] = [(k, tmp[k]) for k in tmp.keys()]
 
-        facts['netapp_workload_tags'] = [
-            dict(
-                id=workload_tag['id'],
-                name=workload_tag['name'],
-                attributes=workload_tag['workloadAttributes']
-            ) for workload_tag in workload_tags]
+        return luns_by_target
 
+    def get_hostside_io_interfaces(self, array_facts, hardware_inventory_facts, controller_reference_label):
+        """Determine the host side io interfaces and their protocols."""
         targets = array_facts["storagePoolBundle"]["target"]
 
-        facts['netapp_hostside_io_interfaces'] = []
+        hostside_io_interfaces = []
         if "ioInterface" in array_facts:
             for interface in array_facts["ioInterface"]:
 
@@ -861,7 +1074,7 @@ class Facts(NetAppESeriesModule):
                                                                             "subnet": ipv4_data["ipv4AddressData"]["ipv4SubnetMask"],
                                                                             "gateway": ipv4_data["ipv4AddressData"]["ipv4GatewayAddress"]}})
 
-                    facts['netapp_hostside_io_interfaces'].append(interface_info)
+                    hostside_io_interfaces.append(interface_info)
 
         # Gather information from controller->hostInterfaces if available (This is a deprecated data structure. Prefer information from ioInterface.
         for controller in array_facts['controller']:
@@ -976,174 +1189,211 @@ class Facts(NetAppESeriesModule):
                                                              "supported": strip_interface_speed(ethernet_data["supportedInterfaceSpeeds"])}})
 
                         # Only add interface if not already added (i.e. was part of ioInterface structure)
-                        for existing_hostside_io_interfaces in facts['netapp_hostside_io_interfaces']:
+                        for existing_hostside_io_interfaces in hostside_io_interfaces:
                             if existing_hostside_io_interfaces["interface_reference"] == interface_info["interface_reference"]:
                                 break
                         else:
-                            facts['netapp_hostside_io_interfaces'].append(interface_info)
+                            hostside_io_interfaces.append(interface_info)
                     except Exception as error:
                         pass
 
-        # Create a dictionary of volume lists keyed by host names
-        facts['netapp_volumes_by_initiators'] = dict()
+        return hostside_io_interfaces
+
+    def get_volumes_by_initiators(self, array_facts, facts):
+        """Create a dictionary of volume lists keyed by host names.
+
+        Lookups are made through dictionaries that are built once so that the cost grows with the number of mapped
+        volumes rather than with the product of the mapping, host, interface and volume counts.
+        """
+        volumes_by_initiators = dict()
+
+        hosts_by_map_reference = dict()
+        for host in facts['netapp_hosts']:
+            hosts_by_map_reference.setdefault(host['hosts_reference'], []).append(host)
+            if host['group_id'] != host['hosts_reference']:
+                hosts_by_map_reference.setdefault(host['group_id'], []).append(host)
+
+        volumes_by_mapping_id = dict()
+        for volume in array_facts['volume'] + array_facts['highLevelVolBundle']['thinVolume']:
+            for volume_mapping in volume['listOfMappings']:
+                volumes_by_mapping_id.setdefault(volume_mapping['id'], []).append(volume)
+
+        storage_pool_name_by_id = dict((pool['id'], pool['name']) for pool in facts['netapp_storage_pools'])
+        workload_tags_by_id = dict((workload_tag['id'], workload_tag) for workload_tag in facts['netapp_workload_tags'])
+
+        pit_views_by_base_volume = dict()
+        for pit_view_volume in array_facts['highLevelVolBundle']['pitView']:
+            pit_views_by_base_volume.setdefault(pit_view_volume['baseVol'], []).append(pit_view_volume)
+
+        hostside_io_interface_protocols = [interface['protocol'] for interface in facts['netapp_hostside_io_interfaces']]
+
+        # Determine host io interface protocols for each combination of host port types
+        host_port_information_by_types = dict()
+
+        def get_host_port_information(host_types):
+            key = frozenset(host_types)
+            if key not in host_port_information_by_types:
+                protocols = set()
+                for host_type in key:
+                    protocols.update(self.HOST_PORT_TYPE_PROTOCOLS.get(host_type, []))
+
+                host_port_information = {}
+                interface_references_by_protocol = {}
+                for interface in facts['netapp_hostside_io_interfaces']:
+                    if interface['protocol'] in protocols:
+                        interface_references = interface_references_by_protocol.setdefault(interface['protocol'], set())
+
+                        # Skip duplicate entries into host_port_information
+                        if interface['interface_reference'] not in interface_references:
+                            interface_references.add(interface['interface_reference'])
+                            host_port_information.setdefault(interface['protocol'], []).append(interface)
+
+                host_port_information_by_types[key] = (host_port_information, set(host_port_information.keys()))
+            return host_port_information_by_types[key]
+
+        # Determine the host independent details for each volume
+        volume_info_by_id = dict()
+
+        def get_volume_info(volume):
+            if volume['id'] not in volume_info_by_id:
+
+                # Determine workload name if there is one
+                workload_name = ""
+                metadata = dict()
+                for volume_tag in volume['metadata']:
+                    if volume_tag['key'] == 'workloadId' and volume_tag['value'] in workload_tags_by_id:
+                        workload_tag = workload_tags_by_id[volume_tag['value']]
+                        workload_name = workload_tag['name']
+                        metadata = dict((entry['key'], entry['value'])
+                                        for entry in workload_tag['attributes']
+                                        if entry['key'] != 'profileId')
+
+                # Get volume specific metadata tags
+                volume_metadata_raw = dict()
+                volume_metadata = dict()
+                for entry in volume['metadata']:
+                    volume_metadata_raw.update({entry["key"]: entry["value"]})
+
+                for sorted_key in sorted(volume_metadata_raw.keys()):
+                    if re.match(".*~[0-9]$", sorted_key):
+                        key = re.sub("~[0-9]$", "", sorted_key)
+                        if key in volume_metadata:
+                            volume_metadata[key] = volume_metadata[key] + volume_metadata_raw[sorted_key]
+                        else:
+                            volume_metadata.update({key: volume_metadata_raw[sorted_key]})
+                    else:
+                        volume_metadata.update({sorted_key: volume_metadata_raw[sorted_key]})
+
+                volume_info_by_id[volume['id']] = {"type": volume['objectType'],
+                                                   "name": volume['name'],
+                                                   "storage_pool": storage_pool_name_by_id[volume['volumeGroupRef']],
+                                                   "id": volume['id'],
+                                                   "wwn": volume['wwn'],
+                                                   "eui": volume['extendedUniqueIdentifier'],
+                                                   "workload_name": workload_name,
+                                                   "workload_metadata": metadata,
+                                                   "meta_data": metadata,
+                                                   "volume_metadata": volume_metadata,
+                                                   "raid_level": volume['raidLevel'],
+                                                   "segment_size_kb": int(volume['segmentSize'] / 1024),
+                                                   "stripe_count": volume['dataDriveCount']}
+            return volume_info_by_id[volume['id']]
+
         for mapping in array_facts['storagePoolBundle']['lunMapping']:
-            for host in facts['netapp_hosts']:
-                if mapping['mapRef'] == host['hosts_reference'] or mapping['mapRef'] == host['group_id']:
-                    if host['name'] not in facts['netapp_volumes_by_initiators'].keys():
-                        facts['netapp_volumes_by_initiators'].update({host['name']: []})
-
-                    # Determine host io interface protocols
-                    host_types = [port['type'] for port in host['ports']]
-                    hostside_io_interface_protocols = []
-                    host_port_protocols = []
-                    host_port_information = {}
-                    for interface in facts['netapp_hostside_io_interfaces']:
-                        hostside_io_interface_protocols.append(interface["protocol"])
-                        for host_type in host_types:
-                            if host_type == "iscsi" and interface["protocol"] in ["iscsi", "ib_iser"]:
-                                host_port_protocols.append(interface["protocol"])
-                                if interface["protocol"] in host_port_information:
-                                    # Skip duplicate entries into host_port_information
-                                    for host_port_info in host_port_information[interface["protocol"]]:
-                                        if interface["interface_reference"] == host_port_info["interface_reference"]:
-                                            break
-                                    else:
-                                        host_port_information[interface["protocol"]].append(interface)
-                                else:
-                                    host_port_information.update({interface["protocol"]: [interface]})
-
-                            elif host_type == "fc" and interface["protocol"] in ["fc"]:
-                                host_port_protocols.append(interface["protocol"])
-                                if interface["protocol"] in host_port_information:
-                                    # Skip duplicate entries into host_port_information
-                                    for host_port_info in host_port_information[interface["protocol"]]:
-                                        if interface["interface_reference"] == host_port_info["interface_reference"]:
-                                            break
-                                    else:
-                                        host_port_information[interface["protocol"]].append(interface)
-                                else:
-                                    host_port_information.update({interface["protocol"]: [interface]})
-
-                            elif host_type == "sas" and interface["protocol"] in ["sas"]:
-                                host_port_protocols.append(interface["protocol"])
-                                if interface["protocol"] in host_port_information:
-                                    # Skip duplicate entries into host_port_information
-                                    for host_port_info in host_port_information[interface["protocol"]]:
-                                        if interface["interface_reference"] == host_port_info["interface_reference"]:
-                                            break
-                                    else:
-                                        host_port_information[interface["protocol"]].append(interface)
-                                else:
-                                    host_port_information.update({interface["protocol"]: [interface]})
-
-                            elif host_type == "ib" and interface["protocol"] in ["ib_iser", "ib_srp"]:
-                                host_port_protocols.append(interface["protocol"])
-                                if interface["protocol"] in host_port_information:
-                                    # Skip duplicate entries into host_port_information
-                                    for host_port_info in host_port_information[interface["protocol"]]:
-                                        if interface["interface_reference"] == host_port_info["interface_reference"]:
-                                            break
-                                    else:
-                                        host_port_information[interface["protocol"]].append(interface)
-                                else:
-                                    host_port_information.update({interface["protocol"]: [interface]})
-
-                            elif host_type == "nvmeof" and interface["protocol"] in ["nvme_ib", "nvme_fc", "nvme_roce"]:
-                                host_port_protocols.append(interface["protocol"])
-                                if interface["protocol"] in host_port_information:
-                                    # Skip duplicate entries into host_port_information
-                                    for host_port_info in host_port_information[interface["protocol"]]:
-                                        if interface["interface_reference"] == host_port_info["interface_reference"]:
-                                            break
-                                    else:
-                                        host_port_information[interface["protocol"]].append(interface)
-                                else:
-                                    host_port_information.update({interface["protocol"]: [interface]})
-
-                    for volume in all_volumes:
-                        storage_pool = [pool["name"] for pool in facts['netapp_storage_pools'] if pool["id"] == volume["volumeGroupRef"]][0]
-
-                        if mapping['id'] in [volume_mapping['id'] for volume_mapping in volume['listOfMappings']]:
-
-                            # Determine workload name if there is one
-                            workload_name = ""
-                            metadata = dict()
-                            for volume_tag in volume['metadata']:
-                                if volume_tag['key'] == 'workloadId':
-                                    for workload_tag in facts['netapp_workload_tags']:
-                                        if volume_tag['value'] == workload_tag['id']:
-                                            workload_name = workload_tag['name']
-                                            metadata = dict((entry['key'], entry['value'])
-                                                            for entry in workload_tag['attributes']
-                                                            if entry['key'] != 'profileId')
-
-                            # Get volume specific metadata tags
-                            volume_metadata_raw = dict()
-                            volume_metadata = dict()
-                            for entry in volume['metadata']:
-                                volume_metadata_raw.update({entry["key"]: entry["value"]})
-
-                            for sorted_key in sorted(volume_metadata_raw.keys()):
-                                if re.match(".*~[0-9]$", sorted_key):
-                                    key = re.sub("~[0-9]$", "", sorted_key)
-                                    if key in volume_metadata:
-                                        volume_metadata[key] = volume_metadata[key] + volume_metadata_raw[sorted_key]
-                                    else:
-                                        volume_metadata.update({key: volume_metadata_raw[sorted_key]})
-                                else:
-                                    volume_metadata.update({sorted_key: volume_metadata_raw[sorted_key]})
-
-                            # Determine drive count
-                            stripe_count = volume['dataDriveCount']
-
-                            volume_info = {"type": volume['objectType'],
-                                           "name": volume['name'],
-                                           "storage_pool": storage_pool,
-                                           "host_types": set(host_types),
-                                           "host_port_information": host_port_information,
-                                           "host_port_protocols": set(host_port_protocols),
-                                           "hostside_io_interface_protocols": set(hostside_io_interface_protocols),
-                                           "id": volume['id'],
-                                           "wwn": volume['wwn'],
-                                           "eui": volume['extendedUniqueIdentifier'],
-                                           "workload_name": workload_name,
-                                           "workload_metadata": metadata,
-                                           "meta_data": metadata,
-                                           "volume_metadata": volume_metadata,
-                                           "raid_level": volume['raidLevel'],
-                                           "segment_size_kb": int(volume['segmentSize'] / 1024),
-                                           "stripe_count": stripe_count}
-                            facts['netapp_volumes_by_initiators'][host['name']].append(volume_info)
-
-                            # Use the base volume to populate related details for snapshot volumes.
-                            for pit_view_volume in array_facts["highLevelVolBundle"]["pitView"]:
-                                if volume["id"] == pit_view_volume["baseVol"]:
-                                    pit_view_volume_info = volume_info.copy()
-                                    pit_view_volume_info.update({"type": pit_view_volume["objectType"],
-                                                                 "name": pit_view_volume['name'],
-                                                                 "id": pit_view_volume['id'],
-                                                                 "wwn": pit_view_volume['wwn'],
-                                                                 "eui": pit_view_volume['extendedUniqueIdentifier']})
-                                    facts['netapp_volumes_by_initiators'][host['name']].append(pit_view_volume_info)
-
-        features = list(feature for feature in array_facts['sa']['capabilities'])
-        features.extend([feature['capability'] for feature in array_facts['sa']['premiumFeatures']
-                         if feature['isEnabled']])
-        features = list(set(features))  # ensure unique
-        features.sort()
-        facts['netapp_enabled_features'] = features
+            for host in hosts_by_map_reference.get(mapping['mapRef'], []):
+                if host['name'] not in volumes_by_initiators:
+                    volumes_by_initiators.update({host['name']: []})
+
+                host_types = [port['type'] for port in host['ports']]
+                host_port_information, host_port_protocols = get_host_port_information(host_types)
+
+                for volume in volumes_by_mapping_id.get(mapping['id'], []):
+                    volume_info = dict(get_volume_info(volume))
+                    volume_info.update({"host_types": set(host_types),
+                                        "host_port_information": host_port_information,
+                                        "host_port_protocols": set(host_port_protocols),
+                                        "hostside_io_interface_protocols": set(hostside_io_interface_protocols)})
+                    volumes_by_initiators[host['name']].append(volume_info)
+
+                    # Use the base volume to populate related details for snapshot volumes.
+                    for pit_view_volume in pit_views_by_base_volume.get(volume['id'], []):
+                        pit_view_volume_info = volume_info.copy()
+                        pit_view_volume_info.update({"type": pit_view_volume["objectType"],
+                                                     "name": pit_view_volume['name'],
+                                                     "id": pit_view_volume['id'],
+                                                     "wwn": pit_view_volume['wwn'],
+                                                     "eui": pit_view_volume['extendedUniqueIdentifier']})
+                        volumes_by_initiators[host['name']].append(pit_view_volume_info)
+
+        return volumes_by_initiators
+
+    def get_facts_cache(self):
+        """Retrieve the cache that holds the facts gathered from the storage system."""
+        if self.facts_cache is None:
+            digest = hashlib.sha1(to_bytes("%s|%s" % (self.url, self.ssid))).hexdigest()
+            self.facts_cache = NetAppESeriesCache(get_cache_path("facts_%s.json" % digest))
+        return self.facts_cache
+
+    def get_last_known_event(self):
+        """Determine the last known storage system event number or None when the events cannot be retrieved.
+
+        The events endpoint only accepts the lastKnown and wait query parameters; it cannot limit or sort the response so
+        the newest event number is found from the web services' bounded queue of recent events.
+        """
+        last_known_event = -1
+        try:
+            rc, events = self.request("storage-systems/%s/events" % self.ssid)
+            for event in events:
+                if int(event["eventNumber"]) > int(last_known_event):
+                    last_known_event = event["eventNumber"]
+        except Exception as error:
+            self.module.warn("Failed to determine last known event. Facts will not be cached. Array Id [%s]. Error [%s]." % (self.ssid, str(error)))
+            return None
+        return last_known_event
 
-        return facts
+    def get_cached_facts(self, key):
+        """Retrieve the cached facts when no storage system events have been reported since they were gathered."""
+        entry = self.get_facts_cache().get(key, ttl=self.facts_cache_ttl)
+        if entry is None:
+            return None
+
+        try:
+            rc, events = self.request("storage-systems/%s/events?lastKnown=%s" % (self.ssid, entry["last_known_event"]))
+        except Exception as error:
+            return None
+
+        for event in events:
+            if int(event["eventNumber"]) > int(entry["last_known_event"]):
+                return None
+        return entry["facts"]
 
     def get_facts(self):
         """Get the embedded or web services proxy information."""
-        facts = self.get_array_facts()
+        facts = None
+        facts_cache_key = None
+        last_known_event = None
+        if self.incremental and self.facts_cache_ttl > 0:
+            facts_cache_key = "%s|%s|%s" % (self.url, self.ssid, ",".join(sorted(self.get_subsets())))
+            facts = self.get_cached_facts(facts_cache_key)
+
+            # Determine the last known event before gathering facts so that changes made while gathering are not missed.
+            if facts is None:
+                last_known_event = self.get_last_known_event()
+
+        facts_cached = facts is not None
+        if not facts_cached:
+            facts = self.get_array_facts()
+
+            if last_known_event is not None:
+                # Sets are cached as lists which is how they are returned by the module.
+                self.get_facts_cache().set(facts_cache_key, dict(last_known_event=last_known_event, facts=json.loads(json.dumps(facts, default=list))),
+                                           ttl=self.facts_cache_ttl)
 
         facts_from_proxy = not self.is_embedded()
         facts.update({"facts_from_proxy": facts_from_proxy})
 
         self.module.exit_json(msg="Gathered facts for storage array. Array ID: [%s]." % self.ssid,
-                              storage_array_facts=facts)
+                              storage_array_facts=facts, facts_cached=facts_cached)
 
 
 def strip_interface_speed(speed):
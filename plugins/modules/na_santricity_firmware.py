@@ -48,6 +48,69 @@ options:
             - Warning! This will clear all storage system mel-events. Use at your own risk!
         type: bool
         default: false
+    arrays:
+        description:
+            - List of storage systems to upgrade in a single task.
+            - The firmware and NVSRAM files are checked for compatibility, the storage systems' health is checked and the files
+              are staged on every storage system concurrently using no more than I(max_workers) threads.
+            - Staged firmware is then activated in waves of no more than I(wave_size) storage systems. Every storage system in a
+              wave is tracked from a single event polling loop and the next wave starts once the wave completes.
+            - No further waves are activated once a storage system in a wave fails to upgrade.
+            - Files are uploaded only once to each SANtricity Web Services Proxy.
+            - The module always waits for the activation of each wave to complete; I(wait_for_completion) is ignored.
+            - Each entry inherits any option it does not specify from the corresponding module option.
+        type: list
+        elements: dict
+        required: false
+        suboptions:
+            ssid:
+                description:
+                    - The storage system identifier.
+                type: str
+                required: true
+            api_url:
+                description:
+                    - See I(api_url).
+                type: str
+            api_username:
+                description:
+                    - See I(api_username).
+                type: str
+            api_password:
+                description:
+                    - See I(api_password).
+                type: str
+            validate_certs:
+                description:
+                    - See I(validate_certs).
+                type: bool
+    max_workers:
+        description:
+            - Maximum number of storage systems checked and staged concurrently when I(arrays) is specified.
+        type: int
+        default: 8
+        required: false
+    wave_size:
+        description:
+            - Maximum number of storage systems activated at the same time when I(arrays) is specified.
+        type: int
+        default: 4
+        required: false
+    manifest_ttl:
+        description:
+            - Number of seconds that the type and version of the firmware and NVSRAM files are recorded in the local file manifest.
+            - The files are only read again when their size or modification time changes or the entry expires.
+            - The manifest is kept in a directory of the system temporary directory that only the current user can access. Set to 0 to
+              disable the on-disk manifest.
+        type: int
+        default: 2592000
+        required: false
+    refresh_manifest:
+        description:
+            - Ignore the file manifest and read the firmware and NVSRAM files again.
+        type: bool
+        default: false
+        required: false
 """
 EXAMPLES = """
 - name: Ensure correct firmware versions
@@ -70,6 +133,20 @@ EXAMPLES = """
     validate_certs: true
     nvsram: "path/to/nvsram"
     firmware: "path/to/firmware"
+- name: Upgrade the firmware of every storage system managed by the proxy, two at a time
+  na_santricity_firmware:
+    api_url: "https://192.168.1.100:8443/devmgr/v2"
+    api_username: "admin"
+    api_password: "adminpass"
+    validate_certs: true
+    nvsram: "path/to/nvsram"
+    firmware: "path/to/bundle"
+    wave_size: 2
+    arrays:
+      - ssid: "array1"
+      - ssid: "array2"
+      - ssid: "array3"
+        api_url: "https://192.168.1.200:8443/devmgr/v2"
 """
 RETURN = """
 msg:
@@ -77,13 +154,32 @@ msg:
     type: str
     returned: always
     sample:
+arrays:
+    description:
+        - Result for each storage system when I(arrays) is specified.
+        - I(timeline) lists the upgrade events with the seconds elapsed since the task started.
+    type: list
+    elements: dict
+    returned: when I(arrays) is specified
+    sample: [{"ssid": "array1", "api_url": "https://192.168.1.100:8443/", "changed": true, "upgrade_required": true,
+              "upgrade_in_process": false, "wave": 1, "msg": "Upgrade completed.", "modules_info": {},
+              "timeline": [{"elapsed": 0.3, "event": "Upgrade check completed."},
+                           {"elapsed": 0.9, "event": "Compatibility check completed."},
+                           {"elapsed": 1.2, "event": "Health check completed."},
+                           {"elapsed": 1.2, "event": "Staging started."},
+                           {"elapsed": 310.5, "event": "Staging completed."},
+                           {"elapsed": 311.0, "event": "Activation started."},
+                           {"elapsed": 1520.2, "event": "Upgrade completed."}]}]
 """
 import os
 import threading
 
-from time import sleep
+from time import sleep, time
 from ansible.module_utils import six
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule, create_multipart_formdata
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import (
+    NetAppESeriesModule, NetAppESeriesModuleError, NetAppESeriesFileManifest, create_multipart_formdata, eseries_max_workers_argument_spec,
+    get_firmware_metadata, run_concurrently)
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity_operations import get_poll_interval
 from ansible.module_utils._text import to_native
 
 
@@ -97,7 +193,17 @@ class NetAppESeriesFirmware(NetAppESeriesModule):
             nvsram=dict(type="str", required=False),
             firmware=dict(type="str", required=True),
             wait_for_completion=dict(type="bool", default=False),
-            clear_mel_events=dict(type="bool", default=False))
+            clear_mel_events=dict(type="bool", default=False),
+            arrays=dict(type="list", elements="dict", required=False, options=dict(
+                ssid=dict(type="str", required=True),
+                api_url=dict(type="str"),
+                api_username=dict(type="str"),
+                api_password=dict(type="str", no_log=True),
+                validate_certs=dict(type="bool"))),
+            wave_size=dict(type="int", default=4),
+            manifest_ttl=dict(type="int", default=NetAppESeriesFileManifest.TTL_SEC),
+            refresh_manifest=dict(type="bool", default=False))
+        ansible_options.update(eseries_max_workers_argument_spec())
 
         super(NetAppESeriesFirmware, self).__init__(ansible_options=ansible_options,
                                                     web_services_version="02.00.0000.0000",
@@ -108,6 +214,11 @@ class NetAppESeriesFirmware(NetAppESeriesModule):
         self.firmware = args["firmware"]
         self.wait_for_completion = args["wait_for_completion"]
         self.clear_mel_events = args["clear_mel_events"]
+        self.arrays = args["arrays"]
+        self.max_workers = args["max_workers"]
+        self.wave_size = args["wave_size"]
+        self.manifest_ttl = args["manifest_ttl"]
+        self.refresh_manifest = args["refresh_manifest"]
 
         self.nvsram_name = None
         self.firmware_name = None
@@ -128,6 +239,9 @@ class NetAppESeriesFirmware(NetAppESeriesModule):
         self.is_nvsram_download_completed_mel_event_count = 1
         self.proxy_wait_for_upgrade_mel_event_count = 1
 
+        self.timeline = []
+        self.timeline_start = time()
+
     def is_upgrade_in_progress(self):
         """Determine whether an upgrade is already in progress."""
         in_progress = False
@@ -147,57 +261,40 @@ class NetAppESeriesFirmware(NetAppESeriesModule):
 
         return in_progress
 
+    def get_file_metadata(self, path, kind):
+        """Retrieve the type and version of a firmware or NVSRAM file (see get_firmware_metadata)."""
+        try:
+            return get_firmware_metadata(path, kind, self.manifest_ttl, self.refresh_manifest)
+        except (IOError, OSError) as error:
+            self.module.fail_json(msg="Failed to read file. File [%s]. Array [%s]. Error [%s]." % (path, self.ssid, to_native(error)))
+
     def is_firmware_bundled(self):
         """Determine whether supplied firmware is bundle."""
         if self.is_bundle_cache is None:
-            with open(self.firmware, "rb") as fh:
-                signature = fh.read(16).lower()
-
-                if b"firmware" in signature:
-                    self.is_bundle_cache = False
-                elif b"combined_content" in signature:
-                    self.is_bundle_cache = True
-                else:
-                    self.module.fail_json(msg="Firmware file is invalid. File [%s]. Array [%s]" % (self.firmware, self.ssid))
+            metadata = self.get_file_metadata(self.firmware, "firmware")
+            if metadata["type"] is None:
+                self.module.fail_json(msg="Firmware file is invalid. File [%s]. Array [%s]" % (self.firmware, self.ssid))
+            self.is_bundle_cache = metadata["type"] == "bundle"
 
         return self.is_bundle_cache
 
     def firmware_version(self):
         """Retrieve firmware version of the firmware file. Return: bytes string"""
         if self.firmware_version_cache is None:
-
-            # Search firmware file for bundle or firmware version
-            with open(self.firmware, "rb") as fh:
-                line = fh.readline()
-                while line:
-                    if self.is_firmware_bundled():
-                        if b'displayableAttributeList=' in line:
-                            for item in line[25:].split(b','):
-                                key, value = item.split(b"|")
-                                if key == b'VERSION':
-                                    self.firmware_version_cache = value.strip(b"\n")
-                            break
-                    elif b"Version:" in line:
-                        self.firmware_version_cache = line.split()[-1].strip(b"\n")
-                        break
-                    line = fh.readline()
-                else:
-                    self.module.fail_json(msg="Failed to determine firmware version. File [%s]. Array [%s]." % (self.firmware, self.ssid))
+            self.is_firmware_bundled()
+            metadata = self.get_file_metadata(self.firmware, "firmware")
+            if metadata["version"] is None:
+                self.module.fail_json(msg="Failed to determine firmware version. File [%s]. Array [%s]." % (self.firmware, self.ssid))
+            self.firmware_version_cache = six.b(metadata["version"])
         return self.firmware_version_cache
 
     def nvsram_version(self):
         """Retrieve NVSRAM version of the NVSRAM file. Return: byte string"""
         if self.nvsram_version_cache is None:
-
-            with open(self.nvsram, "rb") as fh:
-                line = fh.readline()
-                while line:
-                    if b".NVSRAM Configuration Number" in line:
-                        self.nvsram_version_cache = line.split(b'"')[-2]
-                        break
-                    line = fh.readline()
-                else:
-                    self.module.fail_json(msg="Failed to determine NVSRAM file version. File [%s]. Array [%s]." % (self.nvsram, self.ssid))
+            metadata = self.get_file_metadata(self.nvsram, "nvsram")
+            if metadata["version"] is None:
+                self.module.fail_json(msg="Failed to determine NVSRAM file version. File [%s]. Array [%s]." % (self.nvsram, self.ssid))
+            self.nvsram_version_cache = six.b(metadata["version"])
         return self.nvsram_version_cache
 
     def check_system_health(self):
@@ -272,15 +369,15 @@ class NetAppESeriesFirmware(NetAppESeriesModule):
         if rc == "422":
             self.module.fail_json(msg="Failed to activate the staged firmware. Array Id [%s]. Error [%s]" % (self.ssid, response))
 
-    def embedded_firmware_download(self):
-        """Execute the firmware download."""
+    def embedded_firmware_stage(self):
+        """Stage the firmware and NVSRAM on the storage system without activating them."""
         if self.nvsram:
             firmware_url = "firmware/embedded-firmware?nvsram=true&staged=true"
             headers, data = create_multipart_formdata(files=[("nvsramfile", self.nvsram_name, self.nvsram),
-                                                             ("dlpfile", self.firmware_name, self.firmware)])
+                                                             ("dlpfile", self.firmware_name, self.firmware)], log=self.module.log)
         else:
             firmware_url = "firmware/embedded-firmware?nvsram=false&staged=true"
-            headers, data = create_multipart_formdata(files=[("dlpfile", self.firmware_name, self.firmware)])
+            headers, data = create_multipart_formdata(files=[("dlpfile", self.firmware_name, self.firmware)], log=self.module.log)
 
         # Stage firmware and nvsram
         try:
@@ -289,6 +386,10 @@ class NetAppESeriesFirmware(NetAppESeriesModule):
         except Exception as error:
             self.module.fail_json(msg="Failed to stage firmware. Array Id [%s]. Error[%s]." % (self.ssid, to_native(error)))
 
+    def embedded_firmware_download(self):
+        """Execute the firmware download."""
+        self.embedded_firmware_stage()
+
         # Activate firmware
         activate_thread = threading.Thread(target=self.embedded_firmware_activate)
         activate_thread.start()
@@ -314,9 +415,8 @@ class NetAppESeriesFirmware(NetAppESeriesModule):
                     reboot_started = True
                 continue
 
-    def firmware_event_logger(self):
-        """Determine if firmware activation has started."""
-        # Determine the last known event
+    def update_last_known_event(self):
+        """Determine the last known event."""
         try:
             rc, events = self.request("storage-systems/%s/events" % self.ssid)
             for event in events:
@@ -325,44 +425,79 @@ class NetAppESeriesFirmware(NetAppESeriesModule):
         except Exception as error:
             self.module.fail_json(msg="Failed to determine last known event. Array Id [%s]. Error[%s]." % (self.ssid, to_native(error)))
 
+    def poll_firmware_events(self):
+        """Wait briefly for events newer than the last known event and log the firmware events.
+
+        :raise Exception: when the events cannot be retrieved (for example, while the controller reboots).
+        :return bool: whether the firmware activation succeeded.
+        """
+        rc, events = self.request("storage-systems/%s/events?lastKnown=%s&wait=1" % (self.ssid, self.last_known_event), log_request=False)
+        for event in events:
+            if int(event["eventNumber"]) > int(self.last_known_event):
+                self.last_known_event = event["eventNumber"]
+
+            # Log firmware events
+            if event["eventType"] == "firmwareDownloadEvent":
+                self.module.log("%s" % event["status"])
+                if event["status"] == "informational" and event["statusMessage"]:
+                    self.module.log("Controller firmware: %s Array Id [%s]." % (event["statusMessage"], self.ssid))
+                    self.record_timeline(event["statusMessage"])
+
+                if event["status"] == "activate_success":
+                    self.module.log("Controller firmware activated. Array Id [%s]." % self.ssid)
+                    return True
+        return False
+
+    def firmware_event_logger(self):
+        """Determine if firmware activation has started."""
+        self.update_last_known_event()
+
+        # When activation is successful, finish thread
         while True:
             try:
-                rc, events = self.request("storage-systems/%s/events?lastKnown=%s&wait=1" % (self.ssid, self.last_known_event), log_request=False)
-                for event in events:
-                    if int(event["eventNumber"]) > int(self.last_known_event):
-                        self.last_known_event = event["eventNumber"]
-
-                    # Log firmware events
-                    if event["eventType"] == "firmwareDownloadEvent":
-                        self.module.log("%s" % event["status"])
-                        if event["status"] == "informational" and event["statusMessage"]:
-                            self.module.log("Controller firmware: %s Array Id [%s]." % (event["statusMessage"], self.ssid))
-
-                        # When activation is successful, finish thread
-                        if event["status"] == "activate_success":
-                            self.module.log("Controller firmware activated. Array Id [%s]." % self.ssid)
-                            return
+                if self.poll_firmware_events():
+                    return
             except Exception as error:
                 pass
 
+    def record_timeline(self, event):
+        """Add an event to the storage system's upgrade timeline."""
+        self.timeline.append(dict(elapsed=round(time() - self.timeline_start, 1), event=event))
+        self.module.log("%s Array [%s]." % (event, self.ssid))
+
+    def is_upgrade_reported(self):
+        """Determine whether web services reports the firmware and NVSRAM versions of the files.
+
+        :raise Exception: when the versions cannot be retrieved.
+        """
+        if self.is_firmware_bundled():
+            firmware_rc, firmware_version = self.request("storage-systems/%s/graph/xpath-filter?query=/controller/"
+                                                         "codeVersions[codeModule='bundleDisplay']" % self.ssid, log_request=False)
+            current_firmware_version = six.b(firmware_version[0]["versionString"])
+        else:
+            firmware_rc, firmware_version = self.request("storage-systems/%s/graph/xpath-filter?query=/sa/saData/fwVersion"
+                                                         % self.ssid, log_request=False)
+            current_firmware_version = six.b(firmware_version[0])
+
+        nvsram_rc, nvsram_version = self.request("storage-systems/%s/graph/xpath-filter?query=/sa/saData/nvsramVersion" % self.ssid, log_request=False)
+        current_nvsram_version = six.b(nvsram_version[0])
+
+        return current_firmware_version == self.firmware_version() and (not self.nvsram or current_nvsram_version == self.nvsram_version())
+
+    def is_optimal(self):
+        """Determine whether the storage system status is optimal.
+
+        :raise Exception: when the status cannot be retrieved.
+        """
+        rc, response = self.request("storage-systems/%s" % self.ssid, log_request=False)
+        return response["status"] == "optimal"
+
     def wait_for_web_services(self):
         """Wait for web services to report firmware and nvsram upgrade."""
         # Wait for system to reflect changes
         for count in range(int(self.REBOOT_TIMEOUT_SEC / 5)):
             try:
-                if self.is_firmware_bundled():
-                    firmware_rc, firmware_version = self.request("storage-systems/%s/graph/xpath-filter?query=/controller/"
-                                                                 "codeVersions[codeModule='bundleDisplay']" % self.ssid, log_request=False)
-                    current_firmware_version = six.b(firmware_version[0]["versionString"])
-                else:
-                    firmware_rc, firmware_version = self.request("storage-systems/%s/graph/xpath-filter?query=/sa/saData/fwVersion"
-                                                                 % self.ssid, log_request=False)
-                    current_firmware_version = six.b(firmware_version[0])
-
-                nvsram_rc, nvsram_version = self.request("storage-systems/%s/graph/xpath-filter?query=/sa/saData/nvsramVersion" % self.ssid, log_request=False)
-                current_nvsram_version = six.b(nvsram_version[0])
-
-                if current_firmware_version == self.firmware_version() and (not self.nvsram or current_nvsram_version == self.nvsram_version()):
+                if self.is_upgrade_reported():
                     break
             except Exception as error:
                 pass
@@ -373,9 +508,7 @@ class NetAppESeriesFirmware(NetAppESeriesModule):
         # Wait for system to be optimal
         for count in range(int(self.REBOOT_TIMEOUT_SEC / 5)):
             try:
-                rc, response = self.request("storage-systems/%s" % self.ssid, log_request=False)
-
-                if response["status"] == "optimal":
+                if self.is_optimal():
                     self.upgrade_in_progress = False
                     break
             except Exception as error:
@@ -448,8 +581,8 @@ class NetAppESeriesFirmware(NetAppESeriesModule):
 
         self.module.fail_json(msg="Failed to retrieve firmware status update from proxy. Array [%s]." % self.ssid)
 
-    def proxy_upload_and_check_compatibility(self):
-        """Ensure firmware/nvsram file is uploaded and verify compatibility."""
+    def proxy_upload_files(self):
+        """Ensure firmware/nvsram file is uploaded to the proxy."""
         uploaded_files = []
         try:
             rc, uploaded_files = self.request("firmware/cfw-files")
@@ -463,13 +596,12 @@ class NetAppESeriesFirmware(NetAppESeriesModule):
             else:
                 fields = [("validate", "true")]
                 files = [("firmwareFile", self.firmware_name, self.firmware)]
-                headers, data = create_multipart_formdata(files=files, fields=fields)
+                headers, data = create_multipart_formdata(files=files, fields=fields, log=self.module.log)
                 try:
                     rc, response = self.request("firmware/upload", method="POST", data=data, headers=headers)
                 except Exception as error:
                     self.module.fail_json(msg="Failed to upload firmware bundle file. File [%s]. Array [%s]. Error [%s]."
                                               % (self.firmware_name, self.ssid, to_native(error)))
-            self.proxy_check_firmware_compatibility()
 
         if self.nvsram:
             for uploaded_file in uploaded_files:
@@ -478,14 +610,25 @@ class NetAppESeriesFirmware(NetAppESeriesModule):
             else:
                 fields = [("validate", "true")]
                 files = [("firmwareFile", self.nvsram_name, self.nvsram)]
-                headers, data = create_multipart_formdata(files=files, fields=fields)
+                headers, data = create_multipart_formdata(files=files, fields=fields, log=self.module.log)
                 try:
                     rc, response = self.request("firmware/upload", method="POST", data=data, headers=headers)
                 except Exception as error:
                     self.module.fail_json(msg="Failed to upload NVSRAM file. File [%s]. Array [%s]. Error [%s]."
                                               % (self.nvsram_name, self.ssid, to_native(error)))
+
+    def proxy_check_compatibility(self):
+        """Verify the uploaded firmware/nvsram files are compatible with the storage system."""
+        if self.firmware:
+            self.proxy_check_firmware_compatibility()
+        if self.nvsram:
             self.proxy_check_nvsram_compatibility()
 
+    def proxy_upload_and_check_compatibility(self):
+        """Ensure firmware/nvsram file is uploaded and verify compatibility."""
+        self.proxy_upload_files()
+        self.proxy_check_compatibility()
+
     def proxy_check_upgrade_required(self):
         """Determine whether the onboard firmware/nvsram version is the same as the file"""
         # Verify controller consistency and get firmware versions
@@ -567,8 +710,261 @@ class NetAppESeriesFirmware(NetAppESeriesModule):
         if self.wait_for_completion:
             self.proxy_wait_for_upgrade()
 
+    def proxy_stage_firmware(self):
+        """Stage previously uploaded firmware related files on the storage system without activating them."""
+        body = {"stageFirmware": True, "skipMelCheck": self.clear_mel_events, "cfwFile": self.firmware_name}
+        if self.nvsram:
+            body.update({"nvsramFile": self.nvsram_name})
+
+        try:
+            rc, response = self.request("storage-systems/%s/cfw-upgrade" % self.ssid, method="POST", data=body)
+        except Exception as error:
+            self.module.fail_json(msg="Failed to stage firmware. Array [%s]. Error [%s]." % (self.ssid, to_native(error)))
+
+        elapsed = 0
+        interval = None
+        while True:
+            try:
+                rc, status = self.request("storage-systems/%s/cfw-upgrade" % self.ssid, log_request=False)
+            except Exception as error:
+                self.module.fail_json(msg="Failed to retrieve firmware staging status! Array [%s]. Error[%s]." % (self.ssid, to_native(error)))
+
+            if not status["running"]:
+                break
+            if elapsed >= self.REBOOT_TIMEOUT_SEC:
+                self.module.fail_json(msg="Timeout waiting for firmware to be staged. Array [%s]." % self.ssid)
+
+            interval = get_poll_interval(interval)
+            sleep(interval)
+            elapsed += interval
+
+    def proxy_activate_firmware(self):
+        """Activate firmware previously staged by proxy_stage_firmware."""
+        try:
+            rc, response = self.request("storage-systems/%s/cfw-upgrade/activate" % self.ssid, method="POST", data={"skipMelCheck": self.clear_mel_events})
+        except Exception as error:
+            self.module.fail_json(msg="Failed to activate the staged firmware. Array [%s]. Error [%s]." % (self.ssid, to_native(error)))
+
+    def get_array_firmware(self, entry):
+        """Create the firmware upgrade instance for an arrays list entry.
+
+        Entries inherit any connection option they do not specify from the module parameters. The instance shares the
+        firmware file information and reports failures by raising NetAppESeriesModuleError rather than ending the module.
+        """
+        array = self.get_bulk_entry(dict(ssid=entry["ssid"], changed=False, upgrade_required=False, upgrade_in_process=False, wave=None, msg=None),
+                                    connection=entry)
+        array.upgrade_required = False
+        array.upgrade_in_progress = False
+        array.module_info = dict()
+        array.last_known_event = -1
+        array.timeline = []
+        array.result.update(api_url=array.url, modules_info=array.module_info, timeline=array.timeline)
+        return array
+
+    def poll_array_upgrade(self):
+        """Check the progress of the storage system's firmware activation once.
+
+        :raise NetAppESeriesModuleError: when the upgrade failed.
+        :return bool: whether the upgrade is complete.
+        """
+        try:
+            if self.poll_firmware_events():
+                self.record_timeline("Controller firmware activated.")
+        except Exception as error:
+            pass    # Events are unavailable while the controllers reboot.
+
+        if not self.is_embedded():
+            try:
+                rc, status = self.request("storage-systems/%s/cfw-upgrade" % self.ssid, log_request=False, ignore_errors=True)
+            except Exception as error:
+                return False
+
+            if "errorMessage" not in status:
+                if status["running"]:
+                    return False
+                if not status["activationCompletionTime"]:
+                    self.module.fail_json(msg="Failed to complete upgrade. Array [%s]." % self.ssid)
+
+        try:
+            return self.is_upgrade_reported() and self.is_optimal()
+        except Exception as error:
+            return False
+
+    def wait_for_arrays(self, arrays):
+        """Wait for the firmware activation of every storage system in a wave to complete.
+
+        Every storage system is tracked from a single loop which polls each one's events and upgrade status. The poll
+        interval is reset whenever a storage system reports progress and otherwise backs off.
+
+        :return list: (array, error) tuples for the storage systems that failed or did not complete before the timeout.
+        """
+        pending = list(arrays)
+        failures = []
+        elapsed = 0
+        interval = None
+        while pending:
+            timeline_length = sum(len(array.timeline) for array in pending)
+            for array in list(pending):
+                try:
+                    if array.poll_array_upgrade():
+                        array.upgrade_in_progress = False
+                        array.record_timeline("Upgrade completed.")
+                        pending.remove(array)
+                except NetAppESeriesModuleError as error:
+                    failures.append((array, error))
+                    pending.remove(array)
+
+            if not pending:
+                break
+            if elapsed >= self.REBOOT_TIMEOUT_SEC:
+                failures.extend((array, "Timeout waiting for upgrade to complete. Array [%s]." % array.ssid) for array in pending)
+                break
+
+            progress = sum(len(array.timeline) for array in pending) != timeline_length
+            interval = get_poll_interval(None if progress else interval, minimum=2, maximum=30)
+            sleep(interval)
+            elapsed += interval
+
+        return failures
+
+    def apply_arrays(self):
+        """Upgrade the controller firmware of every storage system in the arrays list.
+
+        Compatibility checks, health checks and firmware staging are performed concurrently using no more than max_workers
+        threads. The staged firmware is then activated in waves of no more than wave_size storage systems and no further
+        waves are activated once a storage system fails to upgrade.
+
+        :raise AnsibleExitJson when every storage system completes successfully"""
+        if self.wave_size < 1:
+            self.module.fail_json(msg="wave_size must be greater than zero.")
+
+        # Parse the files once so that the information is shared by every storage system.
+        self.is_firmware_bundled()
+        self.firmware_version()
+        if self.nvsram:
+            self.nvsram_version()
+
+        arrays = [self.get_array_firmware(entry) for entry in self.arrays]
+        keys = [(array.url, array.ssid) for array in arrays]
+        duplicates = sorted(set("%s%s" % key for key in keys if keys.count(key) > 1))
+        if duplicates:
+            self.module.fail_json(msg="Storage systems must be unique. Duplicates [%s]." % ", ".join(duplicates))
+
+        results = [array.result for array in arrays]
+        pending = list(arrays)
+
+        def run(func, msg, arrays=None):
+            for array, result, error in run_concurrently(func, pending if arrays is None else arrays, self.max_workers):
+                if error:
+                    array.result.update(failed=True, msg=to_native(error))
+                    array.record_timeline("%s failed." % msg)
+                    pending.remove(array)
+                elif msg:
+                    array.record_timeline("%s completed." % msg)
+
+        def check_upgrade_required(array):
+            if array.is_upgrade_in_progress():
+                array.module.fail_json(msg="Upgrade is already is progress. Array [%s]." % array.ssid)
+            if array.is_embedded():
+                array.embedded_check_compatibility()
+            else:
+                if not array.is_web_services_version_met(self.MINIMUM_PROXY_VERSION):
+                    array.module.fail_json(msg="Minimum proxy version %s required! Array [%s]." % (self.MINIMUM_PROXY_VERSION, array.ssid))
+                array.proxy_check_upgrade_required()
+        run(check_upgrade_required, "Upgrade check")
+
+        for array in pending:
+            array.result["upgrade_required"] = array.upgrade_required
+            array.result["changed"] = array.upgrade_required
+            if not array.upgrade_required:
+                array.result["msg"] = "Firmware is up to date."
+        pending = [array for array in pending if array.upgrade_required]
+
+        # Upload the files only once to each proxy before the compatibility checks.
+        proxies = dict()
+        for array in pending:
+            if not array.is_embedded():
+                proxies.setdefault((array.url, array.creds["url_username"]), []).append(array)
+        for proxy_arrays, result, error in run_concurrently(lambda proxy_arrays: proxy_arrays[0].proxy_upload_files(), proxies.values(), self.max_workers):
+            if error:
+                for array in proxy_arrays:
+                    array.result.update(failed=True, msg=to_native(error))
+                    pending.remove(array)
+        run(lambda array: array.proxy_check_compatibility(), "Compatibility check", [array for array in pending if not array.is_embedded()])
+
+        def check_health(array):
+            if not array.check_system_health():
+                array.module.fail_json(msg="Storage system health check failed. Array [%s]." % array.ssid)
+        run(check_health, "Health check")
+
+        if not self.module.check_mode:
+            for array in pending:
+                array.result["changed"] = False
+
+            def stage(array):
+                array.record_timeline("Staging started.")
+                if array.is_embedded():
+                    array.embedded_firmware_stage()
+                else:
+                    array.proxy_stage_firmware()
+                array.result["changed"] = True
+            run(stage, "Staging")
+
+            def activate(array):
+                if array.clear_mel_events:
+                    array.delete_mel_events()
+                array.update_last_known_event()
+                array.record_timeline("Activation started.")
+                array.upgrade_in_progress = True
+                if array.is_embedded():
+                    try:
+                        array.embedded_firmware_activate()
+                    except NetAppESeriesModuleError:
+                        raise
+                    except Exception as error:
+                        pass    # The controller may reboot before responding.
+                else:
+                    array.proxy_activate_firmware()
+
+            waves = [pending[index:index + self.wave_size] for index in range(0, len(pending), self.wave_size)]
+            for number, wave in enumerate(waves, 1):
+                for array in wave:
+                    array.result["wave"] = number
+
+                failures = []
+                activated = list(wave)
+                for array, result, error in run_concurrently(activate, wave, self.wave_size):
+                    if error:
+                        failures.append((array, error))
+                        activated.remove(array)
+                failures.extend(self.wait_for_arrays(activated))
+
+                for array, error in failures:
+                    array.result.update(failed=True, msg=to_native(error))
+                    array.record_timeline("Upgrade failed.")
+                for array in wave:
+                    array.result["upgrade_in_process"] = array.upgrade_in_progress
+                    if not array.result.get("failed"):
+                        array.result["msg"] = "Upgrade completed."
+
+                if failures:
+                    for array in [array for later_wave in waves[number:] for array in later_wave]:
+                        array.result.update(failed=True, msg="Firmware is staged but was not activated because an earlier wave failed. Array [%s]."
+                                                             % array.ssid)
+                    break
+
+        for result in results:
+            if result["msg"] is None:
+                result["msg"] = "Upgrade required."
+
+        self.exit_bulk_results(results, "storage systems", label="Arrays", name_key="ssid", changed_key="upgrade_required", changes="upgrades",
+                               action="upgrade", arrays=results)
+
     def apply(self):
         """Upgrade controller firmware."""
+        if self.arrays is not None:
+            self.apply_arrays()
+
         if self.is_upgrade_in_progress():
             self.module.fail_json(msg="Upgrade is already is progress. Array [%s]." % self.ssid)
 
@@ -22,8 +22,9 @@ options:
         description:
             - If the host doesn't yet exist, the label/name to assign at creation time.
             - If the hosts already exists, this will be used to uniquely identify the host to make any required changes
+            - Mutually exclusive with I(hosts).
         type: str
-        required: True
+        required: False
         aliases:
             - label
     state:
@@ -94,6 +95,46 @@ options:
         required: false
         type: bool
         default: false
+    hosts:
+        description:
+            - List of hosts to manage in a single task.
+            - The storage system's hosts, host types and host side interfaces are retrieved once and every host is created,
+              updated, removed or has its ports reassigned from that single snapshot.
+            - Each entry inherits any option it does not specify from the corresponding module option.
+            - The result for each host is returned in I(hosts) and a failure for one host does not prevent the others from
+              being applied.
+            - Mutually exclusive with I(name).
+        type: list
+        elements: dict
+        required: false
+        suboptions:
+            name:
+                description:
+                    - The name of the host to manage.
+                type: str
+                required: true
+                aliases:
+                    - label
+            state:
+                description:
+                    - See I(state).
+                type: str
+                choices: ["absent", "present"]
+            host_type:
+                description:
+                    - See I(host_type).
+                type: str
+                aliases:
+                    - host_type_index
+            ports:
+                description:
+                    - See I(ports).
+                type: list
+                elements: dict
+            force_port:
+                description:
+                    - See I(force_port).
+                type: bool
 """
 
 EXAMPLES = """
@@ -127,6 +168,29 @@ EXAMPLES = """
         validate_certs: true
         name: "Host2"
         state: absent
+
+    - name: Define many hosts from a single snapshot of the storage system's hosts
+      na_santricity_host:
+        ssid: "1"
+        api_url: "https://192.168.1.100:8443/devmgr/v2"
+        api_username: "admin"
+        api_password: "adminpass"
+        validate_certs: true
+        host_type: Linux DM-MP
+        hosts:
+          - name: "Host3"
+            ports:
+              - type: "iscsi"
+                label: "HOST3_PORT_1"
+                port: "iqn.1996-04.de.suse:01:56f86f9bd1ff"
+          - name: "Host4"
+            host_type: VMware
+            ports:
+              - type: "fc"
+                label: "HOST4_FC_1"
+                port: "10:00:FF:7C:FF:FF:FF:02"
+          - name: "Host2"
+            state: absent
 """
 
 RETURN = """
@@ -154,11 +218,18 @@ api_url:
     returned: on success
     type: str
     sample: https://webservices.example.com:8443
+hosts:
+    description: Result for each host when I(hosts) is specified.
+    type: list
+    elements: dict
+    returned: when I(hosts) is specified
+    sample: [{"name": "Host3", "changed": true, "msg": "Host [Host3] has been created."},
+             {"name": "Host4", "changed": false, "msg": "Host [Host4] exists."}]
 """
 import re
 
 from ansible.module_utils._text import to_native
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule, NetAppESeriesModuleError
 
 
 class NetAppESeriesHost(NetAppESeriesModule):
@@ -168,22 +239,48 @@ class NetAppESeriesHost(NetAppESeriesModule):
         ansible_options = dict(state=dict(type="str", default="present", choices=["absent", "present"]),
                                ports=dict(type="list", elements="dict", required=False),
                                force_port=dict(type="bool", default=False),
-                               name=dict(type="str", required=True, aliases=["label"]),
-                               host_type=dict(type="str", required=False, aliases=["host_type_index"]))
+                               name=dict(type="str", required=False, aliases=["label"]),
+                               host_type=dict(type="str", required=False, aliases=["host_type_index"]),
+                               hosts=dict(type="list", elements="dict", required=False, options=dict(
+                                   name=dict(type="str", required=True, aliases=["label"]),
+                                   state=dict(type="str", choices=["absent", "present"]),
+                                   host_type=dict(type="str", aliases=["host_type_index"]),
+                                   ports=dict(type="list", elements="dict"),
+                                   force_port=dict(type="bool"))))
+
+        mutually_exclusive = [["name", "hosts"]]
+        required_one_of = [["name", "hosts"]]
 
         super(NetAppESeriesHost, self).__init__(ansible_options=ansible_options,
                                                 web_services_version="02.00.0000.0000",
-                                                supports_check_mode=True)
+                                                supports_check_mode=True,
+                                                mutually_exclusive=mutually_exclusive,
+                                                required_one_of=required_one_of)
 
         self.check_mode = self.module.check_mode
         args = self.module.params
+        self.hosts = args["hosts"]
+
+        self.all_hosts = list()
+        self.hosts_by_label = dict()
+        self.host_ports_by_label = dict()
+        self.host_ports_by_address = dict()
+        self.port_refs_by_address = dict()
+        self.host_types = dict()
+
+        if not self.url.endswith("/"):
+            self.url += "/"
+
+        self.set_host_parameters(args)
+
+    def set_host_parameters(self, args):
+        """Set the host's expected state from the module parameters or from a hosts entry merged with them."""
         self.ports = args["ports"]
         self.force_port = args["force_port"]
         self.name = args["name"]
         self.state = args["state"]
 
         self.post_body = dict()
-        self.all_hosts = list()
         self.host_obj = dict()
         self.new_ports = list()
         self.ports_for_update = list()
@@ -202,9 +299,6 @@ class NetAppESeriesHost(NetAppESeriesModule):
         else:
             self.host_type_index = None
 
-        if not self.url.endswith("/"):
-            self.url += "/"
-
         # Fix port representation if they are provided with colons
         if self.ports is not None:
             for port in self.ports:
@@ -232,17 +326,17 @@ class NetAppESeriesHost(NetAppESeriesModule):
 
     @property
     def valid_host_type(self):
-        host_types = None
-        try:
-            rc, host_types = self.request("storage-systems/%s/host-types" % self.ssid)
-        except Exception as err:
-            self.module.fail_json(msg="Failed to get host types. Array Id [%s]. Error [%s]." % (self.ssid, to_native(err)))
+        if not self.host_types:
+            host_types = None
+            try:
+                rc, host_types = self.request("storage-systems/%s/host-types" % self.ssid)
+            except Exception as err:
+                self.module.fail_json(msg="Failed to get host types. Array Id [%s]. Error [%s]." % (self.ssid, to_native(err)))
+            self.host_types.update((host_type["index"], host_type) for host_type in host_types)
 
-        try:
-            match = list(filter(lambda host_type: host_type["index"] == self.host_type_index, host_types))[0]
-            return True
-        except IndexError:
+        if self.host_type_index not in self.host_types:
             self.module.fail_json(msg="There is no host type with index %s" % self.host_type_index)
+        return True
 
     def check_port_types(self):
         """Check to see whether the port interface types are available on storage system."""
@@ -282,29 +376,22 @@ class NetAppESeriesHost(NetAppESeriesModule):
                     break
 
     def assigned_host_ports(self, apply_unassigning=False):
-        """Determine if the hostPorts requested have already been assigned and return list of required used ports."""
+        """Determine if the hostPorts requested have already been assigned and return list of required used ports.
+
+        When apply_unassigning is set, the ports are removed from the other hosts and from the port indexes.
+        """
         used_host_ports = {}
-        for host in self.all_hosts:
-            if host["label"].lower() != self.name.lower():
-                for host_port in host["hostSidePorts"]:
-
-                    # Compare expected ports with those from other hosts definitions.
-                    for port in self.ports:
-                        if port["port"] == host_port["address"] or port["label"].lower() == host_port["label"].lower():
-                            if not self.force_port:
-                                self.module.fail_json(msg="Port label or address is already used and force_port option is set to false!")
-                            else:
-                                # Determine port reference
-                                port_ref = [port["hostPortRef"] for port in host["ports"]
-                                            if port["hostPortName"] == host_port["address"]]
-                                port_ref.extend([port["initiatorRef"] for port in host["initiators"]
-                                                 if port["nodeName"]["iscsiNodeName"] == host_port["address"]])
-
-                                # Create dictionary of hosts containing list of port references
-                                if host["hostRef"] not in used_host_ports.keys():
-                                    used_host_ports.update({host["hostRef"]: port_ref})
-                                else:
-                                    used_host_ports[host["hostRef"]].extend(port_ref)
+        conflicts = []
+        for port in self.ports or []:
+
+            # Compare expected ports with those from other hosts definitions.
+            for host, host_port in self.port_conflicts(port):
+                if not self.force_port:
+                    self.module.fail_json(msg="Port label or address is already used and force_port option is set to false!")
+
+                # Create dictionary of hosts containing list of port references
+                used_host_ports.setdefault(host["hostRef"], []).extend(self.port_refs_by_address.get(host_port["address"], []))
+                conflicts.append((host, host_port))
 
         # Unassign assigned ports
         if apply_unassigning:
@@ -316,12 +403,72 @@ class NetAppESeriesHost(NetAppESeriesModule):
                     self.module.fail_json(msg="Failed to unassign host port. Host Id [%s]. Array Id [%s]. Ports [%s]. Error [%s]."
                                               % (self.host_obj["id"], self.ssid, used_host_ports[host_ref], to_native(err)))
 
+            for host, host_port in conflicts:
+                self.unindex_host_port(host, host_port)
+        return used_host_ports
+
+    def index_host(self, host):
+        """Normalize a host's ports and add the host to the host, port label and port address indexes."""
+        for port in host["hostSidePorts"]:
+            port["type"] = port["type"].lower()
+            port["address"] = port["address"].lower()
+
+        # Augment hostSidePorts with their ID (this is an omission in the API)
+        ports = dict((port["label"], port["id"]) for port in host["ports"])
+        ports.update(dict((port["label"], port["id"]) for port in host["initiators"]))
+
+        for host_side_port in host["hostSidePorts"]:
+            if host_side_port["label"] in ports:
+                host_side_port["id"] = ports[host_side_port["label"]]
+
+            self.host_ports_by_label[host_side_port["label"].lower()] = (host, host_side_port)
+            self.host_ports_by_address[host_side_port["address"]] = (host, host_side_port)
+
+        port_refs = dict()
+        for port in host["ports"]:
+            port_refs.setdefault(port["hostPortName"].lower(), []).append(port["hostPortRef"])
+        for port in host["initiators"]:
+            if port["nodeName"]["iscsiNodeName"]:
+                port_refs.setdefault(port["nodeName"]["iscsiNodeName"].lower(), []).append(port["initiatorRef"])
+        self.port_refs_by_address.update(port_refs)
+
+        self.hosts_by_label[host["label"].lower()] = host
+
+    def unindex_host(self, host):
+        """Remove a host and the ports it still owns from the host, port label and port address indexes."""
+        for index in [self.host_ports_by_label, self.host_ports_by_address]:
+            for key in [key for key, (owner, host_port) in index.items() if owner is host]:
+                index.pop(key)
+        self.hosts_by_label.pop(host["label"].lower(), None)
+
+    def unindex_host_port(self, host, host_port):
+        """Remove a port that has been unassigned from its host from the host's side ports and the port indexes."""
+        host["hostSidePorts"] = [port for port in host["hostSidePorts"] if port is not host_port]
+        for index, key in [(self.host_ports_by_label, host_port["label"].lower()), (self.host_ports_by_address, host_port["address"])]:
+            if index.get(key, (None, None))[1] is host_port:
+                index.pop(key)
+        self.port_refs_by_address.pop(host_port["address"], None)
+
+    def port_conflicts(self, port):
+        """Return the (host, hostSidePort) pairs of other hosts using the port's label or address."""
+        conflicts = []
+        for conflict in [self.host_ports_by_label.get(port["label"].lower()), self.host_ports_by_address.get(port["port"].lower())]:
+            if (conflict and conflict[0]["label"].lower() != self.name.lower() and
+                    not any(conflict[1] is existing[1] for existing in conflicts)):
+                conflicts.append(conflict)
+        return conflicts
+
     @property
     def host_exists(self):
         """Determine if the requested host exists
-        As a side effect, set the full list of defined hosts in "all_hosts", and the target host in "host_obj".
+        As a side effect, set the full list of defined hosts in "all_hosts", the target host in "host_obj", and index the
+        hosts by label and their ports by label and address (see load_hosts).
         """
-        match = False
+        self.load_hosts()
+        return bool(self.host_obj)
+
+    def load_hosts(self):
+        """Retrieve every host, setting "all_hosts" and "host_obj" and indexing the hosts by label and their ports by label and address."""
         all_hosts = list()
 
         try:
@@ -329,26 +476,15 @@ class NetAppESeriesHost(NetAppESeriesModule):
         except Exception as err:
             self.module.fail_json(msg="Failed to determine host existence. Array Id [%s]. Error [%s]." % (self.ssid, to_native(err)))
 
-        # Augment the host objects
+        self.hosts_by_label.clear()
+        self.host_ports_by_label.clear()
+        self.host_ports_by_address.clear()
+        self.port_refs_by_address.clear()
         for host in all_hosts:
-            for port in host["hostSidePorts"]:
-                port["type"] = port["type"].lower()
-                port["address"] = port["address"].lower()
-
-            # Augment hostSidePorts with their ID (this is an omission in the API)
-            ports = dict((port["label"], port["id"]) for port in host["ports"])
-            ports.update(dict((port["label"], port["id"]) for port in host["initiators"]))
-
-            for host_side_port in host["hostSidePorts"]:
-                if host_side_port["label"] in ports:
-                    host_side_port["id"] = ports[host_side_port["label"]]
-
-            if host["label"].lower() == self.name.lower():
-                self.host_obj = host
-                match = True
+            self.index_host(host)
 
         self.all_hosts = all_hosts
-        return match
+        self.host_obj = self.hosts_by_label.get(self.name.lower(), dict()) if self.name else dict()
 
     @property
     def needs_update(self):
@@ -390,18 +526,10 @@ class NetAppESeriesHost(NetAppESeriesModule):
 
     def port_on_diff_host(self, arg_port):
         """ Checks to see if a passed in port arg is present on a different host"""
-        for host in self.all_hosts:
-
-            # Only check "other" hosts
-            if host["name"].lower() != self.name.lower():
-                for port in host["hostSidePorts"]:
-
-                    # Check if the port label is found in the port dict list of each host
-                    if arg_port["label"].lower() == port["label"].lower() or arg_port["port"].lower() == port["address"].lower():
-                        return True
-        return False
+        return bool(self.port_conflicts(arg_port))
 
-    def update_host(self):
+    def apply_host_update(self):
+        """Reassign any requested ports used by other hosts and update the host definition."""
         self.post_body = {"name": self.name, "hostType": {"index": self.host_type_index}}
 
         # Remove ports that need reassigning from their current host.
@@ -418,30 +546,33 @@ class NetAppESeriesHost(NetAppESeriesModule):
             except Exception as err:
                 self.module.fail_json(msg="Failed to update host. Array Id [%s]. Error [%s]." % (self.ssid, to_native(err)))
 
+    def update_host(self):
+        self.apply_host_update()
         self.module.exit_json(changed=True)
 
-    def create_host(self):
+    def apply_host_create(self):
+        """Reassign any requested ports used by other hosts and create the host."""
         # Remove ports that need reassigning from their current host.
         self.assigned_host_ports(apply_unassigning=True)
 
-        # needs_reassignment = False
         post_body = dict(name=self.name,
                          hostType=dict(index=self.host_type_index))
 
         if self.ports:
             post_body.update(ports=self.ports)
 
-        if not self.host_exists:
-            if not self.check_mode:
-                try:
-                    rc, self.host_obj = self.request("storage-systems/%s/hosts" % self.ssid, method="POST", data=post_body, ignore_errors=True)
-                except Exception as err:
-                    self.module.fail_json(msg="Failed to create host. Array Id [%s]. Error [%s]." % (self.ssid, to_native(err)))
-        else:
+        if not self.check_mode:
+            try:
+                rc, self.host_obj = self.request("storage-systems/%s/hosts" % self.ssid, method="POST", data=post_body, ignore_errors=True)
+            except Exception as err:
+                self.module.fail_json(msg="Failed to create host. Array Id [%s]. Error [%s]." % (self.ssid, to_native(err)))
+
+    def create_host(self):
+        if self.host_exists:
             payload = self.build_success_payload(self.host_obj)
             self.module.exit_json(changed=False, msg="Host already exists. Id [%s]. Host [%s]." % (self.ssid, self.name), **payload)
 
-        payload = self.build_success_payload(self.host_obj)
+        self.apply_host_create()
         self.module.exit_json(changed=True, msg="Host created.")
 
     def remove_host(self):
@@ -461,7 +592,86 @@ class NetAppESeriesHost(NetAppESeriesModule):
         result["api_url"] = self.url
         return result
 
+    def get_bulk_host(self, entry):
+        """Create the host instance for a hosts list entry.
+
+        Entries inherit any option they do not specify from the module parameters. The instance shares the host, port and
+        host type indexes and reports failures by raising NetAppESeriesModuleError rather than ending the module.
+        """
+        host = self.get_bulk_entry(dict(name=entry["name"], changed=False, msg=None))
+        host.set_host_parameters(self.get_bulk_entry_args(entry))
+        host.host_obj = self.hosts_by_label.get(host.name.lower(), dict())
+        return host
+
+    def apply_hosts(self):
+        """Determine and apply the changes necessary for every entry in the hosts list.
+
+        Hosts, host types and host side interfaces are retrieved once and shared by every host. Hosts are applied in order
+        since ports may move between them and the port indexes are updated after each change.
+
+        :raise AnsibleExitJson when every host completes successfully"""
+        names = [entry["name"].lower() for entry in self.hosts]
+        duplicates = sorted(set(name for name in names if names.count(name) > 1))
+        if duplicates:
+            self.module.fail_json(msg="Host names must be unique. Duplicates [%s]. Array [%s]." % (", ".join(duplicates), self.ssid))
+
+        self.load_hosts()
+        results = []
+        hosts = []
+        for entry in self.hosts:
+            try:
+                host = self.get_bulk_host(entry)
+                hosts.append(host)
+                results.append(host.result)
+            except NetAppESeriesModuleError as error:
+                results.append(dict(name=entry["name"], changed=False, failed=True, msg=str(error)))
+
+        # Check every requested port type against a single retrieval of the host side interfaces.
+        self.ports = [port for host in hosts if host.state == "present" for port in host.ports or []]
+        if self.ports:
+            self.check_port_types()
+
+        for host in hosts:
+            try:
+                if host.state == "absent":
+                    if host.host_obj:
+                        if not self.check_mode:
+                            host.remove_host()
+                        self.unindex_host(host.host_obj)
+                        host.result.update(changed=True, msg="Host [%s] has been removed." % host.name)
+                    else:
+                        host.result.update(msg="Host [%s] does not exist." % host.name)
+                    continue
+
+                if host.host_type_index is None:
+                    if self.host_type_index is None:
+                        self.host_type_index = self.default_host_type
+                    host.host_type_index = self.host_type_index
+
+                old_host_obj = host.host_obj
+                if host.host_obj:
+                    if host.needs_update and host.valid_host_type:
+                        host.apply_host_update()
+                        host.result.update(changed=True, msg="Host [%s] has been updated." % host.name)
+                    else:
+                        host.result.update(msg="Host [%s] exists." % host.name)
+                elif host.valid_host_type:
+                    host.apply_host_create()
+                    host.result.update(changed=True, msg="Host [%s] has been created." % host.name)
+
+                if host.result["changed"] and host.host_obj and "hostSidePorts" in host.host_obj:
+                    if old_host_obj:
+                        self.unindex_host(old_host_obj)
+                    self.index_host(host.host_obj)
+            except NetAppESeriesModuleError as error:
+                host.result.update(failed=True, msg=str(error))
+
+        self.exit_bulk_results(results, "hosts", hosts=results, **self.build_success_payload())
+
     def apply(self):
+        if self.hosts is not None:
+            self.apply_hosts()
+
         if self.state == "present":
             if self.host_type_index is None:
                 self.host_type_index = self.default_host_type
@@ -27,14 +27,43 @@ options:
     name:
         description:
             - Name of the host group to manage
+            - Mutually exclusive with I(host_groups).
         type: str
-        required: true
+        required: false
     hosts:
         description:
             - List of host names/labels to add to the group
         type: list
         elements: str
         required: false
+    host_groups:
+        description:
+            - List of host groups to manage in a single task.
+            - The storage system's host groups and hosts are retrieved once and every host group is created, updated or
+              removed from that single snapshot.
+            - Each entry inherits any option it does not specify from the corresponding module option.
+            - The result for each host group is returned in I(host_groups) and a failure for one host group does not prevent
+              the others from being applied.
+            - Mutually exclusive with I(name).
+        type: list
+        elements: dict
+        required: false
+        suboptions:
+            name:
+                description:
+                    - Name of the host group to manage.
+                type: str
+                required: true
+            state:
+                description:
+                    - See I(state).
+                type: str
+                choices: ["present", "absent"]
+            hosts:
+                description:
+                    - See I(hosts).
+                type: list
+                elements: str
 """
 EXAMPLES = """
     - name: Configure Hostgroup
@@ -49,6 +78,24 @@ EXAMPLES = """
         hosts:
           - host01
           - host02
+
+    - name: Configure many host groups
+      na_santricity_hostgroup:
+        ssid: "1"
+        api_url: "https://192.168.1.100:8443/devmgr/v2"
+        api_username: "admin"
+        api_password: "adminpass"
+        validate_certs: true
+        host_groups:
+          - name: example_hostgroup
+            hosts:
+              - host01
+              - host02
+          - name: another_hostgroup
+            hosts:
+              - host03
+          - name: unused_hostgroup
+            state: absent
 """
 RETURN = """
 clusterRef:
@@ -93,9 +140,16 @@ protectionInformationCapableAccessMethod:
     returned: always except when state is absent
     type: bool
     sample: true
+host_groups:
+    description: Result for each host group when I(host_groups) is specified.
+    type: list
+    elements: dict
+    returned: when I(host_groups) is specified
+    sample: [{"name": "example_hostgroup", "changed": true, "msg": "Host group [example_hostgroup] has been created."},
+             {"name": "unused_hostgroup", "changed": false, "msg": "Host group [unused_hostgroup] does not exist."}]
 """
 from ansible.module_utils._text import to_native
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule, NetAppESeriesModuleError
 
 
 class NetAppESeriesHostGroup(NetAppESeriesModule):
@@ -106,13 +160,29 @@ class NetAppESeriesHostGroup(NetAppESeriesModule):
         version = "02.00.0000.0000"
         ansible_options = dict(
             state=dict(choices=["present", "absent"], type="str", default="present"),
-            name=dict(required=True, type="str"),
-            hosts=dict(required=False, type="list", elements="str"))
+            name=dict(required=False, type="str"),
+            hosts=dict(required=False, type="list", elements="str"),
+            host_groups=dict(required=False, type="list", elements="dict", options=dict(
+                name=dict(required=True, type="str"),
+                state=dict(type="str", choices=["present", "absent"]),
+                hosts=dict(type="list", elements="str"))))
+
+        mutually_exclusive = [["name", "host_groups"]]
+        required_one_of = [["name", "host_groups"]]
+
         super(NetAppESeriesHostGroup, self).__init__(ansible_options=ansible_options,
                                                      web_services_version=version,
-                                                     supports_check_mode=True)
+                                                     supports_check_mode=True,
+                                                     mutually_exclusive=mutually_exclusive,
+                                                     required_one_of=required_one_of)
 
         args = self.module.params
+        self.host_group_entries = args["host_groups"]
+        self.existing_hosts = None
+        self.set_host_group_parameters(args)
+
+    def set_host_group_parameters(self, args):
+        """Set the host group's expected state from the module parameters or from a host_groups entry merged with them."""
         self.state = args["state"]
         self.name = args["name"]
         self.hosts_list = args["hosts"]
@@ -128,11 +198,14 @@ class NetAppESeriesHostGroup(NetAppESeriesModule):
             existing_hosts = []
 
             if self.hosts_list:
-                try:
-                    rc, existing_hosts = self.request("storage-systems/%s/hosts" % self.ssid)
-                except Exception as error:
-                    self.module.fail_json(msg="Failed to retrieve hosts information. Array id [%s].  Error[%s]."
-                                              % (self.ssid, to_native(error)))
+                if self.existing_hosts is not None:
+                    existing_hosts = self.existing_hosts
+                else:
+                    try:
+                        rc, existing_hosts = self.request("storage-systems/%s/hosts" % self.ssid)
+                    except Exception as error:
+                        self.module.fail_json(msg="Failed to retrieve hosts information. Array id [%s].  Error[%s]."
+                                                  % (self.ssid, to_native(error)))
 
                 for host in self.hosts_list:
                     for existing_host in existing_hosts:
@@ -156,6 +229,7 @@ class NetAppESeriesHostGroup(NetAppESeriesModule):
             self.module.fail_json(msg="Failed to retrieve host group information. Array id [%s].  Error[%s]."
                                       % (self.ssid, to_native(error)))
 
+        self.existing_hosts = hosts
         host_groups = [{"id": group["clusterRef"], "name": group["name"]} for group in host_groups]
         for group in host_groups:
             hosts_ids = []
@@ -218,7 +292,8 @@ class NetAppESeriesHostGroup(NetAppESeriesModule):
 
         # unassign hosts that should not be part of the hostgroup
         desired_host_ids = self.hosts
-        for host in self.current_hosts_in_host_group:
+        current_hosts = self.current_host_group["hosts"] if self.current_host_group else self.current_hosts_in_host_group
+        for host in current_hosts:
             if host not in desired_host_ids:
                 self.unassign_hosts([host])
 
@@ -230,44 +305,91 @@ class NetAppESeriesHostGroup(NetAppESeriesModule):
 
         return update_response
 
-    def apply(self):
-        """Apply desired host group state to the storage array."""
-        changes_required = False
-
-        # Search for existing host group match
-        for group in self.host_groups:
+    def get_required_change(self, host_groups):
+        """Find the host group in host_groups and determine whether changes are required."""
+        for group in host_groups:
             if group["name"] == self.name:
                 self.current_host_group = group
                 self.current_host_group["hosts"].sort()
                 break
 
-        # Determine whether changes are required
         if self.state == "present":
             if self.current_host_group:
-                if self.hosts and self.hosts != self.current_host_group["hosts"]:
-                    changes_required = True
+                return bool(self.hosts and self.hosts != self.current_host_group["hosts"])
+            if not self.name:
+                self.module.fail_json(msg="The option name must be supplied when creating a new host group. Array id [%s]." % self.ssid)
+            return True
+        return bool(self.current_host_group)
+
+    def apply_change(self):
+        """Create, update or delete the host group and return a description of the change."""
+        msg = "No changes required."
+        if self.state == "present":
+            if self.current_host_group:
+                if self.hosts != self.current_host_group["hosts"]:
+                    msg = self.update_host_group()
             else:
-                if not self.name:
-                    self.module.fail_json(msg="The option name must be supplied when creating a new host group. Array id [%s]." % self.ssid)
-                changes_required = True
+                msg = self.create_host_group()
 
         elif self.current_host_group:
-            changes_required = True
+            self.delete_host_group()
+            msg = "Host group deleted. Array Id [%s]. Host group [%s]." % (self.ssid, self.current_host_group["name"])
+        return msg
+
+    def apply_host_groups(self):
+        """Determine and apply the changes necessary for every entry in the host_groups list.
+
+        Host groups and hosts are retrieved once and shared by every host group. Host groups are applied in order since hosts
+        may move between them.
+
+        :raise AnsibleExitJson when every host group completes successfully"""
+        names = [entry["name"] for entry in self.host_group_entries]
+        duplicates = sorted(set(name for name in names if names.count(name) > 1))
+        if duplicates:
+            self.module.fail_json(msg="Host group names must be unique. Duplicates [%s]. Array [%s]." % (", ".join(duplicates), self.ssid))
+
+        host_groups = self.host_groups
+        results = []
+        for entry in self.host_group_entries:
+            group = self.get_bulk_entry(dict(name=entry["name"], changed=False, msg=None))
+            result = group.result
+            results.append(result)
+            try:
+                group.set_host_group_parameters(self.get_bulk_entry_args(entry))
+                if group.get_required_change(host_groups):
+                    result["changed"] = True
+                    result["msg"] = "Host group [%s] requires changes." % group.name
+                    if not self.module.check_mode:
+                        group.apply_change()
+                        result["msg"] = ("Host group [%s] has been deleted." if group.state == "absent" else
+                                         "Host group [%s] has been updated." if group.current_host_group else
+                                         "Host group [%s] has been created.") % group.name
+
+                        # Reflect the new membership so later entries see where hosts now belong.
+                        if group.state == "present":
+                            for other_group in host_groups:
+                                other_group["hosts"] = [host for host in other_group["hosts"] if host not in group.hosts]
+                            if group.current_host_group:
+                                group.current_host_group["hosts"] = list(group.hosts)
+                else:
+                    result["msg"] = ("Host group [%s] does not exist." if group.state == "absent" else "Host group [%s] exists.") % group.name
+            except NetAppESeriesModuleError as error:
+                result.update(failed=True, msg=str(error))
+
+        self.exit_bulk_results(results, "host groups", host_groups=results)
+
+    def apply(self):
+        """Apply desired host group state to the storage array."""
+        if self.host_group_entries is not None:
+            self.apply_host_groups()
+
+        # Search for existing host group match and determine whether changes are required
+        changes_required = self.get_required_change(self.host_groups)
 
         # Apply any necessary changes
         msg = ""
         if changes_required and not self.module.check_mode:
-            msg = "No changes required."
-            if self.state == "present":
-                if self.current_host_group:
-                    if self.hosts != self.current_host_group["hosts"]:
-                        msg = self.update_host_group()
-                else:
-                    msg = self.create_host_group()
-
-            elif self.current_host_group:
-                self.delete_host_group()
-                msg = "Host group deleted. Array Id [%s]. Host group [%s]." % (self.ssid, self.current_host_group["name"])
+            msg = self.apply_change()
 
         self.module.exit_json(msg=msg, changed=changes_required)
 
@@ -36,8 +36,9 @@ options:
     description:
       - The name of the volume you wish to include in the mapping.
       - Use ACCESS_VOLUME to reference the in-band access management volume.
+      - Mutually exclusive with I(mappings); one of I(volume_name) or I(mappings) is required.
     type: str
-    required: True
+    required: False
     aliases:
         - volume
   lun:
@@ -47,6 +48,46 @@ options:
       - LUN value will be determine by the storage-system when not specified.
     type: int
     required: false
+  graph_file:
+    description:
+      - Path to a previously saved storage system graph (the response from the storage-systems/{ssid}/graph endpoint).
+      - When specified the current lun mappings are determined from the file rather than from the storage system which
+        allows planning lun mapping changes offline.
+      - Can only be used in check mode.
+    type: path
+    required: false
+  mappings:
+    description:
+      - List of lun mappings to converge in a single task such as the list produced by the
+        netapp_eseries.santricity.santricity_lun_mapping lookup.
+      - The storage system graph is retrieved once, lun conflicts are determined for every mapping before any change is
+        made and only the required create, move and delete requests are issued.
+      - Each entry inherits I(state) and I(target) from the module options when they are not specified.
+      - Mutually exclusive with I(volume_name).
+    type: list
+    elements: dict
+    required: false
+    suboptions:
+      state:
+        description:
+          - See I(state).
+        type: str
+        choices: ["present", "absent"]
+      target:
+        description:
+          - See I(target).
+        type: str
+      volume_name:
+        description:
+          - See I(volume_name).
+        type: str
+        required: true
+        aliases:
+          - volume
+      lun:
+        description:
+          - See I(lun).
+        type: int
 '''
 
 EXAMPLES = '''
@@ -71,6 +112,33 @@ EXAMPLES = '''
         state: absent
         target: host1
         volume: volume1
+    - name: Plan the mapping of volume1 to host1 from a saved storage system graph
+      na_santricity_lun_mapping:
+        ssid: "1"
+        api_url: "https://192.168.1.100:8443/devmgr/v2"
+        api_username: "admin"
+        api_password: "adminpass"
+        validate_certs: true
+        state: present
+        target: host1
+        volume: volume1
+        graph_file: /tmp/array1_graph.json
+      check_mode: true
+    - name: Map many volumes in a single task
+      na_santricity_lun_mapping:
+        ssid: "1"
+        api_url: "https://192.168.1.100:8443/devmgr/v2"
+        api_username: "admin"
+        api_password: "adminpass"
+        validate_certs: true
+        target: hostgroup1
+        mappings:
+          - volume: volume1
+            lun: 1
+          - volume: volume2
+            lun: 2
+          - volume: volume3
+            state: absent
 '''
 RETURN = '''
 msg:
@@ -78,6 +146,13 @@ msg:
     returned: always
     type: str
     sample: Lun mapping is complete
+mappings:
+    description: Result for each lun mapping when I(mappings) is specified.
+    returned: when I(mappings) is specified
+    type: list
+    elements: dict
+    sample: [{"volume": "volume1", "target": "hostgroup1", "lun": 1, "changed": true},
+             {"volume": "volume3", "target": "hostgroup1", "lun": null, "changed": false}]
 '''
 from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule
 from ansible.module_utils._text import to_native
@@ -87,79 +162,84 @@ class NetAppESeriesLunMapping(NetAppESeriesModule):
     def __init__(self):
         ansible_options = dict(state=dict(required=False, choices=["present", "absent"], default="present"),
                                target=dict(required=False, default=None),
-                               volume_name=dict(required=True, aliases=["volume"]),
-                               lun=dict(type="int", required=False))
+                               volume_name=dict(required=False, aliases=["volume"]),
+                               lun=dict(type="int", required=False),
+                               graph_file=dict(type="path", required=False),
+                               mappings=dict(type="list", elements="dict", required=False,
+                                             options=dict(state=dict(type="str", choices=["present", "absent"]),
+                                                          target=dict(type="str"),
+                                                          volume_name=dict(type="str", required=True, aliases=["volume"]),
+                                                          lun=dict(type="int"))))
+        mutually_exclusive = [["volume_name", "mappings"]]
+        required_one_of = [["volume_name", "mappings"]]
 
         super(NetAppESeriesLunMapping, self).__init__(ansible_options=ansible_options,
                                                       web_services_version="02.00.0000.0000",
-                                                      supports_check_mode=True)
+                                                      supports_check_mode=True,
+                                                      mutually_exclusive=mutually_exclusive,
+                                                      required_one_of=required_one_of)
 
         args = self.module.params
         self.state = args["state"] == "present"
         self.target = args["target"] if args["target"] else "DEFAULT_HOSTGROUP"
         self.volume = args["volume_name"] if args["volume_name"] != "ACCESS_VOLUME" else "Access"
         self.lun = args["lun"]
+        self.mappings = args["mappings"]
         self.check_mode = self.module.check_mode
         self.mapping_info = None
+        self.ambiguous_targets = set()
 
         if not self.url.endswith('/'):
             self.url += '/'
 
     def update_mapping_info(self):
         """Collect the current state of the storage array."""
-        response = None
-        try:
-            rc, response = self.request("storage-systems/%s/graph" % self.ssid)
-        except Exception as error:
-            self.module.fail_json(msg="Failed to retrieve storage array graph. Id [%s]. Error [%s]" % (self.ssid, to_native(error)))
+        graph = self.get_graph()
 
         # Create dictionary containing host/cluster references mapped to their names
         target_reference = {}
         target_name = {}
         target_type = {}
 
-        for host in response["storagePoolBundle"]["host"]:
+        for host in graph.hosts:
             target_reference.update({host["hostRef"]: host["name"]})
             target_name.update({host["name"]: host["hostRef"]})
             target_type.update({host["name"]: "host"})
 
-        for cluster in response["storagePoolBundle"]["cluster"]:
+        for cluster in graph.host_groups:
 
             # Verify there is no ambiguity between target's type (ie host and group have the same name)
-            if cluster["name"] == self.target and self.target in target_name.keys():
-                self.module.fail_json(msg="Ambiguous target type: target name is used for both host and group targets! Id [%s]" % self.ssid)
+            if cluster["name"] in target_name.keys():
+                if cluster["name"] == self.target:
+                    self.module.fail_json(msg="Ambiguous target type: target name is used for both host and group targets! Id [%s]" % self.ssid)
+                self.ambiguous_targets.add(cluster["name"])
 
             target_reference.update({cluster["clusterRef"]: cluster["name"]})
             target_name.update({cluster["name"]: cluster["clusterRef"]})
             target_type.update({cluster["name"]: "group"})
 
-        target_reference.update({"0000000000000000000000000000000000000000": "DEFAULT_HOSTGROUP"})
-        target_name.update({"DEFAULT_HOSTGROUP": "0000000000000000000000000000000000000000"})
+        target_reference.update({graph.DEFAULT_HOSTGROUP_REF: "DEFAULT_HOSTGROUP"})
+        target_name.update({"DEFAULT_HOSTGROUP": graph.DEFAULT_HOSTGROUP_REF})
         target_type.update({"DEFAULT_HOSTGROUP": "group"})
 
         volume_reference = {}
         volume_name = {}
         lun_name = {}
-        for volume in response["volume"]:
-            volume_reference.update({volume["volumeRef"]: volume["name"]})
-            volume_name.update({volume["name"]: volume["volumeRef"]})
-            if volume["listOfMappings"]:
-                lun_name.update({volume["name"]: volume["listOfMappings"][0]["lun"]})
-        for volume in response["highLevelVolBundle"]["thinVolume"]:
+        for volume in graph.volumes:
             volume_reference.update({volume["volumeRef"]: volume["name"]})
             volume_name.update({volume["name"]: volume["volumeRef"]})
             if volume["listOfMappings"]:
                 lun_name.update({volume["name"]: volume["listOfMappings"][0]["lun"]})
 
-        volume_name.update({response["sa"]["accessVolume"]["name"]: response["sa"]["accessVolume"]["accessVolumeRef"]})
-        volume_reference.update({response["sa"]["accessVolume"]["accessVolumeRef"]: response["sa"]["accessVolume"]["name"]})
+        volume_name.update({graph.access_volume["name"]: graph.access_volume["accessVolumeRef"]})
+        volume_reference.update({graph.access_volume["accessVolumeRef"]: graph.access_volume["name"]})
 
         # Build current mapping object
         self.mapping_info = dict(lun_mapping=[dict(volume_reference=mapping["volumeRef"],
                                                    map_reference=mapping["mapRef"],
                                                    lun_mapping_reference=mapping["lunMappingRef"],
                                                    lun=mapping["lun"]
-                                                   ) for mapping in response["storagePoolBundle"]["lunMapping"]],
+                                                   ) for mapping in graph.mappings],
                                  volume_by_reference=volume_reference,
                                  volume_by_name=volume_name,
                                  lun_by_name=lun_name,
@@ -208,8 +288,143 @@ class NetAppESeriesLunMapping(NetAppESeriesModule):
 
         return target_match, reference, lun
 
+    def get_mapping_changes(self):
+        """Determine the lun mapping changes required for every entry in the mappings list.
+
+        Lun conflicts are determined for every mapping before any change is made. A requested lun is available when it is
+        unused by the target or when it is released by a mapping that is deleted or moved first.
+
+        :raise AnsibleFailJson when any entry is invalid or its lun conflicts with an existing or requested mapping.
+        :return list(dict): changes for each entry in the order they must be applied.
+        """
+        self.update_mapping_info()
+        mapping_by_volume_reference = dict((mapping["volume_reference"], mapping) for mapping in self.mapping_info["lun_mapping"])
+        volume_reference_by_lun = dict(((mapping["map_reference"], mapping["lun"]), mapping["volume_reference"])
+                                       for mapping in self.mapping_info["lun_mapping"])
+
+        errors = []
+        changes = []
+        for index, entry in enumerate(self.mappings):
+            state = (entry["state"] or self.module.params["state"]) == "present"
+            target = entry["target"] or self.module.params["target"] or "DEFAULT_HOSTGROUP"
+            volume = entry["volume_name"] if entry["volume_name"] != "ACCESS_VOLUME" else "Access"
+
+            if volume in [change["volume"] for change in changes]:
+                errors.append("Volume [%s] is specified more than once." % volume)
+                continue
+            if state:
+                if volume not in self.mapping_info["volume_by_name"].keys():
+                    errors.append("Volume [%s] does not exist." % volume)
+                    continue
+                if target not in self.mapping_info["target_by_name"].keys():
+                    errors.append("Target [%s] does not exist." % target)
+                    continue
+                if target in self.ambiguous_targets:
+                    errors.append("Ambiguous target type: target name [%s] is used for both host and group targets!" % target)
+                    continue
+
+            volume_reference = self.mapping_info["volume_by_name"].get(volume)
+            current = mapping_by_volume_reference.get(volume_reference)
+            change = dict(index=index, volume=volume, target=target, lun=entry["lun"], volume_reference=volume_reference, current=current,
+                          action=None)
+            if state:
+                if not current:
+                    change["action"] = "create"
+                elif (self.mapping_info["target_by_reference"].get(current["map_reference"]) != target or
+                      (entry["lun"] is not None and current["lun"] != entry["lun"])):
+                    change["action"] = "move"
+            elif current:
+                change["action"] = "delete"
+            changes.append(change)
+
+        # Determine the order that the changes can be applied without requesting a lun that is still in use.
+        released = set()
+        requested = dict()
+        ordered_changes = []
+
+        def is_lun_available(change):
+            slot = (self.mapping_info["target_by_name"][change["target"]], change["lun"])
+            owner = volume_reference_by_lun.get(slot)
+            return owner is None or owner == change["volume_reference"] or slot in released
+
+        def release(change):
+            ordered_changes.append(change)
+            released.add((change["current"]["map_reference"], change["current"]["lun"]))
+
+        for change in changes:
+            if change["action"] in ["create", "move"] and change["lun"] is not None:
+                slot = (change["target"], change["lun"])
+                if slot in requested:
+                    errors.append("Lun [%s] is requested for target [%s] by both volume [%s] and volume [%s]."
+                                  % (change["lun"], change["target"], requested[slot], change["volume"]))
+                requested[slot] = change["volume"]
+            elif change["action"] == "move":
+                release(change)
+            elif change["action"] == "delete":
+                release(change)
+
+        pending = [change for change in changes if change["action"] == "move" and change["lun"] is not None]
+        while pending:
+            available = [change for change in pending if is_lun_available(change)]
+            if not available:
+                break
+            for change in available:
+                pending.remove(change)
+                release(change)
+
+        creates = [change for change in changes if change["action"] == "create"]
+        for change in pending + [change for change in creates if change["lun"] is not None and not is_lun_available(change)]:
+            errors.append("Lun [%s] is already in use for target [%s]. Volume [%s]." % (change["lun"], change["target"], change["volume"]))
+
+        if errors:
+            self.module.fail_json(msg="Invalid lun mappings. Array Id [%s]. Errors [%s]" % (self.ssid, " ".join(errors)))
+
+        # Deletions must precede the moves and creations that request their luns and creations that request a lun must precede
+        # those that do not so that the lun cannot be assigned automatically to another volume.
+        ordered_changes.sort(key=lambda change: change["action"] != "delete")
+        creates.sort(key=lambda change: change["lun"] is None)
+        return ordered_changes + creates + [change for change in changes if change["action"] is None]
+
+    def update_mappings(self):
+        """Apply the changes required for every entry in the mappings list."""
+        changes = self.get_mapping_changes()
+        for change in changes:
+            change["result"] = dict(volume=change["volume"], target=change["target"], lun=change["lun"],
+                                    changed=change["action"] is not None and self.check_mode)
+        results = [change["result"] for change in sorted(changes, key=lambda change: change["index"])]
+
+        for change in changes:
+            if change["action"] is None or self.check_mode:
+                continue
+
+            try:
+                if change["action"] == "delete":
+                    rc, response = self.request("storage-systems/%s/volume-mappings/%s" % (self.ssid, change["current"]["lun_mapping_reference"]),
+                                                method="DELETE")
+                else:
+                    body = dict(targetId=self.mapping_info["target_by_name"][change["target"]])
+                    if change["lun"] is not None:
+                        body.update(dict(lun=change["lun"]))
+
+                    if change["action"] == "move":
+                        rc, response = self.request("storage-systems/%s/volume-mappings/%s/move" % (self.ssid, change["current"]["lun_mapping_reference"]),
+                                                    method="POST", data=body)
+                    else:
+                        body.update(dict(mappableObjectId=change["volume_reference"]))
+                        rc, response = self.request("storage-systems/%s/volume-mappings" % self.ssid, method="POST", data=body)
+            except Exception as error:
+                self.module.fail_json(msg="Failed to update storage array lun mapping. Volume [%s]. Target [%s]. Id [%s]. Error [%s]"
+                                          % (change["volume"], change["target"], self.ssid, to_native(error)),
+                                      changed=any(result["changed"] for result in results), mappings=results)
+            change["result"]["changed"] = True
+
+        self.module.exit_json(msg="Lun mapping is complete.", changed=any(result["changed"] for result in results), mappings=results)
+
     def update(self):
         """Execute the changes the require changes on the storage array."""
+        if self.mappings is not None:
+            self.update_mappings()
+
         target_match, lun_reference, lun = self.get_lun_mapping()
         update = (self.state and not target_match) or (not self.state and lun_reference)
 
@@ -23,9 +23,33 @@ options:
             - This option can be a list of file paths and/or directories containing drive firmware.
             - Note that only files with the extension .dlp will be attempted to be added to the proxy; all other files will be ignored.
             - NetApp E-Series drives require special firmware which can be downloaded from https://mysupport.netapp.com/NOW/download/tools/diskfw_eseries/
+            - Files are compared with the proxy's files by content as well as by name. A local manifest of file digests records
+              the content of every uploaded file so that a file whose content changed is uploaded again. Files are only hashed
+              again when their size or modification time changes.
         type: list
         elements: str
         required: false
+    max_workers:
+        description:
+            - Maximum number of files uploaded or removed concurrently.
+        type: int
+        default: 4
+        required: false
+    manifest_ttl:
+        description:
+            - Number of seconds that directory listings, file digests and the digests of uploaded files are recorded in the local file manifest.
+            - The manifest is kept in a directory of the system temporary directory that only the current user can access. Set to 0 to
+              disable the on-disk manifest, in which case files whose content changed are only uploaded again when their name changes.
+        type: int
+        default: 2592000
+        required: false
+    refresh_manifest:
+        description:
+            - Ignore the recorded directory listings and file digests and determine them again.
+            - The digests of files uploaded to the proxy are kept.
+        type: bool
+        default: false
+        required: false
 """
 EXAMPLES = """
 - name: Ensure correct firmware versions
@@ -44,16 +68,40 @@ msg:
     description: Whether any changes have been made to the collection of drive firmware on SANtricity Web Services Proxy.
     type: str
     returned: always
+files_added:
+    description: Files uploaded to the proxy, including files whose content changed.
+    type: list
+    returned: always
+    sample: ["drive_firmware.dlp"]
+files_updated:
+    description: Files uploaded again because their content changed.
+    type: list
+    returned: always
+    sample: ["drive_firmware.dlp"]
+files_removed:
+    description: Files removed from the proxy.
+    type: list
+    returned: always
+    sample: ["old_drive_firmware.dlp"]
+upload_bytes:
+    description: Number of bytes uploaded, or that would be uploaded in check mode.
+    type: int
+    returned: always
+    sample: 8388608
 """
 import os
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule, create_multipart_formdata
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import (
+    NetAppESeriesModule, NetAppESeriesFileManifest, create_multipart_formdata, eseries_max_workers_argument_spec, run_concurrently)
 
 
 class NetAppESeriesProxyDriveFirmwareUpload(NetAppESeriesModule):
     WAIT_TIMEOUT_SEC = 60 * 15
 
     def __init__(self):
-        ansible_options = dict(firmware=dict(type="list", elements="str", required=False))
+        ansible_options = dict(firmware=dict(type="list", elements="str", required=False),
+                               manifest_ttl=dict(type="int", default=NetAppESeriesFileManifest.TTL_SEC),
+                               refresh_manifest=dict(type="bool", default=False))
+        ansible_options.update(eseries_max_workers_argument_spec(default=4))
 
         super(NetAppESeriesProxyDriveFirmwareUpload, self).__init__(ansible_options=ansible_options,
                                                                     web_services_version="02.00.0000.0000",
@@ -61,34 +109,27 @@ class NetAppESeriesProxyDriveFirmwareUpload(NetAppESeriesModule):
                                                                     proxy_specific_task=True)
         args = self.module.params
         self.firmware = args["firmware"]
+        self.max_workers = args["max_workers"]
 
         self.files = None
         self.add_files = []
+        self.update_files = []
         self.remove_files = []
         self.upload_failures = []
+        self.manifest = NetAppESeriesFileManifest(self.url, "files/drive", args["manifest_ttl"], args["refresh_manifest"])
 
     def determine_file_paths(self):
         """Determine all the drive firmware file paths."""
         self.files = {}
         if self.firmware:
-            for path in self.firmware:
-
-                if not os.path.exists(path):
-                    self.module.fail_json(msg="Drive firmware file does not exist! File [%s]" % path)
-                elif os.path.isdir(path):
-                    if not path.endswith("/"):
-                        path = path + "/"
-                    for dir_filename in os.listdir(path):
-                        if ".dlp" in dir_filename:
-                            self.files.update({dir_filename: path + dir_filename})
-                elif ".dlp" in path:
-                    name = os.path.basename(path)
-                    self.files.update({name: path})
-
+            try:
+                self.files = self.manifest.list_files(self.firmware)
+            except (IOError, OSError) as error:
+                self.module.fail_json(msg="Drive firmware file does not exist! File [%s]" % error.filename)
         self.module.warn("%s" % self.files)
 
     def determine_changes(self):
-        """Determine whether drive firmware files should be uploaded to the proxy."""
+        """Determine whether drive firmware files should be uploaded to the proxy, uploaded again because their content changed, or removed."""
         try:
             rc, results = self.request("files/drive")
             current_files = [result["fileName"] for result in results]
@@ -100,27 +141,42 @@ class NetAppESeriesProxyDriveFirmwareUpload(NetAppESeriesModule):
             for expected_file in self.files.keys():
                 if expected_file not in current_files:
                     self.add_files.append(expected_file)
+                elif self.manifest.is_changed(expected_file, self.files[expected_file]):
+                    self.add_files.append(expected_file)
+                    self.update_files.append(expected_file)
+
         except Exception as error:
             self.module.fail_json(msg="Failed to retrieve proxy drive firmware file list. Error [%s]" % error)
 
+    def get_upload_bytes(self):
+        """Determine the number of bytes required to upload the added files."""
+        return sum(self.manifest.get_digest(self.files[filename])["size"] for filename in self.add_files)
+
+    def upload_file(self, filename):
+        """Add a drive firmware file to the proxy and record its digest."""
+        digest = self.manifest.get_digest(self.files[filename])
+        firmware_name = os.path.basename(filename)
+        files = [("file", firmware_name, self.files[filename])]
+        headers, data = create_multipart_formdata(files, log=self.module.log)
+        rc, response = self.request("/files/drive", method="POST", headers=headers, data=data)
+        self.manifest.set_uploaded_digest(filename, digest)
+
     def upload_files(self):
         """Add drive firmware file to the proxy."""
-        for filename in self.add_files:
-            firmware_name = os.path.basename(filename)
-            files = [("file", firmware_name, self.files[filename])]
-            headers, data = create_multipart_formdata(files)
-            try:
-                rc, response = self.request("/files/drive", method="POST", headers=headers, data=data)
-            except Exception as error:
+        for filename, result, error in run_concurrently(self.upload_file, self.add_files, self.max_workers):
+            if error:
                 self.upload_failures.append(filename)
-                self.module.warn("Failed to upload drive firmware file. File [%s]." % firmware_name)
+                self.module.warn("Failed to upload drive firmware file. File [%s]." % os.path.basename(filename))
+
+    def delete_file(self, filename):
+        """Remove a drive firmware file from the proxy and forget its digest."""
+        rc, response = self.request("files/drive/%s" % filename, method="DELETE")
+        self.manifest.set_uploaded_digest(filename, None)
 
     def delete_files(self):
         """Remove drive firmware file to the proxy."""
-        for filename in self.remove_files:
-            try:
-                rc, response = self.request("files/drive/%s" % filename, method="DELETE")
-            except Exception as error:
+        for filename, result, error in run_concurrently(self.delete_file, self.remove_files, self.max_workers):
+            if error:
                 self.upload_failures.append(filename)
                 self.module.warn("Failed to delete drive firmware file. File [%s]" % filename)
 
@@ -135,12 +191,14 @@ class NetAppESeriesProxyDriveFirmwareUpload(NetAppESeriesModule):
 
         if self.add_files or self.remove_files:
             change_required = True
+        upload_bytes = self.get_upload_bytes()
 
         if change_required and not self.module.check_mode:
             self.upload_files()
             self.delete_files()
 
-        self.module.exit_json(changed=change_required, files_added=self.add_files, files_removed=self.remove_files)
+        self.module.exit_json(changed=change_required, files_added=self.add_files, files_updated=self.update_files, files_removed=self.remove_files,
+                              upload_bytes=upload_bytes)
 
 
 def main():
@@ -22,9 +22,33 @@ options:
         description:
             - List of paths and/or directories containing firmware/NVSRAM files.
             - All firmware/NVSRAM files that are not specified will be removed from the proxy if they exist.
+            - Files are compared with the proxy's files by content as well as by name. A local manifest of file digests records
+              the content of every uploaded file so that a file whose content changed is uploaded again. Files are only hashed
+              again when their size or modification time changes.
         type: list
         elements: str
         required: false
+    max_workers:
+        description:
+            - Maximum number of files uploaded or removed concurrently.
+        type: int
+        default: 4
+        required: false
+    manifest_ttl:
+        description:
+            - Number of seconds that directory listings, file digests and the digests of uploaded files are recorded in the local file manifest.
+            - The manifest is kept in a directory of the system temporary directory that only the current user can access. Set to 0 to
+              disable the on-disk manifest, in which case files whose content changed are only uploaded again when their name changes.
+        type: int
+        default: 2592000
+        required: false
+    refresh_manifest:
+        description:
+            - Ignore the recorded directory listings and file digests and determine them again.
+            - The digests of files uploaded to the proxy are kept.
+        type: bool
+        default: false
+        required: false
 """
 EXAMPLES = """
 - name: Ensure proxy has the expected firmware versions.
@@ -44,15 +68,37 @@ msg:
     type: str
     returned: always
     sample:
+files_added:
+    description: Files uploaded to the proxy, including files whose content changed.
+    type: list
+    returned: always
+    sample: ["firmware.dlp"]
+files_updated:
+    description: Files uploaded again because their content changed.
+    type: list
+    returned: always
+    sample: ["firmware.dlp"]
+files_removed:
+    description: Files removed from the proxy.
+    type: list
+    returned: always
+    sample: ["old_firmware.dlp"]
+upload_bytes:
+    description: Number of bytes uploaded, or that would be uploaded in check mode.
+    type: int
+    returned: always
+    sample: 1073741824
 """
-import os
-
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule, create_multipart_formdata
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import (
+    NetAppESeriesModule, NetAppESeriesFileManifest, create_multipart_formdata, eseries_max_workers_argument_spec, run_concurrently)
 
 
 class NetAppESeriesProxyFirmwareUpload(NetAppESeriesModule):
     def __init__(self):
-        ansible_options = dict(firmware=dict(type="list", elements="str", required=False))
+        ansible_options = dict(firmware=dict(type="list", elements="str", required=False),
+                               manifest_ttl=dict(type="int", default=NetAppESeriesFileManifest.TTL_SEC),
+                               refresh_manifest=dict(type="bool", default=False))
+        ansible_options.update(eseries_max_workers_argument_spec(default=4))
         super(NetAppESeriesProxyFirmwareUpload, self).__init__(ansible_options=ansible_options,
                                                                web_services_version="02.00.0000.0000",
                                                                supports_check_mode=True,
@@ -60,32 +106,25 @@ class NetAppESeriesProxyFirmwareUpload(NetAppESeriesModule):
 
         args = self.module.params
         self.firmware = args["firmware"]
+        self.max_workers = args["max_workers"]
         self.files = None
         self.add_files = []
+        self.update_files = []
         self.remove_files = []
         self.upload_failures = []
+        self.manifest = NetAppESeriesFileManifest(self.url, "firmware/cfw-files", args["manifest_ttl"], args["refresh_manifest"])
 
     def determine_file_paths(self):
         """Determine all the drive firmware file paths."""
         self.files = {}
         if self.firmware:
-            for firmware_path in self.firmware:
-
-                if not os.path.exists(firmware_path):
-                    self.module.fail_json(msg="Drive firmware file does not exist! File [%s]" % firmware_path)
-                elif os.path.isdir(firmware_path):
-                    if not firmware_path.endswith("/"):
-                        firmware_path = firmware_path + "/"
-
-                    for dir_filename in os.listdir(firmware_path):
-                        if ".dlp" in dir_filename:
-                            self.files.update({dir_filename: firmware_path + dir_filename})
-                elif ".dlp" in firmware_path:
-                    name = os.path.basename(firmware_path)
-                    self.files.update({name: firmware_path})
+            try:
+                self.files = self.manifest.list_files(self.firmware)
+            except (IOError, OSError) as error:
+                self.module.fail_json(msg="Drive firmware file does not exist! File [%s]" % error.filename)
 
     def determine_changes(self):
-        """Determine whether files need to be added or removed."""
+        """Determine whether files need to be added, uploaded again because their content changed, or removed."""
         try:
             rc, results = self.request("firmware/cfw-files")
             current_files = [result["filename"] for result in results]
@@ -97,27 +136,41 @@ class NetAppESeriesProxyFirmwareUpload(NetAppESeriesModule):
             for expected_file in self.files.keys():
                 if expected_file not in current_files:
                     self.add_files.append(expected_file)
+                elif self.manifest.is_changed(expected_file, self.files[expected_file]):
+                    self.add_files.append(expected_file)
+                    self.update_files.append(expected_file)
         except Exception as error:
             self.module.fail_json(msg="Failed to retrieve current firmware file listing.")
 
+    def get_upload_bytes(self):
+        """Determine the number of bytes required to upload the added files."""
+        return sum(self.manifest.get_digest(self.files[filename])["size"] for filename in self.add_files)
+
+    def upload_file(self, filename):
+        """Upload a firmware or nvsram file and record its digest."""
+        digest = self.manifest.get_digest(self.files[filename])
+        fields = [("validate", "true")]
+        files = [("firmwareFile", filename, self.files[filename])]
+        headers, data = create_multipart_formdata(files=files, fields=fields, log=self.module.log)
+        rc, response = self.request("firmware/upload/", method="POST", data=data, headers=headers)
+        self.manifest.set_uploaded_digest(filename, digest)
+
     def upload_files(self):
         """Upload firmware and nvsram file."""
-        for filename in self.add_files:
-            fields = [("validate", "true")]
-            files = [("firmwareFile", filename, self.files[filename])]
-            headers, data = create_multipart_formdata(files=files, fields=fields)
-            try:
-                rc, response = self.request("firmware/upload/", method="POST", data=data, headers=headers)
-            except Exception as error:
+        for filename, result, error in run_concurrently(self.upload_file, self.add_files, self.max_workers):
+            if error:
                 self.upload_failures.append(filename)
                 self.module.warn("Failed to upload firmware file. File [%s]" % filename)
 
+    def delete_file(self, filename):
+        """Remove a firmware or nvsram file and forget its digest."""
+        rc, response = self.request("firmware/upload/%s" % filename, method="DELETE")
+        self.manifest.set_uploaded_digest(filename, None)
+
     def delete_files(self):
         """Remove firmware and nvsram file."""
-        for filename in self.remove_files:
-            try:
-                rc, response = self.request("firmware/upload/%s" % filename, method="DELETE")
-            except Exception as error:
+        for filename, result, error in run_concurrently(self.delete_file, self.remove_files, self.max_workers):
+            if error:
                 self.upload_failures.append(filename)
                 self.module.warn("Failed to delete firmware file. File [%s]" % filename)
 
@@ -131,6 +184,7 @@ class NetAppESeriesProxyFirmwareUpload(NetAppESeriesModule):
         self.determine_changes()
         if self.add_files or self.remove_files:
             change_required = True
+        upload_bytes = self.get_upload_bytes()
 
         if change_required and not self.module.check_mode:
             self.upload_files()
@@ -139,7 +193,8 @@ class NetAppESeriesProxyFirmwareUpload(NetAppESeriesModule):
         if self.upload_failures:
             self.module.fail_json(msg="Some file failed to be uploaded! changed=%s, Files_added [%s]. Files_removed [%s]. Upload_failures [%s]"
                                       % (change_required, self.add_files, self.remove_files, self.upload_failures))
-        self.module.exit_json(changed=change_required, files_added=self.add_files, files_removed=self.remove_files)
+        self.module.exit_json(changed=change_required, files_added=self.add_files, files_updated=self.update_files, files_removed=self.remove_files,
+                              upload_bytes=upload_bytes)
 
 
 def main():
@@ -94,6 +94,13 @@ options:
         type: bool
         required: false
         default: true
+    max_workers:
+        description:
+            - Maximum number of storage systems evaluated, added, updated or removed concurrently.
+            - Limits the number of simultaneous requests made to SANtricity Web Services Proxy.
+        type: int
+        required: false
+        default: 8
 """
 
 EXAMPLES = """
@@ -154,13 +161,26 @@ msg:
     type: str
     returned: always
     sample: "Storage systems [system1, system2, 1144FG123018, 721716500123, 123540006043, 112123001239] were added."
+systems:
+    description: Result of each storage system added, updated or removed.
+    type: list
+    elements: dict
+    returned: always
+    sample: [{"ssid": "system1", "action": "add", "succeeded": true, "elapsed": 4.2},
+             {"ssid": "system2", "action": "update", "succeeded": false, "elapsed": 0.3}]
+timing:
+    description: Seconds spent in each phase of the module run.
+    type: dict
+    returned: always
+    sample: {"discover": 31.2, "inventory": 0.4, "evaluate": 0.1, "remove": 0.0, "add": 12.6, "update": 1.1}
 """
 import json
-import threading
 
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import (
+    NetAppESeriesModule, eseries_max_workers_argument_spec, run_concurrently)
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity_operations import get_poll_interval
 from ansible.module_utils._text import to_native
-from time import sleep
+from time import sleep, time
 
 try:
     import ipaddress
@@ -175,6 +195,8 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
     DEFAULT_GRAPH_DISCOVERY_TIMEOUT = 30
     DEFAULT_PASSWORD_STATE_TIMEOUT = 30
     DEFAULT_DISCOVERY_TIMEOUT_SEC = 300
+    PASSWORD_VALIDATION_RETRIES = 5
+    PASSWORD_VALIDATION_MAXIMUM_INTERVAL_SEC = 16
 
     def __init__(self):
         ansible_options = dict(add_discovered_systems=dict(type="bool", required=False, default=False),
@@ -183,6 +205,7 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
                                tags=dict(type="dict", required=False),
                                accept_certificate=dict(type="bool", required=False, default=True),
                                systems=dict(type="list", elements="dict", required=False, default=[]))
+        ansible_options.update(eseries_max_workers_argument_spec())
 
         super(NetAppESeriesProxySystems, self).__init__(ansible_options=ansible_options,
                                                         web_services_version="04.10.0000.0000",
@@ -193,6 +216,7 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
         self.subnet_mask = args["subnet_mask"]
         self.accept_certificate = args["accept_certificate"]
         self.default_password = args["password"]
+        self.max_workers = args["max_workers"]
 
         self.default_meta_tags = []
         if "tags" in args and args["tags"]:
@@ -207,6 +231,8 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
         self.systems_to_remove = []
         self.systems_to_update = []
         self.systems_to_add = []
+        self.results = []
+        self.timing = {}
 
         self.serial_numbers = []
         self.systems = []
@@ -435,11 +461,13 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
             if system["accept_certificate"] and not all(controller["certificateStatus"] == "trusted" for controller in system["current_info"]["controllers"]):
                 system["changes"].update({"acceptCertificate": True})
 
-        if system["id"] not in self.undiscovered_systems and system["changes"]:
-            self.systems_to_update.append(system)
+        return bool(system["ssid"] not in self.undiscovered_systems and system["changes"])
 
     def add_system(self, system):
-        """Add basic storage system definition to the web services proxy."""
+        """Add basic storage system definition to the web services proxy.
+
+        :return bool: whether the storage system was added.
+        """
         self.set_password(system)
 
         body = {"id": system["ssid"],
@@ -454,11 +482,13 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
             rc, storage_system = self.request("storage-systems", method="POST", data=body)
         except Exception as error:
             self.module.warn("Failed to add storage system. Array [%s]. Error [%s]" % (system["ssid"], to_native(error)))
-            return  # Skip the password validation.
+            return False  # Skip the password validation.
 
-        # Ensure the password is validated
-        for retries in range(5):
-            sleep(1)
+        # Ensure the password is validated, backing off exponentially while the proxy establishes its connection.
+        interval = None
+        for retries in range(self.PASSWORD_VALIDATION_RETRIES):
+            interval = get_poll_interval(interval, minimum=1, maximum=self.PASSWORD_VALIDATION_MAXIMUM_INTERVAL_SEC)
+            sleep(interval)
             try:
                 rc, storage_system = self.request("storage-systems/%s/validatePassword" % system["ssid"], method="POST")
                 break
@@ -466,20 +496,61 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
                 continue
         else:
             self.module.warn("Failed to validate password status. Array [%s]. Error [%s]" % (system["ssid"], to_native(error)))
+        return True
 
     def update_system(self, system):
-        """Update storage system configuration."""
+        """Update storage system configuration.
+
+        :return bool: whether the storage system was updated.
+        """
         try:
             rc, storage_system = self.request("storage-systems/%s" % system["ssid"], method="POST", data=system["changes"])
         except Exception as error:
             self.module.warn("Failed to update storage system. Array [%s]. Error [%s]" % (system["ssid"], to_native(error)))
+            return False
+        return True
 
     def remove_system(self, ssid):
-        """Remove storage system."""
+        """Remove storage system.
+
+        :return bool: whether the storage system was removed.
+        """
         try:
             rc, storage_system = self.request("storage-systems/%s" % ssid, method="DELETE")
         except Exception as error:
             self.module.warn("Failed to remove storage system. Array [%s]. Error [%s]." % (ssid, to_native(error)))
+            return False
+        return True
+
+    def run_phase(self, phase, func, items):
+        """Apply func to each item using no more than max_workers concurrent requests and record the phase duration.
+
+        :return list: (item, result, error) tuples in the order the items were given.
+        """
+        start = time()
+        results = run_concurrently(func, items, self.max_workers)
+        self.timing[phase] = round(self.timing.get(phase, 0) + time() - start, 1)
+        return results
+
+    def apply_systems(self, action, func, systems):
+        """Add, update or remove storage systems and record each storage system's result.
+
+        :return list: identifiers of the storage systems acted upon.
+        """
+        def timed(system):
+            start = time()
+            succeeded = func(system)
+            return succeeded, round(time() - start, 1)
+
+        ssids = []
+        for system, result, error in self.run_phase(action, timed, systems):
+            ssid = system if action == "remove" else system["ssid"]
+            succeeded, elapsed = result if error is None else (False, 0)
+            if error:
+                self.module.warn("Failed to %s storage system. Array [%s]. Error [%s]." % (action, ssid, to_native(error)))
+            self.results.append(dict(ssid=ssid, action=action, succeeded=bool(succeeded), elapsed=elapsed))
+            ssids.append(ssid)
+        return ssids
 
     def apply(self):
         """Determine whether changes are required and, if necessary, apply them."""
@@ -495,20 +566,25 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
 
         if self.add_discovered_systems or self.systems:
             if self.subnet_mask:
+                start = time()
                 self.discover_array()
+                self.timing["discover"] = round(time() - start, 1)
+
+            start = time()
             self.update_storage_systems_info()
+            self.timing["inventory"] = round(time() - start, 1)
 
             # Determine whether the storage system requires updating
-            thread_pool = []
-            for system in self.systems:
-                if not system["failed"]:
-                    thread = threading.Thread(target=self.update_system_changes, args=(system,))
-                    thread_pool.append(thread)
-                    thread.start()
-            for thread in thread_pool:
-                thread.join()
+            for system, update_required, error in self.run_phase("evaluate", self.update_system_changes,
+                                                                 [system for system in self.systems if not system["failed"]]):
+                if error:
+                    self.module.warn("Failed to determine storage system changes. Array [%s]. Error [%s]." % (system["ssid"], to_native(error)))
+                elif update_required:
+                    self.systems_to_update.append(system)
         else:
+            start = time()
             self.update_storage_systems_info()
+            self.timing["inventory"] = round(time() - start, 1)
 
         changes_required = False
         if self.systems_to_add or self.systems_to_update or self.systems_to_remove:
@@ -521,60 +597,36 @@ class NetAppESeriesProxySystems(NetAppESeriesModule):
 
             # Remove storage systems
             if self.systems_to_remove:
-                ssids = []
-                thread_pool = []
-                for ssid in self.systems_to_remove:
-                    thread = threading.Thread(target=self.remove_system, args=(ssid,))
-                    thread_pool.append(thread)
-                    thread.start()
-                    ssids.append(ssid)
-                for thread in thread_pool:
-                    thread.join()
+                ssids = self.apply_systems("remove", self.remove_system, self.systems_to_remove)
                 if ssids:
                     remove_msg = "system%s removed: %s" % ("s" if len(ssids) > 1 else "", ", ".join(ssids))
 
-            thread_pool = []
-
             # Add storage systems
             if self.systems_to_add:
-                ssids = []
-                for system in self.systems_to_add:
-                    if not system["failed"]:
-                        thread = threading.Thread(target=self.add_system, args=(system,))
-                        thread_pool.append(thread)
-                        thread.start()
-                        ssids.append(system["ssid"])
+                ssids = self.apply_systems("add", self.add_system, [system for system in self.systems_to_add if not system["failed"]])
                 if ssids:
                     add_msg = "system%s added: %s" % ("s" if len(ssids) > 1 else "", ", ".join(ssids))
 
             # Update storage systems
             if self.systems_to_update:
-                ssids = []
-                for system in self.systems_to_update:
-                    if not system["failed"]:
-                        thread = threading.Thread(target=self.update_system, args=(system,))
-                        thread_pool.append(thread)
-                        thread.start()
-                        ssids.append(system["ssid"])
+                ssids = self.apply_systems("update", self.update_system, [system for system in self.systems_to_update if not system["failed"]])
                 if ssids:
                     update_msg = "system%s updated: %s" % ("s" if len(ssids) > 1 else "", ", ".join(ssids))
 
-            # Wait for storage systems to be added or updated
-            for thread in thread_pool:
-                thread.join()
-
             # Report module actions
             if self.undiscovered_systems:
                 undiscovered_msg = "system%s undiscovered: %s" % ("s " if len(self.undiscovered_systems) > 1 else "", ", ".join(self.undiscovered_systems))
-                self.module.fail_json(msg=(", ".join([msg for msg in [add_msg, update_msg, remove_msg, undiscovered_msg] if msg])), changed=changes_required)
+                self.module.fail_json(msg=(", ".join([msg for msg in [add_msg, update_msg, remove_msg, undiscovered_msg] if msg])), changed=changes_required,
+                                      systems=self.results, timing=self.timing)
 
-            self.module.exit_json(msg=", ".join([msg for msg in [add_msg, update_msg, remove_msg] if msg]), changed=changes_required)
+            self.module.exit_json(msg=", ".join([msg for msg in [add_msg, update_msg, remove_msg] if msg]), changed=changes_required,
+                                  systems=self.results, timing=self.timing)
 
         # Report no changes
         if self.undiscovered_systems:
             self.module.fail_json(msg="No changes were made; however the following system(s) failed to be discovered: %s."
-                                      % self.undiscovered_systems, changed=changes_required)
-        self.module.exit_json(msg="No changes were made.", changed=changes_required)
+                                      % self.undiscovered_systems, changed=changes_required, systems=self.results, timing=self.timing)
+        self.module.exit_json(msg="No changes were made.", changed=changes_required, systems=self.results, timing=self.timing)
 
 
 def main():
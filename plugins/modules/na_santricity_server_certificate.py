@@ -103,18 +103,16 @@ removed_certificates:
     sample: ['removed_certificiate.crt']
 """
 
-import binascii
 import random
 import re
 
 from ansible.module_utils import six
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule, load_certificate_file
 from ansible.module_utils._text import to_native
 from time import sleep
 
 try:
     import cryptography
-    from cryptography import x509
     from cryptography.hazmat.primitives import serialization
     from cryptography.hazmat.backends import default_backend
 except ImportError:
@@ -228,106 +226,57 @@ class NetAppESeriesServerCertificate(NetAppESeriesModule):
 
     def certificate_info_from_file(self, path):
         """Determine the certificate info from the provided filepath."""
-        certificates_info = {}
         try:
-            # Treat file as PEM encoded file.
-            with open(path, "r") as fh:
-                line = fh.readline()
-                while line != "":
-
-                    # Add public certificates to bundle_info.
-                    if re.search("^-+BEGIN CERTIFICATE-+$", line):
-                        certificate = line
-                        line = fh.readline()
-                        while not re.search("^-+END CERTIFICATE-+$", line):
-                            if line == "":
-                                self.module.fail_json(msg="Invalid certificate! Path [%s]. Array [%s]." % (path, self.ssid))
-                            certificate += line
-                            line = fh.readline()
-                        certificate += line
-                        if not six.PY2:
-                            certificate = six.b(certificate)
-                        info = x509.load_pem_x509_certificate(certificate, default_backend())
-                        certificates_info.update(self.certificate_info(info, certificate, path))
-
-                    # Add private key to self.private_key.
-                    elif re.search("^-+BEGIN.*PRIVATE KEY-+$", line):
-                        pkcs8 = "BEGIN PRIVATE KEY" in line
-                        pkcs8_encrypted = "BEGIN ENCRYPTED PRIVATE KEY" in line
-                        key = line
-                        line = fh.readline()
-                        while not re.search("^-+END.*PRIVATE KEY-+$", line):
-                            if line == "":
-                                self.module.fail_json(msg="Invalid certificate! Array [%s]." % self.ssid)
-                            key += line
-                            line = fh.readline()
-                        key += line
-                        if not six.PY2:
-                            key = six.b(key)
-                            if self.passphrase:
-                                self.passphrase = six.b(self.passphrase)
-
-                        # Check for PKCS8 PEM encoding.
-                        if pkcs8 or pkcs8_encrypted:
-                            try:
-                                if pkcs8:
-                                    crypto_key = serialization.load_pem_private_key(key, password=None, backend=default_backend())
-                                else:
-                                    crypto_key = serialization.load_pem_private_key(key, password=self.passphrase, backend=default_backend())
-                            except ValueError as error:
-                                self.module.fail_json(msg="Failed to load%sPKCS8 encoded private key. %s"
-                                                          " Error [%s]." % (" encrypted " if pkcs8_encrypted else " ",
-                                                                            "Check passphrase." if pkcs8_encrypted else "", error))
-
-                            key = crypto_key.private_bytes(encoding=serialization.Encoding.PEM,
-                                                           format=serialization.PrivateFormat.TraditionalOpenSSL,
-                                                           encryption_algorithm=serialization.NoEncryption())
-
-                        # Check whether multiple private keys have been provided and fail if different
-                        if "private_key" in certificates_info.keys() and certificates_info["private_key"] != key:
-                            self.module.fail_json(msg="Multiple private keys have been provided! Array [%s]" % self.ssid)
-                        else:
-                            certificates_info.update({"private_key": key})
-
-                    line = fh.readline()
-
-            # Throw exception when no PEM certificates have been discovered.
-            if len(certificates_info) == 0:
-                raise Exception("Failed to discover a valid PEM encoded certificate or private key!")
-
+            loaded = load_certificate_file(path)
         except Exception as error:
-            # Treat file as DER encoded certificate
-            try:
-                with open(path, "rb") as fh:
-                    cert_info = x509.load_der_x509_certificate(fh.read(), default_backend())
-                    cert_data = cert_info.public_bytes(serialization.Encoding.PEM)
-                    certificates_info.update(self.certificate_info(cert_info, cert_data, path))
-
-                # Throw exception when no DER encoded certificates have been discovered.
-                if len(certificates_info) == 0:
-                    raise Exception("Failed to discover a valid DER encoded certificate!")
-            except Exception as error:
+            self.module.fail_json(msg="Invalid file type! File is neither PEM or DER encoded certificate/private key."
+                                      " Path [%s]. Array [%s]. Error [%s]." % (path, self.ssid, to_native(error)))
 
-                # Treat file as DER encoded private key
+        certificates_info = {}
+        for info in loaded["certificates"]:
+            certificates_info.update(self.certificate_info(info, six.b(info["certificate"]), path))
+
+        for block_type, key in loaded["private_keys"]:
+            pkcs8 = block_type == "PRIVATE KEY"
+            pkcs8_encrypted = block_type == "ENCRYPTED PRIVATE KEY"
+            passphrase = six.b(self.passphrase) if self.passphrase and not six.PY2 else self.passphrase
+
+            # Check for PKCS8 PEM or DER encoding.
+            if pkcs8 or pkcs8_encrypted or block_type is None:
                 try:
-                    with open(path, "rb") as fh:
-                        crypto_key = serialization.load_der_public_key(fh.read(), backend=default_backend())
-                        key = crypto_key.private_bytes(encoding=serialization.Encoding.PEM,
-                                                       format=serialization.PrivateFormat.TraditionalOpenSSL,
-                                                       encryption_algorithm=serialization.NoEncryption())
-                        certificates_info.update({"private_key": key})
-                except Exception as error:
-                    self.module.fail_json(msg="Invalid file type! File is neither PEM or DER encoded certificate/private key."
-                                              " Path [%s]. Array [%s]. Error [%s]." % (path, self.ssid, to_native(error)))
+                    if block_type is None:
+                        crypto_key = serialization.load_der_private_key(key, password=None, backend=default_backend())
+                    elif pkcs8:
+                        crypto_key = serialization.load_pem_private_key(key, password=None, backend=default_backend())
+                    else:
+                        crypto_key = serialization.load_pem_private_key(key, password=passphrase, backend=default_backend())
+                except ValueError as error:
+                    self.module.fail_json(msg="Failed to load%sPKCS8 encoded private key. %s"
+                                              " Error [%s]." % (" encrypted " if pkcs8_encrypted else " ",
+                                                                "Check passphrase." if pkcs8_encrypted else "", error))
+
+                key = crypto_key.private_bytes(encoding=serialization.Encoding.PEM,
+                                               format=serialization.PrivateFormat.TraditionalOpenSSL,
+                                               encryption_algorithm=serialization.NoEncryption())
+
+            # Check whether multiple private keys have been provided and fail if different
+            if "private_key" in certificates_info.keys() and certificates_info["private_key"] != key:
+                self.module.fail_json(msg="Multiple private keys have been provided! Array [%s]" % self.ssid)
+            else:
+                certificates_info.update({"private_key": key})
 
         return certificates_info
 
     def certificate_info(self, info, data, path):
-        """Load x509 certificate that is either encoded DER or PEM encoding and return the certificate fingerprint."""
-        fingerprint = binascii.hexlify(info.fingerprint(info.signature_hash_algorithm)).decode("utf-8")
-        return {self.sanitize_distinguished_name(info.subject.rfc4514_string()): {"alias": fingerprint, "fingerprint": fingerprint,
-                                                                                  "certificate": data, "path": path,
-                                                                                  "issuer": self.sanitize_distinguished_name(info.issuer.rfc4514_string())}}
+        """Return the certificate information keyed by its sanitized subject distinguished name.
+
+        :param dict info: certificate information from load_certificate_file().
+        :param bytes data: PEM encoded certificate.
+        :param str path: certificate file path.
+        """
+        return {self.sanitize_distinguished_name(info["subject"]): {"alias": info["fingerprint"], "fingerprint": info["fingerprint"],
+                                                                    "certificate": data, "path": path,
+                                                                    "issuer": self.sanitize_distinguished_name(info["issuer"])}}
 
     def get_current_certificates(self):
         """Determine the server certificates that exist on the storage system."""
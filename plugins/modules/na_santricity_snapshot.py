@@ -38,19 +38,23 @@ options:
         selection will also be deleted.
       - View indicates a consistency group snapshot volume of particular point-in-time image(s); snapshot volumes will be created for each base volume member.
       - Views are created from images from a single point-in-time so once created they cannot be modified.
+      - Metadata indicates the point-in-time image metadata kept in the key-value store; when I(state==absent) every entry that no longer matches
+        a point-in-time image or that cannot be parsed is removed. Limited to the consistency group I(group_name) when it is specified.
     type: str
     default: group
     choices:
       - group
       - pit
       - view
+      - metadata
     required: false
   group_name:
     description:
       - Name of the snapshot consistency group or snapshot volume.
       - Be sure to use different names for snapshot consistency groups and snapshot volumes to avoid name conflicts.
+      - Required unless I(groups) is specified or I(type==metadata).
     type: str
-    required: true
+    required: false
   volumes:
     description:
       - Details for each consistency group base volume for defining reserve capacity, preferred reserve capacity storage pool, and snapshot volume options.
@@ -201,10 +205,142 @@ options:
     type: bool
     default: false
     required: false
+  prefetch_consistency_groups:
+    description:
+      - Retrieve every snapshot consistency group with its member volumes at once instead of only the group named by I(group_name).
+      - Member volumes are retrieved concurrently. Use with I(cache_ttl) when looping over many consistency groups so that each
+        iteration reuses the same retrieval.
+    type: bool
+    default: false
+    required: false
+  max_workers:
+    description:
+      - Maximum number of concurrent requests used to retrieve consistency group member volumes when I(prefetch_consistency_groups=true).
+      - Also bounds the concurrent point-in-time image metadata updates, snapshot volume mapping changes, read/write conversions and I(groups)
+        entries that are applied together.
+      - Point-in-time images of a consistency group are always removed one at a time, oldest first.
+    type: int
+    default: 8
+    required: false
+  cache_ttl:
+    description:
+      - Number of seconds that prefetched consistency groups are cached on disk for the same storage system when I(prefetch_consistency_groups=true).
+      - Consistency groups changed by this module are retrieved again on the next run. Changes made outside of this module are not seen until
+        the cache expires or I(refresh_cache=true).
+      - The cache is kept in a directory of the system temporary directory that only the current user can access. Set to 0 to disable the cache.
+    type: int
+    default: 0
+    required: false
+  refresh_cache:
+    description:
+      - Ignore any cached consistency groups and retrieve them again.
+      - The cache is updated with the results when I(cache_ttl) is greater than 0.
+    type: bool
+    default: false
+    required: false
+  cleanup_metadata:
+    description:
+      - Whether to remove point-in-time image metadata that no longer matches a point-in-time image each time this module is executed.
+      - When disabled, use I(type==metadata) and I(state==absent) to remove the unused metadata periodically instead.
+    type: bool
+    default: true
+    required: false
+  groups:
+    description:
+      - List of snapshot consistency group, point-in-time image, view or rollback definitions to apply in a single task.
+      - Volumes, hosts, reserve capacity volumes and consistency groups are retrieved once and shared by every entry.
+      - Each entry inherits any option it does not specify from the corresponding module option.
+      - Entries are applied in order; consecutive entries that create point-in-time images (I(state=present) and I(type=pit)) are taken
+        concurrently, up to I(max_workers) at a time, so that their images are taken as close together as possible.
+      - The result for each entry is returned in I(groups) and a failure for one entry does not prevent the others from being applied.
+      - Mutually exclusive with I(group_name).
+    type: list
+    elements: dict
+    required: false
+    suboptions:
+      group_name:
+        description:
+          - See I(group_name).
+        type: str
+        required: true
+      state:
+        description:
+          - See I(state).
+        type: str
+        choices: ["absent", "present", "rollback"]
+      type:
+        description:
+          - See I(type).
+        type: str
+        choices: ["group", "pit", "view"]
+      volumes:
+        description:
+          - See I(volumes).
+        type: list
+        elements: dict
+      maximum_snapshots:
+        description:
+          - See I(maximum_snapshots).
+        type: int
+      reserve_capacity_pct:
+        description:
+          - See I(reserve_capacity_pct).
+        type: int
+      preferred_reserve_storage_pool:
+        description:
+          - See I(preferred_reserve_storage_pool).
+        type: str
+      alert_threshold_pct:
+        description:
+          - See I(alert_threshold_pct).
+        type: int
+      reserve_capacity_full_policy:
+        description:
+          - See I(reserve_capacity_full_policy).
+        type: str
+        choices: ["purge", "reject"]
+      rollback_priority:
+        description:
+          - See I(rollback_priority).
+        type: str
+        choices: ["highest", "high", "medium", "low", "lowest"]
+      rollback_backup:
+        description:
+          - See I(rollback_backup).
+        type: bool
+      pit_name:
+        description:
+          - See I(pit_name).
+        type: str
+      pit_description:
+        description:
+          - See I(pit_description).
+        type: str
+      pit_timestamp:
+        description:
+          - See I(pit_timestamp).
+        type: str
+      view_name:
+        description:
+          - See I(view_name).
+        type: str
+      view_host:
+        description:
+          - See I(view_host).
+        type: str
+      view_writable:
+        description:
+          - See I(view_writable).
+        type: bool
+      view_validate:
+        description:
+          - See I(view_validate).
+        type: bool
 notes:
   - Key-value pairs are used to keep track of snapshot names and descriptions since the snapshot point-in-time images do have metadata associated with their
     data structures; therefore, it is necessary to clean out old keys that are no longer associated with an actual image. This cleaning action is performed each
-    time this module is executed.
+    time this module is executed unless I(cleanup_metadata=false).
+  - Point-in-time image metadata keys have the form ansible|<group_name>|<pit_name> and the value <timestamp>|<pit_name>|<pit_description>.
 """
 EXAMPLES = """
 - name: Ensure snapshot consistency group exists.
@@ -307,6 +443,46 @@ EXAMPLES = """
     state: absent
     type: group
     group_name: snapshot_group1
+- name: Ensure snapshot consistency groups exist, reusing one retrieval of all consistency groups.
+  na_santricity_snapshot:
+    ssid: "1"
+    api_url: https://192.168.1.100:8443/devmgr/v2
+    api_username: admin
+    api_password: adminpass
+    state: present
+    type: group
+    group_name: "{{ item }}"
+    volumes:
+      - volume: "{{ item }}_volume"
+    prefetch_consistency_groups: true
+    cache_ttl: 300
+    refresh_cache: "{{ ansible_loop.first }}"
+  loop: [snapshot_group1, snapshot_group2]
+  loop_control:
+    extended: true
+- name: Take point-in-time snapshot images of several consistency groups at the same time.
+  na_santricity_snapshot:
+    ssid: "1"
+    api_url: https://192.168.1.100:8443/devmgr/v2
+    api_username: admin
+    api_password: adminpass
+    state: present
+    type: pit
+    pit_description: nightly backup
+    max_workers: 40
+    groups:
+      - group_name: snapshot_group1
+        pit_name: nightly_group1
+      - group_name: snapshot_group2
+        pit_name: nightly_group2
+- name: Remove point-in-time image metadata that no longer matches a point-in-time image.
+  na_santricity_snapshot:
+    ssid: "1"
+    api_url: https://192.168.1.100:8443/devmgr/v2
+    api_username: admin
+    api_password: adminpass
+    state: absent
+    type: metadata
 """
 RETURN = """
 changed:
@@ -316,32 +492,57 @@ changed:
 group_changes:
   description: All changes performed to the consistency group.
   type: dict
-  returned: always
+  returned: when I(group_name) is specified
 deleted_metadata_keys:
   description: Keys that were purged from the key-value datastore.
   type: list
   returned: always
+groups:
+  description:
+    - Result of each I(groups) entry in order.
+    - I(started) is the number of seconds after the module began applying changes that the entry started and I(elapsed) is the number of
+      seconds the entry took.
+  type: list
+  elements: dict
+  returned: when I(groups) is specified
+  sample: [{"group_name": "snapshot_group1", "type": "pit", "state": "present", "changed": true, "group_changes": {}, "msg": null,
+            "started": 0.412, "elapsed": 1.204, "timings": {}}]
+timings:
+  description:
+    - Number of seconds spent on each point-in-time image removal and snapshot volume mapping or conversion operation.
+    - Included in each I(groups) entry's result when I(groups) is specified.
+  type: dict
+  returned: when I(group_name) is specified
+  sample: {"remove_pit_images": 12.504, "map_view": 1.021}
+elapsed:
+  description: Number of seconds taken to apply every I(groups) entry.
+  type: float
+  returned: when I(groups) is specified
 """
 from datetime import datetime
 import re
+import time
 from time import sleep
 
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import (
+    NetAppESeriesModule, NetAppESeriesModuleError, eseries_max_workers_argument_spec, run_concurrently, snapshot_cache)
 
 
 class NetAppESeriesSnapshot(NetAppESeriesModule):
+    PIT_METADATA_PREFIX = "ansible|"
+
     def __init__(self):
+        volume_options = dict(volume=dict(type="str", required=True),
+                              reserve_capacity_pct=dict(type="int", default=40, required=False),
+                              preferred_reserve_storage_pool=dict(type="str", required=False),
+                              snapshot_volume_writable=dict(type="bool", default=True, required=False),
+                              snapshot_volume_validate=dict(type="bool", default=False, required=False),
+                              snapshot_volume_host=dict(type="str", default=None, required=False),
+                              snapshot_volume_lun=dict(type="int", default=None, required=False))
         ansible_options = dict(state=dict(type="str", default="present", choices=["absent", "present", "rollback"], required=False),
-                               type=dict(type="str", default="group", choices=["group", "pit", "view"], required=False),
-                               group_name=dict(type="str", required=True),
-                               volumes=dict(type="list", elements="dict", required=False,
-                                            options=dict(volume=dict(type="str", required=True),
-                                                         reserve_capacity_pct=dict(type="int", default=40, required=False),
-                                                         preferred_reserve_storage_pool=dict(type="str", required=False),
-                                                         snapshot_volume_writable=dict(type="bool", default=True, required=False),
-                                                         snapshot_volume_validate=dict(type="bool", default=False, required=False),
-                                                         snapshot_volume_host=dict(type="str", default=None, required=False),
-                                                         snapshot_volume_lun=dict(type="int", default=None, required=False))),
+                               type=dict(type="str", default="group", choices=["group", "pit", "view", "metadata"], required=False),
+                               group_name=dict(type="str", required=False),
+                               volumes=dict(type="list", elements="dict", required=False, options=volume_options),
                                maximum_snapshots=dict(type="int", default=32, required=False),
                                reserve_capacity_pct=dict(type="int", default=40, required=False),
                                preferred_reserve_storage_pool=dict(type="str", required=False),
@@ -355,12 +556,79 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
                                view_name=dict(type="str", required=False),
                                view_host=dict(type="str", default=None, required=False),
                                view_writable=dict(type="bool", default=True, required=False),
-                               view_validate=dict(type="bool", default=False, required=False))
+                               view_validate=dict(type="bool", default=False, required=False),
+                               prefetch_consistency_groups=dict(type="bool", default=False, required=False),
+                               cache_ttl=dict(type="int", default=0, required=False),
+                               refresh_cache=dict(type="bool", default=False, required=False),
+                               cleanup_metadata=dict(type="bool", default=True, required=False),
+                               groups=dict(type="list", elements="dict", required=False,
+                                           options=dict(group_name=dict(type="str", required=True),
+                                                        state=dict(type="str", choices=["absent", "present", "rollback"], required=False),
+                                                        type=dict(type="str", choices=["group", "pit", "view"], required=False),
+                                                        volumes=dict(type="list", elements="dict", required=False, options=volume_options),
+                                                        maximum_snapshots=dict(type="int", required=False),
+                                                        reserve_capacity_pct=dict(type="int", required=False),
+                                                        preferred_reserve_storage_pool=dict(type="str", required=False),
+                                                        alert_threshold_pct=dict(type="int", required=False),
+                                                        reserve_capacity_full_policy=dict(type="str", choices=["purge", "reject"], required=False),
+                                                        rollback_priority=dict(type="str", choices=["highest", "high", "medium", "low", "lowest"],
+                                                                               required=False),
+                                                        rollback_backup=dict(type="bool", required=False),
+                                                        pit_name=dict(type="str", required=False),
+                                                        pit_description=dict(type="str", required=False),
+                                                        pit_timestamp=dict(type="str", required=False),
+                                                        view_name=dict(type="str", required=False),
+                                                        view_host=dict(type="str", required=False),
+                                                        view_writable=dict(type="bool", required=False),
+                                                        view_validate=dict(type="bool", required=False))))
+        ansible_options.update(eseries_max_workers_argument_spec())
+
+        mutually_exclusive = [["group_name", "groups"]]
+        required_if = [["type", object_type, ["group_name", "groups"], True] for object_type in ["group", "pit", "view"]]
 
         super(NetAppESeriesSnapshot, self).__init__(ansible_options=ansible_options,
                                                     web_services_version="05.00.0000.0000",
-                                                    supports_check_mode=True)
+                                                    supports_check_mode=True,
+                                                    mutually_exclusive=mutually_exclusive,
+                                                    required_if=required_if)
         args = self.module.params
+        self.group_entries = args["groups"]
+        self.prefetch_consistency_groups = args["prefetch_consistency_groups"] or self.group_entries is not None
+        self.max_workers = args["max_workers"]
+        self.cache_ttl = args["cache_ttl"]
+        self.refresh_cache = args["refresh_cache"]
+        self.cleanup_metadata = args["cleanup_metadata"]
+        self.pending_pit_metadata = None
+        self.timings = {}
+
+        if self.group_entries is None:
+            self.set_snapshot_parameters(args)
+
+        # Check whether request needs to be forwarded on to the controller web services rest api.
+        self.url_path_prefix = ""
+        if not self.is_embedded():
+            if self.ssid == "0" or self.ssid.lower() == "proxy":
+                self.module.fail_json(msg="Snapshot is not a valid operation for SANtricity Web Services Proxy! ssid cannot be '0' or 'proxy'."
+                                          " Array [%s]" % self.ssid)
+            self.url_path_prefix = "storage-systems/%s/forward/devmgr/v2/" % self.ssid
+
+        self.cache = {"get_consistency_groups": None,
+                      "get_all_storage_pools_by_id": {},
+                      "get_all_storage_pools_by_name": {},
+                      "get_all_volumes_by_id": {},
+                      "get_all_volumes_by_name": {},
+                      "get_all_hosts_and_hostgroups_by_name": {},
+                      "get_all_hosts_and_hostgroups_by_id": {},
+                      "get_mapping_by_id": {},
+                      "get_mapping_by_name": {},
+                      "get_all_concat_volumes_by_id": {},
+                      "get_pit_metadata_index": None,
+                      "get_pit_image_timestamps": None,
+                      "get_unused_pit_key_values": []}
+        self.reset_group_cache()
+
+    def set_snapshot_parameters(self, args):
+        """Set the expected snapshot state from the module parameters or from a groups entry merged with them."""
         self.state = args["state"]
         self.type = args["type"]
         self.group_name = args["group_name"]
@@ -432,7 +700,10 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
                                           " Array [%s]." % self.ssid)
 
         # Check for required arguments
-        if self.state == "present":
+        if self.type == "metadata":
+            if self.state != "absent":
+                self.module.fail_json(msg="Invalid argument! Point-in-time image metadata can only be removed; state must be absent. Array [%s]." % self.ssid)
+        elif self.state == "present":
             if self.type == "group":
                 if not self.volumes:
                     self.module.fail_json(msg="Missing argument! Volumes must be defined to create a snapshot consistency group."
@@ -466,43 +737,25 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
                     self.module.fail_json(msg="Missing argument! view_name must be defined to create a snapshot consistency group view."
                                               " Group [%s]. Array [%s]" % (self.group_name, self.ssid))
 
-        # Check whether request needs to be forwarded on to the controller web services rest api.
-        self.url_path_prefix = ""
-        if not self.is_embedded():
-            if self.ssid == "0" or self.ssid.lower() == "proxy":
-                self.module.fail_json(msg="Snapshot is not a valid operation for SANtricity Web Services Proxy! ssid cannot be '0' or 'proxy'."
-                                          " Array [%s]" % self.ssid)
-            self.url_path_prefix = "storage-systems/%s/forward/devmgr/v2/" % self.ssid
+    def reset_group_cache(self):
+        """Discard the cached information that belongs to the expected consistency group.
 
-        self.cache = {"get_consistency_group": {},
-                      "get_all_storage_pools_by_id": {},
-                      "get_all_storage_pools_by_name": {},
-                      "get_all_volumes_by_id": {},
-                      "get_all_volumes_by_name": {},
-                      "get_all_hosts_and_hostgroups_by_name": {},
-                      "get_all_hosts_and_hostgroups_by_id": {},
-                      "get_mapping_by_id": {},
-                      "get_mapping_by_name": {},
-                      "get_all_concat_volumes_by_id": {},
-                      "get_pit_images_by_timestamp": {},
-                      "get_pit_images_by_name": {},
-                      "get_pit_images_metadata": {},
-                      "get_unused_pit_key_values": [],
-                      "get_pit_info": None,
-                      "get_consistency_group_view": {},
-                      "view_changes_required": []}
+        Storage system wide information, such as volumes, hosts and the prefetched consistency groups, is kept in self.cache.
+        """
+        self.group_cache = {"get_consistency_group": {},
+                            "get_pit_images_by_timestamp": {},
+                            "get_pit_images_by_name": {},
+                            "get_pit_images_metadata": {},
+                            "get_pit_info": None,
+                            "get_consistency_group_view": {},
+                            "view_changes_required": []}
 
     def get_all_storage_pools_by_id(self):
         """Retrieve and return all storage pools/volume groups."""
         if not self.cache["get_all_storage_pools_by_id"]:
-            try:
-                rc, storage_pools = self.request("storage-systems/%s/storage-pools" % self.ssid)
-
-                for storage_pool in storage_pools:
-                    self.cache["get_all_storage_pools_by_id"].update({storage_pool["id"]: storage_pool})
-                    self.cache["get_all_storage_pools_by_name"].update({storage_pool["name"]: storage_pool})
-            except Exception as error:
-                self.module.fail_json(msg="Failed to retrieve volumes! Error [%s]. Array [%s]." % (error, self.ssid))
+            graph = self.get_graph()
+            self.cache["get_all_storage_pools_by_id"].update(graph.storage_pools_by_id)
+            self.cache["get_all_storage_pools_by_name"].update(graph.storage_pools_by_name)
 
         return self.cache["get_all_storage_pools_by_id"]
 
@@ -516,15 +769,9 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
     def get_all_volumes_by_id(self):
         """Retrieve and return a dictionary of all thick and thin volumes keyed by id."""
         if not self.cache["get_all_volumes_by_id"]:
-            try:
-                rc, thick_volumes = self.request("storage-systems/%s/volumes" % self.ssid)
-                rc, thin_volumes = self.request("storage-systems/%s/thin-volumes" % self.ssid)
-
-                for volume in thick_volumes + thin_volumes:
-                    self.cache["get_all_volumes_by_id"].update({volume["id"]: volume})
-                    self.cache["get_all_volumes_by_name"].update({volume["name"]: volume})
-            except Exception as error:
-                self.module.fail_json(msg="Failed to retrieve volumes! Error [%s]. Array [%s]." % (error, self.ssid))
+            graph = self.get_graph()
+            self.cache["get_all_volumes_by_id"].update(graph.volumes_by_id)
+            self.cache["get_all_volumes_by_name"].update(graph.volumes_by_name)
 
         return self.cache["get_all_volumes_by_id"]
 
@@ -538,13 +785,11 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
     def get_all_hosts_and_hostgroups_by_id(self):
         """Retrieve and return a dictionary of all host and host groups keyed by name."""
         if not self.cache["get_all_hosts_and_hostgroups_by_id"]:
+            graph = self.get_graph()
             try:
-                rc, hostgroups = self.request("storage-systems/%s/host-groups" % self.ssid)
-                # hostgroup_by_id = {hostgroup["id"]: hostgroup for hostgroup in hostgroups}
-                hostgroup_by_id = dict((hostgroup["id"], hostgroup) for hostgroup in hostgroups)
+                hostgroup_by_id = dict((hostgroup["id"], hostgroup) for hostgroup in graph.host_groups)
 
-                rc, hosts = self.request("storage-systems/%s/hosts" % self.ssid)
-                for host in hosts:
+                for host in graph.hosts:
                     if host["clusterRef"] != "0000000000000000000000000000000000000000":
                         hostgroup_name = hostgroup_by_id[host["clusterRef"]]["name"]
 
@@ -575,10 +820,9 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
         if not self.cache["get_mapping_by_id"]:
             existing_hosts_and_hostgroups_by_id = self.get_all_hosts_and_hostgroups_by_id()
             existing_hosts_and_hostgroups_by_name = self.get_all_hosts_and_hostgroups_by_name()
+            graph = self.get_graph()
             try:
-                rc, mappings = self.request("storage-systems/%s/volume-mappings" % self.ssid)
-
-                for mapping in mappings:
+                for mapping in graph.mappings:
                     host_ids = [mapping["mapRef"]]
                     map_entry = {mapping["lun"]: mapping["volumeRef"]}
 
@@ -623,46 +867,120 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
 
         return self.cache["get_all_concat_volumes_by_id"]
 
+    def get_consistency_group_cache_key(self):
+        """Return the prefetched consistency group cache key for the storage system."""
+        return "consistency_groups|%s|%s" % (self.url, self.ssid)
+
+    def get_member_volumes(self, consistency_group):
+        """Retrieve the member volumes of a consistency group."""
+        rc, member_volumes = self.request("storage-systems/%s/consistency-groups/%s/member-volumes" % (self.ssid, consistency_group["id"]))
+        return member_volumes
+
+    def get_consistency_groups(self):
+        """Retrieve every consistency group with its member volumes keyed by consistency group label.
+
+        Member volumes are retrieved concurrently. When cache_ttl is greater than zero the consistency groups are cached so
+        later module runs only retrieve the member volumes of consistency groups that were marked stale.
+        """
+        if self.cache["get_consistency_groups"] is None:
+            cache_key = self.get_consistency_group_cache_key()
+            prefetched = None if self.refresh_cache else snapshot_cache.get(cache_key, self.cache_ttl)
+
+            if prefetched is None or prefetched["stale"]:
+                previous_groups = prefetched["groups"] if prefetched else {}
+                stale = prefetched["stale"] if prefetched else []
+                try:
+                    rc, consistency_groups = self.request("storage-systems/%s/consistency-groups" % self.ssid)
+                except Exception as error:
+                    self.module.fail_json(msg="Failed to retrieve snapshot consistency groups! Error [%s]. Array [%s]." % (error, self.ssid))
+
+                groups = {}
+                for consistency_group in consistency_groups:
+                    previous_group = previous_groups.get(consistency_group["label"])
+                    member_volumes = None
+                    if previous_group and previous_group["group"]["id"] == consistency_group["id"] and consistency_group["label"] not in stale:
+                        member_volumes = previous_group["member_volumes"]
+                    groups.update({consistency_group["label"]: {"group": consistency_group, "member_volumes": member_volumes}})
+
+                pending = [group for group in groups.values() if group["member_volumes"] is None]
+                for group, member_volumes, error in run_concurrently(lambda group: self.get_member_volumes(group["group"]), pending, self.max_workers):
+                    if error:
+                        self.module.fail_json(msg="Failed to retrieve snapshot consistency group member volumes! Group [%s]. Error [%s]. Array [%s]."
+                                                  % (group["group"]["label"], error, self.ssid))
+                    group["member_volumes"] = member_volumes
+
+                prefetched = {"groups": groups, "stale": []}
+                snapshot_cache.set(cache_key, prefetched, self.cache_ttl)
+
+            self.cache["get_consistency_groups"] = prefetched["groups"]
+
+        return self.cache["get_consistency_groups"]
+
+    def mark_consistency_group_stale(self):
+        """Mark the consistency group as stale in the prefetched consistency group cache so it is retrieved again."""
+        if self.prefetch_consistency_groups:
+            cache_key = self.get_consistency_group_cache_key()
+            prefetched = snapshot_cache.get(cache_key, self.cache_ttl)
+            if prefetched is not None and self.group_name not in prefetched["stale"]:
+                prefetched["stale"].append(self.group_name)
+                snapshot_cache.set(cache_key, prefetched, self.cache_ttl)
+
     def get_consistency_group(self):
         """Retrieve consistency groups and return information on the expected group."""
         existing_volumes = self.get_all_volumes_by_id()
 
-        if not self.cache["get_consistency_group"]:
-            try:
-                rc, consistency_groups = self.request("storage-systems/%s/consistency-groups" % self.ssid)
-
-                for consistency_group in consistency_groups:
-                    if consistency_group["label"] == self.group_name:
-                        rc, member_volumes = self.request("storage-systems/%s/consistency-groups/%s/member-volumes" % (self.ssid, consistency_group["id"]))
-
-                        self.cache["get_consistency_group"].update({"consistency_group_id": consistency_group["cgRef"],
-                                                                    "alert_threshold_pct": consistency_group["fullWarnThreshold"],
-                                                                    "maximum_snapshots": consistency_group["autoDeleteLimit"],
-                                                                    "rollback_priority": consistency_group["rollbackPriority"],
-                                                                    "reserve_capacity_full_policy": consistency_group["repFullPolicy"],
-                                                                    "sequence_numbers": consistency_group["uniqueSequenceNumber"],
-                                                                    "base_volumes": []})
-
-                        for member_volume in member_volumes:
-                            base_volume = existing_volumes[member_volume["volumeId"]]
-                            base_volume_size_b = int(base_volume["totalSizeInBytes"])
-                            total_reserve_capacity_b = int(member_volume["totalRepositoryCapacity"])
-                            reserve_capacity_pct = int(round(float(total_reserve_capacity_b) / float(base_volume_size_b) * 100))
+        if not self.group_cache["get_consistency_group"]:
+            consistency_group = None
+            member_volumes = []
+            if self.prefetch_consistency_groups:
+                prefetched_group = self.get_consistency_groups().get(self.group_name)
+                if prefetched_group:
+                    consistency_group = prefetched_group["group"]
+                    member_volumes = prefetched_group["member_volumes"]
+            else:
+                try:
+                    rc, consistency_groups = self.request("storage-systems/%s/consistency-groups" % self.ssid)
 
+                    for group in consistency_groups:
+                        if group["label"] == self.group_name:
+                            consistency_group = group
+                            member_volumes = self.get_member_volumes(group)
+                            break
+                except Exception as error:
+                    self.module.fail_json(msg="Failed to retrieve snapshot consistency groups! Error [%s]. Array [%s]." % (error, self.ssid))
+
+            if consistency_group:
+                concat_volumes = self.get_all_concat_volumes_by_id()
+                self.group_cache["get_consistency_group"].update({"consistency_group_id": consistency_group["cgRef"],
+                                                                  "alert_threshold_pct": consistency_group["fullWarnThreshold"],
+                                                                  "maximum_snapshots": consistency_group["autoDeleteLimit"],
+                                                                  "rollback_priority": consistency_group["rollbackPriority"],
+                                                                  "reserve_capacity_full_policy": consistency_group["repFullPolicy"],
+                                                                  "sequence_numbers": consistency_group["uniqueSequenceNumber"],
+                                                                  "base_volumes": []})
+
+                for member_volume in member_volumes:
+                    base_volume = existing_volumes[member_volume["volumeId"]]
+                    base_volume_size_b = int(base_volume["totalSizeInBytes"])
+                    total_reserve_capacity_b = int(member_volume["totalRepositoryCapacity"])
+                    reserve_capacity_pct = int(round(float(total_reserve_capacity_b) / float(base_volume_size_b) * 100))
+
+                    concat = concat_volumes.get(member_volume["repositoryVolume"])
+                    if concat is None:
+                        try:
                             rc, concat = self.request("storage-systems/%s/repositories/concat/%s" % (self.ssid, member_volume["repositoryVolume"]))
+                        except Exception as error:
+                            self.module.fail_json(msg="Failed to retrieve reserve capacity volume! Volume [%s]. Error [%s]. Array [%s]."
+                                                      % (member_volume["repositoryVolume"], error, self.ssid))
 
-                            self.cache["get_consistency_group"]["base_volumes"].append({"name": base_volume["name"],
-                                                                                        "id": base_volume["id"],
-                                                                                        "base_volume_size_b": base_volume_size_b,
-                                                                                        "total_reserve_capacity_b": total_reserve_capacity_b,
-                                                                                        "reserve_capacity_pct": reserve_capacity_pct,
-                                                                                        "repository_volume_info": concat})
-                        break
-
-            except Exception as error:
-                self.module.fail_json(msg="Failed to retrieve snapshot consistency groups! Error [%s]. Array [%s]." % (error, self.ssid))
+                    self.group_cache["get_consistency_group"]["base_volumes"].append({"name": base_volume["name"],
+                                                                                      "id": base_volume["id"],
+                                                                                      "base_volume_size_b": base_volume_size_b,
+                                                                                      "total_reserve_capacity_b": total_reserve_capacity_b,
+                                                                                      "reserve_capacity_pct": reserve_capacity_pct,
+                                                                                      "repository_volume_info": concat})
 
-        return self.cache["get_consistency_group"]
+        return self.group_cache["get_consistency_group"]
 
     def get_candidate(self, volume_name, volume_info):
         """Return candidate for volume."""
@@ -710,28 +1028,59 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
 
         return volume_info
 
-    def get_pit_images_metadata(self):
-        """Retrieve and return consistency group snapshot images' metadata keyed on timestamps."""
-        if not self.cache["get_pit_images_metadata"]:
+    def get_pit_metadata_index(self):
+        """Retrieve the point-in-time image metadata from the key-value store indexed by consistency group and timestamp.
+
+        Only keys with the point-in-time image metadata prefix are considered. Entries whose value cannot be parsed are kept
+        in the malformed list so that they can be removed.
+        """
+        if self.cache["get_pit_metadata_index"] is None:
             try:
                 rc, key_values = self.request(self.url_path_prefix + "key-values")
+            except Exception as error:
+                self.module.fail_json(msg="Failed to retrieve consistency group snapshot images metadata!  Array [%s]. Error [%s]." % (self.ssid, error))
+
+            index = {"groups": {}, "malformed": []}
+            for entry in key_values:
+                if entry["key"].startswith(self.PIT_METADATA_PREFIX):
+                    key_tokens = entry["key"][len(self.PIT_METADATA_PREFIX):].split("|", 1)
+                    values = entry["value"].split("|", 2)
+                    if len(key_tokens) != 2 or len(values) != 3:
+                        index["malformed"].append(entry["key"])
+                        continue
 
-                for entry in key_values:
-                    if re.search("ansible\\|%s\\|" % self.group_name, entry["key"]):
-                        name = entry["key"].replace("ansible|%s|" % self.group_name, "")
-                        values = entry["value"].split("|")
-                        if len(values) == 3:
-                            timestamp, image_id, description = values
-                            self.cache["get_pit_images_metadata"].update({timestamp: {"name": name, "description": description}})
+                    group_name, name = key_tokens
+                    timestamp, image_name, description = values
+                    index["groups"].setdefault(group_name, {}).update({timestamp: {"key": entry["key"], "name": name, "description": description}})
+            self.cache["get_pit_metadata_index"] = index
 
+        return self.cache["get_pit_metadata_index"]
+
+    def get_pit_images_metadata(self):
+        """Retrieve and return consistency group snapshot images' metadata keyed on timestamps."""
+        if not self.group_cache["get_pit_images_metadata"]:
+            self.group_cache["get_pit_images_metadata"].update(self.get_pit_metadata_index()["groups"].get(self.group_name, {}))
+
+        return self.group_cache["get_pit_images_metadata"]
+
+    def get_pit_image_timestamps(self):
+        """Retrieve the set of timestamps of every snapshot image on the storage system.
+
+        :return set: snapshot image timestamps or None when the snapshot images could not be retrieved.
+        """
+        if self.cache["get_pit_image_timestamps"] is None:
+            try:
+                rc, images = self.request("storage-systems/%s/snapshot-images" % self.ssid)
+                self.cache["get_pit_image_timestamps"] = set(str(image["pitTimestamp"]) for image in images)
             except Exception as error:
-                self.module.fail_json(msg="Failed to retrieve consistency group snapshot images metadata!  Array [%s]. Error [%s]." % (self.ssid, error))
+                self.module.warn("Failed to retrieve all snapshots to determine all key-value pairs that do no match a point-in-time snapshot images!"
+                                 " Array [%s]. Error [%s]." % (self.ssid, error))
 
-        return self.cache["get_pit_images_metadata"]
+        return self.cache["get_pit_image_timestamps"]
 
     def get_pit_images_by_timestamp(self):
         """Retrieve and return snapshot images."""
-        if not self.cache["get_pit_images_by_timestamp"]:
+        if not self.group_cache["get_pit_images_by_timestamp"]:
             group_id = self.get_consistency_group()["consistency_group_id"]
             images_metadata = self.get_pit_images_metadata()
             existing_volumes_by_id = self.get_all_volumes_by_id()
@@ -754,51 +1103,60 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
                             "base_volume_name": existing_volumes_by_id[image_info["baseVol"]]["name"],
                             "image_info": image_info}
 
-                    if timestamp not in self.cache["get_pit_images_by_timestamp"].keys():
-                        self.cache["get_pit_images_by_timestamp"].update({timestamp: {"sequence_number": image_info["pitSequenceNumber"], "images": [info]}})
-                        if metadata["name"]:
-                            self.cache["get_pit_images_by_name"].update({metadata["name"]: {"sequence_number": image_info["pitSequenceNumber"],
+                    if timestamp not in self.group_cache["get_pit_images_by_timestamp"].keys():
+                        self.group_cache["get_pit_images_by_timestamp"].update({timestamp: {"sequence_number": image_info["pitSequenceNumber"],
                                                                                             "images": [info]}})
+                        if metadata["name"]:
+                            self.group_cache["get_pit_images_by_name"].update({metadata["name"]: {"sequence_number": image_info["pitSequenceNumber"],
+                                                                                                  "images": [info]}})
                     else:
-                        self.cache["get_pit_images_by_timestamp"][timestamp]["images"].append(info)
+                        self.group_cache["get_pit_images_by_timestamp"][timestamp]["images"].append(info)
                         if metadata["name"]:
-                            self.cache["get_pit_images_by_name"][metadata["name"]]["images"].append(info)
+                            self.group_cache["get_pit_images_by_name"][metadata["name"]]["images"].append(info)
 
             except Exception as error:
                 self.module.fail_json(msg="Failed to retrieve consistency group snapshot images!"
                                           " Group [%s]. Array [%s]. Error [%s]." % (self.group_name, self.ssid, error))
 
-        return self.cache["get_pit_images_by_timestamp"]
+        return self.group_cache["get_pit_images_by_timestamp"]
 
     def get_pit_images_by_name(self):
         """Retrieve and return snapshot images."""
-        if not self.cache["get_pit_images_by_name"]:
+        if not self.group_cache["get_pit_images_by_name"]:
             self.get_pit_images_by_timestamp()
 
-        return self.cache["get_pit_images_by_name"]
+        return self.group_cache["get_pit_images_by_name"]
 
     def get_unused_pit_key(self):
         """Determine all embedded pit key-values that do not match existing snapshot images."""
-        if not self.cache["get_unused_pit_key_values"]:
-            try:
-                rc, images = self.request("storage-systems/%s/snapshot-images" % self.ssid)
-                rc, key_values = self.request("key-values")
-
-                for key_value in key_values:
-                    key = key_value["key"]
-                    value = key_value["value"]
-                    if re.match("ansible\\|.*\\|.*", value):
-                        for image in images:
-                            if str(image["pitTimestamp"]) == value.split("|")[0]:
-                                break
-                        else:
-                            self.cache["get_unused_pit_key_values"].append(key)
-            except Exception as error:
-                self.module.warn("Failed to retrieve all snapshots to determine all key-value pairs that do no match a point-in-time snapshot images!"
-                                 " Array [%s]. Error [%s]." % (self.ssid, error))
+        if self.cleanup_metadata and not self.cache["get_unused_pit_key_values"]:
+            timestamps = self.get_pit_image_timestamps()
+            if timestamps is not None:
+                for group_name, group_metadata in self.get_pit_metadata_index()["groups"].items():
+                    for timestamp, metadata in group_metadata.items():
+                        if timestamp not in timestamps:
+                            self.cache["get_unused_pit_key_values"].append(metadata["key"])
 
         return self.cache["get_unused_pit_key_values"]
 
+    def get_orphaned_pit_metadata_keys(self):
+        """Determine the metadata keys that do not match a snapshot image or cannot be parsed, limited to group_name when specified."""
+        timestamps = self.get_pit_image_timestamps()
+        if timestamps is None:
+            self.module.fail_json(msg="Failed to retrieve snapshot images! Unable to determine unused point-in-time image metadata. Array [%s]." % self.ssid)
+
+        index = self.get_pit_metadata_index()
+        keys = []
+        for group_name, group_metadata in index["groups"].items():
+            if not self.group_name or group_name == self.group_name:
+                keys.extend(metadata["key"] for timestamp, metadata in group_metadata.items() if timestamp not in timestamps)
+
+        for key in index["malformed"]:
+            if not self.group_name or key.startswith("%s%s|" % (self.PIT_METADATA_PREFIX, self.group_name)):
+                keys.append(key)
+
+        return sorted(keys)
+
     def get_pit_info(self):
         """Determine consistency group's snapshot images base on provided arguments (pit_name or timestamp)."""
 
@@ -811,17 +1169,17 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
                     (self.pit_timestamp_tokens < 5 or self.pit_timestamp.minute == timestamp.minute) and
                     (self.pit_timestamp_tokens < 6 or self.pit_timestamp.second == timestamp.second))
 
-        if self.cache["get_pit_info"] is None:
+        if self.group_cache["get_pit_info"] is None:
             group = self.get_consistency_group()
             pit_images_by_timestamp = self.get_pit_images_by_timestamp()
             pit_images_by_name = self.get_pit_images_by_name()
 
             if self.pit_name:
                 if self.pit_name in pit_images_by_name.keys():
-                    self.cache["get_pit_info"] = pit_images_by_name[self.pit_name]
+                    self.group_cache["get_pit_info"] = pit_images_by_name[self.pit_name]
 
                     if self.pit_timestamp:
-                        for image in self.cache["get_pit_info"]["images"]:
+                        for image in self.group_cache["get_pit_info"]["images"]:
                             if not _check_timestamp(image["timestamp"]):
                                 self.module.fail_json(msg="Snapshot image does not exist that matches both name and supplied timestamp!"
                                                           " Group [%s]. Image [%s]. Array [%s]." % (self.group_name, image, self.ssid))
@@ -832,13 +1190,13 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
 
                     for image_timestamp in pit_images_by_timestamp.keys():
                         if int(pit_images_by_timestamp[image_timestamp]["sequence_number"]) == int(sequence_number):
-                            self.cache["get_pit_info"] = pit_images_by_timestamp[image_timestamp]
+                            self.group_cache["get_pit_info"] = pit_images_by_timestamp[image_timestamp]
                             break
                 elif self.pit_timestamp == "oldest":
                     sequence_number = group["sequence_numbers"][0]
                     for image_timestamp in pit_images_by_timestamp.keys():
                         if int(pit_images_by_timestamp[image_timestamp]["sequence_number"]) == int(sequence_number):
-                            self.cache["get_pit_info"] = pit_images_by_timestamp[image_timestamp]
+                            self.group_cache["get_pit_info"] = pit_images_by_timestamp[image_timestamp]
                             break
                 else:
                     for image_timestamp in pit_images_by_timestamp.keys():
@@ -848,13 +1206,13 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
                                                           " Group [%s]. Array [%s]." % (self.group_name, self.ssid))
 
                             sequence_number = pit_images_by_timestamp[image_timestamp]["sequence_number"]
-                            self.cache["get_pit_info"] = pit_images_by_timestamp[image_timestamp]
+                            self.group_cache["get_pit_info"] = pit_images_by_timestamp[image_timestamp]
 
-        if self.state != "absent" and self.type != "pit" and self.cache["get_pit_info"] is None:
+        if self.state != "absent" and self.type != "pit" and self.group_cache["get_pit_info"] is None:
             self.module.fail_json(msg="Snapshot consistency group point-in-time image does not exist! Name [%s]. Timestamp [%s]. Group [%s]."
                                       " Array [%s]." % (self.pit_name, self.pit_timestamp, self.group_name, self.ssid))
 
-        return self.cache["get_pit_info"]
+        return self.group_cache["get_pit_info"]
 
     def create_changes_required(self):
         """Determine the required state changes for creating a new consistency group."""
@@ -962,15 +1320,15 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
         """Determine and return consistency group view."""
         group_id = self.get_consistency_group()["consistency_group_id"]
 
-        if not self.cache["get_consistency_group_view"]:
+        if not self.group_cache["get_consistency_group_view"]:
             try:
                 rc, views = self.request("storage-systems/%s/consistency-groups/%s/views" % (self.ssid, group_id))
 
                 # Check for existing view (collection of snapshot volumes for a consistency group) within consistency group.
                 for view in views:
                     if view["name"] == self.view_name:
-                        self.cache["get_consistency_group_view"] = view
-                        self.cache["get_consistency_group_view"].update({"snapshot_volumes": []})
+                        self.group_cache["get_consistency_group_view"] = view
+                        self.group_cache["get_consistency_group_view"].update({"snapshot_volumes": []})
 
                         # Determine snapshot volumes associated with view.
                         try:
@@ -980,7 +1338,7 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
                                 if (snapshot_volume["membership"] and
                                         snapshot_volume["membership"]["viewType"] == "member" and
                                         snapshot_volume["membership"]["cgViewRef"] == view["cgViewRef"]):
-                                    self.cache["get_consistency_group_view"]["snapshot_volumes"].append(snapshot_volume)
+                                    self.group_cache["get_consistency_group_view"]["snapshot_volumes"].append(snapshot_volume)
                         except Exception as error:
                             self.module.fail_json(msg="Failed to retrieve host mapping information!."
                                                       " Group [%s]. Array [%s]. Error [%s]." % (self.group_name, self.ssid, error))
@@ -988,7 +1346,7 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
                 self.module.fail_json(msg="Failed to retrieve consistency group's views!"
                                           " Group [%s]. Array [%s]. Error [%s]." % (self.group_name, self.ssid, error))
 
-        return self.cache["get_consistency_group_view"]
+        return self.group_cache["get_consistency_group_view"]
 
     def create_view_changes_required(self):
         """Determine whether snapshot consistency group point-in-time view needs to be created."""
@@ -1119,7 +1477,7 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
 
         try:
             rc, group = self.request("storage-systems/%s/consistency-groups" % self.ssid, method="POST", data=consistency_group_request)
-            self.cache["get_consistency_group"].update({"consistency_group_id": group["cgRef"]})
+            self.group_cache["get_consistency_group"].update({"consistency_group_id": group["cgRef"]})
         except Exception as error:
             self.module.fail_json(msg="Failed to remove snapshot consistency group! Group [%s]. Array [%s]." % (self.group_name, self.ssid))
 
@@ -1199,18 +1557,25 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
         try:
             rc, images = self.request("storage-systems/%s/consistency-groups/%s/snapshots" % (self.ssid, group_id), method="POST")
 
-            # Embedded web services should store the pit_image metadata since sending it to the proxy will be written to it instead.
-            if self.pit_name:
-                try:
-                    rc, key_values = self.request(self.url_path_prefix + "key-values/ansible|%s|%s" % (self.group_name, self.pit_name), method="POST",
-                                                  data="%s|%s|%s" % (images[0]["pitTimestamp"], self.pit_name, self.pit_description))
-                except Exception as error:
-                    self.module.fail_json(msg="Failed to create metadata for snapshot images!"
-                                              " Group [%s]. Array [%s]. Error [%s]." % (self.group_name, self.ssid, error))
         except Exception as error:
             self.module.fail_json(msg="Failed to create consistency group snapshot images!"
                                       " Group [%s]. Array [%s]. Error [%s]." % (self.group_name, self.ssid, error))
 
+        # Embedded web services should store the pit_image metadata since sending it to the proxy will be written to it instead.
+        if self.pit_name:
+            key = "%s%s|%s" % (self.PIT_METADATA_PREFIX, self.group_name, self.pit_name)
+            value = "%s|%s|%s" % (images[0]["pitTimestamp"], self.pit_name, self.pit_description)
+
+            # Metadata for many groups is written together once every image has been taken.
+            if self.pending_pit_metadata is not None:
+                self.pending_pit_metadata.append((key, value, self.result))
+                return
+
+            errors = self.update_pit_metadata([(key, value)])
+            if errors:
+                self.module.fail_json(msg="Failed to create metadata for snapshot images!"
+                                          " Group [%s]. Array [%s]. Error [%s]." % (self.group_name, self.ssid, errors[key]))
+
     def remove_pit_images(self, pit_info):
         """Remove selected snapshot point-in-time images."""
         group_id = self.get_consistency_group()["consistency_group_id"]
@@ -1220,30 +1585,72 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
                                if int(pit_image["sequence_number"]) < pit_sequence_number)
         sequence_numbers.add(pit_sequence_number)
 
-        for sequence_number in sorted(sequence_numbers):
-
+        # Point-in-time images must be removed oldest first so each deletion must complete before the next one is issued.
+        started = time.time()
+        for count, sequence_number in enumerate(sorted(sequence_numbers)):
             try:
                 rc, images = self.request("storage-systems/%s/consistency-groups/%s/snapshots/%s" % (self.ssid, group_id, sequence_number), method="DELETE")
             except Exception as error:
-                self.module.fail_json(msg="Failed to create consistency group snapshot images!"
-                                          " Group [%s]. Array [%s]. Error [%s]." % (self.group_name, self.ssid, error))
+                self.record_timing("remove_pit_images", started)
+                self.module.fail_json(msg="Failed to remove consistency group snapshot images! Removed [%s of %s]. Sequence number [%s]."
+                                          " Group [%s]. Array [%s]. Error [%s]." % (count, len(sequence_numbers), sequence_number, self.group_name,
+                                                                                    self.ssid, error))
+        self.record_timing("remove_pit_images", started)
 
         # Embedded web services should store the pit_image metadata since sending it to the proxy will be written to it instead.
         if self.pit_name:
-            try:
-                rc, key_values = self.request(self.url_path_prefix + "key-values/ansible|%s|%s" % (self.group_name, self.pit_name), method="DELETE")
-            except Exception as error:
+            key = "%s%s|%s" % (self.PIT_METADATA_PREFIX, self.group_name, self.pit_name)
+            errors = self.update_pit_metadata([(key, None)])
+            if errors:
                 self.module.fail_json(msg="Failed to delete metadata for snapshot images!"
-                                          " Group [%s]. Array [%s]. Error [%s]." % (self.group_name, self.ssid, error))
+                                          " Group [%s]. Array [%s]. Error [%s]." % (self.group_name, self.ssid, errors[key]))
+
+    def update_pit_metadata(self, entries):
+        """Write or delete point-in-time image metadata key-values concurrently.
+
+        :param list entries: (key, value) tuples; the key is deleted when value is None.
+        :return dict: errors keyed by the metadata keys that could not be written or deleted.
+        """
+        def update(entry):
+            key, value = entry
+            if value is None:
+                return self.request(self.url_path_prefix + "key-values/%s" % key, method="DELETE")
+            return self.request(self.url_path_prefix + "key-values/%s" % key, method="POST", data=value)
+
+        errors = {}
+        index = self.cache["get_pit_metadata_index"]
+        for entry, result, error in run_concurrently(update, entries, self.max_workers):
+            key, value = entry
+            if error:
+                errors.update({key: error})
+
+            # Keep the metadata index consistent with the key-value store so that it can be reused by the remaining groups.
+            elif index is not None:
+                group_name, name = key[len(self.PIT_METADATA_PREFIX):].split("|", 1)
+                group_metadata = index["groups"].setdefault(group_name, {})
+                for timestamp in [timestamp for timestamp, metadata in group_metadata.items() if metadata["key"] == key]:
+                    group_metadata.pop(timestamp)
+                if value is not None:
+                    group_metadata.update({value.split("|", 1)[0]: {"key": key, "name": name, "description": value.split("|", 2)[2]}})
+
+        return errors
+
+    def write_pending_pit_metadata(self):
+        """Write the metadata for the point-in-time images taken by the groups list entries, marking the entries whose metadata could not be written."""
+        if self.pending_pit_metadata:
+            errors = self.update_pit_metadata([(key, value) for key, value, result in self.pending_pit_metadata])
+            for key, value, result in self.pending_pit_metadata:
+                if key in errors:
+                    result.update(failed=True, msg="Failed to create metadata for snapshot images! Group [%s]. Array [%s]. Error [%s]."
+                                                   % (result["group_name"], self.ssid, errors[key]))
+            self.pending_pit_metadata[:] = []
 
     def cleanup_old_pit_metadata(self, keys):
         """Delete unused point-in-time image metadata."""
-        for key in keys:
-            try:
-                rc, images = self.request("key-values/%s" % key, method="DELETE")
-            except Exception as error:
-                self.module.fail_json(msg="Failed to purge unused point-in-time image metadata! Key [%s]. Array [%s]."
-                                          " Error [%s]." % (key, self.ssid, error))
+        errors = self.update_pit_metadata([(key, None) for key in keys])
+        if errors:
+            self.module.fail_json(msg="Failed to purge unused point-in-time image metadata! Keys [%s]. Array [%s]. Error [%s]."
+                                      % (", ".join(sorted(errors.keys())), self.ssid, "; ".join(str(errors[key]) for key in sorted(errors.keys()))))
 
     def create_view(self, view_info):
         """Generate consistency group view."""
@@ -1274,70 +1681,99 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
             view = self.get_consistency_group_view()
             existing_volumes_by_id = self.get_all_volumes_by_id()
             existing_hosts_by_name = self.get_all_hosts_and_hostgroups_by_name()
+            map_requests = []
             for volume_name, volume_info in self.volumes.items():
                 if volume_info["snapshot_volume_host"]:
                     for snapshot_volume in view["snapshot_volumes"]:
                         if volume_name == existing_volumes_by_id[snapshot_volume["baseVol"]]["name"]:
-                            snapshot_volume_map_request = {"mappableObjectId": snapshot_volume["id"],
-                                                           "lun": volume_info["snapshot_volume_lun"],
-                                                           "targetId": existing_hosts_by_name[volume_info["snapshot_volume_host"]]["id"]}
-                            try:
-                                rc, mapping = self.request("storage-systems/%s/volume-mappings" % self.ssid, method="POST", data=snapshot_volume_map_request)
-                            except Exception as error:
-                                self.module.fail_json(msg="Failed to map snapshot volume! Snapshot volume [%s]. View [%s]. Group [%s]. Array [%s]."
-                                                          " Error [%s]" % (snapshot_volume["name"], self.view_name, self.group_name, self.ssid, error))
+                            map_requests.append((snapshot_volume, {"mappableObjectId": snapshot_volume["id"],
+                                                                   "lun": volume_info["snapshot_volume_lun"],
+                                                                   "targetId": existing_hosts_by_name[volume_info["snapshot_volume_host"]]["id"]}))
                             break
+
+            failures = self.run_operation("map_view", lambda map_request: self.request("storage-systems/%s/volume-mappings" % self.ssid,
+                                                                                       method="POST", data=map_request[1]), map_requests)
         except Exception as error:
             self.module.fail_json(msg="Failed to create consistency group snapshot volumes!"
                                       " Group [%s]. Array [%s]. Error [%s]." % (self.group_name, self.ssid, error))
 
+        if failures:
+            self.module.fail_json(msg="Failed to map %s of %s snapshot volumes! View [%s]. Group [%s]. Array [%s]. Errors [%s]."
+                                      % (len(failures), len(map_requests), self.view_name, self.group_name, self.ssid,
+                                         "; ".join("Snapshot volume [%s]. Error [%s]" % (map_request[0]["name"], error)
+                                                   for map_request, error in failures)))
+
+    def record_timing(self, operation, started):
+        """Add the time elapsed since started to the operation's total time in seconds."""
+        self.timings.update({operation: round(self.timings.get(operation, 0) + time.time() - started, 3)})
+
+    def run_operation(self, operation, func, items):
+        """Call func for each independent item concurrently, bounded by max_workers, and record the operation's time.
+
+        :return list: (item, error) tuples for every item that failed.
+        """
+        started = time.time()
+        results = run_concurrently(func, items, self.max_workers)
+        self.record_timing(operation, started)
+        return [(item, error) for item, result, error in results if error]
+
     def map_view(self, map_information_list):
         """Map consistency group point-in-time snapshot volumes to host or host group."""
         existing_volumes = self.get_all_volumes_by_id()
         existing_host_or_hostgroups = self.get_all_hosts_and_hostgroups_by_id()
-        for map_request in map_information_list:
-            try:
-                rc, mapping = self.request("storage-systems/%s/volume-mappings" % self.ssid, method="POST", data=map_request)
-            except Exception as error:
-                self.module.fail_json(msg="Failed to map snapshot volume! Snapshot volume [%s]. Target [%s]. Lun [%s]. Group [%s]. Array [%s]."
-                                          " Error [%s]." % (existing_volumes[map_request["mappableObjectId"]],
-                                                            existing_host_or_hostgroups[map_request["targetId"]],
-                                                            map_request["lun"], self.group_name, self.ssid, error))
+        failures = self.run_operation("map_view", lambda map_request: self.request("storage-systems/%s/volume-mappings" % self.ssid,
+                                                                                   method="POST", data=map_request), map_information_list)
+        if failures:
+            self.module.fail_json(msg="Failed to map %s of %s snapshot volumes! Group [%s]. Array [%s]. Errors [%s]."
+                                      % (len(failures), len(map_information_list), self.group_name, self.ssid,
+                                         "; ".join("Snapshot volume [%s]. Target [%s]. Lun [%s]. Error [%s]"
+                                                   % (existing_volumes[map_request["mappableObjectId"]]["name"],
+                                                      existing_host_or_hostgroups[map_request["targetId"]]["name"], map_request["lun"], error)
+                                                   for map_request, error in failures)))
 
     def unmap_view(self, unmap_info_list):
         """Unmap consistency group point-in-time snapshot volumes from host or host group."""
-        for unmap_info in unmap_info_list:
-            try:
-                rc, unmap = self.request("storage-systems/%s/volume-mappings/%s" % (self.ssid, unmap_info["lun_mapping_reference"]), method="DELETE")
-            except Exception as error:
-                self.module.fail_json(msg="Failed to unmap snapshot volume! Snapshot volume [%s]. View [%s]. Group [%s]. Array [%s]."
-                                          " Error [%s]." % (unmap_info["snapshot_volume_name"], self.view_name, self.group_name, self.ssid, error))
+        failures = self.run_operation("unmap_view", lambda unmap_info: self.request("storage-systems/%s/volume-mappings/%s"
+                                                                                    % (self.ssid, unmap_info["lun_mapping_reference"]),
+                                                                                    method="DELETE"), unmap_info_list)
+        if failures:
+            self.module.fail_json(msg="Failed to unmap %s of %s snapshot volumes! View [%s]. Group [%s]. Array [%s]. Errors [%s]."
+                                      % (len(failures), len(unmap_info_list), self.view_name, self.group_name, self.ssid,
+                                         "; ".join("Snapshot volume [%s]. Error [%s]" % (unmap_info["snapshot_volume_name"], error)
+                                                   for unmap_info, error in failures)))
 
     def move_view_mapping(self, map_information_list):
         """Move consistency group point-in-time snapshot volumes to a different host or host group."""
         existing_volumes = self.get_all_volumes_by_id()
         existing_host_or_hostgroups = self.get_all_hosts_and_hostgroups_by_id()
-        for map_request in map_information_list:
-            try:
-                rc, mapping = self.request("storage-systems/%s/symbol/moveLUNMapping?verboseErrorResponse=true" % self.ssid, method="POST", data=map_request)
-            except Exception as error:
-                self.module.fail_json(msg="Failed to move snapshot volume mapping! Snapshot volume [%s]. Target [%s]. Lun [%s]. Group [%s]. Array [%s]."
-                                          " Error [%s]." % (existing_volumes[map_request["mappableObjectId"]],
-                                                            existing_host_or_hostgroups[map_request["targetId"]],
-                                                            map_request["lun"], self.group_name, self.ssid, error))
+        url = "storage-systems/%s/symbol/moveLUNMapping?verboseErrorResponse=true" % self.ssid
+        failures = self.run_operation("move_view_mapping", lambda map_request: self.request(url, method="POST", data=map_request), map_information_list)
+        if failures:
+            self.module.fail_json(msg="Failed to move %s of %s snapshot volume mappings! Group [%s]. Array [%s]. Errors [%s]."
+                                      % (len(failures), len(map_information_list), self.group_name, self.ssid,
+                                         "; ".join("Snapshot volume [%s]. Target [%s]. Lun [%s]. Error [%s]"
+                                                   % (existing_volumes[map_request["mappableObjectId"]]["name"],
+                                                      existing_host_or_hostgroups[map_request["targetId"]]["name"], map_request["lun"], error)
+                                                   for map_request, error in failures)))
 
     def convert_view_to_writable(self, convert_view_information_list):
         """Make consistency group point-in-time snapshot volumes writable."""
+        convert_requests = []
         for volume_name, volume_info in convert_view_information_list.items():
             candidate = self.get_candidate(volume_name, volume_info)
-            convert_request = {"fullThreshold": self.alert_threshold_pct,
-                               "repositoryCandidate": candidate["candidate"]["candidate"]}
-            try:
-                rc, convert = self.request("/storage-systems/%s/snapshot-volumes/%s/convertReadOnly" % (self.ssid, volume_info["snapshot_volume_id"]),
-                                           method="POST", data=convert_request)
-            except Exception as error:
-                self.module.fail_json(msg="Failed to convert snapshot volume to read/write! Snapshot volume [%s]. View [%s] Group [%s]. Array [%s]."
-                                          " Error [%s]." % (volume_info["snapshot_volume_id"], self.view_name, self.group_name, self.ssid, error))
+            convert_requests.append((volume_info, {"fullThreshold": self.alert_threshold_pct, "repositoryCandidate": candidate["candidate"]["candidate"]}))
+
+        def convert(convert_request):
+            volume_info, data = convert_request
+            return self.request("/storage-systems/%s/snapshot-volumes/%s/convertReadOnly" % (self.ssid, volume_info["snapshot_volume_id"]),
+                                method="POST", data=data)
+
+        failures = self.run_operation("convert_view_to_writable", convert, convert_requests)
+        if failures:
+            self.module.fail_json(msg="Failed to convert %s of %s snapshot volumes to read/write! View [%s] Group [%s]. Array [%s]. Errors [%s]."
+                                      % (len(failures), len(convert_requests), self.view_name, self.group_name, self.ssid,
+                                         "; ".join("Snapshot volume [%s]. Error [%s]" % (convert_request[0]["snapshot_volume_id"], error)
+                                                   for convert_request, error in failures)))
 
     def remove_view(self, view_id):
         """Remove a consistency group view."""
@@ -1434,8 +1870,11 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
                                         existing_mappings[host_id].update({next_lun: None})
                                         break
 
-    def apply(self):
-        """Apply any required snapshot state changes."""
+    def get_required_changes(self):
+        """Determine whether the expected consistency group, point-in-time images or view require changes.
+
+        :return tuple: whether changes are required and the changes to apply.
+        """
         changes_required = False
         group = self.get_consistency_group()
         group_changes = {}
@@ -1511,70 +1950,222 @@ class NetAppESeriesSnapshot(NetAppESeriesModule):
                 self.module.fail_json(msg="Rollback operation is not available when the snapshot consistency group does not exist!"
                                           " Group [%s]. Array [%s]." % (self.group_name, self.ssid))
 
-        # Determine if they're any key-value pairs that need to be cleaned up since snapshot pit images were deleted outside of this module.
-        unused_pit_keys = self.get_unused_pit_key()
+        return changes_required, group_changes
 
-        # Apply any required changes.
-        if (changes_required or unused_pit_keys) and not self.module.check_mode:
-            if group:
-                if self.state == "absent":
-                    if self.type == "group":
-                        self.remove_snapshot_consistency_group(group)
-                    elif self.type == "pit":
-                        self.remove_pit_images(group_changes)
-                    elif self.type == "view":
-                        self.remove_view(group_changes["id"])
-
-                elif self.state == "present":
-
-                    if self.type == "group":
-                        if group_changes["update_group"]:
-                            self.update_snapshot_consistency_group(group_changes["update_group"])
-                        if group_changes["add_volumes"]:
-                            self.add_base_volumes(group_changes["add_volumes"])
-                        if group_changes["remove_volumes"]:
-                            self.remove_base_volumes(group_changes["remove_volumes"])
+    def apply_changes(self, group_changes):
+        """Apply the changes determined by get_required_changes()."""
+        group = self.get_consistency_group()
+        if group:
+            if self.state == "absent":
+                if self.type == "group":
+                    self.remove_snapshot_consistency_group(group)
+                elif self.type == "pit":
+                    self.remove_pit_images(group_changes)
+                elif self.type == "view":
+                    self.remove_view(group_changes["id"])
+
+            elif self.state == "present":
+
+                if self.type == "group":
+                    if group_changes["update_group"]:
+                        self.update_snapshot_consistency_group(group_changes["update_group"])
+                    if group_changes["add_volumes"]:
+                        self.add_base_volumes(group_changes["add_volumes"])
+                    if group_changes["remove_volumes"]:
+                        self.remove_base_volumes(group_changes["remove_volumes"])
+                    if group_changes["trim_reserve_capacity"]:
+                        self.trim_reserve_capacities(group_changes["trim_reserve_capacity"])
+                        if group_changes["expand_reserve_capacity"]:
+                            sleep(15)
+                    if group_changes["expand_reserve_capacity"]:
+                        self.expand_reserve_capacities(group_changes["expand_reserve_capacity"])
+
+                elif self.type == "pit":
+                    self.create_pit_images()
+
+                elif self.type == "view":
+                    view = self.get_consistency_group_view()
+                    if view:
                         if group_changes["trim_reserve_capacity"]:
                             self.trim_reserve_capacities(group_changes["trim_reserve_capacity"])
                             if group_changes["expand_reserve_capacity"]:
                                 sleep(15)
                         if group_changes["expand_reserve_capacity"]:
                             self.expand_reserve_capacities(group_changes["expand_reserve_capacity"])
+                        if group_changes["map_snapshot_volumes_mapping"]:
+                            self.map_view(group_changes["map_snapshot_volumes_mapping"])
+                        if group_changes["unmap_snapshot_volumes_mapping"]:
+                            self.unmap_view(group_changes["unmap_snapshot_volumes_mapping"])
+                        if group_changes["move_snapshot_volumes_mapping"]:
+                            self.move_view_mapping(group_changes["move_snapshot_volumes_mapping"])
+                        if group_changes["update_snapshot_volumes_writable"]:
+                            self.convert_view_to_writable(group_changes["update_snapshot_volumes_writable"])
+                    else:
+                        self.create_view(group_changes)
 
-                    elif self.type == "pit":
-                        self.create_pit_images()
+            elif self.state == "rollback":
+                self.rollback(group_changes)
+
+        elif self.type == "group":
+            self.create_snapshot_consistency_group(group_changes["create_group"])
+            self.add_base_volumes(group_changes["add_volumes"])
+
+    def get_bulk_group(self, entry):
+        """Create the snapshot instance for a groups list entry.
+
+        The instance shares the storage system wide information in self.cache with every other entry and reports failures
+        by raising NetAppESeriesModuleError rather than ending the module. Instances must be created right before they are
+        applied so that they see the changes made by the entries before them.
+        """
+        args = self.get_bulk_entry_args(entry)
+        timings = {}
+        group = self.get_bulk_entry(dict(group_name=entry["group_name"], type=args["type"], state=args["state"], changed=False, msg=None,
+                                         timings=timings))
+        group.reset_group_cache()
+        group.timings = timings
+        group.set_snapshot_parameters(args)
+        return group
+
+    def apply_group_changes(self, group, started):
+        """Determine and apply the changes for a groups list entry, recording the result and its timing."""
+        entry_started = time.time()
+        try:
+            changes_required, group_changes = group.get_required_changes()
+            group.result.update(changed=changes_required, group_changes=group_changes)
+            if changes_required and not self.module.check_mode:
+                group.mark_consistency_group_stale()
+                group.apply_changes(group_changes)
+        except NetAppESeriesModuleError as error:
+            group.result.update(failed=True, msg=str(error))
+        group.result.update(started=round(entry_started - started, 3), elapsed=round(time.time() - entry_started, 3))
+
+    def invalidate_storage_system_cache(self):
+        """Discard the storage system wide information that applied changes may have modified so that it is retrieved again.
+
+        Consistency groups, volumes, reserve capacity volumes, storage pool capacities and snapshot volume mappings can all be
+        changed by an entry while hosts and the point-in-time image metadata index, which is updated as images change, are kept.
+        """
+        self.invalidate_memoized()
+        self.cache.update({"get_consistency_groups": None,
+                           "get_all_storage_pools_by_id": {},
+                           "get_all_storage_pools_by_name": {},
+                           "get_all_volumes_by_id": {},
+                           "get_all_volumes_by_name": {},
+                           "get_mapping_by_id": {},
+                           "get_mapping_by_name": {},
+                           "get_all_concat_volumes_by_id": {},
+                           "get_pit_image_timestamps": None})
+
+    def is_concurrent_group(self, args, pit_args):
+        """Determine whether a groups list entry can be applied concurrently with the consecutive point-in-time image entries before it.
+
+        Images can be taken concurrently for any consistency groups but a consistency group's images must be removed oldest
+        first so no other entry for the same consistency group may run alongside a removal.
+
+        :param dict args: options of the entry (see get_bulk_entry_args()).
+        :param list pit_args: options of the point-in-time image entries before it.
+        """
+        if args["type"] != "pit" or args["state"] not in ["present", "absent"]:
+            return False
+        for pit_group_args in pit_args:
+            if pit_group_args["group_name"] == args["group_name"] and "absent" in [pit_group_args["state"], args["state"]]:
+                return False
+        return True
+
+    def apply_groups(self):
+        """Determine and apply the changes necessary for every entry in the groups list.
+
+        Volumes, hosts, reserve capacity volumes and every consistency group are retrieved once and shared by all entries;
+        whatever an entry changes is retrieved again for the entries after it. Entries are applied in order except
+        consecutive point-in-time image entries which are applied concurrently, bounded by max_workers, so that their images
+        are taken as close together as possible and old images are removed from many consistency groups at once.
+
+        :raise AnsibleExitJson when every entry completes successfully"""
+        started = time.time()
+        self.get_pit_metadata_index()
 
-                    elif self.type == "view":
-                        view = self.get_consistency_group_view()
-                        if view:
-                            if group_changes["trim_reserve_capacity"]:
-                                self.trim_reserve_capacities(group_changes["trim_reserve_capacity"])
-                                if group_changes["expand_reserve_capacity"]:
-                                    sleep(15)
-                            if group_changes["expand_reserve_capacity"]:
-                                self.expand_reserve_capacities(group_changes["expand_reserve_capacity"])
-                            if group_changes["map_snapshot_volumes_mapping"]:
-                                self.map_view(group_changes["map_snapshot_volumes_mapping"])
-                            if group_changes["unmap_snapshot_volumes_mapping"]:
-                                self.unmap_view(group_changes["unmap_snapshot_volumes_mapping"])
-                            if group_changes["move_snapshot_volumes_mapping"]:
-                                self.move_view_mapping(group_changes["move_snapshot_volumes_mapping"])
-                            if group_changes["update_snapshot_volumes_writable"]:
-                                self.convert_view_to_writable(group_changes["update_snapshot_volumes_writable"])
-                        else:
-                            self.create_view(group_changes)
+        # Determine if they're any key-value pairs that need to be cleaned up since snapshot pit images were deleted outside of this module.
+        unused_pit_keys = self.get_unused_pit_key()
+
+        self.pending_pit_metadata = []
+        results = []
+        index = 0
+        while index < len(self.group_entries):
+            entries = [self.group_entries[index]]
+            pit_args = [self.get_bulk_entry_args(self.group_entries[index])]
+            index += 1
+            if self.is_concurrent_group(pit_args[0], []):
+                while index < len(self.group_entries) and self.is_concurrent_group(self.get_bulk_entry_args(self.group_entries[index]), pit_args):
+                    entries.append(self.group_entries[index])
+                    pit_args.append(self.get_bulk_entry_args(self.group_entries[index]))
+                    index += 1
+
+            # Storage system wide information is retrieved here, rather than by each entry, so concurrent entries share it.
+            self.get_all_volumes_by_id()
+            self.get_all_storage_pools_by_id()
+            self.get_mapping_by_id()
+            self.get_all_concat_volumes_by_id()
+            self.get_consistency_groups()
+
+            groups = []
+            for entry in entries:
+                try:
+                    group = self.get_bulk_group(entry)
+                    groups.append(group)
+                    results.append(group.result)
+                except NetAppESeriesModuleError as error:
+                    results.append(dict(group_name=entry["group_name"], changed=False, failed=True, msg=str(error)))
 
-                elif self.state == "rollback":
-                    self.rollback(group_changes)
+            # Unexpected errors are reported with the entry so that they are never lost from a concurrent batch.
+            for group, result, error in run_concurrently(lambda group: self.apply_group_changes(group, started), groups, self.max_workers):
+                if error:
+                    group.result.update(failed=True, msg=str(error))
+            self.write_pending_pit_metadata()
 
-            elif self.type == "group":
-                self.create_snapshot_consistency_group(group_changes["create_group"])
-                self.add_base_volumes(group_changes["add_volumes"])
+            # Entries changed by this batch must be retrieved again by the entries that follow.
+            if any(group.result["changed"] for group in groups) and not self.module.check_mode:
+                self.invalidate_storage_system_cache()
+
+        if unused_pit_keys and not self.module.check_mode:
+            self.cleanup_old_pit_metadata(unused_pit_keys)
+
+        self.exit_bulk_results(results, "snapshot groups", label="Groups", name_key="group_name", groups=results, deleted_metadata_keys=unused_pit_keys,
+                               elapsed=round(time.time() - started, 3))
+
+    def apply_metadata(self):
+        """Remove point-in-time image metadata that does not match a snapshot image or that cannot be parsed.
+
+        :raise AnsibleExitJson with the removed metadata keys"""
+        orphaned_keys = self.get_orphaned_pit_metadata_keys()
+        if orphaned_keys and not self.module.check_mode:
+            self.cleanup_old_pit_metadata(orphaned_keys)
+
+        self.module.exit_json(msg="%s point-in-time image metadata entries removed." % len(orphaned_keys), changed=bool(orphaned_keys),
+                              deleted_metadata_keys=orphaned_keys)
+
+    def apply(self):
+        """Apply any required snapshot state changes."""
+        if self.group_entries is not None:
+            self.apply_groups()
+
+        if self.type == "metadata":
+            self.apply_metadata()
+
+        changes_required, group_changes = self.get_required_changes()
+
+        # Determine if they're any key-value pairs that need to be cleaned up since snapshot pit images were deleted outside of this module.
+        unused_pit_keys = self.get_unused_pit_key()
+
+        # Apply any required changes.
+        if (changes_required or unused_pit_keys) and not self.module.check_mode:
+            if changes_required:
+                self.mark_consistency_group_stale()
+                self.apply_changes(group_changes)
 
             if unused_pit_keys:
-                self.cleanup_old_pit_metadata()
+                self.cleanup_old_pit_metadata(unused_pit_keys)
 
-        self.module.exit_json(changed=changes_required, group_changes=group_changes, deleted_metadata_keys=unused_pit_keys)
+        self.module.exit_json(changed=changes_required, group_changes=group_changes, deleted_metadata_keys=unused_pit_keys, timings=self.timings)
 
 
 def main():
@@ -183,13 +183,13 @@ msg:
     type: str
     sample: Json facts for the pool that was created.
 """
-import functools
 from itertools import groupby
 from time import sleep
 
 from pprint import pformat
 from ansible.module_utils._text import to_native
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule, memoize
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity_operations import get_poll_interval
 
 
 def get_most_common_elements(iterator):
@@ -201,22 +201,6 @@ def get_most_common_elements(iterator):
     return sorted(grouped, key=lambda x: x[1], reverse=True)
 
 
-def memoize(func):
-    """Generic memoizer for any function with any number of arguments including zero."""
-
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        class MemoizeFuncArgs(dict):
-            def __missing__(self, _key):
-                self[_key] = func(*args, **kwargs)
-                return self[_key]
-
-        key = str((args, kwargs)) if args and kwargs else "no_argument_response"
-        return MemoizeFuncArgs().__getitem__(key)
-
-    return wrapper
-
-
 class NetAppESeriesStoragePool(NetAppESeriesModule):
     EXPANSION_TIMEOUT_SEC = 10
     DEFAULT_DISK_POOL_MINIMUM_DISK_COUNT = 11
@@ -335,6 +319,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
         return [drive for drive in self.drives if drive["currentVolumeGroupRef"] == self.pool_detail["id"] and not drive["hotSpare"]]
 
     @property
+    @memoize
     def expandable_drive_count(self):
         """Maximum number of drives that a storage pool can be expended at a given time."""
         capabilities = None
@@ -350,6 +335,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
         return capabilities["featureParameters"]["maxDCEDrives"]
 
     @property
+    @memoize
     def disk_pool_drive_minimum(self):
         """Provide the storage array's minimum disk pool drive count."""
         rc, attr = self.request("storage-systems/%s/symbol/getSystemAttributeDefaults" % self.ssid, ignore_errors=True)
@@ -375,6 +361,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
         return list(available_drive_capacities)
 
     @property
+    @memoize
     def drives(self):
         """Retrieve list of drives found in storage system."""
         drives = None
@@ -385,6 +372,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
 
         return drives
 
+    @memoize
     def tray_by_ids(self):
         """Retrieve list of trays found in storage system and return dictionary of trays keyed by ids."""
         tray_by_ids = {}
@@ -432,6 +420,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
         return False
 
     @property
+    @memoize
     def storage_pool(self):
         """Retrieve storage pool information."""
         storage_pools_resp = None
@@ -445,6 +434,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
         return pool_detail[0] if pool_detail else dict()
 
     @property
+    @memoize
     def storage_pool_volumes(self):
         """Retrieve list of volumes associated with storage pool."""
         volumes_resp = None
@@ -751,6 +741,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
                 except Exception as error:
                     self.module.fail_json(msg="Failed to set reserve drive count for disk pool. Disk Pool [%s]."
                                               " Array [%s]." % (self.pool_detail["id"], self.ssid))
+                self.invalidate_memoized()
 
         return changed
 
@@ -769,6 +760,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
                                         % self.ssid, method="POST", data=dict(driveRef=drives_list))
             except Exception as error:
                 self.module.fail_json(msg="Failed to erase all secured drives. Array [%s]" % self.ssid)
+            self.invalidate_memoized()
 
         return changed
 
@@ -799,6 +791,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
                                       % (self.ssid, to_native(error)))
 
         # Update drive and storage pool information
+        self.invalidate_memoized()
         self.pool_detail = self.storage_pool
 
     def delete_storage_pool(self):
@@ -811,6 +804,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
         except Exception as error:
             self.module.fail_json(msg="Failed to delete storage pool. Pool id [%s]. Array id [%s]. Error [%s]."
                                       % (self.pool_detail["id"], self.ssid, to_native(error)))
+        self.invalidate_memoized()
 
         if storage_pool_drives and self.erase_secured_drives:
             try:
@@ -819,6 +813,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
             except Exception as error:
                 self.module.fail_json(msg="Failed to erase drives prior to creating new storage pool. Array [%s]."
                                           " Error [%s]." % (self.ssid, to_native(error)))
+            self.invalidate_memoized()
 
     def secure_storage_pool(self, check_mode=False):
         """Enable security on an existing storage pool"""
@@ -837,6 +832,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
             except Exception as error:
                 self.module.fail_json(msg="Failed to secure storage pool. Pool id [%s]. Array [%s]. Error"
                                           " [%s]." % (self.pool_detail["id"], self.ssid, to_native(error)))
+            self.invalidate_memoized()
 
         self.pool_detail = self.storage_pool
         return needs_secure_pool
@@ -856,6 +852,7 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
             except Exception as error:
                 self.module.fail_json(msg="Failed to change the raid level of storage pool. Array id [%s]."
                                           " Error [%s]." % (self.ssid, to_native(error)))
+            self.invalidate_memoized()
 
         self.pool_detail = self.storage_pool
         return needs_migration
@@ -888,13 +885,14 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
                 except Exception as error:
                     self.module.fail_json(msg="Failed to update DDP critical alert threshold! Pool [%s]. Array [%s]."
                                               " Error [%s]" % (self.name, self.ssid, to_native(error)))
+            self.invalidate_memoized()
         return needs_update
 
     def expand_storage_pool(self, check_mode=False):
         """Add drives to existing storage pool.
 
         :return bool: whether drives were required to be added to satisfy the specified criteria."""
-        expansion_candidate_list = self.get_expansion_candidate_drives()
+        expansion_candidate_list = list(self.get_expansion_candidate_drives())
         changed_required = bool(expansion_candidate_list)
         estimated_completion_time = 0.0
 
@@ -930,23 +928,30 @@ class NetAppESeriesStoragePool(NetAppESeriesModule):
 
                     self.module.fail_json(msg="Failed to add drives to storage pool. Pool id [%s]. Array id [%s]."
                                               " Error [%s]." % (self.pool_detail["id"], self.ssid, to_native(error)))
+                self.invalidate_memoized()
 
                 # Wait for expansion completion unless it is the last request in the candidate list
                 if required_expansion_candidate_list:
-                    for dummy in range(self.EXPANSION_TIMEOUT_SEC):
+                    elapsed = 0
+                    interval = None
+                    while elapsed < self.EXPANSION_TIMEOUT_SEC:
                         rc, actions_resp = self.request("storage-systems/%s/storage-pools/%s/action-progress"
                                                         % (self.ssid, self.pool_detail["id"]), ignore_errors=True)
                         if rc == 200:
                             for action in actions_resp:
                                 if (action["volumeRef"] in self.storage_pool_volumes and
                                         action["currentAction"] == "remappingDce"):
-                                    sleep(1)
                                     estimated_completion_time = action["estimatedTimeToCompletion"]
                                     break
                             else:
                                 estimated_completion_time = 0.0
                                 break
 
+                        # Back off between progress requests for the remainder of the allotted time.
+                        interval = get_poll_interval(interval, minimum=1, maximum=max(1, self.EXPANSION_TIMEOUT_SEC - elapsed))
+                        sleep(interval)
+                        elapsed += interval
+
         return changed_required, estimated_completion_time
 
     def apply(self):
@@ -28,8 +28,9 @@ options:
     name:
         description:
             - The name of the volume to manage.
+            - Mutually exclusive with I(volumes); one of I(name) or I(volumes) is required.
         type: str
-        required: true
+        required: false
     storage_pool_name:
         description:
             - Required only when requested I(state=="present").
@@ -50,7 +51,7 @@ options:
             - Size of the virtual volume in the case of a thin volume in I(size_unit).
             - Maximum virtual volume size of a thin provisioned volume is 256tb; however other OS-level restrictions may exist.
         type: float
-        required: true
+        required: false
     size_tolerance_b:
         description:
             - Tolerance for total volume size measured in bytes; so, if the total volumes size is within
@@ -224,9 +225,141 @@ options:
     wait_for_initialization:
         description:
             - Forces the module to wait for expansion operations to complete before continuing.
+            - When I(volumes) is specified the operations of every volume are waited on together.
         type: bool
         default: false
         required: false
+    volumes:
+        description:
+            - List of volumes to manage in a single task.
+            - Volume, storage pool and workload tag information is retrieved once and the required changes for every volume are
+              applied concurrently using no more than I(max_workers) threads.
+            - Each entry inherits any option it does not specify from the corresponding module option.
+            - The result for each volume is returned in I(volumes) and a failure for one volume does not prevent the others
+              from being applied.
+            - Mutually exclusive with I(name).
+        type: list
+        elements: dict
+        required: false
+        suboptions:
+            name:
+                description:
+                    - The name of the volume to manage.
+                type: str
+                required: true
+            state:
+                description:
+                    - See I(state).
+                type: str
+                choices: ["present", "absent"]
+            storage_pool_name:
+                description:
+                    - See I(storage_pool_name).
+                type: str
+            size_unit:
+                description:
+                    - See I(size_unit).
+                type: str
+                choices: ["bytes", "b", "kb", "mb", "gb", "tb", "pb", "eb", "zb", "yb", "pct"]
+            size:
+                description:
+                    - See I(size).
+                type: float
+            size_tolerance_b:
+                description:
+                    - See I(size_tolerance_b).
+                type: int
+            segment_size_kb:
+                description:
+                    - See I(segment_size_kb).
+                type: int
+            owning_controller:
+                description:
+                    - See I(owning_controller).
+                type: str
+                choices: ["A", "B"]
+            raid_level:
+                description:
+                    - See I(raid_level).
+                type: str
+                choices: ["raid1", "raid6"]
+            ssd_cache_enabled:
+                description:
+                    - See I(ssd_cache_enabled).
+                type: bool
+            data_assurance_enabled:
+                description:
+                    - See I(data_assurance_enabled).
+                type: bool
+            thin_provision:
+                description:
+                    - See I(thin_provision).
+                type: bool
+            thin_volume_repo_size:
+                description:
+                    - See I(thin_volume_repo_size).
+                type: int
+            thin_volume_max_repo_size:
+                description:
+                    - See I(thin_volume_max_repo_size).
+                type: float
+            thin_volume_expansion_policy:
+                description:
+                    - See I(thin_volume_expansion_policy).
+                type: str
+                choices: ["automatic", "manual"]
+            thin_volume_growth_alert_threshold:
+                description:
+                    - See I(thin_volume_growth_alert_threshold).
+                type: int
+            read_cache_enable:
+                description:
+                    - See I(read_cache_enable).
+                type: bool
+            read_ahead_enable:
+                description:
+                    - See I(read_ahead_enable).
+                type: bool
+            write_cache_enable:
+                description:
+                    - See I(write_cache_enable).
+                type: bool
+            write_cache_mirror_enable:
+                description:
+                    - See I(write_cache_mirror_enable).
+                type: bool
+            cache_without_batteries:
+                description:
+                    - See I(cache_without_batteries).
+                type: bool
+            workload_name:
+                description:
+                    - See I(workload_name).
+                type: str
+            workload_metadata:
+                description:
+                    - See I(workload_metadata).
+                type: dict
+                aliases:
+                    - metadata
+            volume_metadata:
+                description:
+                    - See I(volume_metadata).
+                type: dict
+            allow_expansion:
+                description:
+                    - See I(allow_expansion).
+                type: bool
+            wait_for_initialization:
+                description:
+                    - See I(wait_for_initialization).
+                type: bool
+    max_workers:
+        description:
+            - Maximum number of concurrent requests used when I(volumes) is specified.
+        type: int
+        default: 8
+        required: false
 """
 EXAMPLES = """
 - name: Create simple volume with workload tags (volume meta data)
@@ -303,6 +436,24 @@ EXAMPLES = """
     validate_certs: true
     state: absent
     name: volume
+
+- name: Create many volumes in a single task
+  na_santricity_volume:
+    ssid: "1"
+    api_url: "https://192.168.1.100:8443/devmgr/v2"
+    api_username: "admin"
+    api_password: "adminpass"
+    validate_certs: true
+    storage_pool_name: storage_pool
+    size: 100
+    size_unit: gb
+    max_workers: 16
+    volumes:
+      - name: volume1
+      - name: volume2
+        size: 200
+      - name: volume3
+        state: absent
 """
 RETURN = """
 msg:
@@ -310,11 +461,20 @@ msg:
     type: str
     returned: always
     sample: "Standard volume [workload_vol_1] has been created."
+volumes:
+    description: Result for each volume when I(volumes) is specified.
+    type: list
+    elements: dict
+    returned: when I(volumes) is specified
+    sample: [{"name": "volume1", "changed": true, "msg": "Volume [volume1] has been created."},
+             {"name": "volume2", "changed": false, "msg": "Volume [volume2] exists."}]
 """
 
 import time
 
-from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModule
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import (
+    NetAppESeriesModule, NetAppESeriesModuleError, eseries_max_workers_argument_spec, memoize, run_concurrently)
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity_operations import NetAppESeriesLongLivedOperations
 from ansible.module_utils._text import to_native
 
 
@@ -327,10 +487,10 @@ class NetAppESeriesVolume(NetAppESeriesModule):
     def __init__(self):
         ansible_options = dict(
             state=dict(choices=["present", "absent"], default="present"),
-            name=dict(required=True, type="str"),
+            name=dict(type="str"),
             storage_pool_name=dict(type="str"),
             size_unit=dict(default="gb", choices=["bytes", "b", "kb", "mb", "gb", "tb", "pb", "eb", "zb", "yb", "pct"], type="str"),
-            size=dict(type="float", required=True),
+            size=dict(type="float", required=False),
             size_tolerance_b=dict(type="int", required=False, default=10485760),
             segment_size_kb=dict(type="int", default=128, required=False),
             owning_controller=dict(type="str", choices=["A", "B"], required=False),
@@ -351,19 +511,57 @@ class NetAppESeriesVolume(NetAppESeriesModule):
             workload_metadata=dict(type="dict", required=False, aliases=["metadata"]),
             volume_metadata=dict(type="dict", required=False),
             allow_expansion=dict(type="bool", default=False),
-            wait_for_initialization=dict(type="bool", default=False))
-
-        required_if = [
-            ["state", "present", ["storage_pool_name", "size"]],
-            ["thin_provision", "true", ["thin_volume_repo_size"]]
-        ]
+            wait_for_initialization=dict(type="bool", default=False),
+            volumes=dict(type="list", elements="dict", required=False, options=dict(
+                name=dict(type="str", required=True),
+                state=dict(type="str", choices=["present", "absent"]),
+                storage_pool_name=dict(type="str"),
+                size_unit=dict(type="str", choices=["bytes", "b", "kb", "mb", "gb", "tb", "pb", "eb", "zb", "yb", "pct"]),
+                size=dict(type="float"),
+                size_tolerance_b=dict(type="int"),
+                segment_size_kb=dict(type="int"),
+                owning_controller=dict(type="str", choices=["A", "B"]),
+                raid_level=dict(type="str", choices=["raid1", "raid6"]),
+                ssd_cache_enabled=dict(type="bool"),
+                data_assurance_enabled=dict(type="bool"),
+                thin_provision=dict(type="bool"),
+                thin_volume_repo_size=dict(type="int"),
+                thin_volume_max_repo_size=dict(type="float"),
+                thin_volume_expansion_policy=dict(type="str", choices=["automatic", "manual"]),
+                thin_volume_growth_alert_threshold=dict(type="int"),
+                read_cache_enable=dict(type="bool"),
+                read_ahead_enable=dict(type="bool"),
+                write_cache_enable=dict(type="bool"),
+                write_cache_mirror_enable=dict(type="bool"),
+                cache_without_batteries=dict(type="bool"),
+                workload_name=dict(type="str"),
+                workload_metadata=dict(type="dict", aliases=["metadata"]),
+                volume_metadata=dict(type="dict"),
+                allow_expansion=dict(type="bool"),
+                wait_for_initialization=dict(type="bool"))))
+        ansible_options.update(eseries_max_workers_argument_spec())
+
+        mutually_exclusive = [["name", "volumes"]]
+        required_one_of = [["name", "volumes"]]
 
         super(NetAppESeriesVolume, self).__init__(ansible_options=ansible_options,
                                                   web_services_version="02.00.0000.0000",
                                                   supports_check_mode=True,
-                                                  required_if=required_if)
+                                                  mutually_exclusive=mutually_exclusive,
+                                                  required_one_of=required_one_of)
 
         args = self.module.params
+        self.volumes = args["volumes"]
+        self.max_workers = args["max_workers"]
+
+        if self.volumes is None:
+            self.set_volume_parameters(args)
+
+    def set_volume_parameters(self, args):
+        """Set the volume's expected state from the module parameters or from a volumes entry merged with them.
+
+        :raise AnsibleFailJson when the volume's parameters are invalid.
+        """
         self.state = args["state"]
         self.name = args["name"]
         self.storage_pool_name = args["storage_pool_name"]
@@ -372,6 +570,12 @@ class NetAppESeriesVolume(NetAppESeriesModule):
         self.segment_size_kb = args["segment_size_kb"]
         self.raid_level = args.get("raid_level")
 
+        if self.state == "present":
+            missing = [option for option in ["storage_pool_name", "size"] if args[option] is None]
+            if missing:
+                self.module.fail_json(msg="state is present but all of the following are missing: %s. Volume [%s]. Array [%s]."
+                                          % (", ".join(missing), self.name, self.ssid))
+
         if args["size"]:
             if self.size_unit == "pct":
                 if args["thin_provision"]:
@@ -472,8 +676,9 @@ class NetAppESeriesVolume(NetAppESeriesModule):
         segment_count = int(size_bytes / segment_size_bytes)
         return segment_count * segment_size_bytes
 
-    def get_volume(self):
-        """Retrieve volume details from storage array."""
+    @memoize
+    def get_volumes(self):
+        """Retrieve the thick and thin volumes from the storage array keyed by name."""
         volumes = list()
         thin_volumes = list()
         try:
@@ -487,60 +692,50 @@ class NetAppESeriesVolume(NetAppESeriesModule):
             self.module.fail_json(msg="Failed to obtain list of thin volumes.  Array Id [%s]. Error[%s]."
                                       % (self.ssid, to_native(err)))
 
-        volume_detail = [volume for volume in volumes + thin_volumes if volume["name"] == self.name]
-        return volume_detail[0] if volume_detail else dict()
+        return dict((volume["name"], volume) for volume in volumes + thin_volumes)
+
+    def get_volume(self):
+        """Retrieve volume details from storage array."""
+        return self.get_volumes().get(self.name, dict())
 
     def wait_for_volume_availability(self, retries=VOLUME_CREATION_BLOCKING_TIMEOUT_SEC / 5):
         """Waits until volume becomes available.
 
         :raises AnsibleFailJson when retries are exhausted.
         """
-        if retries == 0:
-            self.module.fail_json(msg="Timed out waiting for the volume %s to become available. Array [%s]."
-                                      % (self.name, self.ssid))
-        if not self.get_volume():
+        while retries > 0:
+            self.invalidate_memoized("get_volumes")
+            if self.get_volume():
+                return
             time.sleep(5)
-            self.wait_for_volume_availability(retries=retries - 1)
+            retries -= 1
+
+        self.module.fail_json(msg="Timed out waiting for the volume %s to become available. Array [%s]."
+                                  % (self.name, self.ssid))
 
     def wait_for_volume_action(self, timeout=None):
         """Waits until volume action is complete is complete.
         :param: int timeout: Wait duration measured in seconds. Waits indefinitely when None.
         """
-        action = "unknown"
-        percent_complete = None
-        while action != "complete":
-            time.sleep(5)
-
-            try:
-                rc, operations = self.request("storage-systems/%s/symbol/getLongLivedOpsProgress" % self.ssid)
-
-                # Search long lived operations for volume
-                action = "complete"
-                for operation in operations["longLivedOpsProgress"]:
-                    if operation["volAction"] is not None:
-                        for key in operation.keys():
-                            if (operation[key] is not None and "volumeRef" in operation[key] and
-                                    (operation[key]["volumeRef"] == self.volume_detail["id"] or
-                                     ("storageVolumeRef" in self.volume_detail and operation[key]["volumeRef"] == self.volume_detail["storageVolumeRef"]))):
-                                action = operation["volAction"]
-                                percent_complete = operation["init"]["percentComplete"]
-            except Exception as err:
-                self.module.fail_json(msg="Failed to get volume expansion progress. Volume [%s]. Array Id [%s]."
-                                          " Error[%s]." % (self.name, self.ssid, to_native(err)))
-
-            if timeout is not None:
-                if timeout <= 0:
-                    self.module.warn("Expansion action, %s, failed to complete during the allotted time. Time remaining"
-                                     " [%s]. Array Id [%s]." % (action, percent_complete, self.ssid))
-                    self.module.fail_json(msg="Expansion action failed to complete. Time remaining [%s]. Array Id [%s]." % (percent_complete, self.ssid))
-                if timeout:
-                    timeout -= 5
-
-            self.module.log("Expansion action, %s, is %s complete." % (action, percent_complete))
+        operations = NetAppESeriesLongLivedOperations(self)
+        operations.watch(self.name, self.volume_detail)
+        try:
+            incomplete = operations.wait(timeout)
+        except Exception as err:
+            self.module.fail_json(msg="Failed to get volume expansion progress. Volume [%s]. Array Id [%s]."
+                                      " Error[%s]." % (self.name, self.ssid, to_native(err)))
+
+        if incomplete:
+            progress = operations.progress[self.name]
+            self.module.warn("Expansion action, %s, failed to complete during the allotted time. Percent complete"
+                             " [%s]. Array Id [%s]." % (progress["action"], progress["percent_complete"], self.ssid))
+            self.module.fail_json(msg="Expansion action failed to complete. Percent complete [%s]. Array Id [%s]."
+                                      % (progress["percent_complete"], self.ssid))
         self.module.log("Expansion action is complete.")
 
-    def get_storage_pool(self):
-        """Retrieve storage pool details from the storage array."""
+    @memoize
+    def get_storage_pools(self):
+        """Retrieve the storage pools from the storage array keyed by name."""
         storage_pools = list()
         try:
             rc, storage_pools = self.request("storage-systems/%s/storage-pools" % self.ssid)
@@ -548,8 +743,21 @@ class NetAppESeriesVolume(NetAppESeriesModule):
             self.module.fail_json(msg="Failed to obtain list of storage pools.  Array Id [%s]. Error[%s]."
                                       % (self.ssid, to_native(err)))
 
-        pool_detail = [storage_pool for storage_pool in storage_pools if storage_pool["name"] == self.storage_pool_name]
-        return pool_detail[0] if pool_detail else dict()
+        return dict((storage_pool["name"], storage_pool) for storage_pool in storage_pools)
+
+    def get_storage_pool(self):
+        """Retrieve storage pool details from the storage array."""
+        return self.get_storage_pools().get(self.storage_pool_name, dict())
+
+    @memoize
+    def get_workload_tags(self):
+        """Retrieve the storage array workload tags."""
+        workload_tags = list()
+        try:
+            rc, workload_tags = self.request("storage-systems/%s/workloads" % self.ssid)
+        except Exception as error:
+            self.module.fail_json(msg="Failed to retrieve storage array workload tags. Array [%s]" % self.ssid)
+        return workload_tags
 
     def check_storage_pool_sufficiency(self):
         """Perform a series of checks as to the sufficiency of the storage pool for the volume."""
@@ -589,11 +797,7 @@ class NetAppESeriesVolume(NetAppESeriesModule):
         ansible_profile_id = None
 
         if self.workload_name:
-            try:
-                rc, workload_tags = self.request("storage-systems/%s/workloads" % self.ssid)
-            except Exception as error:
-                self.module.fail_json(msg="Failed to retrieve storage array workload tags. Array [%s]" % self.ssid)
-
+            workload_tags = self.get_workload_tags()
             ansible_profile_id = "Other_1"
             request_body = dict(name=self.workload_name,
                                 profileId=ansible_profile_id,
@@ -629,6 +833,7 @@ class NetAppESeriesVolume(NetAppESeriesModule):
                         except Exception as error:
                             self.module.fail_json(msg="Failed to create new workload tag. Array [%s]. Error [%s]"
                                                       % (self.ssid, to_native(error)))
+                        self.invalidate_memoized("get_workload_tags")
                         self.module.log("Workload tag [%s] required change." % self.workload_name)
                     break
 
@@ -654,6 +859,7 @@ class NetAppESeriesVolume(NetAppESeriesModule):
                     except Exception as error:
                         self.module.fail_json(msg="Failed to create new workload tag. Array [%s]. Error [%s]"
                                                   % (self.ssid, to_native(error)))
+                    self.invalidate_memoized("get_workload_tags")
                 self.module.log("Workload tag [%s] was added." % self.workload_name)
 
         return change_required
@@ -800,14 +1006,17 @@ class NetAppESeriesVolume(NetAppESeriesModule):
                                           % (self.name, self.ssid, to_native(error)))
             self.module.log("New volume created [%s]." % self.name)
 
-    def update_volume_properties(self):
+    def update_volume_properties(self, refresh=True):
         """Update existing thin-volume or volume properties.
 
+        :param bool refresh: whether to wait for and retrieve the volume details first; the caller is otherwise responsible
+                             for volume_detail being current.
         :raise AnsibleFailJson when either thick/thin volume update request fails.
         :return bool: whether update was applied
         """
-        self.wait_for_volume_availability()
-        self.volume_detail = self.get_volume()
+        if refresh:
+            self.wait_for_volume_availability()
+            self.volume_detail = self.get_volume()
 
         request_body = self.get_volume_property_changes()
 
@@ -875,13 +1084,13 @@ class NetAppESeriesVolume(NetAppESeriesModule):
                                           % (self.name, self.ssid, to_native(error)))
             self.module.log("Volume deleted [%s]." % self.name)
 
-    def apply(self):
-        """Determine and apply any changes necessary to satisfy the specified criteria.
+    def get_required_change(self):
+        """Retrieve the volume and storage pool details and determine whether any changes need to be applied.
 
-        :raise AnsibleExitJson when completes successfully"""
+        :raise AnsibleFailJson when the requested changes are invalid.
+        :return bool: whether changes are required.
+        """
         change = False
-        msg = None
-
         self.volume_detail = self.get_volume()
         self.pool_detail = self.get_storage_pool()
 
@@ -916,6 +1125,170 @@ class NetAppESeriesVolume(NetAppESeriesModule):
             change = True
 
         self.module.log("Update required: [%s]." % change)
+        return change
+
+    def update_existing_volume(self, msg=None, refresh=True):
+        """Update the properties and expand the existing thick/thin volume when required.
+
+        :param str msg: message describing the changes that have already been applied.
+        :param bool refresh: whether to wait for and retrieve the volume details before updating its properties.
+        :return str: message describing the changes applied.
+        """
+        if self.update_volume_properties(refresh=refresh):
+            msg = "Volume [%s] properties were updated."
+
+        if self.get_expand_volume_changes():
+            self.expand_volume()
+            msg = msg[:-1] + " and was expanded." if msg else "Volume [%s] was expanded."
+        return msg
+
+    def get_bulk_volume(self, entry):
+        """Create the volume instance for a volumes list entry.
+
+        Entries inherit any option they do not specify from the module parameters. The instance shares the memoized storage
+        array information and reports failures by raising NetAppESeriesModuleError rather than ending the module.
+        """
+        volume = self.get_bulk_entry(dict(name=entry["name"], changed=False, msg=None))
+        volume.msg = None
+        volume.set_volume_parameters(self.get_bulk_entry_args(entry))
+        return volume
+
+    def wait_for_volumes_availability(self, volumes, retries=VOLUME_CREATION_BLOCKING_TIMEOUT_SEC / 5):
+        """Wait until every created volume becomes available and update their volume details.
+
+        :return list: volumes that did not become available.
+        """
+        pending = list(volumes)
+        while pending and retries > 0:
+            self.invalidate_memoized("get_volumes")
+            for volume in list(pending):
+                volume.volume_detail = volume.get_volume()
+                if volume.volume_detail:
+                    pending.remove(volume)
+            if pending:
+                retries -= 1
+                time.sleep(5)
+        return pending
+
+    def apply_volumes(self):
+        """Determine and apply the changes necessary for every entry in the volumes list.
+
+        Volume, storage pool and workload tag information is retrieved once and shared by every volume. Workload tags are
+        updated first, followed by volume creations, property updates and expansions, and deletions each issued using no more
+        than max_workers threads. A failure for one volume is reported in its result without preventing the others from
+        being applied.
+
+        :raise AnsibleExitJson when every volume completes successfully"""
+        names = [entry["name"] for entry in self.volumes]
+        duplicates = sorted(set(name for name in names if names.count(name) > 1))
+        if duplicates:
+            self.module.fail_json(msg="Volume names must be unique. Duplicates [%s]. Array [%s]." % (", ".join(duplicates), self.ssid))
+
+        self.get_volumes()
+        self.get_storage_pools()
+
+        results = []
+        volumes = []
+        for entry in self.volumes:
+            try:
+                volume = self.get_bulk_volume(entry)
+                results.append(volume.result)
+                if volume.get_required_change():
+                    volume.result["changed"] = True
+                    volumes.append(volume)
+                else:
+                    volume.result["msg"] = ("Volume [%s] does not exist." if volume.state == "absent" else "Volume [%s] exists.") % volume.name
+            except NetAppESeriesModuleError as error:
+                results.append(dict(name=entry["name"], changed=False, failed=True, msg=str(error)))
+
+        if not self.module.check_mode:
+            for volume in volumes:
+                volume.result["changed"] = False
+
+            def fail(volume, error):
+                volume.result.update(failed=True, msg=str(error))
+                volumes.remove(volume)
+
+            # Workload tags are shared between volumes so they must be applied in order.
+            for volume in [volume for volume in volumes if volume.state == "present"]:
+                try:
+                    if volume.update_workload_tags():
+                        volume.result["changed"] = True
+                        volume.msg = "Workload tag change occurred."
+                except NetAppESeriesModuleError as error:
+                    fail(volume, error)
+
+            def create(volume):
+                volume.check_storage_pool_sufficiency()
+                volume.create_volume()
+
+            created = [volume for volume in volumes if volume.state == "present" and not volume.volume_detail]
+            for volume, result, error in run_concurrently(create, created, self.max_workers):
+                if error:
+                    fail(volume, error)
+                    created.remove(volume)
+                else:
+                    volume.result["changed"] = True
+                    volume.msg = volume.msg[:-1] + " and volume [%s] was created." if volume.msg else "Volume [%s] has been created."
+
+            for volume in self.wait_for_volumes_availability(created):
+                fail(volume, "Timed out waiting for the volume %s to become available. Array [%s]." % (volume.name, self.ssid))
+                created.remove(volume)
+
+            def update(volume):
+                if volume in created:
+                    volume.update_volume_properties(refresh=False)
+                else:
+                    volume.msg = volume.update_existing_volume(volume.msg, refresh=False)
+                    volume.result["changed"] = True
+
+            updated = [volume for volume in volumes if volume.state == "present"]
+            for volume, result, error in run_concurrently(update, updated, self.max_workers):
+                if error:
+                    fail(volume, error)
+
+            # Wait for the operations of every volume together rather than one volume after another.
+            waiting = [volume for volume in volumes if volume.state == "present" and volume.wait_for_initialization]
+            if waiting:
+                self.module.log("Waiting for volume operations to complete.")
+                operations = NetAppESeriesLongLivedOperations(self)
+                for volume in waiting:
+                    operations.watch(volume.name, volume.volume_detail)
+                try:
+                    operations.wait()
+                except Exception as error:
+                    for volume in waiting:
+                        fail(volume, "Failed to get volume expansion progress. Volume [%s]. Array Id [%s]. Error[%s]."
+                                     % (volume.name, self.ssid, to_native(error)))
+
+            def delete(volume):
+                volume.delete_volume()
+                volume.result["changed"] = True
+                volume.msg = "Volume [%s] has been deleted."
+
+            deleted = [volume for volume in volumes if volume.state == "absent"]
+            for volume, result, error in run_concurrently(delete, deleted, self.max_workers):
+                if error:
+                    fail(volume, error)
+
+            for volume in volumes:
+                volume.result["msg"] = volume.msg % volume.name if volume.msg and "%s" in volume.msg else volume.msg
+
+        for result in results:
+            if result["msg"] is None:
+                result["msg"] = "Volume [%s] requires changes." % result["name"]
+
+        self.exit_bulk_results(results, "volumes", volumes=results)
+
+    def apply(self):
+        """Determine and apply any changes necessary to satisfy the specified criteria.
+
+        :raise AnsibleExitJson when completes successfully"""
+        if self.volumes is not None:
+            self.apply_volumes()
+
+        msg = None
+        change = self.get_required_change()
 
         # Apply any necessary changes
         if change and not self.module.check_mode:
@@ -929,12 +1302,7 @@ class NetAppESeriesVolume(NetAppESeriesModule):
                     self.update_volume_properties()
                     msg = msg[:-1] + " and volume [%s] was created." if msg else "Volume [%s] has been created."
                 else:
-                    if self.update_volume_properties():
-                        msg = "Volume [%s] properties were updated."
-
-                    if self.get_expand_volume_changes():
-                        self.expand_volume()
-                        msg = msg[:-1] + " and was expanded." if msg else "Volume [%s] was expanded."
+                    msg = self.update_existing_volume(msg)
 
                 if self.wait_for_initialization:
                     self.module.log("Waiting for volume operation to complete.")
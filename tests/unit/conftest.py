@@ -0,0 +1,27 @@
+# (c) 2024, NetApp, Inc
+# BSD-3 Clause (see COPYING or https://opensource.org/licenses/BSD-3-Clause)
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import pytest
+from ansible_collections.community.internal_test_tools.tests.unit.compat import mock
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import (about_cache, certificate_cache, discovery_cache,
+                                                                                           file_manifest_cache, snapshot_cache)
+
+CACHES = [about_cache, certificate_cache, discovery_cache, file_manifest_cache, snapshot_cache]
+
+
+@pytest.fixture(autouse=True)
+def isolate_caches(tmp_path):
+    """Ensure cached values are neither shared between tests nor persisted outside of the test's temporary directory."""
+    paths = [cache.path for cache in CACHES]
+    for cache in CACHES:
+        cache.clear()
+        cache.path = str(tmp_path / ("%s.json" % id(cache)))
+
+    with mock.patch("tempfile.gettempdir", return_value=str(tmp_path)):
+        yield
+
+    for cache, path in zip(CACHES, paths):
+        cache.clear()
+        cache.path = path
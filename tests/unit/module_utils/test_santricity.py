@@ -0,0 +1,455 @@
+# (c) 2024, NetApp, Inc
+# BSD-3 Clause (see COPYING or https://opensource.org/licenses/BSD-3-Clause)
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+from ansible.module_utils.six.moves.urllib.error import HTTPError
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesCache, NetAppESeriesModule, get_cache_path
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesModuleError, NetAppESeriesSession
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import create_multipart_formdata, iter_concurrently, run_concurrently
+from ansible_collections.community.internal_test_tools.tests.unit.compat import mock
+
+
+class FakeResponse(object):
+    def __init__(self, status, body=b"{}", will_close=False):
+        self.status = status
+        self.reason = "reason"
+        self.msg = {}
+        self.body = body
+        self.will_close = will_close
+
+    def read(self):
+        return self.body
+
+
+class FakeConnection(object):
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.sock = None
+        self.timeout = None
+        self.closed = False
+
+    def request(self, method, path, body=None, headers=None):
+        self.requests.append((method, path, body, dict(headers)))
+
+    def getresponse(self):
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def close(self):
+        self.closed = True
+
+
+class SessionTest(unittest.TestCase):
+    URL = "https://192.168.1.100:8443/devmgr/v2/storage-systems"
+
+    def _open(self, session, connections, **kwargs):
+        with mock.patch.object(NetAppESeriesSession, "_connect", side_effect=connections):
+            return session.open(self.URL, use_proxy=False, validate_certs=False, url_username="admin", url_password="adminpass", **kwargs)
+
+    def test_checkout_checkin_pass(self):
+        """Verify idle connections are reused per credential set and surplus connections are closed."""
+        session = NetAppESeriesSession()
+        first = FakeConnection([FakeResponse(200), FakeResponse(200)])
+        self.assertEqual(self._open(session, [first]).read(), b"{}")
+        self.assertEqual(self._open(session, []).getcode(), 200)
+        self.assertEqual(len(first.requests), 2)
+        self.assertEqual(session.statistics, dict(new=1, reused=1, fallback=0))
+
+        with mock.patch.object(NetAppESeriesSession, "_connect", side_effect=[FakeConnection([FakeResponse(200)])]) as connect:
+            session.open(self.URL, use_proxy=False, validate_certs=False, url_username="monitor", url_password="monitorpass")
+        connect.assert_called_once()
+
+        key = ("https", "192.168.1.100:8443", False, "admin", "adminpass")
+        connections = [FakeConnection([]) for index in range(NetAppESeriesSession.MAX_IDLE_CONNECTIONS + 1)]
+        for connection in connections:
+            session._checkin(key, connection)
+        self.assertEqual(len(session.idle_connections[key]), NetAppESeriesSession.MAX_IDLE_CONNECTIONS)
+        self.assertTrue(connections[-1].closed)
+
+        session.close()
+        self.assertTrue(all(connection.closed for connection in connections))
+        self.assertEqual(session.idle_connections, dict())
+
+    def test_open_retry_pass(self):
+        """Verify idempotent requests are retried on a new connection when a reused connection has been closed."""
+        session = NetAppESeriesSession()
+        stale = FakeConnection([FakeResponse(200), socket.error("connection reset")])
+        fresh = FakeConnection([FakeResponse(200)])
+        self._open(session, [stale])
+        self.assertEqual(self._open(session, [fresh]).getcode(), 200)
+        self.assertTrue(stale.closed)
+        self.assertEqual(len(fresh.requests), 1)
+
+        unauthorized = FakeConnection([FakeResponse(401), FakeResponse(200)])
+        self.assertEqual(self._open(NetAppESeriesSession(), [unauthorized], data="{}", method="POST").getcode(), 200)
+        self.assertNotIn("Authorization", unauthorized.requests[0][3])
+        self.assertIn("Authorization", unauthorized.requests[1][3])
+
+    def test_open_stale_connection_pass(self):
+        """Verify idle connections closed by the server are discarded before a non-idempotent request is sent."""
+        session = NetAppESeriesSession()
+        stale = FakeConnection([FakeResponse(200)])
+        self._open(session, [stale])
+
+        client, server = socket.socketpair()
+        self.addCleanup(client.close)
+        stale.sock = client
+        server.close()
+
+        fresh = FakeConnection([FakeResponse(200)])
+        self.assertEqual(self._open(session, [fresh], data="{}", method="POST").getcode(), 200)
+        self.assertTrue(stale.closed)
+        self.assertEqual(len(stale.requests), 1)
+        self.assertEqual(fresh.requests[0][0], "POST")
+        self.assertEqual(session.statistics, dict(new=2, reused=0, fallback=0))
+
+    def test_open_retry_fail(self):
+        """Verify non-idempotent requests are not resent after a reused connection fails or the request is redirected."""
+        for method in ["POST", "DELETE"]:
+            session = NetAppESeriesSession()
+            stale = FakeConnection([FakeResponse(200), socket.error("connection reset")])
+            self._open(session, [stale])
+            with self.assertRaises(socket.error):
+                self._open(session, [FakeConnection([FakeResponse(200)])], data="{}", method=method)
+            self.assertEqual(len(stale.requests), 2)
+
+        with self.assertRaises(HTTPError):
+            self._open(NetAppESeriesSession(), [FakeConnection([FakeResponse(302)])], data="{}", method="POST")
+        self.assertIsNone(self._open(NetAppESeriesSession(), [FakeConnection([FakeResponse(302)])]))
+
+        with self.assertRaises(HTTPError):
+            self._open(NetAppESeriesSession(), [FakeConnection([FakeResponse(404)])])
+
+
+class CacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "cache.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_get_cache_path_pass(self):
+        """Verify the cache directory is only created, for the current user only, once a cache is persisted."""
+        with mock.patch("tempfile.gettempdir", return_value=self.directory):
+            path = get_cache_path("about_cache.json")
+        self.assertEqual(path, os.path.join(self.directory, "netapp_eseries_santricity_%s" % os.getuid(), "about_cache.json"))
+        self.assertFalse(os.path.exists(os.path.dirname(path)))
+
+        NetAppESeriesCache(path).set("key", "value", 60)
+        self.assertEqual(os.stat(os.path.dirname(path)).st_mode & 0o777, 0o700)
+        self.assertEqual(NetAppESeriesCache(path).get("key", 60), "value")
+
+    def test_get_cache_path_fail(self):
+        """Verify persistence is disabled when the cache directory is accessible to other users or is not a directory."""
+        directory = os.path.join(self.directory, "netapp_eseries_santricity_%s" % os.getuid())
+        with mock.patch("tempfile.gettempdir", return_value=self.directory):
+            path = get_cache_path("about_cache.json")
+        os.mkdir(directory, 0o700)
+        NetAppESeriesCache(path).set("key", "value", 60)
+        os.chmod(directory, 0o777)
+        self.assertIsNone(NetAppESeriesCache(path).get("key", 60))
+        NetAppESeriesCache(path).set("key2", "value", 60)
+        os.chmod(directory, 0o700)
+        self.assertEqual(list(NetAppESeriesCache(path)._load().keys()), ["key"])
+
+        shutil.rmtree(directory)
+        os.symlink(self.directory, directory)
+        NetAppESeriesCache(path).set("key", "value", 60)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "about_cache.json")))
+
+    def test_save_load_pass(self):
+        """Verify values persisted by one cache are loaded by another within the time-to-live."""
+        NetAppESeriesCache(self.path).set("key", {"value": [1, 2]}, 60)
+        self.assertEqual(os.stat(self.path).st_mode & 0o077, 0)
+        self.assertEqual(NetAppESeriesCache(self.path).get("key", 60), {"value": [1, 2]})
+        self.assertEqual(sorted(os.listdir(self.directory)), ["cache.json", "cache.json.lock"])
+
+        cache = NetAppESeriesCache(self.path)
+        cache.set("key2", "value2", 60)
+        self.assertEqual(sorted(NetAppESeriesCache(self.path)._load().keys()), ["key", "key2"])
+
+    def test_ttl_pass(self):
+        """Verify persisted entries are ignored when ttl is zero or the entry has expired and are only memoized otherwise."""
+        NetAppESeriesCache(self.path).set("key", "value", 60)
+        self.assertIsNone(NetAppESeriesCache(self.path).get("key"))
+        with mock.patch("time.time", return_value=time.time() + 120):
+            self.assertIsNone(NetAppESeriesCache(self.path).get("key", 60))
+            NetAppESeriesCache(self.path).set("key2", "value2", 60)
+        self.assertEqual(list(NetAppESeriesCache(self.path)._load().keys()), ["key2"])
+
+        # Entries are kept for their own ttl regardless of the ttl of other writers.
+        NetAppESeriesCache(self.path).set("long", "value", 3600)
+        with mock.patch("time.time", return_value=time.time() + 120):
+            NetAppESeriesCache(self.path).set("short", "value", 60)
+            self.assertEqual(NetAppESeriesCache(self.path).get("long", 3600), "value")
+            self.assertIsNone(NetAppESeriesCache(self.path).get("long", 60))
+        with mock.patch("time.time", return_value=time.time() + 240):
+            NetAppESeriesCache(self.path).set("other", "value", 3600)
+            self.assertIsNone(NetAppESeriesCache(self.path).get("short", 3600))
+        self.assertEqual(sorted(NetAppESeriesCache(self.path)._load().keys()), ["long", "other"])
+
+        cache = NetAppESeriesCache(self.path)
+        cache.set("memoized", "value")
+        self.assertEqual(cache.get("memoized"), "value")
+        self.assertNotIn("memoized", NetAppESeriesCache(self.path)._load())
+        cache.clear()
+        self.assertIsNone(cache.get("memoized"))
+
+    def test_load_fail(self):
+        """Verify corrupt, untrusted and linked cache files are ignored."""
+        for content in ["{not json", "[1, 2]", json.dumps({"key": "value"}), json.dumps({"key": {"timestamp": "now", "value": "value"}})]:
+            with open(self.path, "w") as fh:
+                fh.write(content)
+            self.assertIsNone(NetAppESeriesCache(self.path).get("key", 60))
+
+        NetAppESeriesCache(self.path).set("key", "value", 60)
+        os.chmod(self.path, 0o666)
+        self.assertIsNone(NetAppESeriesCache(self.path).get("key", 60))
+        os.chmod(self.path, 0o600)
+        with mock.patch("os.getuid", return_value=os.getuid() + 1):
+            self.assertIsNone(NetAppESeriesCache(self.path).get("key", 60))
+
+        link = os.path.join(self.directory, "link.json")
+        os.symlink(self.path, link)
+        self.assertIsNone(NetAppESeriesCache(link).get("key", 60))
+
+    def test_save_fail(self):
+        """Verify values are still memoized when the cache cannot be persisted."""
+        cache = NetAppESeriesCache(os.path.join(self.directory, "missing", "cache.json"))
+        cache.set("key", "value", 60)
+        self.assertEqual(cache.get("key", 60), "value")
+
+        cache = NetAppESeriesCache(None)
+        cache.set("key", "value", 60)
+        self.assertEqual(cache.get("key", 60), "value")
+
+    def test_set_lock_pass(self):
+        """Verify updates from concurrent writers are not lost."""
+        caches = [NetAppESeriesCache(self.path) for index in range(8)]
+        threads = [threading.Thread(target=cache.set, args=("key%s" % index, index, 60)) for index, cache in enumerate(caches)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(NetAppESeriesCache(self.path)._load()), 8)
+
+
+class AboutCacheTest(unittest.TestCase):
+    REQUEST_FUNC = "ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity.request"
+    ABOUT_CACHE_OBJ = "ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity.about_cache"
+    ABOUT = {"runningAsProxy": False, "version": "05.20.0000.0001"}
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = NetAppESeriesCache(os.path.join(self.directory, "about_cache.json"))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _get_module(self):
+        module = NetAppESeriesModule.__new__(NetAppESeriesModule)
+        module.module = mock.Mock()
+        module.url = "http://192.168.1.100:8080/devmgr/v2"
+        module.ssid = "1"
+        module.creds = dict(url_username="admin", url_password="adminpass", validate_certs=False)
+        module.keep_alive = False
+        module.about_cache_ttl = 60
+        return module
+
+    def test_get_web_services_about_pass(self):
+        """Verify the secure port fallback is cached and reused without probing the web services again."""
+        with mock.patch(self.ABOUT_CACHE_OBJ, self.cache):
+            with mock.patch(self.REQUEST_FUNC, side_effect=[(404, None), (200, self.ABOUT)]) as request:
+                module = self._get_module()
+                self.assertEqual(module._get_web_services_about(), self.ABOUT)
+            self.assertEqual(module.url, "https://192.168.1.100:8443/")
+            self.assertEqual(request.call_count, 2)
+
+            self.cache.clear()
+            with mock.patch(self.REQUEST_FUNC) as request:
+                module = self._get_module()
+                self.assertEqual(module._get_web_services_about(), self.ABOUT)
+            self.assertEqual(module.url, "https://192.168.1.100:8443/")
+            request.assert_not_called()
+
+    def test_get_web_services_about_fail(self):
+        """Verify a url persisted in the cache is never used as the request target."""
+        self.cache.set("about|http://192.168.1.100:8080/|admin", dict(url="https://attacker.example.com/", about=self.ABOUT), 60)
+        self.cache.clear()
+        with mock.patch(self.ABOUT_CACHE_OBJ, self.cache):
+            with mock.patch(self.REQUEST_FUNC) as request:
+                module = self._get_module()
+                self.assertEqual(module._get_web_services_about(), self.ABOUT)
+            self.assertEqual(module.url, "http://192.168.1.100:8080/")
+            request.assert_not_called()
+
+            self.cache.clear()
+            with mock.patch(self.REQUEST_FUNC, return_value=(200, self.ABOUT)) as request:
+                module = self._get_module()
+                module.creds["url_username"] = "monitor"
+                module._get_web_services_about()
+            request.assert_called_once()
+
+
+class BulkEntryTest(unittest.TestCase):
+
+    def _get_module(self):
+        module = NetAppESeriesModule.__new__(NetAppESeriesModule)
+        module.module = mock.Mock(params=dict(api_url="https://192.168.1.100:8443/devmgr/v2", state="present"))
+        module.module.exit_json.side_effect = SystemExit
+        module.module.fail_json.side_effect = SystemExit
+        module.url = "https://192.168.1.100:8443/devmgr/v2/"
+        module.ssid = "1"
+        module.creds = dict(url_username="admin", url_password="adminpass", validate_certs=True)
+        module.is_proxy_used_cache = True
+        module.is_embedded_available_cache = True
+        module.is_web_services_valid_cache = True
+        module.graph_cache = "graph"
+        module._memoized = dict(key="value")
+        return module
+
+    def test_get_bulk_entry_pass(self):
+        """Verify entries share the module's information unless they are for another storage system."""
+        module = self._get_module()
+        args = module.get_bulk_entry_args(dict(name="host1", state=None))
+        self.assertEqual(args, dict(api_url="https://192.168.1.100:8443/devmgr/v2", state="present", name="host1"))
+
+        entry = module.get_bulk_entry(dict(name="host1", changed=False))
+        self.assertEqual(entry.result, dict(name="host1", changed=False))
+        self.assertEqual(entry.graph_cache, "graph")
+        self.assertIs(entry._memoized, module._memoized)
+        with self.assertRaisesRegex(NetAppESeriesModuleError, "entry failure"):
+            entry.module.fail_json(msg="entry failure")
+
+        connection = dict(ssid="2", api_url="https://192.168.1.200:8443/devmgr/v2", api_username=None, api_password="password", validate_certs=False)
+        entry = module.get_bulk_entry(dict(ssid="2", changed=False), connection=connection)
+        self.assertEqual(entry.url, "https://192.168.1.200:8443/devmgr/v2/")
+        self.assertEqual(entry.creds, dict(url_username="admin", url_password="password", validate_certs=False))
+        self.assertEqual([entry.is_proxy_used_cache, entry.is_embedded_available_cache, entry.is_web_services_valid_cache, entry.graph_cache],
+                         [None, None, None, None])
+        self.assertEqual(entry._memoized, dict())
+        self.assertEqual(module.ssid, "1")
+        self.assertEqual(module._memoized, dict(key="value"))
+
+    def test_exit_bulk_results_pass(self):
+        """Verify the results of every entry are summarized."""
+        module = self._get_module()
+        results = [dict(name="host1", changed=True), dict(name="host2", changed=False)]
+        with self.assertRaises(SystemExit):
+            module.exit_bulk_results(results, "hosts", hosts=results)
+        module.module.exit_json.assert_called_once_with(msg="1 of 2 hosts required changes.", changed=True, hosts=results)
+
+    def test_exit_bulk_results_fail(self):
+        """Verify failed entries are reported by name."""
+        module = self._get_module()
+        results = [dict(group_name="group1", changed=True, failed=True), dict(group_name="group2", changed=False)]
+        with self.assertRaises(SystemExit):
+            module.exit_bulk_results(results, "snapshot groups", label="Groups", name_key="group_name", groups=results)
+        module.module.fail_json.assert_called_once_with(msg="Failed to apply changes to 1 of 2 snapshot groups. Groups [group1]. Array [1].",
+                                                        changed=True, groups=results)
+
+        module = self._get_module()
+        results = [dict(ssid="1", changed=False, upgrade_required=True, failed=True), dict(ssid="2", changed=False, upgrade_required=False)]
+        with self.assertRaises(SystemExit):
+            module.exit_bulk_results(results, "storage systems", label="Arrays", name_key="ssid", changed_key="upgrade_required", changes="upgrades",
+                                     action="upgrade", arrays=results)
+        module.module.fail_json.assert_called_once_with(msg="Failed to upgrade 1 of 2 storage systems. Arrays [1].", changed=True, arrays=results)
+
+        module = self._get_module()
+        results = [dict(ssid="1", changed=False, upgrade_required=True), dict(ssid="2", changed=False, upgrade_required=False)]
+        with self.assertRaises(SystemExit):
+            module.exit_bulk_results(results, "storage systems", name_key="ssid", changed_key="upgrade_required", changes="upgrades", arrays=results)
+        module.module.exit_json.assert_called_once_with(msg="1 of 2 storage systems required upgrades.", changed=True, arrays=results)
+
+
+class MultipartFormDataTest(unittest.TestCase):
+
+    def test_create_multipart_formdata_pass(self):
+        """Verify create_multipart_formdata streams the file contents with the expected content length."""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "test_firmware.dlp")
+            with open(path, "wb") as fh:
+                fh.write(b"x" * 20000)
+
+            log = []
+            headers, data = create_multipart_formdata(files=[("dlpfile", "test_firmware.dlp", path)], fields=[("validate", "true")], log=log.append)
+            body = b"".join(iter(lambda: data.read(4096), b""))
+            self.assertEqual(int(headers["Content-Length"]), len(body))
+            self.assertIn(b"x" * 20000 + b"\r\n", body)
+            self.assertIn(b'name="validate"\r\n\r\ntrue\r\n', body)
+            self.assertTrue(log[-1].startswith("Uploaded 100%"))
+
+            data.seek(0)
+            self.assertEqual(data.read(), body)
+
+            headers, data = create_multipart_formdata(files=[("dlpfile", "test_firmware.dlp", path)], send_8kb=True)
+            self.assertEqual(int(headers["Content-Length"]), len(data))
+            self.assertNotIn(b"x" * 8193, data.read())
+        finally:
+            shutil.rmtree(directory)
+
+    def test_create_multipart_formdata_empty_file_pass(self):
+        """Verify empty files are sent as empty parts."""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "empty.dlp")
+            open(path, "wb").close()
+
+            headers, data = create_multipart_formdata(files=[("dlpfile", "empty.dlp", path)], fields=[("validate", "true")])
+            body = b"".join(iter(lambda: data.read(4096), b""))
+            self.assertEqual(int(headers["Content-Length"]), len(body))
+            self.assertIn(b"Content-Type: application/octet-stream\r\n\r\n\r\n--", body)
+        finally:
+            shutil.rmtree(directory)
+
+
+class ConcurrencyTest(unittest.TestCase):
+
+    def test_run_concurrently_pass(self):
+        """Verify results are returned in the order the items were given and exceptions are returned with their item."""
+        def func(item):
+            if item == 3:
+                raise ValueError("bad item")
+            return item * 2
+
+        results = run_concurrently(func, range(5), 2)
+        self.assertEqual([(item, result) for item, result, error in results], [(0, 0), (1, 2), (2, 4), (3, None), (4, 8)])
+        self.assertEqual([str(error) for item, result, error in results if error], ["bad item"])
+
+    def test_run_concurrently_fail(self):
+        """Verify a worker that exits ends the call in the calling thread rather than waiting forever."""
+        started = []
+        lock = threading.Lock()
+
+        def func(item):
+            with lock:
+                started.append(item)
+            if item == 1:
+                raise SystemExit(1)
+            return item
+
+        with self.assertRaises(SystemExit):
+            run_concurrently(func, range(100), 1)
+        self.assertEqual(started, [0, 1])
+
+        def interrupt(item):
+            raise KeyboardInterrupt()
+
+        with self.assertRaises(KeyboardInterrupt):
+            list(iter_concurrently(interrupt, iter(range(10)), 4))
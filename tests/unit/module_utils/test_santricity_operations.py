@@ -0,0 +1,88 @@
+# (c) 2024, NetApp, Inc
+# BSD-3 Clause (see COPYING or https://opensource.org/licenses/BSD-3-Clause)
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import unittest
+
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity_operations import (
+    NetAppESeriesLongLivedOperations, get_poll_interval)
+from ansible_collections.community.internal_test_tools.tests.unit.compat import mock
+
+
+class LongLivedOperationsTest(unittest.TestCase):
+    SLEEP_FUNC = "ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity_operations.time.sleep"
+    VOLUME = {"id": "0200000001", "name": "volume1"}
+    THIN_VOLUME = {"id": "0200000002", "storageVolumeRef": "0200000003", "name": "thin_volume1"}
+
+    @staticmethod
+    def _progress(operations):
+        """Create a getLongLivedOpsProgress response from (action, volumeRef, percent complete, time to completion) tuples."""
+        return 200, {"longLivedOpsProgress": [{"volAction": action, "init": {"volumeRef": reference, "percentComplete": percent, "timeToCompletion": eta}}
+                                              for action, reference, percent, eta in operations]}
+
+    def _get_operations(self, responses):
+        module = mock.Mock(ssid="1")
+        module.request.side_effect = responses
+        operations = NetAppESeriesLongLivedOperations(module)
+        operations.watch("volume1", self.VOLUME)
+        operations.watch("thin_volume1", self.THIN_VOLUME)
+        return operations
+
+    def test_get_poll_interval_pass(self):
+        """Verify the interval starts at the minimum, backs off exponentially and follows the estimated time remaining."""
+        self.assertEqual(get_poll_interval(), 5)
+        self.assertEqual(get_poll_interval(previous=5), 10)
+        self.assertEqual(get_poll_interval(previous=40), 60)
+        self.assertEqual(get_poll_interval(previous=40, remaining=100), 25)
+        self.assertEqual(get_poll_interval(remaining=8), 5)
+        self.assertEqual(get_poll_interval(remaining=3600), 60)
+
+    def test_poll_pass(self):
+        """Verify the progress of every watched volume is retrieved with a single request."""
+        operations = self._get_operations([self._progress([("initializing", "0200000003", 40, 10), ("initializing", "0200000009", 10, 90),
+                                                           (None, "0200000001", None, None)])])
+        self.assertEqual(operations.in_progress(), ["thin_volume1", "volume1"])
+        self.assertEqual(operations.poll(), ["thin_volume1"])
+        self.assertEqual(operations.progress["thin_volume1"], dict(action="initializing", percent_complete=40, time_to_completion=10))
+        self.assertEqual(operations.progress["volume1"]["action"], "complete")
+        operations.module.request.assert_called_once_with("storage-systems/1/symbol/getLongLivedOpsProgress")
+
+    def test_estimate_remaining_pass(self):
+        """Verify the time remaining is taken from the storage system or estimated from the observed rate of progress."""
+        operations = self._get_operations([self._progress([("initializing", "0200000001", 20, None), ("expanding", "0200000003", 50, 2)]),
+                                           self._progress([("initializing", "0200000001", 30, -1), ("expanding", "0200000003", 60, 1)])])
+        operations.poll()
+        self.assertEqual(operations.estimate_remaining("thin_volume1"), 120)
+        self.assertIsNone(operations.estimate_remaining("volume1"))
+
+        operations.elapsed = 20
+        operations.poll()
+        self.assertEqual(operations.estimate_remaining("volume1"), 140)
+        self.assertEqual(operations.get_poll_interval(), 15)
+
+    def test_wait_pass(self):
+        """Verify wait polls until every operation completes, backing off while no progress is reported."""
+        operations = self._get_operations([self._progress([("initializing", "0200000001", None, None)]),
+                                           self._progress([("initializing", "0200000001", 50, None)]),
+                                           self._progress([])])
+        with mock.patch(self.SLEEP_FUNC) as sleep:
+            self.assertEqual(operations.wait(), [])
+        self.assertEqual([call[0][0] for call in sleep.call_args_list], [5, 10, 20])
+        self.assertEqual(operations.module.request.call_count, 3)
+        operations.module.module.log.assert_called_with("Volume [volume1] action, initializing, is 50 complete.")
+
+    def test_wait_timeout_fail(self):
+        """Verify wait stops at the timeout and reports the operations that did not complete."""
+        operations = self._get_operations([self._progress([("initializing", "0200000001", 10, None)]) for count in range(10)])
+        with mock.patch(self.SLEEP_FUNC) as sleep:
+            self.assertEqual(operations.wait(timeout=12), ["volume1"])
+        self.assertEqual([call[0][0] for call in sleep.call_args_list], [5, 7])
+        self.assertEqual(operations.elapsed, 12)
+
+    def test_wait_fail(self):
+        """Verify a failed progress request is raised to the caller."""
+        operations = self._get_operations([Exception("request failed")])
+        with mock.patch(self.SLEEP_FUNC):
+            with self.assertRaisesRegex(Exception, "request failed"):
+                operations.wait()
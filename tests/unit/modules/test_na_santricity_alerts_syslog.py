@@ -39,11 +39,11 @@ class NetAppESeriesAlertSyslogTest(ModuleTestCase):
 
         for options in options_list:
             with self._set_args(options):
-                with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+                with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                     syslog = NetAppESeriesAlertsSyslog()
         for options in options_list:
             with self._set_args(options):
-                with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": True})]):
+                with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": True})):
                     syslog = NetAppESeriesAlertsSyslog()
 
     def test_invalid_options_fail(self):
@@ -54,7 +54,7 @@ class NetAppESeriesAlertSyslogTest(ModuleTestCase):
         for options in options_list:
             with self._set_args(options):
                 with self.assertRaisesRegex(AnsibleFailJson, "Maximum number of syslog servers is 5!"):
-                    with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+                    with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                         syslog = NetAppESeriesAlertsSyslog()
 
     def test_change_required_pass(self):
@@ -73,7 +73,7 @@ class NetAppESeriesAlertSyslogTest(ModuleTestCase):
 
         for index in range(5):
             with self._set_args(options_list[index]):
-                with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+                with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                     syslog = NetAppESeriesAlertsSyslog()
                     syslog.get_current_configuration = lambda: current_config_list[index]
                     self.assertTrue(syslog.is_change_required())
@@ -81,7 +81,7 @@ class NetAppESeriesAlertSyslogTest(ModuleTestCase):
     def test_get_current_configuration_fail(self):
         """Verify get_current_configuration throws expected exception."""
         with self._set_args({"servers": []}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 syslog = NetAppESeriesAlertsSyslog()
 
             with self.assertRaisesRegex(AnsibleFailJson, "Failed to retrieve syslog configuration!"):
@@ -99,7 +99,7 @@ class NetAppESeriesAlertSyslogTest(ModuleTestCase):
 
         for index in range(3):
             with self._set_args(options_list[index]):
-                with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+                with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                     syslog = NetAppESeriesAlertsSyslog()
                     syslog.get_current_configuration = lambda: current_config_list[index]
                     self.assertFalse(syslog.is_change_required())
@@ -116,14 +116,14 @@ class NetAppESeriesAlertSyslogTest(ModuleTestCase):
 
         for index in range(3):
             with self._set_args(options_list[index]):
-                with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+                with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                     syslog = NetAppESeriesAlertsSyslog()
                     self.assertEqual(syslog.make_request_body(), expected_config_list[index])
 
     def test_test_configuration_fail(self):
         """Verify get_current_configuration throws expected exception."""
         with self._set_args({"servers": []}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 syslog = NetAppESeriesAlertsSyslog()
 
                 with self.assertRaisesRegex(AnsibleFailJson, "Failed to send test message!"):
@@ -133,7 +133,7 @@ class NetAppESeriesAlertSyslogTest(ModuleTestCase):
     def test_update_pass(self):
         """Verify update method successfully completes."""
         with self._set_args({"test": True, "servers": [{"address": "192.168.1.100"}]}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 syslog = NetAppESeriesAlertsSyslog()
                 syslog.is_change_required = lambda: True
                 syslog.make_request_body = lambda: {}
@@ -146,7 +146,7 @@ class NetAppESeriesAlertSyslogTest(ModuleTestCase):
     def tests_update_fail(self):
         """Verify update method throws expected exceptions."""
         with self._set_args({"servers": []}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 syslog = NetAppESeriesAlertsSyslog()
                 syslog.is_change_required = lambda: True
                 syslog.make_request_body = lambda: {}
@@ -50,11 +50,11 @@ class AsupTest(ModuleTestCase):
 
         for options in options_list:
             with self._set_args(options):
-                with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+                with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                     asup = NetAppESeriesAsup()
         for options in options_list:
             with self._set_args(options):
-                with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": True})]):
+                with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": True})):
                     asup = NetAppESeriesAsup()
 
     def test_invalid_options_fail(self):
@@ -75,31 +75,31 @@ class AsupTest(ModuleTestCase):
         for options in options_list:
             with self._set_args(options):
                 with self.assertRaises(AnsibleFailJson):
-                    with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+                    with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                         asup = NetAppESeriesAsup()
 
     def test_get_configuration_fail(self):
         """Verify get_configuration method throws expected exceptions."""
         with self._set_args({"state": "disabled", "active": False}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 asup = NetAppESeriesAsup()
                 with mock.patch(self.REQ_FUNC, return_value=Exception()):
                     with self.assertRaisesRegex(AnsibleFailJson, "Failed to retrieve ASUP configuration!"):
                         asup.get_configuration()
         with self._set_args({"state": "disabled", "active": False}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 asup = NetAppESeriesAsup()
                 with mock.patch(self.REQ_FUNC, return_value=(200, {"asupCapable": False, "onDemandCapable": True})):
                     with self.assertRaisesRegex(AnsibleFailJson, "Failed to retrieve ASUP configuration!"):
                         asup.get_configuration()
         with self._set_args({"state": "disabled", "active": False}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 asup = NetAppESeriesAsup()
                 with mock.patch(self.REQ_FUNC, return_value=(200, {"asupCapable": True, "onDemandCapable": False})):
                     with self.assertRaisesRegex(AnsibleFailJson, "Failed to retrieve ASUP configuration!"):
                         asup.get_configuration()
         with self._set_args({"state": "disabled", "active": False}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 asup = NetAppESeriesAsup()
                 with mock.patch(self.REQ_FUNC, return_value=(200, {"asupCapable": False, "onDemandCapable": False})):
                     with self.assertRaisesRegex(AnsibleFailJson, "Failed to retrieve ASUP configuration!"):
@@ -108,13 +108,13 @@ class AsupTest(ModuleTestCase):
     def test_in_maintenance_mode_pass(self):
         """Verify whether asup is in maintenance mode successful."""
         with self._set_args({"state": "disabled", "active": False}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 asup = NetAppESeriesAsup()
                 with mock.patch(self.REQ_FUNC, return_value=(200, [{"key": "ansible_asup_maintenance_stop_time", "value": str(time.time() + 10000)}])):
                     self.assertTrue(asup.in_maintenance_mode())
 
         with self._set_args({"state": "disabled", "active": False}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 asup = NetAppESeriesAsup()
                 with mock.patch(self.REQ_FUNC, return_value=(200, [{"key": "ansible_asup_maintenance_email_list", "value": "janey@netapp.com,joe@netapp.com"},
                                                                    {"key": "ansible_asup_maintenance_stop_time", "value": str(time.time() - 1)}])):
@@ -123,7 +123,7 @@ class AsupTest(ModuleTestCase):
     def test_in_maintenance_mode_fail(self):
         """Verify that in_maintenance mode throws expected exceptions."""
         with self._set_args({"state": "disabled", "active": False}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 asup = NetAppESeriesAsup()
                 with self.assertRaisesRegex(AnsibleFailJson, "Failed to retrieve maintenance windows information!"):
                     with mock.patch(self.REQ_FUNC, return_value=Exception()):
@@ -211,7 +211,7 @@ class AsupTest(ModuleTestCase):
 
         for index, options in enumerate(options_list):
             with self._set_args(options):
-                with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+                with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                     asup = NetAppESeriesAsup()
                     asup.get_configuration = lambda: asup_config[index % 3]
                     asup.in_maintenance_mode = lambda: False
@@ -249,7 +249,7 @@ class AsupTest(ModuleTestCase):
         }):
             with mock.patch(
                 self.BASE_REQ_FUNC,
-                side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]
+                return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})
             ):
                 asup = NetAppESeriesAsup()
                 asup.get_configuration = lambda: asup_config
@@ -259,7 +259,7 @@ class AsupTest(ModuleTestCase):
                     with mock.patch(self.REQ_FUNC, return_value=Exception()):
                         asup.update_configuration()
         with self._set_args({"state": "disabled", "active": False}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 asup = NetAppESeriesAsup()
                 asup.get_configuration = lambda: asup_config
                 asup.in_maintenance_mode = lambda: False
@@ -270,14 +270,14 @@ class AsupTest(ModuleTestCase):
 
         # Exceptions for state=="maintenance enabled"
         with self._set_args({"state": "maintenance_enabled", "maintenance_duration": 24, "maintenance_emails": ["janey@netapp.com", "joe@netapp.com"]}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 asup = NetAppESeriesAsup()
                 asup.get_configuration = lambda: {"asupEnabled": False}
                 asup.in_maintenance_mode = lambda: False
                 with self.assertRaisesRegex(AnsibleFailJson, "AutoSupport must be enabled before enabling or disabling maintenance mode."):
                     asup.update_configuration()
         with self._set_args({"state": "maintenance_enabled", "maintenance_duration": 24, "maintenance_emails": ["janey@netapp.com", "joe@netapp.com"]}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 asup = NetAppESeriesAsup()
                 asup.get_configuration = lambda: {"asupEnabled": True}
                 asup.in_maintenance_mode = lambda: False
@@ -285,7 +285,7 @@ class AsupTest(ModuleTestCase):
                     with mock.patch(self.REQ_FUNC, return_value=Exception()):
                         asup.update_configuration()
         with self._set_args({"state": "maintenance_enabled", "maintenance_duration": 24, "maintenance_emails": ["janey@netapp.com", "joe@netapp.com"]}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 asup = NetAppESeriesAsup()
                 asup.get_configuration = lambda: {"asupEnabled": True}
                 asup.in_maintenance_mode = lambda: False
@@ -293,7 +293,7 @@ class AsupTest(ModuleTestCase):
                     with mock.patch(self.REQ_FUNC, side_effect=[(200, None), Exception()]):
                         asup.update_configuration()
         with self._set_args({"state": "maintenance_enabled", "maintenance_duration": 24, "maintenance_emails": ["janey@netapp.com", "joe@netapp.com"]}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 asup = NetAppESeriesAsup()
                 asup.get_configuration = lambda: {"asupEnabled": True}
                 asup.in_maintenance_mode = lambda: False
@@ -303,7 +303,7 @@ class AsupTest(ModuleTestCase):
 
         # Exceptions for state=="maintenance disabled"
         with self._set_args({"state": "maintenance_disabled"}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 asup = NetAppESeriesAsup()
                 asup.get_configuration = lambda: {"asupEnabled": True}
                 asup.in_maintenance_mode = lambda: True
@@ -311,7 +311,7 @@ class AsupTest(ModuleTestCase):
                     with mock.patch(self.REQ_FUNC, return_value=Exception()):
                         asup.update_configuration()
         with self._set_args({"state": "maintenance_disabled"}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 asup = NetAppESeriesAsup()
                 asup.get_configuration = lambda: {"asupEnabled": True}
                 asup.in_maintenance_mode = lambda: True
@@ -319,7 +319,7 @@ class AsupTest(ModuleTestCase):
                     with mock.patch(self.REQ_FUNC, side_effect=[(200, None), Exception()]):
                         asup.update_configuration()
         with self._set_args({"state": "maintenance_disabled"}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 asup = NetAppESeriesAsup()
                 asup.get_configuration = lambda: {"asupEnabled": True}
                 asup.in_maintenance_mode = lambda: True
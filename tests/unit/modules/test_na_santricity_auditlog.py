@@ -40,7 +40,7 @@ class NetAppESeriesAuditLogTests(ModuleTestCase):
         for max_records in max_records_set:
             initial["max_records"] = max_records
             with self._set_args(**initial):
-                with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+                with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                     audit_log = NetAppESeriesAuditLog()
                     self.assertTrue(audit_log.max_records == max_records)
 
@@ -69,7 +69,7 @@ class NetAppESeriesAuditLogTests(ModuleTestCase):
         for threshold in threshold_set:
             initial["threshold"] = threshold
             with self._set_args(**initial):
-                with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+                with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                     audit_log = NetAppESeriesAuditLog()
                     self.assertTrue(audit_log.threshold == threshold)
 
@@ -85,7 +85,7 @@ class NetAppESeriesAuditLogTests(ModuleTestCase):
             with self.assertRaisesRegex(AnsibleFailJson, r"Audit-log percent threshold must be between 60 and 90"):
                 initial["threshold"] = threshold
                 with self._set_args(**initial):
-                    with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+                    with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                         NetAppESeriesAuditLog()
 
     def test_get_configuration_pass(self):
@@ -100,7 +100,7 @@ class NetAppESeriesAuditLogTests(ModuleTestCase):
                     "auditLogWarningThresholdPct": 90}
 
         with self._set_args(**initial):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 audit_log = NetAppESeriesAuditLog()
 
             with mock.patch(self.REQ_FUNC, return_value=(200, expected)):
@@ -115,7 +115,7 @@ class NetAppESeriesAuditLogTests(ModuleTestCase):
                    "threshold": 90}
 
         with self._set_args(**initial):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 audit_log = NetAppESeriesAuditLog()
 
             with self.assertRaisesRegex(AnsibleFailJson, r"Failed to retrieve the audit-log configuration!"):
@@ -141,7 +141,7 @@ class NetAppESeriesAuditLogTests(ModuleTestCase):
             initial_with_changes = initial.copy()
             initial_with_changes.update(change)
             with self._set_args(**initial_with_changes):
-                with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+                with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                     audit_log = NetAppESeriesAuditLog()
 
                 with mock.patch(self.REQ_FUNC, return_value=(200, response)):
@@ -156,7 +156,7 @@ class NetAppESeriesAuditLogTests(ModuleTestCase):
                    "threshold": 90}
 
         with self._set_args(**initial):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 audit_log = NetAppESeriesAuditLog()
 
             with self.assertRaisesRegex(AnsibleFailJson, r"Failed to delete audit-log messages!"):
@@ -176,7 +176,7 @@ class NetAppESeriesAuditLogTests(ModuleTestCase):
                    "force": True}
 
         with self._set_args(**initial):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 audit_log = NetAppESeriesAuditLog()
                 with mock.patch(self.REQ_FUNC, side_effect=[(200, body),
                                                             (422, {u"invalidFieldsIfKnown": None,
@@ -201,7 +201,7 @@ class NetAppESeriesAuditLogTests(ModuleTestCase):
                    "force": False}
 
         with self._set_args(**initial):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 audit_log = NetAppESeriesAuditLog()
 
             with self.assertRaisesRegex(AnsibleFailJson, r"Failed to update audit-log configuration!"):
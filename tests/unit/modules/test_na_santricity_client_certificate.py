@@ -5,13 +5,19 @@ __metaclass__ = type
 from contextlib import contextmanager
 from ansible.module_utils.testing import patch_module_args
 import datetime
+import hashlib
 import os
+import tempfile
 import unittest
 from ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_client_certificate import NetAppESeriesClientCertificate
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesCache, about_cache, load_certificate_file
 from ansible_collections.community.internal_test_tools.tests.unit.plugins.modules.utils import (
     AnsibleFailJson, AnsibleExitJson, ModuleTestCase
 )
 from ansible_collections.community.internal_test_tools.tests.unit.compat import mock
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
 
 
 class NetAppESeriesClientCertificateTest(ModuleTestCase):
@@ -22,9 +28,11 @@ class NetAppESeriesClientCertificateTest(ModuleTestCase):
                        "ssid": "1", "validate_certs": "no"}
 
     REQUEST_FUNC = "ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_client_certificate.NetAppESeriesClientCertificate.request"
-    LOAD_PEM_X509_CERTIFICATE = "ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_client_certificate.x509.load_pem_x509_certificate"
-    LOAD_DER_X509_CERTIFICATE = "ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_client_certificate.x509.load_der_x509_certificate"
+    LOAD_PEM_X509_CERTIFICATE = "ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity.x509.load_pem_x509_certificate"
+    LOAD_DER_X509_CERTIFICATE = "ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity.x509.load_der_x509_certificate"
+    CERTIFICATE_CACHE_OBJ = "ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity.certificate_cache"
     BASE_REQUEST_FUNC = "ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity.request"
+    LOAD_CERTIFICATE_FILE_FUNC = "ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_client_certificate.load_certificate_file"
 
     CERTIFICATE_PATH = "certificate.crt"
     CERTIFICATE_CONTENT = """Certificate:
@@ -175,32 +183,36 @@ toSuYG5pK8sBIlWk5T5iNL0g+BITbyWNSYh0umFRvLyKxvsCMc5bhd9V0FWb
         with patch_module_args(module_args):
             yield
 
+    def _get_cache(self):
+        return NetAppESeriesCache(os.path.join(tempfile.mkdtemp(), "certificate_cache.json"))
+
     def test_init_url_path_prefix(self):
         """Verify url path prefix for both embedded and proxy scenarios."""
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 self.assertEqual(certificate.url_path_prefix, "")
 
+        about_cache.clear()
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": True})):
                 certificate = NetAppESeriesClientCertificate()
                 self.assertEqual(certificate.url_path_prefix, "storage-systems/1/forward/devmgr/v2/")
 
         with self._set_args({"ssid": "0", "certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": True})):
                 certificate = NetAppESeriesClientCertificate()
                 self.assertEqual(certificate.url_path_prefix, "")
 
         with self._set_args({"ssid": "PROXY", "certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": True})):
                 certificate = NetAppESeriesClientCertificate()
                 self.assertEqual(certificate.url_path_prefix, "")
 
     def test_certificate_info_pass(self):
         """Determine whether certificate_info returns expected results."""
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 self.assertEqual(certificate.certificate_info(self.CERTIFICATE_PATH), {
                     "start_date": datetime.datetime(2019, 4, 1, 19, 30, 7, tzinfo=datetime.timezone.utc),
@@ -212,34 +224,34 @@ toSuYG5pK8sBIlWk5T5iNL0g+BITbyWNSYh0umFRvLyKxvsCMc5bhd9V0FWb
     def test_certificate_info_fail(self):
         """Determine wehther certificate_info throws expected exceptions."""
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with self.assertRaisesRegex(AnsibleFailJson, r"Failed to load certificate."):
-                    with mock.patch(self.LOAD_PEM_X509_CERTIFICATE, side_effect=Exception()):
+                    with mock.patch(self.LOAD_PEM_X509_CERTIFICATE, side_effect=Exception()), mock.patch(self.CERTIFICATE_CACHE_OBJ, self._get_cache()):
                         with mock.patch(self.LOAD_DER_X509_CERTIFICATE, side_effect=Exception()):
                             certificate.certificate_info(self.CERTIFICATE_PATH)
 
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with self.assertRaisesRegex(AnsibleFailJson, r"Failed to open certificate file or invalid certificate object type."):
-                    with mock.patch(self.LOAD_PEM_X509_CERTIFICATE, return_value=None):
+                    with mock.patch(self.LOAD_PEM_X509_CERTIFICATE, return_value=None), mock.patch(self.CERTIFICATE_CACHE_OBJ, self._get_cache()):
                         certificate.certificate_info(self.CERTIFICATE_PATH)
 
     def test_certificate_fingerprint_pass(self):
         """Determine whether certificate_fingerprint returns expected results."""
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 self.assertEqual(certificate.certificate_fingerprint(self.CERTIFICATE_PATH), "4cb68a8039a54b2f5fbe4c55dabb92464a0149a9fce64eb779fd3211c482e44e")
 
     def test_certificate_fingerprint_fail(self):
         """Determine whether certificate_fingerprint throws expected exceptions."""
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with self.assertRaisesRegex(AnsibleFailJson, r"Failed to determine certificate fingerprint."):
-                    with mock.patch(self.LOAD_PEM_X509_CERTIFICATE, side_effect=Exception()):
+                    with mock.patch(self.LOAD_PEM_X509_CERTIFICATE, side_effect=Exception()), mock.patch(self.CERTIFICATE_CACHE_OBJ, self._get_cache()):
                         with mock.patch(self.LOAD_DER_X509_CERTIFICATE, side_effect=Exception()):
                             certificate.certificate_fingerprint(self.CERTIFICATE_PATH)
 
@@ -247,7 +259,7 @@ toSuYG5pK8sBIlWk5T5iNL0g+BITbyWNSYh0umFRvLyKxvsCMc5bhd9V0FWb
     def test_determine_changes_pass(self):
         """Determine whether determine_changes successful return expected results."""
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with mock.patch(self.REQUEST_FUNC, return_value=(200, self.GET_CERTIFICATE_RESPONSE)):
                     certificate.determine_changes()
@@ -255,7 +267,7 @@ toSuYG5pK8sBIlWk5T5iNL0g+BITbyWNSYh0umFRvLyKxvsCMc5bhd9V0FWb
                     # self.assertEqual(certificate.remove_certificates, [])
 
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with mock.patch(self.REQUEST_FUNC, side_effect=[(404, None), (200, self.GET_CERTIFICATE_RESPONSE_OLD)]):
                     certificate.determine_changes()
@@ -263,7 +275,7 @@ toSuYG5pK8sBIlWk5T5iNL0g+BITbyWNSYh0umFRvLyKxvsCMc5bhd9V0FWb
                     # self.assertEqual(certificate.remove_certificates, [])
 
         with self._set_args({"certificates": []}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with mock.patch(self.REQUEST_FUNC, side_effect=[(404, None), (200, self.GET_CERTIFICATE_RESPONSE_OLD)]):
                     certificate.determine_changes()
@@ -273,14 +285,14 @@ toSuYG5pK8sBIlWk5T5iNL0g+BITbyWNSYh0umFRvLyKxvsCMc5bhd9V0FWb
     def test_determine_changes_fail(self):
         """Determine whether determine_changes throws expected exceptions."""
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with self.assertRaisesRegex(AnsibleFailJson, r"Failed to retrieve remote server certificates."):
                     with mock.patch(self.REQUEST_FUNC, return_value=(300, [])):
                         certificate.determine_changes()
 
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with self.assertRaisesRegex(AnsibleFailJson, r"Failed to retrieve remote server certificates."):
                     with mock.patch(self.REQUEST_FUNC, side_effect=[(404, None), (300, [])]):
@@ -289,13 +301,13 @@ toSuYG5pK8sBIlWk5T5iNL0g+BITbyWNSYh0umFRvLyKxvsCMc5bhd9V0FWb
     def test_upload_certificate_pass(self):
         """Validate upload_certificate successfully completes"""
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with mock.patch(self.REQUEST_FUNC, return_value=(200, [])):
                     certificate.upload_certificate(self.CERTIFICATE_PATH)
 
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with mock.patch(self.REQUEST_FUNC, side_effect=[(404, None), (200, [])]):
                     certificate.upload_certificate(self.CERTIFICATE_PATH)
@@ -303,14 +315,14 @@ toSuYG5pK8sBIlWk5T5iNL0g+BITbyWNSYh0umFRvLyKxvsCMc5bhd9V0FWb
     def test_upload_certificate_fail(self):
         """Validate upload_certificate successfully completes"""
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with self.assertRaisesRegex(AnsibleFailJson, r"Failed to upload certificate."):
                     with mock.patch(self.REQUEST_FUNC, return_value=(300, [])):
                         certificate.upload_certificate(self.CERTIFICATE_PATH)
 
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with self.assertRaisesRegex(AnsibleFailJson, r"Failed to upload certificate."):
                     with mock.patch(self.REQUEST_FUNC, side_effect=[(404, None), (300, [])]):
@@ -319,13 +331,13 @@ toSuYG5pK8sBIlWk5T5iNL0g+BITbyWNSYh0umFRvLyKxvsCMc5bhd9V0FWb
     def test_delete_certificate_pass(self):
         """Validate delete_certificate successfully completes"""
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with mock.patch(self.REQUEST_FUNC, return_value=(200, [])):
                     certificate.delete_certificate({"alias": "alias1"})
 
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with mock.patch(self.REQUEST_FUNC, side_effect=[(404, None), (200, [])]):
                     certificate.delete_certificate({"alias": "alias1"})
@@ -333,14 +345,14 @@ toSuYG5pK8sBIlWk5T5iNL0g+BITbyWNSYh0umFRvLyKxvsCMc5bhd9V0FWb
     def test_delete_certificate_fail(self):
         """Validate delete_certificate successfully completes"""
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with self.assertRaisesRegex(AnsibleFailJson, r"Failed to delete certificate."):
                     with mock.patch(self.REQUEST_FUNC, return_value=(300, [])):
                         certificate.delete_certificate({"alias": "alias1"})
 
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 with self.assertRaisesRegex(AnsibleFailJson, r"Failed to delete certificate."):
                     with mock.patch(self.REQUEST_FUNC, side_effect=[(404, None), (300, [])]):
@@ -350,7 +362,7 @@ toSuYG5pK8sBIlWk5T5iNL0g+BITbyWNSYh0umFRvLyKxvsCMc5bhd9V0FWb
     def test_apply_pass(self):
         """Verify apply functions as expected."""
         with self._set_args({"certificates": [self.CERTIFICATE_PATH]}):
-            with mock.patch(self.BASE_REQUEST_FUNC, side_effect=[(200, {"version": "03.00.0000.0000"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": False})):
                 certificate = NetAppESeriesClientCertificate()
                 certificate.determine_changes = lambda: None
                 certificate.delete_certificate = lambda x: None
@@ -379,3 +391,84 @@ toSuYG5pK8sBIlWk5T5iNL0g+BITbyWNSYh0umFRvLyKxvsCMc5bhd9V0FWb
                 certificate.module.check_mode = False
                 with self.assertRaises(AnsibleExitJson):
                     certificate.apply()
+
+    def test_load_certificate_file_pass(self):
+        """Verify certificate bundles are split in a single pass and their parsed certificates are reused while private keys are not cached."""
+        key = ec.generate_private_key(ec.SECP256R1(), default_backend()).private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+        path = os.path.join(tempfile.mkdtemp(), "bundle.pem")
+        with open(path, "wb") as fh:
+            fh.write(self.CERTIFICATE_CONTENT.encode("utf-8") + b"\n" + key)
+
+        cache = self._get_cache()
+        with mock.patch(self.CERTIFICATE_CACHE_OBJ, cache):
+            loaded = load_certificate_file(path)
+            with mock.patch(self.LOAD_PEM_X509_CERTIFICATE, side_effect=Exception()):
+                self.assertEqual(load_certificate_file(path), loaded)
+
+        self.assertEqual([certificate["fingerprint"] for certificate in loaded["certificates"]], [self.CERTIFICATE_FINGERPRINT.decode("utf-8")])
+        self.assertEqual(loaded["certificates"][0]["not_valid_before"], "2019-04-01T19:30:07")
+        self.assertEqual(loaded["private_keys"], [("PRIVATE KEY", key.strip())])
+        self.assertFalse(key.decode("utf-8") in str(cache.entries))
+
+    def test_load_certificate_file_fail(self):
+        """Verify cached certificates that do not match the file's certificates are ignored."""
+        path = os.path.join(tempfile.mkdtemp(), "certificate.pem")
+        with open(path, "wb") as fh:
+            fh.write(self.CERTIFICATE_CONTENT.encode("utf-8"))
+        with open(path, "rb") as fh:
+            key = "certificate|%s" % hashlib.sha256(fh.read()).hexdigest()
+
+        cache = self._get_cache()
+        cache.set(key, [{"fingerprint": "1234", "certificate": "-----BEGIN CERTIFICATE-----\nYWJjZA==\n-----END CERTIFICATE-----"}], 60)
+        cache.clear()
+        with mock.patch(self.CERTIFICATE_CACHE_OBJ, cache):
+            loaded = load_certificate_file(path)
+        self.assertEqual([certificate["fingerprint"] for certificate in loaded["certificates"]], [self.CERTIFICATE_FINGERPRINT.decode("utf-8")])
+
+        cache.set(key, "invalid", 60)
+        cache.clear()
+        with mock.patch(self.CERTIFICATE_CACHE_OBJ, cache):
+            self.assertEqual(load_certificate_file(path), loaded)
+
+    def test_apply_arrays_pass(self):
+        """Verify every storage system is compared against the expected certificates and updated."""
+        requests = []
+        fingerprint = self.CERTIFICATE_FINGERPRINT.decode("utf-8")
+        current_certificates = [{"alias": "alias1", "shaFingerprint": fingerprint, "sha256Fingerprint": fingerprint, "isUserInstalled": True},
+                                {"alias": "alias2", "shaFingerprint": "1234", "sha256Fingerprint": "5678", "isUserInstalled": True}]
+
+        def request(url, method="GET", **kwargs):
+            requests.append((url, method))
+            return 200, current_certificates if method == "GET" else {}
+
+        with self._set_args({"certificates": [self.CERTIFICATE_PATH], "reload_certificates": False,
+                             "arrays": [{"ssid": "1"}, {"ssid": "2", "certificates": []}, {"ssid": "3", "remove_unspecified_user_certificates": True}]}):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": True})):
+                certificate = NetAppESeriesClientCertificate()
+                with mock.patch(self.REQUEST_FUNC, side_effect=request):
+                    with mock.patch(self.LOAD_CERTIFICATE_FILE_FUNC, side_effect=load_certificate_file) as load:
+                        with self.assertRaisesRegex(AnsibleExitJson, "1 of 3 storage systems required certificate changes.") as result:
+                            certificate.apply()
+
+        self.assertEqual([(array["ssid"], array["changed"]) for array in result.exception.args[0]["arrays"]], [("1", False), ("2", False), ("3", True)])
+        load.assert_called_once_with(self.CERTIFICATE_PATH)
+        self.assertEqual([url for url, method in requests if method != "GET"], ["storage-systems/3/forward/devmgr/v2/certificates/remote-server/alias2"])
+
+    def test_apply_arrays_fail(self):
+        """Verify a storage system failure is reported without preventing the other storage systems from being compared."""
+        def request(url, method="GET", **kwargs):
+            return (300, []) if url.startswith("storage-systems/2/") else (200, self.GET_CERTIFICATE_RESPONSE)
+
+        with self._set_args({"certificates": [self.CERTIFICATE_PATH], "arrays": [{"ssid": "1"}, {"ssid": "2"}]}):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": True})):
+                certificate = NetAppESeriesClientCertificate()
+                with mock.patch(self.REQUEST_FUNC, side_effect=request):
+                    with self.assertRaisesRegex(AnsibleFailJson, r"Failed to apply certificate changes to 1 of 2 storage systems. Arrays \[2\]."):
+                        certificate.apply()
+
+        with self._set_args({"certificates": ["/does/not/exist.pem"], "arrays": [{"ssid": "1"}]}):
+            with mock.patch(self.BASE_REQUEST_FUNC, return_value=(200, {"version": "03.00.0000.0000", "runningAsProxy": True})):
+                certificate = NetAppESeriesClientCertificate()
+                with self.assertRaisesRegex(AnsibleFailJson, r"Failed to load certificate. File \[/does/not/exist.pem\]."):
+                    certificate.apply()
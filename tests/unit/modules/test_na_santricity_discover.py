@@ -3,8 +3,12 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
+import os
+import tempfile
+
 from contextlib import contextmanager
 from ansible.module_utils.testing import patch_module_args
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesCache
 from ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_discover import NetAppESeriesDiscover
 from ansible_collections.community.internal_test_tools.tests.unit.plugins.modules.utils import (
     AnsibleFailJson, AnsibleExitJson, ModuleTestCase
@@ -16,6 +20,9 @@ class AlertsTest(ModuleTestCase):
     REQUIRED_PARAMS = {"subnet_mask": "192.168.1.0/24"}
     BASE_REQ_FUNC = 'ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_discover.request'
     SLEEP_FUNC = 'ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_discover.sleep'
+    CACHE_OBJ = 'ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_discover.discovery_cache'
+    SYSTEM = {"api_urls": ["https://192.168.1.100:8443/", "https://192.168.1.101:8443/"], "label": "array_label",
+              "addresses": [], "proxy_ssid": "", "proxy_required": False}
 
     @contextmanager
     def _set_args(self, args=None):
@@ -115,11 +122,32 @@ class AlertsTest(ModuleTestCase):
 
     def test_no_proxy_discover_pass(self):
         """Verify no_proxy_discover completes successfully."""
-        with self._set_args():
+        def check_ip_address(systems_found, address, ports):
+            systems_found.update({"012345678901": {"api_urls": ["https://%s:%s/" % (address, ports[0])], "label": "array_label",
+                                                   "addresses": [], "proxy_ssid": "", "proxy_required": False}})
+
+        with self._set_args({"subnet_mask": ["192.168.1.0/24", "192.168.1.96/30", "10.10.0.0/30"]}):
             discover = NetAppESeriesDiscover()
-            discover.check_ip_address = None
+            discover.is_port_open = lambda address, port: str(address) in ["192.168.1.100", "10.10.0.1"]
+            discover.check_ip_address = check_ip_address
             discover.no_proxy_discover()
 
+        self.assertEqual(sorted(discover.systems_found["012345678901"]["api_urls"]),
+                         ["https://10.10.0.1:8443/", "https://192.168.1.100:8443/"])
+
+    def test_get_subnets_pass(self):
+        """Verify get_subnets combines overlapping subnets."""
+        with self._set_args({"subnet_mask": "192.168.1.0/25,192.168.1.128/25, 192.168.1.64/26,10.0.0.0/16"}):
+            discover = NetAppESeriesDiscover()
+            self.assertEqual([str(subnet) for subnet in discover.get_subnets()], ["10.0.0.0/16", "192.168.1.0/24"])
+
+    def test_get_subnets_fail(self):
+        """Verify get_subnets throws expected exception."""
+        with self._set_args({"subnet_mask": ["192.168.1.0/24", "192.168.1.5/24"]}):
+            discover = NetAppESeriesDiscover()
+            with self.assertRaisesRegex(AnsibleFailJson, "Invalid subnet! Subnet \\[192.168.1.5/24\\]."):
+                discover.get_subnets()
+
     def test_verify_proxy_service_pass(self):
         """Verify verify_proxy_service completes successfully."""
         with self._set_args({"proxy_url": "https://192.168.1.200", "proxy_username": "admin", "proxy_password": "adminpass"}):
@@ -280,3 +308,40 @@ class AlertsTest(ModuleTestCase):
             discover.no_proxy_discover = lambda: None
             with self.assertRaisesRegex(AnsibleExitJson, "Discover process complete."):
                 discover.discover()
+
+    def test_validate_cached_system_pass(self):
+        """Verify validate_cached_system only returns api urls that still reach the cached storage system."""
+        def check_ip_address(systems_found, address, ports):
+            systems_found.update({"012345678901" if address == "192.168.1.100" else "109876543210": {}})
+
+        with self._set_args():
+            discover = NetAppESeriesDiscover()
+            discover.is_port_open = lambda address, port: port == 8443
+            discover.check_ip_address = check_ip_address
+            self.assertEqual(discover.validate_cached_system(("012345678901", dict(self.SYSTEM))), ["https://192.168.1.100:8443/"])
+            self.assertEqual(discover.validate_cached_system(("012345678901", dict(self.SYSTEM, proxy_required=True))), self.SYSTEM["api_urls"])
+
+    def test_discover_cache_pass(self):
+        """Verify discover only searches the subnet when cached storage systems are missing or stale."""
+        cache = NetAppESeriesCache(os.path.join(tempfile.mkdtemp(), "discovery_cache.json"))
+        options_list = [({"serials": ["012345678901"]}, ["https://192.168.1.100:8443/"], False),
+                        ({"serials": ["012345678901", "109876543210"]}, ["https://192.168.1.100:8443/"], True),
+                        ({"serials": ["012345678901"], "refresh_cache": True}, ["https://192.168.1.100:8443/"], True),
+                        ({}, [], True)]
+
+        for options, valid_api_urls, searched in options_list:
+            cache.clear()
+            cache.set("discovery||False|192.168.1.0/24", {"012345678901": dict(self.SYSTEM)}, 3600)
+            options.update({"cache_ttl": 3600})
+            with self._set_args(options):
+                with mock.patch(self.CACHE_OBJ, cache):
+                    discover = NetAppESeriesDiscover()
+                    discover.validate_cached_system = lambda cached_system: valid_api_urls
+                    discover.no_proxy_discover = lambda: discover.systems_found.update({"109876543210": dict(self.SYSTEM)})
+                    with self.assertRaises(AnsibleExitJson) as result:
+                        discover.discover()
+
+            self.assertEqual(result.exception.args[0]["searched"], searched)
+            self.assertEqual("109876543210" in result.exception.args[0]["systems_found"], searched)
+            self.assertEqual(sorted(cache.get("discovery||False|192.168.1.0/24", 3600).keys()),
+                             sorted(result.exception.args[0]["systems_found"].keys()))
@@ -60,27 +60,52 @@ class HostTest(ModuleTestCase):
                     with mock.patch(self.CREATE_MULTIPART_FORMDATA_FUNC, return_value=("", {})):
                         firmware_object.upload_firmware()
 
+    def _graph(self, firmware_versions, offline=None):
+        """Create a storage system graph containing the compatible drives with the specified firmware versions."""
+        drive_references = [drive["driveRef"] for compatibility in self.FIRMWARE_DRIVES_RESPONSE["compatibilities"]
+                            for drive in compatibility["compatibleDrives"]]
+        drives = [{"driveRef": reference, "offline": reference in (offline or []), "firmwareVersion": firmware_version,
+                   "physicalLocation": {"trayRef": "0E00000000000000000000000000000000000000", "slot": slot}}
+                  for slot, (reference, firmware_version) in enumerate(zip(drive_references, firmware_versions), 1)]
+        return {"drive": drives, "tray": [{"trayRef": "0E00000000000000000000000000000000000000", "trayId": 99}]}
+
     def test_upgrade_list_pass(self):
         """Verify upgrade_list method pass"""
         side_effects = [(200, self.FIRMWARE_DRIVES_RESPONSE),
-                        (200, {"offline": False, "available": True, "firmwareVersion": "MS00"}),
-                        (200, {"offline": False, "available": True, "firmwareVersion": "MS01"}),
-                        (200, {"offline": False, "available": True, "firmwareVersion": "MS02"})]
+                        (200, self._graph(["MS00", "MS01", "MS02"]))]
         with self._set_args({"firmware": ["path/to/test_drive_firmware_1"]}):
             firmware_object = NetAppESeriesDriveFirmware()
             with mock.patch(self.REQUEST_FUNC, side_effect=side_effects):
                 self.assertEqual(firmware_object.upgrade_list(), [{"driveRefList": ["010000005000C5007EDE4ECF0000000000000000",
                                                                                     "010000005000C5007EDF9AAB0000000000000000"],
                                                                    "filename": "test_drive_firmware_1"}])
+                self.assertEqual(firmware_object.upgrade_plan(), [
+                    {"filename": "test_drive_firmware_1", "current_firmware": "MS00", "target_firmware": "MS02", "tray": 99,
+                     "online_upgrade_capable": True, "drive_count": 1, "slots": [1]},
+                    {"filename": "test_drive_firmware_1", "current_firmware": "MS01", "target_firmware": "MS02", "tray": 99,
+                     "online_upgrade_capable": True, "drive_count": 1, "slots": [2]}])
 
         side_effects = [(200, self.FIRMWARE_DRIVES_RESPONSE),
-                        (200, {"offline": False, "available": True, "firmwareVersion": "MS02"}),
-                        (200, {"offline": False, "available": True, "firmwareVersion": "MS02"}),
-                        (200, {"offline": False, "available": True, "firmwareVersion": "MS02"})]
+                        (200, self._graph(["MS02", "MS02", "MS02"]))]
         with self._set_args({"firmware": ["path/to/test_drive_firmware_1"]}):
             firmware_object = NetAppESeriesDriveFirmware()
             with mock.patch(self.REQUEST_FUNC, side_effect=side_effects):
                 self.assertEqual(firmware_object.upgrade_list(), [])
+                self.assertEqual(firmware_object.upgrade_plan(), [])
+
+        side_effects = [(200, self.FIRMWARE_DRIVES_RESPONSE),
+                        (200, self._graph(["MS02", "MS02", "MS02", "MS00", "MS00", "MS00"], offline=["010000005000C5007EDE4ECF0000000000000001"]))]
+        with self._set_args({"firmware": ["path/to/test_drive_firmware_1", "path/to/test_drive_firmware_2"], "upgrade_drives_online": False}):
+            firmware_object = NetAppESeriesDriveFirmware()
+            with mock.patch(self.REQUEST_FUNC, side_effect=side_effects):
+                self.assertEqual(firmware_object.upgrade_list(), [{"driveRefList": ["010000005000C5007EDF9AAB0000000000000001",
+                                                                                    "010000005000C5007EDBE3C70000000000000001"],
+                                                                   "filename": "test_drive_firmware_2"}])
+                self.assertEqual(firmware_object.upgrade_plan(), [
+                    {"filename": "test_drive_firmware_2", "current_firmware": "MS00", "target_firmware": "MS01", "tray": 99,
+                     "online_upgrade_capable": False, "drive_count": 1, "slots": [5]},
+                    {"filename": "test_drive_firmware_2", "current_firmware": "MS00", "target_firmware": "MS01", "tray": 99,
+                     "online_upgrade_capable": True, "drive_count": 1, "slots": [6]}])
 
     def test_upgrade_list_fail(self):
         """Verify upgrade_list method throws expected exceptions."""
@@ -90,10 +115,8 @@ class HostTest(ModuleTestCase):
                 with mock.patch(self.REQUEST_FUNC, response=Exception()):
                     firmware_object.upgrade_list()
 
-        side_effects = [(200, self.FIRMWARE_DRIVES_RESPONSE),
-                        (200, {"offline": False, "available": True, "firmwareVersion": "MS01"}),
-                        (200, {"offline": False, "available": True, "firmwareVersion": "MS00"}),
-                        Exception()]
+        graph = self._graph(["MS01", "MS00"])
+        side_effects = [(200, self.FIRMWARE_DRIVES_RESPONSE), (200, graph)]
         with self._set_args({"firmware": ["path/to/test_drive_firmware_1"]}):
             firmware_object = NetAppESeriesDriveFirmware()
             with self.assertRaisesRegex(AnsibleFailJson, "Failed to retrieve drive information."):
@@ -101,9 +124,7 @@ class HostTest(ModuleTestCase):
                     firmware_object.upgrade_list()
 
         side_effects = [(200, self.FIRMWARE_DRIVES_RESPONSE),
-                        (200, {"offline": False, "available": True, "firmwareVersion": "MS01"}),
-                        (200, {"offline": False, "available": True, "firmwareVersion": "MS00"}),
-                        (200, {"offline": False, "available": True, "firmwareVersion": "MS00"})]
+                        (200, self._graph(["MS01", "MS00", "MS00", "MS00", "MS00", "MS00"]))]
         with self._set_args({"firmware": ["path/to/test_drive_firmware_2"], "upgrade_drives_online": True}):
             firmware_object = NetAppESeriesDriveFirmware()
             with self.assertRaisesRegex(AnsibleFailJson, "Drive is not capable of online upgrade."):
@@ -3,12 +3,17 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
+import os
+import shutil
+import tempfile
+import time
 import unittest
 from contextlib import contextmanager
 from ansible.module_utils.testing import patch_module_args
 from ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_facts import Facts
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesCache
 from ansible_collections.community.internal_test_tools.tests.unit.plugins.modules.utils import (
-    AnsibleFailJson, ModuleTestCase
+    AnsibleExitJson, AnsibleFailJson, ModuleTestCase
 )
 from ansible_collections.community.internal_test_tools.tests.unit.compat import mock
 
@@ -476,3 +481,164 @@ class FactsTest(ModuleTestCase):
             with mock.patch(self.GET_CONTROLLERS_FUNC, return_value={"070000000000000000000001": "A", "070000000000000000000002": "B"}):
                 with mock.patch(self.REQUEST_FUNC, side_effect=[(200, self.GRAPH_RESPONSE), (200, self.WORKLOAD_RESPONSE)]):
                     self.assertEqual(facts.get_array_facts(), self.EXPECTED_GET_ARRAY_FACTS)
+
+    def _build_volumes_by_initiators_facts(self, volume_count, host_count, group_count, interface_count):
+        """Build array graph and facts structures with each volume mapped to either a host or a host group."""
+        groups = ["85000000600A098000A4B28D00%014d" % index for index in range(group_count)]
+        hosts = [{"hosts_reference": "84000000600A098000A4B28D00%014d" % index, "group_id": groups[index % group_count], "name": "host%s" % index,
+                  "ports": [{"type": "iscsi" if index % 2 else "fc"}]} for index in range(host_count)]
+        interfaces = [{"protocol": "iscsi" if index % 2 else "fc", "interface_reference": "2201020000000000000000000000000000%06d" % (index // 4)}
+                      for index in range(interface_count)]
+        volumes = []
+        mappings = []
+        for index in range(volume_count):
+            mapping_id = "88000000600A098000A4B28D00%014d" % index
+            volumes.append({"id": "02000000600A098000A4B28D00%014d" % index, "name": "volume%s" % index, "objectType": "volume",
+                            "volumeGroupRef": "04000000600A098000A4B9D10000380A5D4AAC3C", "wwn": "600A098000A4B28D00%014d" % index,
+                            "extendedUniqueIdentifier": "", "metadata": [{"key": "workloadId", "value": "4200000001000000000000000000000000000000"}],
+                            "raidLevel": "raid6", "segmentSize": 131072, "dataDriveCount": 8, "listOfMappings": [{"id": mapping_id}]})
+            mappings.append({"id": mapping_id, "mapRef": groups[index % group_count] if index % 3 else hosts[index % host_count]["hosts_reference"],
+                             "lun": index, "type": "host"})
+
+        array_facts = {"volume": volumes, "highLevelVolBundle": {"thinVolume": [], "pitView": []}, "storagePoolBundle": {"lunMapping": mappings}}
+        facts = {"netapp_hosts": hosts, "netapp_hostside_io_interfaces": interfaces,
+                 "netapp_storage_pools": [{"id": "04000000600A098000A4B9D10000380A5D4AAC3C", "name": "pool"}],
+                 "netapp_workload_tags": [{"id": "4200000001000000000000000000000000000000", "name": "beegfs_metadata",
+                                           "attributes": [{"key": "profileId", "value": "ansible_workload_1"}, {"key": "type", "value": "metadata"}]}]}
+        return array_facts, facts
+
+    def test_get_volumes_by_initiators_pass(self):
+        """Verify get_volumes_by_initiators returns the expected results."""
+        with self._set_args():
+            facts = Facts()
+            array_facts, host_facts = self._build_volumes_by_initiators_facts(volume_count=3, host_count=2, group_count=1, interface_count=4)
+            volumes_by_initiators = facts.get_volumes_by_initiators(array_facts, host_facts)
+
+            self.assertEqual(sorted(volumes_by_initiators.keys()), ["host0", "host1"])
+            self.assertEqual([volume["name"] for volume in volumes_by_initiators["host0"]], ["volume0", "volume1", "volume2"])
+            self.assertEqual([volume["name"] for volume in volumes_by_initiators["host1"]], ["volume1", "volume2"])
+            self.assertEqual(volumes_by_initiators["host0"][0]["host_types"], set(["fc"]))
+            self.assertEqual(volumes_by_initiators["host0"][0]["host_port_protocols"], set(["fc"]))
+            self.assertEqual(volumes_by_initiators["host1"][0]["host_port_protocols"], set(["iscsi"]))
+            self.assertEqual(len(volumes_by_initiators["host1"][0]["host_port_information"]["iscsi"]), 1)
+            self.assertEqual(volumes_by_initiators["host1"][0]["workload_name"], "beegfs_metadata")
+            self.assertEqual(volumes_by_initiators["host1"][0]["workload_metadata"], {"type": "metadata"})
+            self.assertEqual(volumes_by_initiators["host1"][0]["storage_pool"], "pool")
+            self.assertEqual(volumes_by_initiators["host1"][0]["segment_size_kb"], 128)
+
+            # Volume details are shared between hosts but each host receives its own copy.
+            self.assertIsNot(volumes_by_initiators["host0"][1], volumes_by_initiators["host1"][0])
+
+    def test_get_volumes_by_initiators_scale_pass(self):
+        """Verify get_volumes_by_initiators completes quickly for large storage systems."""
+        with self._set_args():
+            facts = Facts()
+            array_facts, host_facts = self._build_volumes_by_initiators_facts(volume_count=2000, host_count=300, group_count=30, interface_count=16)
+
+            start = time.time()
+            volumes_by_initiators = facts.get_volumes_by_initiators(array_facts, host_facts)
+            self.assertLess(time.time() - start, 10)
+
+            self.assertEqual(len(volumes_by_initiators), 300)
+            self.assertEqual(sum(len(volumes) for volumes in volumes_by_initiators.values()), 2000 // 3 + 1 + (2000 - 2000 // 3 - 1) * 10)
+
+    def test_get_subsets_pass(self):
+        """Verify get_subsets returns the expected subsets."""
+        with self._set_args():
+            facts = Facts()
+            self.assertEqual(facts.get_subsets(), set(Facts.SUBSET_GRAPH_PATHS.keys()))
+
+        with self._set_args(gather_subset=["storage_pools", "disks"]):
+            facts = Facts()
+            self.assertEqual(facts.get_subsets(), set(["storage_pools", "disks"]))
+
+        with self._set_args(gather_subset=["lun_mappings"]):
+            facts = Facts()
+            self.assertEqual(facts.get_subsets(), set(["lun_mappings", "hosts", "volumes"]))
+
+        with self._set_args(gather_subset=["!snapshots", "!volumes_by_initiators"]):
+            facts = Facts()
+            self.assertEqual(facts.get_subsets(), set(Facts.SUBSET_GRAPH_PATHS.keys()) - set(["snapshots", "volumes_by_initiators"]))
+
+        with self._set_args(gather_subset=["!all"]):
+            facts = Facts()
+            self.assertEqual(facts.get_subsets(), set())
+
+    def test_get_subsets_fail(self):
+        """Verify get_subsets throws the expected exceptions."""
+        with self._set_args(gather_subset=["volumes", "bogus"]):
+            facts = Facts()
+            with self.assertRaisesRegex(AnsibleFailJson, "Invalid gather_subset! Subset \\[bogus\\]"):
+                facts.get_subsets()
+
+    def test_get_array_facts_subset_pass(self):
+        """Verify get_array_facts only retrieves and returns the requested subsets."""
+        with self._set_args(gather_subset=["storage_pools"]):
+            facts = Facts()
+            facts.is_embedded = lambda: True
+            storage_pools = [{"id": "04000000600A098000A4B9D10000380A5D4AAC3C", "name": "beegfs_storage_vg", "freeSpace": "8498142969856",
+                              "totalRaidedSpace": "9597654597632", "usedSpace": "1099511627776"}]
+            with mock.patch(self.REQUEST_FUNC, return_value=(200, storage_pools)) as request:
+                self.assertEqual(facts.get_array_facts(), {"facts_from_proxy": False, "ssid": "1",
+                                                           "netapp_storage_pools": [{"id": "04000000600A098000A4B9D10000380A5D4AAC3C",
+                                                                                     "name": "beegfs_storage_vg",
+                                                                                     "available_capacity": "8498142969856",
+                                                                                     "total_capacity": "9597654597632",
+                                                                                     "used_capacity": "1099511627776"}]})
+                request.assert_called_once_with("storage-systems/1/graph/xpath-filter?query=/volumeGroup")
+
+    def test_get_array_graph_pass(self):
+        """Verify get_array_graph uses xpath-filter queries for a few graph sections and otherwise the full graph."""
+        with self._set_args():
+            facts = Facts()
+            with mock.patch(self.REQUEST_FUNC, side_effect=[(200, [{"saData": {}}]), (200, [{"hostRef": "1"}])]) as request:
+                self.assertEqual(facts.get_array_graph(["/storagePoolBundle/host", "/sa"]),
+                                 {"sa": {"saData": {}}, "storagePoolBundle": {"host": [{"hostRef": "1"}]}})
+                self.assertEqual(request.call_count, 2)
+
+            with mock.patch(self.REQUEST_FUNC, return_value=(200, self.GRAPH_RESPONSE)) as request:
+                self.assertEqual(facts.get_array_graph(["/sa", "/drive", "/volume", "/volumeGroup", "/controller"]), self.GRAPH_RESPONSE)
+                request.assert_called_once_with("storage-systems/1/graph")
+
+    def test_get_array_graph_fail(self):
+        """Verify get_array_graph throws the expected exceptions."""
+        with self._set_args():
+            facts = Facts()
+            with self.assertRaisesRegex(AnsibleFailJson, "Failed to retrieve storage array graph. Query \\[/volumeGroup\\]"):
+                with mock.patch(self.REQUEST_FUNC, return_value=Exception()):
+                    facts.get_array_graph(["/volumeGroup"])
+
+    def test_get_facts_incremental_pass(self):
+        """Verify get_facts returns cached facts until a storage system event is reported."""
+        storage_pools = [{"id": "04000000600A098000A4B9D10000380A5D4AAC3C", "name": "beegfs_storage_vg", "freeSpace": "8498142969856",
+                          "totalRaidedSpace": "9597654597632", "usedSpace": "1099511627776"}]
+        cache_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_directory)
+        cache_path = os.path.join(cache_directory, "facts.json")
+
+        def facts_instance():
+            facts = Facts()
+            facts.is_embedded = lambda: True
+            facts.facts_cache = NetAppESeriesCache(cache_path)
+            return facts
+
+        with self._set_args(gather_subset=["storage_pools"], incremental=True):
+            with mock.patch(self.REQUEST_FUNC, side_effect=[(200, [{"eventNumber": "4"}, {"eventNumber": "5"}]), (200, storage_pools)]):
+                with self.assertRaisesRegex(AnsibleExitJson, "'facts_cached': False"):
+                    facts_instance().get_facts()
+
+            with mock.patch(self.REQUEST_FUNC, return_value=(200, [])) as request:
+                with self.assertRaisesRegex(AnsibleExitJson, "beegfs_storage_vg.*'facts_cached': True"):
+                    facts_instance().get_facts()
+                request.assert_called_once_with("storage-systems/1/events?lastKnown=5")
+
+            with mock.patch(self.REQUEST_FUNC, side_effect=[(200, [{"eventNumber": "6"}]), (200, [{"eventNumber": "6"}]), (200, storage_pools)]):
+                with self.assertRaisesRegex(AnsibleExitJson, "'facts_cached': False"):
+                    facts_instance().get_facts()
+
+        # Facts are not cached when not incremental.
+        with self._set_args(gather_subset=["storage_pools"]):
+            with mock.patch(self.REQUEST_FUNC, return_value=(200, storage_pools)) as request:
+                with self.assertRaisesRegex(AnsibleExitJson, "'facts_cached': False"):
+                    facts_instance().get_facts()
+                request.assert_called_once_with("storage-systems/1/graph/xpath-filter?query=/volumeGroup")
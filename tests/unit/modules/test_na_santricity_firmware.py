@@ -3,13 +3,16 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
+import os
+import shutil
+import tempfile
 import unittest
 from contextlib import contextmanager
 from ansible.module_utils.testing import patch_module_args
 from ansible.module_utils import six
 from ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_firmware import NetAppESeriesFirmware
 from ansible_collections.community.internal_test_tools.tests.unit.plugins.modules.utils import (
-    AnsibleFailJson, ModuleTestCase
+    AnsibleExitJson, AnsibleFailJson, ModuleTestCase
 )
 from ansible_collections.community.internal_test_tools.tests.unit.compat.mock import mock_open, patch
 
@@ -73,40 +76,75 @@ class FirmwareTest(ModuleTestCase):
         with patch_module_args(module_args):
             yield
 
+    @contextmanager
+    def _firmware_file(self, data):
+        """Create a temporary firmware file containing data."""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "test.dlp")
+            with open(path, "wb") as fh:
+                fh.write(data)
+            yield path
+        finally:
+            shutil.rmtree(directory)
+
     def test_is_firmware_bundled_pass(self):
         """Determine whether firmware file is bundled."""
-        with self._set_args({"firmware": "test.dlp", "nvsram": "test.dlp"}):
-            with patch(builtin_path, mock_open(read_data=b"firmwarexxxxxxxx")) as mock_file:
+        with self._firmware_file(b"firmwarexxxxxxxx") as path:
+            with self._set_args({"firmware": path, "nvsram": path}):
                 firmware = NetAppESeriesFirmware()
                 self.assertEqual(firmware.is_firmware_bundled(), False)
 
-        with self._set_args({"firmware": "test.dlp", "nvsram": "test.dlp"}):
-            with patch(builtin_path, mock_open(read_data=self.BUNDLE_HEADER[:16])) as mock_file:
+        with self._firmware_file(self.BUNDLE_HEADER[:16]) as path:
+            with self._set_args({"firmware": path, "nvsram": path}):
                 firmware = NetAppESeriesFirmware()
                 self.assertEqual(firmware.is_firmware_bundled(), True)
 
     def test_is_firmware_bundles_fail(self):
         """Verify non-firmware fails."""
-        with self._set_args({"firmware": "test.dlp", "nvsram": "test.dlp"}):
-            with patch(builtin_path, mock_open(read_data=b"xxxxxxxxxxxxxxxx")) as mock_file:
+        with self._firmware_file(b"xxxxxxxxxxxxxxxx") as path:
+            with self._set_args({"firmware": path, "nvsram": path}):
                 firmware = NetAppESeriesFirmware()
                 with self.assertRaisesRegex(AnsibleFailJson, "Firmware file is invalid."):
                     firmware.is_firmware_bundled()
 
+        with self._set_args({"firmware": "/path/to/missing_test.dlp", "nvsram": "test.dlp"}):
+            firmware = NetAppESeriesFirmware()
+            with self.assertRaisesRegex(AnsibleFailJson, "Failed to read file."):
+                firmware.is_firmware_bundled()
+
     def test_firmware_version(self):
         """Verify correct firmware version is returned."""
-        with self._set_args({"firmware": "test.dlp", "nvsram": "test.dlp"}):
-            firmware = NetAppESeriesFirmware()
-            firmware.is_firmware_bundled = lambda: True
-            with patch(builtin_path, mock_open_with_iter(read_data=self.BUNDLE_HEADER)) as mock_file:
+        with self._firmware_file(self.BUNDLE_HEADER) as path:
+            with self._set_args({"firmware": path, "nvsram": path}):
+                firmware = NetAppESeriesFirmware()
                 self.assertEqual(firmware.firmware_version(), b"11.40.5")
 
+        with self._firmware_file(b"firmware xxxxxxx\nName: RC_08425000\nVersion: 08.42.50.00\n") as path:
+            with self._set_args({"firmware": path, "nvsram": path}):
+                firmware = NetAppESeriesFirmware()
+                self.assertEqual(firmware.firmware_version(), b"08.42.50.00")
+
+    def test_firmware_version_cached(self):
+        """Verify the firmware file is only parsed again when its size or modification time changes."""
+        with self._firmware_file(self.BUNDLE_HEADER) as path:
+            with self._set_args({"firmware": path, "nvsram": path}):
+                self.assertEqual(NetAppESeriesFirmware().firmware_version(), b"11.40.5")
+
+                stat = os.stat(path)
+                with open(path, "wb") as fh:
+                    fh.write(self.BUNDLE_HEADER.replace(b"VERSION|11.40.5", b"VERSION|11.40.6"))
+                os.utime(path, (stat.st_atime, stat.st_mtime))
+                self.assertEqual(NetAppESeriesFirmware().firmware_version(), b"11.40.5")
+
+                os.utime(path, (stat.st_atime, stat.st_mtime + 1))
+                self.assertEqual(NetAppESeriesFirmware().firmware_version(), b"11.40.6")
+
     def test_nvsram_version(self):
         """Verify correct nvsram version is returned."""
-        with self._set_args({"firmware": "test.dlp", "nvsram": "test.dlp"}):
-            firmware = NetAppESeriesFirmware()
-
-            with patch(builtin_path, mock_open_with_iter(read_data=self.NVSRAM_HEADER)) as mock_file:
+        with self._firmware_file(self.NVSRAM_HEADER) as path:
+            with self._set_args({"firmware": path, "nvsram": path}):
+                firmware = NetAppESeriesFirmware()
                 self.assertEqual(firmware.nvsram_version(), b"N280X-852834-D02")
 
     def test_check_system_health_pass(self):
@@ -512,3 +550,60 @@ class FirmwareTest(ModuleTestCase):
             with self.assertRaisesRegex(AnsibleFailJson, "Failed to initiate firmware upgrade."):
                 with patch(self.REQUEST_FUNC, return_value=Exception()):
                     firmware.proxy_upgrade()
+
+    @contextmanager
+    def _patch_arrays(self, activate=None):
+        """Patch the storage system requests used by apply_arrays."""
+        methods = dict(is_firmware_bundled=dict(return_value=True), firmware_version=dict(return_value=b"11.40.5"),
+                       nvsram_version=dict(return_value=b"N280X-852834-D02"), is_upgrade_in_progress=dict(return_value=False),
+                       is_embedded=dict(return_value=True),
+                       embedded_check_compatibility=dict(side_effect=lambda self: setattr(self, "upgrade_required", self.ssid != "3")),
+                       check_system_health=dict(return_value=True), embedded_firmware_stage=dict(return_value=None),
+                       update_last_known_event=dict(return_value=None), embedded_firmware_activate=dict(side_effect=activate),
+                       poll_firmware_events=dict(return_value=False), is_upgrade_reported=dict(return_value=True), is_optimal=dict(return_value=True))
+        patches = [patch.object(NetAppESeriesFirmware, name, autospec=True, **kwargs) for name, kwargs in methods.items()]
+        patches.append(patch(self.SLEEP_FUNC, return_value=None))
+        for method_patch in patches:
+            method_patch.start()
+        try:
+            yield
+        finally:
+            for method_patch in patches:
+                method_patch.stop()
+
+    def test_apply_arrays_pass(self):
+        """Verify apply_arrays stages every storage system and activates them in waves."""
+        with self._set_args({"firmware": "test_firmware.dlp", "nvsram": "test_nvsram.dlp", "wave_size": 2,
+                             "arrays": [{"ssid": "1"}, {"ssid": "2", "api_url": "http://localhost:8080/devmgr/v2"}, {"ssid": "3"}]}):
+            firmware = NetAppESeriesFirmware()
+            with self._patch_arrays():
+                with self.assertRaises(AnsibleExitJson) as result:
+                    firmware.apply()
+
+        result = result.exception.args[0]
+        self.assertTrue(result["changed"])
+        self.assertEqual(result["msg"], "2 of 3 storage systems required upgrades.")
+        self.assertEqual([(array["ssid"], array["changed"], array["wave"], array["msg"]) for array in result["arrays"]],
+                         [("1", True, 1, "Upgrade completed."), ("2", True, 1, "Upgrade completed."), ("3", False, None, "Firmware is up to date.")])
+        self.assertEqual(result["arrays"][1]["api_url"], "http://localhost:8080/devmgr/v2/")
+        self.assertEqual([entry["event"] for entry in result["arrays"][0]["timeline"]],
+                         ["Upgrade check completed.", "Health check completed.", "Staging started.", "Staging completed.", "Activation started.",
+                          "Upgrade completed."])
+
+    def test_apply_arrays_fail(self):
+        """Verify apply_arrays stops activating waves once a storage system fails to upgrade."""
+        def activate(firmware):
+            if firmware.ssid == "1":
+                firmware.module.fail_json(msg="Failed to activate the staged firmware. Array Id [%s]." % firmware.ssid)
+
+        with self._set_args({"firmware": "test_firmware.dlp", "wave_size": 1, "arrays": [{"ssid": "1"}, {"ssid": "2"}, {"ssid": "3"}]}):
+            firmware = NetAppESeriesFirmware()
+            with self._patch_arrays(activate):
+                with self.assertRaisesRegex(AnsibleFailJson, "Failed to upgrade 2 of 3 storage systems. Arrays \\[1, 2\\]."):
+                    firmware.apply()
+
+        with self._set_args({"firmware": "test_firmware.dlp", "arrays": [{"ssid": "1"}, {"ssid": "1"}]}):
+            firmware = NetAppESeriesFirmware()
+            with self._patch_arrays():
+                with self.assertRaisesRegex(AnsibleFailJson, "Storage systems must be unique."):
+                    firmware.apply()
@@ -3,6 +3,7 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
+import copy
 import unittest
 from contextlib import contextmanager
 from ansible.module_utils.testing import patch_module_args
@@ -89,6 +90,7 @@ class HostTest(ModuleTestCase):
     def _set_args(self, args):
         module_args = self.REQUIRED_PARAMS.copy()
         module_args.update(args)
+        module_args = dict((key, value) for key, value in module_args.items() if value is not None)
         with patch_module_args(module_args):
             yield
 
@@ -182,6 +184,118 @@ class HostTest(ModuleTestCase):
                     exists = host.host_exists
                     host.needs_update
 
+    def test_port_conflicts_pass(self):
+        """Verify port_conflicts finds ports used by other hosts from the port indexes."""
+        with mock.patch(self.REQ_FUNC, return_value=(200, self.EXISTING_HOSTS)):
+            with self._set_args({'state': 'present', 'name': 'beegfs_metadata1', 'host_type': 'linux dm-mp',
+                                 'ports': [{'label': 'beegfs_metadata1_iscsi_0', 'type': 'iscsi', 'port': 'iqn.used_elsewhere'}]}):
+                host = NetAppESeriesHost()
+                self.assertTrue(host.host_exists)
+
+                self.assertEqual(host.port_conflicts({'label': 'beegfs_metadata1_iscsi_0',
+                                                      'port': 'iqn.1993-08.org.debian.beegfs-metadata:01:69e4efdf30b8'}), [])
+                self.assertEqual([port['label'] for host_obj, port in host.port_conflicts({'label': 'BEEGFS_STORAGE1_ISCSI_0', 'port': 'iqn.not_used'})],
+                                 ['beegfs_storage1_iscsi_0'])
+                self.assertEqual([port['label'] for host_obj, port in host.port_conflicts({'label': 'beegfs_storage1_iscsi_0',
+                                                                                           'port': 'iqn.used_elsewhere'})],
+                                 ['beegfs_storage1_iscsi_0', 'beegfs_metadata2_iscsi_0'])
+                self.assertTrue(host.port_on_diff_host({'label': 'new_label', 'port': 'iqn.used_elsewhere'}))
+                self.assertEqual(host.port_refs_by_address['iqn.used_elsewhere'], ['89000000600A098000A4B28D00303CFC5D4300F7'])
+
+    def test_apply_hosts_pass(self):
+        """Verify apply_hosts creates, updates and removes hosts from a single retrieval of the storage system hosts."""
+        requests = []
+
+        def request(url, method="GET", data=None, **kwargs):
+            requests.append((method, url))
+            if url.endswith("/hosts") and method == "GET":
+                return 200, copy.deepcopy(self.EXISTING_HOSTS)
+            if url.endswith("host-types"):
+                return 200, self.HOST_TYPES
+            if "interfaces" in url:
+                return 200, []
+            return 200, {}
+
+        with self._set_args({'name': None, 'host_type': 'linux dm-mp', 'force_port': True,
+                             'hosts': [{'name': 'new_host', 'ports': [{'label': 'new_host_iscsi_0', 'type': 'iscsi', 'port': 'iqn.used_elsewhere'}]},
+                                       {'name': 'beegfs_metadata1', 'host_type': 'windows'},
+                                       {'name': 'beegfs_storage1'},
+                                       {'name': 'beegfs_metadata2', 'state': 'absent'},
+                                       {'name': 'missing_host', 'state': 'absent'}]}):
+            host = NetAppESeriesHost()
+            host.request = request
+            with self.assertRaises(AnsibleExitJson) as result:
+                host.apply()
+
+        self.assertEqual([(entry['name'], entry['changed']) for entry in result.exception.args[0]['hosts']],
+                         [('new_host', True), ('beegfs_metadata1', True), ('beegfs_storage1', False), ('beegfs_metadata2', True), ('missing_host', False)])
+        self.assertEqual(len([request for request in requests if request == ("GET", "storage-systems/1/hosts")]), 1)
+        self.assertEqual(len([request for request in requests if request[1].endswith("host-types")]), 1)
+        self.assertIn(("POST", "storage-systems/1/hosts/84000000600A098000A4B9D10030370B5D430109"), requests)
+        self.assertIn(("DELETE", "storage-systems/1/hosts/84000000600A098000A4B9D10030370B5D430120"), requests)
+
+    def test_apply_hosts_port_move_pass(self):
+        """Verify ports moved between hosts by one entry are seen by the entries that follow."""
+        requests = []
+        hosts = copy.deepcopy(self.EXISTING_HOSTS[:2])
+        updated_host = copy.deepcopy(hosts[1])
+        updated_host.update(initiators=[], hostSidePorts=[])
+
+        def request(url, method="GET", data=None, **kwargs):
+            requests.append((method, url, data))
+            if url.endswith("/hosts") and method == "GET":
+                return 200, hosts
+            if url.endswith("host-types"):
+                return 200, self.HOST_TYPES
+            if "interfaces" in url:
+                return 200, []
+            if url.endswith(updated_host["id"]):
+                return 200, updated_host
+            return 200, {}
+
+        with self._set_args({'name': None, 'host_type': 'linux dm-mp',
+                             'hosts': [{'name': 'beegfs_metadata1', 'ports': [{'label': 'beegfs_metadata1_iscsi_1', 'type': 'iscsi', 'port': 'iqn.new'}]},
+                                       {'name': 'new_host', 'ports': [{'label': 'new_host_iscsi_0', 'type': 'iscsi',
+                                                                       'port': 'iqn.1993-08.org.debian.beegfs-metadata:01:69e4efdf30b8'}]},
+                                       {'name': 'beegfs_storage2', 'force_port': True,
+                                        'ports': [{'label': 'storage2_iscsi_0', 'type': 'iscsi',
+                                                   'port': 'iqn.1993-08.org.debian.beegfs-storage1:01:b0621126818'}]},
+                                       {'name': 'beegfs_storage1', 'ports': [{'label': 'storage1_iscsi_1', 'type': 'iscsi', 'port': 'iqn.storage1'}]}]}):
+            host = NetAppESeriesHost()
+            host.request = request
+            with self.assertRaises(AnsibleExitJson) as result:
+                host.apply()
+
+        self.assertEqual([(entry['name'], entry['changed']) for entry in result.exception.args[0]['hosts']],
+                         [('beegfs_metadata1', True), ('new_host', True), ('beegfs_storage2', True), ('beegfs_storage1', True)])
+        storage1_updates = [data for method, url, data in requests if method == "POST" and url.endswith(hosts[0]["id"]) and "name" in data]
+        self.assertEqual(storage1_updates[0]["portsToRemove"], [])
+        self.assertEqual([port["port"] for port in storage1_updates[0]["ports"]], ["iqn.storage1"])
+
+    def test_apply_hosts_fail(self):
+        """Verify apply_hosts reports the hosts that failed without preventing the others from being applied."""
+        def request(url, method="GET", data=None, **kwargs):
+            if url.endswith("/hosts") and method == "GET":
+                return 200, copy.deepcopy(self.EXISTING_HOSTS)
+            if url.endswith("host-types"):
+                return 200, self.HOST_TYPES
+            if "interfaces" in url:
+                return 200, []
+            return 200, {}
+
+        with self._set_args({'name': None, 'host_type': 'linux dm-mp',
+                             'hosts': [{'name': 'new_host', 'ports': [{'label': 'new_host_iscsi_0', 'type': 'iscsi', 'port': 'iqn.used_elsewhere'}]},
+                                       {'name': 'other_host'}]}):
+            host = NetAppESeriesHost()
+            host.request = request
+            with self.assertRaisesRegex(AnsibleFailJson, "Failed to apply changes to 1 of 2 hosts. Hosts \\[new_host\\]."):
+                host.apply()
+
+        with self._set_args({'name': None, 'hosts': [{'name': 'host'}, {'name': 'HOST'}]}):
+            host = NetAppESeriesHost()
+            with self.assertRaisesRegex(AnsibleFailJson, "Host names must be unique."):
+                host.apply()
+
     def test_valid_host_type_pass(self):
         """Validate the available host types."""
         with mock.patch(self.REQ_FUNC, return_value=(200, self.HOST_TYPES)):
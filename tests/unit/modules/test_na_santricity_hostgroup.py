@@ -143,3 +143,54 @@ class HostTest(ModuleTestCase):
             hostgroup_object = NetAppESeriesHostGroup()
             with self.assertRaises(AnsibleExitJson):
                 hostgroup_object.apply()
+
+    def test_apply_host_groups_pass(self):
+        """Apply a list of host groups with a single retrieval of the existing host groups and hosts."""
+        requests = []
+
+        def request(url, method="GET", data=None, **kwargs):
+            requests.append((method, url))
+            if url.endswith("/host-groups") and method == "GET":
+                return 200, self.HOSTGROUPS_GET_RESPONSE
+            if url.endswith("/hosts"):
+                return 200, self.HOSTS_GET_RESPONSE
+            return 200, {}
+
+        with self._set_args({"state": "present",
+                             "host_groups": [{"name": "group1", "hosts": ["host1"]},
+                                             {"name": "group2", "hosts": ["host1", "host2", "host3"]},
+                                             {"name": "group3", "state": "absent"},
+                                             {"name": "group4", "hosts": ["host2"]},
+                                             {"name": "group5", "state": "absent"}]}):
+            hostgroup_object = NetAppESeriesHostGroup()
+            with mock.patch(self.REQ_FUNC, side_effect=request):
+                with self.assertRaisesRegex(AnsibleExitJson, "3 of 5 host groups required changes.") as result:
+                    hostgroup_object.apply()
+
+        self.assertEqual([host_group["msg"] for host_group in result.exception.args[0]["host_groups"]],
+                         ["Host group [group1] exists.", "Host group [group2] has been updated.",
+                          "Host group [group3] has been deleted.", "Host group [group4] has been created.",
+                          "Host group [group5] does not exist."])
+        self.assertEqual(len([request for request in requests if request[0] == "GET"]), 2)
+
+    def test_apply_host_groups_fail(self):
+        """Verify host group failures are reported without stopping the remaining host groups."""
+        def request(url, method="GET", data=None, **kwargs):
+            if url.endswith("/host-groups") and method == "GET":
+                return 200, self.HOSTGROUPS_GET_RESPONSE
+            if url.endswith("/hosts"):
+                return 200, self.HOSTS_GET_RESPONSE
+            raise Exception()
+
+        with self._set_args({"state": "present",
+                             "host_groups": [{"name": "group1", "hosts": ["host2"]}, {"name": "group3"}]}):
+            hostgroup_object = NetAppESeriesHostGroup()
+            with mock.patch(self.REQ_FUNC, side_effect=request):
+                with self.assertRaisesRegex(AnsibleFailJson, r"Failed to apply changes to 1 of 2 host groups. Host groups \[group1\]"):
+                    hostgroup_object.apply()
+
+        with self._set_args({"state": "present",
+                             "host_groups": [{"name": "group1"}, {"name": "group1", "state": "absent"}]}):
+            hostgroup_object = NetAppESeriesHostGroup()
+            with self.assertRaisesRegex(AnsibleFailJson, "Host group names must be unique."):
+                hostgroup_object.apply()
@@ -62,11 +62,11 @@ class LdapTest(ModuleTestCase):
                          "names": ["name1", "name2"], "group_attributes": ["group_attr1", "group_attr1"], "user_attribute": "user_attr"}]
 
         for options in options_list:
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
                 with self._set_args(options):
                     ldap = NetAppESeriesLdap()
         for options in options_list:
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": False})):
                 with self._set_args(options):
                     ldap = NetAppESeriesLdap()
 
@@ -75,7 +75,7 @@ class LdapTest(ModuleTestCase):
         options = {"state": "present", "identifier": "test_domain", "server_url": "ldap://test.example.com:389",
                    "search_base": "ou=accounts,DC=test,DC=example,DC=com", "bind_user": "admin", "bind_password": "adminpass",
                    "names": ["name1", "name2"], "group_attributes": ["group_attr1", "group_attr1"], "user_attribute": "user_attr"}
-        with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+        with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
             with mock.patch(self.REQ_FUNC, return_value=(200, self.GET_DOMAINS)):
                 with self._set_args(options):
                     ldap = NetAppESeriesLdap()
@@ -86,7 +86,7 @@ class LdapTest(ModuleTestCase):
         options = {"state": "present", "identifier": "test_domain", "server_url": "ldap://test.example.com:389",
                    "search_base": "ou=accounts,DC=test,DC=example,DC=com", "bind_user": "admin", "bind_password": "adminpass",
                    "names": ["name1", "name2"], "group_attributes": ["group_attr1", "group_attr1"], "user_attribute": "user_attr"}
-        with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+        with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
             with mock.patch(self.REQ_FUNC, return_value=Exception()):
                 with self.assertRaisesRegex(AnsibleFailJson, "Failed to retrieve current LDAP configuration."):
                     with self._set_args(options):
@@ -111,7 +111,7 @@ class LdapTest(ModuleTestCase):
                              'names': ['name1', 'name2'], 'roleMapCollection': [], 'searchBase': 'ou=accounts,DC=test,DC=example,DC=com',
                              'userAttribute': 'user_attr', 'bindLookupUser': {'password': 'adminpass', 'user': 'admin'}}]
         for index in range(len(options_list)):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
                 with self._set_args(options_list[index]):
                     ldap = NetAppESeriesLdap()
                     ldap.build_request_body()
@@ -128,26 +128,26 @@ class LdapTest(ModuleTestCase):
                          "names": ["name1", "name2"], "group_attributes": ["group_attr1", "group_attr1"], "user_attribute": "user_attr"}]
 
         for index in range(len(options_list)):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
                 with self._set_args(options_list[index]):
                     ldap = NetAppESeriesLdap()
                     ldap.get_domains = lambda: self.GET_DOMAINS["ldapDomains"]
                     self.assertTrue(ldap.are_changes_required())
 
-        with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+        with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
             with self._set_args({"state": "disabled"}):
                 ldap = NetAppESeriesLdap()
                 ldap.get_domains = lambda: self.GET_DOMAINS["ldapDomains"]
                 self.assertTrue(ldap.are_changes_required())
                 self.assertEqual(ldap.existing_domain_ids, ["test1", "test2"])
 
-        with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+        with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
             with self._set_args({"state": "absent", "identifier": "test_domain"}):
                 ldap = NetAppESeriesLdap()
                 ldap.get_domains = lambda: self.GET_DOMAINS["ldapDomains"]
                 self.assertFalse(ldap.are_changes_required())
 
-        with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+        with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
             with self._set_args({"state": "present", "identifier": "test2", "server_url": "ldap://test2.example.com:389",
                                  "search_base": "ou=accounts,DC=test2,DC=example,DC=com",
                                  "bind_user": "CN=cn,OU=accounts,DC=test2,DC=example,DC=com", "bind_password": "adminpass",
@@ -162,7 +162,7 @@ class LdapTest(ModuleTestCase):
                                                                    {"id": "ANSIBLE_TMP_DOMAIN", "result": {"authenticationTestResult": "ok"}}])):
                     self.assertFalse(ldap.are_changes_required())
 
-        with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+        with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
             with self._set_args({"state": "present", "identifier": "test2", "server_url": "ldap://test2.example.com:389",
                                  "search_base": "ou=accounts,DC=test,DC=example,DC=com",
                                  "bind_user": "CN=cn,OU=accounts,DC=test2,DC=example,DC=com", "bind_password": "adminpass",
@@ -179,7 +179,7 @@ class LdapTest(ModuleTestCase):
 
     def test_are_changes_required_fail(self):
         """Verify are_changes_required throws expected exception."""
-        with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+        with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
             with self._set_args({"state": "present", "identifier": "test2", "server_url": "ldap://test2.example.com:389",
                                  "search_base": "ou=accounts,DC=test2,DC=example,DC=com",
                                  "bind_user": "CN=cn,OU=accounts,DC=test2,DC=example,DC=com", "bind_password": "adminpass",
@@ -194,7 +194,7 @@ class LdapTest(ModuleTestCase):
                                                                        {"id": "ANSIBLE_TMP_DOMAIN", "result": {"authenticationTestResult": "fail"}}])):
                         ldap.are_changes_required()
 
-        with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+        with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
             with self._set_args({"state": "present", "identifier": "test2", "server_url": "ldap://test2.example.com:389",
                                  "search_base": "ou=accounts,DC=test2,DC=example,DC=com",
                                  "bind_user": "CN=cn,OU=accounts,DC=test2,DC=example,DC=com", "bind_password": "adminpass",
@@ -216,7 +216,7 @@ class LdapTest(ModuleTestCase):
                              "bind_user": "CN=cn,OU=accounts,DC=test2,DC=example,DC=com", "bind_password": "adminpass",
                              "role_mappings": {".*": ["storage.admin", "support.admin", "security.admin", "storage.monitor"]},
                              "names": ["test2.example.com"], "group_attributes": ["memberOf"], "user_attribute": "sAMAccountName"}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
                 ldap = NetAppESeriesLdap()
                 ldap.build_request_body()
                 with mock.patch(self.REQ_FUNC, return_value=(200, {"ldapDomains": [{"id": "test2"}]})):
@@ -229,7 +229,7 @@ class LdapTest(ModuleTestCase):
                              "bind_user": "CN=cn,OU=accounts,DC=test2,DC=example,DC=com", "bind_password": "adminpass",
                              "role_mappings": {".*": ["storage.admin", "support.admin", "security.admin", "storage.monitor"]},
                              "names": ["test2.example.com"], "group_attributes": ["memberOf"], "user_attribute": "sAMAccountName"}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
                 ldap = NetAppESeriesLdap()
                 ldap.build_request_body()
                 with self.assertRaisesRegex(AnsibleFailJson, "Failed to create LDAP domain."):
@@ -243,7 +243,7 @@ class LdapTest(ModuleTestCase):
                              "bind_user": "CN=cn,OU=accounts,DC=test2,DC=example,DC=com", "bind_password": "adminpass",
                              "role_mappings": {".*": ["storage.admin", "support.admin", "security.admin", "storage.monitor"]},
                              "names": ["test2.example.com"], "group_attributes": ["memberOf"], "user_attribute": "sAMAccountName"}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
                 ldap = NetAppESeriesLdap()
                 ldap.build_request_body()
                 ldap.domain = {"id": "test2"}
@@ -257,7 +257,7 @@ class LdapTest(ModuleTestCase):
                              "bind_user": "CN=cn,OU=accounts,DC=test2,DC=example,DC=com", "bind_password": "adminpass",
                              "role_mappings": {".*": ["storage.admin", "support.admin", "security.admin", "storage.monitor"]},
                              "names": ["test2.example.com"], "group_attributes": ["memberOf"], "user_attribute": "sAMAccountName"}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
                 ldap = NetAppESeriesLdap()
                 ldap.build_request_body()
                 ldap.domain = {"id": "test2"}
@@ -272,7 +272,7 @@ class LdapTest(ModuleTestCase):
                              "bind_user": "CN=cn,OU=accounts,DC=test2,DC=example,DC=com", "bind_password": "adminpass",
                              "role_mappings": {".*": ["storage.admin", "support.admin", "security.admin", "storage.monitor"]},
                              "names": ["test2.example.com"], "group_attributes": ["memberOf"], "user_attribute": "sAMAccountName"}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
                 ldap = NetAppESeriesLdap()
                 with mock.patch(self.REQ_FUNC, return_value=(200, None)):
                     ldap.delete_domain("test2")
@@ -284,7 +284,7 @@ class LdapTest(ModuleTestCase):
                              "bind_user": "CN=cn,OU=accounts,DC=test2,DC=example,DC=com", "bind_password": "adminpass",
                              "role_mappings": {".*": ["storage.admin", "support.admin", "security.admin", "storage.monitor"]},
                              "names": ["test2.example.com"], "group_attributes": ["memberOf"], "user_attribute": "sAMAccountName"}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
                 ldap = NetAppESeriesLdap()
                 with self.assertRaisesRegex(AnsibleFailJson, "Failed to delete LDAP domain."):
                     with mock.patch(self.REQ_FUNC, return_value=Exception()):
@@ -297,7 +297,7 @@ class LdapTest(ModuleTestCase):
                              "bind_user": "CN=cn,OU=accounts,DC=test2,DC=example,DC=com", "bind_password": "adminpass",
                              "role_mappings": {".*": ["storage.admin", "support.admin", "security.admin", "storage.monitor"]},
                              "names": ["test2.example.com"], "group_attributes": ["memberOf"], "user_attribute": "sAMAccountName"}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
                 ldap = NetAppESeriesLdap()
                 ldap.delete_domain = lambda x: None
                 ldap.existing_domain_ids = ["id1", "id2", "id3"]
@@ -310,7 +310,7 @@ class LdapTest(ModuleTestCase):
                              "bind_user": "CN=cn,OU=accounts,DC=test2,DC=example,DC=com", "bind_password": "adminpass",
                              "role_mappings": {".*": ["storage.admin", "support.admin", "security.admin", "storage.monitor"]},
                              "names": ["test2.example.com"], "group_attributes": ["memberOf"], "user_attribute": "sAMAccountName"}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
                 ldap = NetAppESeriesLdap()
                 ldap.build_request_body = lambda: None
                 ldap.are_changes_required = lambda: False
@@ -322,7 +322,7 @@ class LdapTest(ModuleTestCase):
                              "bind_user": "CN=cn,OU=accounts,DC=test2,DC=example,DC=com", "bind_password": "adminpass",
                              "role_mappings": {".*": ["storage.admin", "support.admin", "security.admin", "storage.monitor"]},
                              "names": ["test2.example.com"], "group_attributes": ["memberOf"], "user_attribute": "sAMAccountName"}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
                 ldap = NetAppESeriesLdap()
                 ldap.build_request_body = lambda: None
                 ldap.are_changes_required = lambda: True
@@ -336,7 +336,7 @@ class LdapTest(ModuleTestCase):
                              "bind_user": "CN=cn,OU=accounts,DC=test2,DC=example,DC=com", "bind_password": "adminpass",
                              "role_mappings": {".*": ["storage.admin", "support.admin", "security.admin", "storage.monitor"]},
                              "names": ["test2.example.com"], "group_attributes": ["memberOf"], "user_attribute": "sAMAccountName"}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
                 ldap = NetAppESeriesLdap()
                 ldap.build_request_body = lambda: None
                 ldap.are_changes_required = lambda: True
@@ -346,7 +346,7 @@ class LdapTest(ModuleTestCase):
                     ldap.apply()
 
         with self._set_args({"state": "absent", "identifier": "test2"}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
                 ldap = NetAppESeriesLdap()
                 ldap.build_request_body = lambda: None
                 ldap.are_changes_required = lambda: True
@@ -356,7 +356,7 @@ class LdapTest(ModuleTestCase):
                     ldap.apply()
 
         with self._set_args({"state": "disabled"}):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.10.0000.0001"}), (200, {"runningAsProxy": True})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.10.0000.0001", "runningAsProxy": True})):
                 ldap = NetAppESeriesLdap()
                 ldap.build_request_body = lambda: None
                 ldap.are_changes_required = lambda: True
@@ -3,6 +3,9 @@
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 from contextlib import contextmanager
+import json
+import os
+import tempfile
 from ansible.module_utils.testing import patch_module_args
 from ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_lun_mapping import NetAppESeriesLunMapping
 from ansible_collections.community.internal_test_tools.tests.unit.plugins.modules.utils import (
@@ -69,6 +72,29 @@ class NetAppLunMappingTest(ModuleTestCase):
                 print("%s" % mapping.mapping_info)
                 self.assertEqual(mapping.mapping_info, self.MAPPING_INFO)
 
+    def test_update_mapping_info_graph_file_pass(self):
+        """Verify update_mapping_info uses a saved storage system graph in check mode without issuing requests."""
+        graph_file = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False)
+        try:
+            json.dump(self.GRAPH_RESPONSE, graph_file)
+            graph_file.close()
+
+            options = {"target": "host1", "volume": "volume1", "graph_file": graph_file.name, "_ansible_check_mode": True}
+            with self._set_args(options):
+                mapping = NetAppESeriesLunMapping()
+                with mock.patch(self.REQ_FUNC, return_value=Exception()) as request:
+                    mapping.update_mapping_info()
+                    self.assertEqual(mapping.mapping_info, self.MAPPING_INFO)
+                    request.assert_not_called()
+
+            options = {"target": "host1", "volume": "volume1", "graph_file": graph_file.name}
+            with self._set_args(options):
+                mapping = NetAppESeriesLunMapping()
+                with self.assertRaisesRegex(AnsibleFailJson, "The graph_file option can only be used in check mode."):
+                    mapping.update_mapping_info()
+        finally:
+            os.remove(graph_file.name)
+
     def test_update_mapping_info_fail(self):
         """Verify update_mapping_info throws the expected exceptions."""
         response = {"storagePoolBundle": {"host": [{"name": "host1", "hostRef": "1"},
@@ -199,3 +225,51 @@ class NetAppLunMappingTest(ModuleTestCase):
             with mock.patch(self.REQ_FUNC, return_value=Exception()):
                 with self.assertRaisesRegex(AnsibleFailJson, "Failed to update storage array lun mapping."):
                     mapping.update()
+
+    def test_update_mappings_pass(self):
+        """Verify the mappings list is converged with a single graph request and ordered lun changes."""
+        options = {"mappings": [{"volume": "volume1", "target": "host1", "lun": 5},
+                                {"volume": "volume3", "target": "host2", "lun": 3},
+                                {"volume": "volume2", "target": "host1", "lun": 7},
+                                {"volume": "thin_volume1", "state": "absent"}]}
+        with self._set_args(options):
+            mapping = NetAppESeriesLunMapping()
+            with mock.patch(self.REQ_FUNC, side_effect=[(200, self.GRAPH_RESPONSE), (200, None), (200, None), (200, None)]) as request:
+                with self.assertRaisesRegex(AnsibleExitJson, "'changed': True.*'volume': 'volume1', 'target': 'host1', 'lun': 5, 'changed': False"):
+                    mapping.update()
+            self.assertEqual([(call[0][0], call[1].get("method")) for call in request.call_args_list[1:]],
+                             [("storage-systems/1/volume-mappings/300001", "DELETE"),
+                              ("storage-systems/1/volume-mappings/200001/move", "POST"),
+                              ("storage-systems/1/volume-mappings", "POST")])
+            self.assertEqual(request.call_args_list[3][1]["data"], {"targetId": "2", "lun": 3, "mappableObjectId": "300"})
+
+        options = {"mappings": [{"volume": "volume3", "target": "host3"}, {"volume": "thin_volume3", "target": "host3", "lun": 0}]}
+        with self._set_args(options):
+            mapping = NetAppESeriesLunMapping()
+            with mock.patch(self.REQ_FUNC, side_effect=[(200, self.GRAPH_RESPONSE), (200, None), (200, None)]) as request:
+                with self.assertRaisesRegex(AnsibleExitJson, "'volume': 'volume3', 'target': 'host3', 'lun': None, 'changed': True"):
+                    mapping.update()
+            self.assertEqual([call[1]["data"] for call in request.call_args_list[1:]],
+                             [{"targetId": "3", "lun": 0, "mappableObjectId": "3000"}, {"targetId": "3", "mappableObjectId": "300"}])
+
+        options = {"mappings": [{"volume": "volume3", "target": "host1"}], "_ansible_check_mode": True}
+        with self._set_args(options):
+            mapping = NetAppESeriesLunMapping()
+            with mock.patch(self.REQ_FUNC, return_value=(200, self.GRAPH_RESPONSE)) as request:
+                with self.assertRaisesRegex(AnsibleExitJson, "'changed': True"):
+                    mapping.update()
+            self.assertEqual(request.call_count, 1)
+
+    def test_update_mappings_fail(self):
+        """Verify every lun conflict is reported before any change is made."""
+        options = {"mappings": [{"volume": "volume3", "target": "host1", "lun": 5},
+                                {"volume": "thin_volume3", "target": "host3", "lun": 9},
+                                {"volume": "thin_volume2", "target": "host3", "lun": 9},
+                                {"volume": "volume10", "target": "host3"}]}
+        with self._set_args(options):
+            mapping = NetAppESeriesLunMapping()
+            with mock.patch(self.REQ_FUNC, return_value=(200, self.GRAPH_RESPONSE)) as request:
+                with self.assertRaisesRegex(AnsibleFailJson, "Volume \\[volume10\\] does not exist.*Lun \\[9\\] is requested for target \\[host3\\]"
+                                                             ".*Lun \\[5\\] is already in use for target \\[host1\\]"):
+                    mapping.update()
+            self.assertEqual(request.call_count, 1)
@@ -24,6 +24,7 @@ class StoragePoolTest(ModuleTestCase):
     OS_PATH_EXISTS_FUNC = "os.path.exists"
     OS_PATH_ISDIR_FUNC = "os.path.isdir"
     OS_LISTDIR_FUNC = "os.listdir"
+    OS_PATH_GETMTIME_FUNC = "os.path.getmtime"
 
     @contextmanager
     def _set_args(self, args=None):
@@ -41,7 +42,8 @@ class StoragePoolTest(ModuleTestCase):
             with patch(self.OS_PATH_EXISTS_FUNC, return_value=True):
                 with patch(self.OS_PATH_ISDIR_FUNC, side_effect=[False, True]):
                     with patch(self.OS_LISTDIR_FUNC, return_value=["firmware2.dlp", "firmware3.dlp"]):
-                        firmware.determine_file_paths()
+                        with patch(self.OS_PATH_GETMTIME_FUNC, return_value=1):
+                            firmware.determine_file_paths()
                         self.assertEqual(firmware.files, {"firmware1.dlp": "/path/to/firmware1.dlp",
                                                           "firmware2.dlp": "/path/to/firmware/directory/firmware2.dlp",
                                                           "firmware3.dlp": "/path/to/firmware/directory/firmware3.dlp"})
@@ -111,6 +113,7 @@ class StoragePoolTest(ModuleTestCase):
             firmware.is_proxy = lambda: True
             firmware.determine_file_paths = lambda: None
             firmware.determine_changes = lambda: None
+            firmware.get_upload_bytes = lambda: 0
 
             firmware.add_files = ["firmware1.dlp", "firmware2.dlp"]
             firmware.remove_files = ["firmware3.dlp", "firmware4.dlp"]
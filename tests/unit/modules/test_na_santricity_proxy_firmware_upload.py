@@ -2,9 +2,13 @@
 # BSD-3 Clause (see COPYING or https://opensource.org/licenses/BSD-3-Clause)
 from __future__ import absolute_import, division, print_function
 __metaclass__ = type
+import os
+import shutil
+import tempfile
 from contextlib import contextmanager
 from ansible.module_utils.testing import patch_module_args
 from ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_proxy_firmware_upload import NetAppESeriesProxyFirmwareUpload
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import file_manifest_cache as FILE_MANIFEST_CACHE
 from ansible_collections.community.internal_test_tools.tests.unit.plugins.modules.utils import (
     AnsibleFailJson, AnsibleExitJson, ModuleTestCase
 )
@@ -23,6 +27,7 @@ class StoragePoolTest(ModuleTestCase):
     OS_PATH_EXISTS_FUNC = "os.path.exists"
     OS_PATH_ISDIR_FUNC = "os.path.isdir"
     OS_LISTDIR_FUNC = "os.listdir"
+    OS_PATH_GETMTIME_FUNC = "os.path.getmtime"
 
     @contextmanager
     def _set_args(self, args=None):
@@ -40,7 +45,8 @@ class StoragePoolTest(ModuleTestCase):
             with patch(self.OS_PATH_EXISTS_FUNC, return_value=True):
                 with patch(self.OS_PATH_ISDIR_FUNC, side_effect=[False, True]):
                     with patch(self.OS_LISTDIR_FUNC, return_value=["firmware2.dlp", "firmware3.dlp"]):
-                        firmware.determine_file_paths()
+                        with patch(self.OS_PATH_GETMTIME_FUNC, return_value=1):
+                            firmware.determine_file_paths()
                         self.assertEqual(firmware.files, {"firmware1.dlp": "/path/to/firmware1.dlp",
                                                           "firmware2.dlp": "/path/to/firmware/directory/firmware2.dlp",
                                                           "firmware3.dlp": "/path/to/firmware/directory/firmware3.dlp"})
@@ -110,6 +116,7 @@ class StoragePoolTest(ModuleTestCase):
             firmware.is_proxy = lambda: True
             firmware.determine_file_paths = lambda: None
             firmware.determine_changes = lambda: None
+            firmware.get_upload_bytes = lambda: 0
 
             firmware.add_files = ["firmware1.dlp", "firmware2.dlp"]
             firmware.remove_files = ["firmware3.dlp", "firmware4.dlp"]
@@ -139,3 +146,58 @@ class StoragePoolTest(ModuleTestCase):
 
             with self.assertRaisesRegex(AnsibleFailJson, r"Module can only be executed against SANtricity Web Services Proxy."):
                 firmware.apply()
+
+    def test_determine_changes_content_pass(self):
+        """Ensure files whose content changed since they were uploaded are uploaded again."""
+        directory = tempfile.mkdtemp()
+        try:
+            with self._set_args({"firmware": [directory]}):
+                firmware = NetAppESeriesProxyFirmwareUpload()
+                firmware.files = {}
+                for filename in ["content_firmware1.dlp", "content_firmware2.dlp"]:
+                    firmware.files[filename] = os.path.join(directory, filename)
+                    with open(firmware.files[filename], "wb") as fh:
+                        fh.write(filename.encode() * 10)
+
+                with patch(self.CREATE_MULTIPART_FORMDATA_FUNC, return_value=(None, None)):
+                    with patch(self.REQUEST_FUNC, return_value=(200, None)):
+                        for filename in firmware.files.keys():
+                            firmware.upload_file(filename)
+
+                with open(firmware.files["content_firmware2.dlp"], "wb") as fh:
+                    fh.write(b"changed")
+                os.utime(firmware.files["content_firmware2.dlp"], (1, 1))
+
+                with patch(self.REQUEST_FUNC, return_value=(200, [{"filename": "content_firmware1.dlp"}, {"filename": "content_firmware2.dlp"}])):
+                    firmware.determine_changes()
+                self.assertEqual(firmware.add_files, ["content_firmware2.dlp"])
+                self.assertEqual(firmware.update_files, ["content_firmware2.dlp"])
+                self.assertEqual(firmware.remove_files, [])
+                self.assertEqual(firmware.get_upload_bytes(), 7)
+        finally:
+            shutil.rmtree(directory)
+
+    def test_manifest_options_pass(self):
+        """Ensure the manifest is only persisted when manifest_ttl is set and is ignored when refresh_manifest is set."""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "firmware.dlp")
+            with open(path, "wb") as fh:
+                fh.write(b"firmware")
+
+            with self._set_args({"firmware": [directory], "manifest_ttl": 0}):
+                firmware = NetAppESeriesProxyFirmwareUpload()
+                digest = firmware.manifest.get_digest(path)
+                self.assertFalse(os.path.exists(FILE_MANIFEST_CACHE.path))
+
+            mtime = os.path.getmtime(path)
+            with open(path, "wb") as fh:
+                fh.write(b"firmwar2")
+            os.utime(path, (mtime, mtime))
+            with self._set_args({"firmware": [directory]}):
+                self.assertEqual(NetAppESeriesProxyFirmwareUpload().manifest.get_digest(path), digest)
+            with self._set_args({"firmware": [directory], "refresh_manifest": True}):
+                self.assertNotEqual(NetAppESeriesProxyFirmwareUpload().manifest.get_digest(path), digest)
+                self.assertTrue(os.path.exists(FILE_MANIFEST_CACHE.path))
+        finally:
+            shutil.rmtree(directory)
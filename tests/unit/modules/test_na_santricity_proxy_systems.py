@@ -489,6 +489,34 @@ class StoragePoolTest(ModuleTestCase):
                 with mock.patch(self.REQUEST_FUNC, side_effect=[(200, None), Exception()]):
                     systems.add_system(system)
 
+    def test_add_system_password_backoff_pass(self):
+        """Validate add_system backs off exponentially while validating the storage system password."""
+        system = {"ssid": "1", "serial": "1", "password": "password", "meta_tags": [], "controller_addresses": ["192.168.1.5", "192.168.1.6"],
+                  "accept_certificate": False}
+        with self._set_args({"password": "password", "systems": [{"ssid": "1", "serial": "1"}]}):
+            systems = NetAppESeriesProxySystems()
+            systems.set_password = lambda x: None
+            with mock.patch(self.TIME_FUNC, return_value=None) as sleep:
+                with mock.patch(self.REQUEST_FUNC, side_effect=[(200, None), Exception(), Exception(), Exception(), (200, None)]):
+                    self.assertTrue(systems.add_system(system))
+            self.assertEqual([call[0][0] for call in sleep.call_args_list], [1, 2, 4, 8])
+
+    def test_apply_systems_pass(self):
+        """Validate apply_systems records the result of every storage system."""
+        with self._set_args({"password": "password", "systems": [{"ssid": "1", "serial": "1"}], "max_workers": 2}):
+            systems = NetAppESeriesProxySystems()
+
+            def update_system(system):
+                if system["ssid"] == "3":
+                    raise Exception("failure")
+                return system["ssid"] == "1"
+
+            ssids = systems.apply_systems("update", update_system, [{"ssid": "1"}, {"ssid": "2"}, {"ssid": "3"}])
+            self.assertEqual(ssids, ["1", "2", "3"])
+            self.assertEqual([(result["ssid"], result["action"], result["succeeded"]) for result in systems.results],
+                             [("1", "update", True), ("2", "update", False), ("3", "update", False)])
+            self.assertIn("update", systems.timing)
+
     def test_update_system_pass(self):
         """Validate update_system method."""
         system = {"ssid": "1", "changes": {}}
@@ -744,3 +772,7 @@ class StoragePoolTest(ModuleTestCase):
             systems.is_embedded = lambda: True
             with self.assertRaisesRegex(AnsibleFailJson, "Cannot add/remove storage systems to SANtricity Web Services Embedded instance."):
                 systems.apply()
+
+        with self._set_args({"password": "password", "systems": [{"ssid": "1", "serial": "1"}], "max_workers": 0}):
+            with self.assertRaisesRegex(AnsibleFailJson, "max_workers must be greater than zero."):
+                NetAppESeriesProxySystems()
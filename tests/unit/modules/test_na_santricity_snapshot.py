@@ -0,0 +1,398 @@
+# (c) 2024, NetApp, Inc
+# BSD-3 Clause (see COPYING or https://opensource.org/licenses/BSD-3-Clause)
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+import os
+import tempfile
+
+from contextlib import contextmanager
+from ansible.module_utils.testing import patch_module_args
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity import NetAppESeriesCache
+from ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_snapshot import NetAppESeriesSnapshot
+from ansible_collections.community.internal_test_tools.tests.unit.plugins.modules.utils import (
+    AnsibleExitJson, AnsibleFailJson, ModuleTestCase
+)
+from ansible_collections.community.internal_test_tools.tests.unit.compat import mock
+
+
+class SnapshotTest(ModuleTestCase):
+    REQUIRED_PARAMS = {"api_username": "admin",
+                       "api_password": "adminpassword",
+                       "api_url": "https://localhost:8443/devmgr/v2",
+                       "ssid": "1",
+                       "validate_certs": "no"}
+    REQ_FUNC = "ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_snapshot.NetAppESeriesSnapshot.request"
+    IS_EMBEDDED_FUNC = "ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_snapshot.NetAppESeriesSnapshot.is_embedded"
+    CACHE_OBJ = "ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_snapshot.snapshot_cache"
+
+    VOLUMES_BY_ID = {"0200000001": {"name": "volume1", "id": "0200000001", "totalSizeInBytes": "107374182400"},
+                     "0200000002": {"name": "volume2", "id": "0200000002", "totalSizeInBytes": "107374182400"}}
+    CONSISTENCY_GROUPS = [{"id": "2A00000001", "cgRef": "2A00000001", "label": "group1", "fullWarnThreshold": 75, "autoDeleteLimit": 32,
+                           "rollbackPriority": "medium", "repFullPolicy": "purgepit", "uniqueSequenceNumber": [1, 2]},
+                          {"id": "2A00000002", "cgRef": "2A00000002", "label": "group2", "fullWarnThreshold": 75, "autoDeleteLimit": 32,
+                           "rollbackPriority": "medium", "repFullPolicy": "purgepit", "uniqueSequenceNumber": []}]
+    MEMBER_VOLUMES = {"2A00000001": [{"volumeId": "0200000001", "totalRepositoryCapacity": "42949672960", "repositoryVolume": "3600000001"}],
+                      "2A00000002": [{"volumeId": "0200000002", "totalRepositoryCapacity": "21474836480", "repositoryVolume": "3600000002"}]}
+    CONCAT_VOLUMES = [{"id": "3600000001", "memberCount": 1}, {"id": "3600000002", "memberCount": 2}]
+    SNAPSHOT_IMAGES = [{"pitTimestamp": "1600000000"}]
+    KEY_VALUES = [{"key": "ansible|group1|pit1", "value": "1600000000|pit1|daily"},
+                  {"key": "ansible|group1|pit0", "value": "1500000000|pit0|daily"},
+                  {"key": "ansible|group2|pit1", "value": "1400000000|pit1|"},
+                  {"key": "ansible|group2|pit2", "value": "invalid"},
+                  {"key": "other", "value": "1300000000|other|"}]
+
+    @contextmanager
+    def _set_args(self, args=None):
+        module_args = self.REQUIRED_PARAMS.copy()
+        if args is not None:
+            module_args.update(args)
+        with patch_module_args(module_args):
+            yield
+
+    def _request(self, requests):
+        """Return a request function that responds with the consistency group responses and records every request."""
+        def request(url, method="GET", data=None, **kwargs):
+            requests.append(url)
+            if url.endswith("/consistency-groups"):
+                return 200, self.CONSISTENCY_GROUPS
+            if url.endswith("/member-volumes"):
+                return 200, self.MEMBER_VOLUMES[url.split("/")[-2]]
+            if url.endswith("/repositories/concat"):
+                return 200, self.CONCAT_VOLUMES
+            if url.endswith("/snapshots") and method == "POST":
+                return 200, [{"pitTimestamp": "1700000000"}]
+            if url.endswith("snapshot-images"):
+                return 200, self.SNAPSHOT_IMAGES
+            if url.endswith("key-values"):
+                return 200, self.KEY_VALUES
+            if url.startswith("key-values/") or (url.endswith("/consistency-groups/2A00000002") and method == "DELETE"):
+                return 200, {}
+            raise Exception("Unexpected request! [%s]" % url)
+        return request
+
+    def _get_cache(self):
+        return NetAppESeriesCache(os.path.join(tempfile.mkdtemp(), "snapshot_cache.json"))
+
+    def _get_snapshot_object(self):
+        with mock.patch(self.IS_EMBEDDED_FUNC, return_value=True):
+            snapshot = NetAppESeriesSnapshot()
+        snapshot.get_all_volumes_by_id = lambda: self.VOLUMES_BY_ID
+        snapshot.get_all_storage_pools_by_id = lambda: {}
+        snapshot.get_mapping_by_id = lambda: {}
+        snapshot.complete_volume_definitions = lambda: None
+        return snapshot
+
+    def test_get_consistency_group_pass(self):
+        """Verify the consistency group's reserve capacity volumes are resolved from a single concat volume retrieval."""
+        requests = []
+        with self._set_args({"state": "absent", "group_name": "group2"}):
+            snapshot = self._get_snapshot_object()
+            with mock.patch(self.REQ_FUNC, side_effect=self._request(requests)):
+                group = snapshot.get_consistency_group()
+
+        self.assertEqual(group["consistency_group_id"], "2A00000002")
+        self.assertEqual(group["base_volumes"], [{"name": "volume2", "id": "0200000002", "base_volume_size_b": 107374182400,
+                                                  "total_reserve_capacity_b": 21474836480, "reserve_capacity_pct": 20,
+                                                  "repository_volume_info": {"id": "3600000002", "memberCount": 2}}])
+        self.assertEqual(requests, ["storage-systems/1/consistency-groups", "storage-systems/1/consistency-groups/2A00000002/member-volumes",
+                                    "storage-systems/1/repositories/concat"])
+
+    def test_get_consistency_groups_pass(self):
+        """Verify prefetched consistency groups are reused by later module runs until they are marked stale."""
+        cache = self._get_cache()
+        options_list = [({}, ["storage-systems/1/consistency-groups", "storage-systems/1/consistency-groups/2A00000001/member-volumes",
+                              "storage-systems/1/consistency-groups/2A00000002/member-volumes"]),
+                        ({}, []),
+                        ({"mark_stale": "group1"}, ["storage-systems/1/consistency-groups", "storage-systems/1/consistency-groups/2A00000001/member-volumes"]),
+                        ({"refresh_cache": True}, ["storage-systems/1/consistency-groups", "storage-systems/1/consistency-groups/2A00000001/member-volumes",
+                                                   "storage-systems/1/consistency-groups/2A00000002/member-volumes"])]
+
+        with mock.patch(self.CACHE_OBJ, cache):
+            for options, expected_requests in options_list:
+                mark_stale = options.pop("mark_stale", None)
+                if mark_stale:
+                    with self._set_args({"state": "absent", "group_name": mark_stale, "prefetch_consistency_groups": True, "cache_ttl": 300}):
+                        self._get_snapshot_object().mark_consistency_group_stale()
+
+                cache.clear()
+                requests = []
+                args = {"state": "absent", "group_name": "group1", "prefetch_consistency_groups": True, "cache_ttl": 300}
+                args.update(options)
+                with self._set_args(args):
+                    snapshot = self._get_snapshot_object()
+                    with mock.patch(self.REQ_FUNC, side_effect=self._request(requests)):
+                        groups = snapshot.get_consistency_groups()
+
+                self.assertEqual(sorted(requests), sorted(expected_requests))
+                self.assertEqual(sorted(groups.keys()), ["group1", "group2"])
+                self.assertEqual(groups["group2"]["member_volumes"], self.MEMBER_VOLUMES["2A00000002"])
+
+    def test_get_consistency_groups_fail(self):
+        """Verify member volume retrieval failures are reported."""
+        def request(url, method="GET", data=None, **kwargs):
+            if url.endswith("/consistency-groups"):
+                return 200, self.CONSISTENCY_GROUPS
+            raise Exception()
+
+        with self._set_args({"state": "absent", "group_name": "group1", "prefetch_consistency_groups": True}):
+            snapshot = self._get_snapshot_object()
+            with mock.patch(self.REQ_FUNC, side_effect=request), mock.patch(self.CACHE_OBJ, self._get_cache()):
+                with self.assertRaisesRegex(AnsibleFailJson, "Failed to retrieve snapshot consistency group member volumes!"):
+                    snapshot.get_consistency_groups()
+
+        with self._set_args({"state": "absent", "group_name": "group1", "max_workers": 0}):
+            with self.assertRaisesRegex(AnsibleFailJson, "max_workers must be greater than zero."):
+                self._get_snapshot_object()
+
+    def test_apply_groups_pass(self):
+        """Verify every groups entry is applied from a single retrieval of the consistency groups."""
+        requests = []
+        with self._set_args({"state": "present", "type": "pit", "pit_description": "nightly",
+                             "groups": [{"group_name": "group2", "type": "group", "state": "absent"},
+                                        {"group_name": "group1", "pit_name": "pit1"},
+                                        {"group_name": "group1", "pit_name": "pit2"}]}):
+            snapshot = self._get_snapshot_object()
+            with mock.patch(self.REQ_FUNC, side_effect=self._request(requests)), mock.patch(self.CACHE_OBJ, self._get_cache()):
+                with self.assertRaisesRegex(AnsibleExitJson, "3 of 3 snapshot groups required changes.") as result:
+                    snapshot.apply()
+
+        groups = result.exception.args[0]["groups"]
+        self.assertEqual([(group["group_name"], group["type"], group["changed"]) for group in groups],
+                         [("group2", "group", True), ("group1", "pit", True), ("group1", "pit", True)])
+        self.assertTrue(all("elapsed" in group and "started" in group for group in groups))
+        self.assertEqual(len([request for request in requests if request.endswith("/consistency-groups/2A00000001/snapshots")]), 2)
+        self.assertEqual(sorted(request for request in requests if request.startswith("key-values/")),
+                         ["key-values/ansible|group1|pit0", "key-values/ansible|group1|pit1", "key-values/ansible|group1|pit2",
+                          "key-values/ansible|group2|pit1"])
+        self.assertEqual(result.exception.args[0]["deleted_metadata_keys"], ["ansible|group1|pit0", "ansible|group2|pit1"])
+        self.assertEqual(len([request for request in requests if request == "key-values"]), 1)
+
+    def test_apply_groups_created_group_pass(self):
+        """Verify an entry sees the consistency group created by an entry before it."""
+        requests = []
+        consistency_groups = list(self.CONSISTENCY_GROUPS)
+        created_group = {"id": "2A00000003", "cgRef": "2A00000003", "label": "group3", "fullWarnThreshold": 75, "autoDeleteLimit": 32,
+                         "rollbackPriority": "medium", "repFullPolicy": "purgepit", "uniqueSequenceNumber": []}
+        base_request = self._request(requests)
+        get_required_changes = NetAppESeriesSnapshot.get_required_changes
+
+        def request(url, method="GET", data=None, **kwargs):
+            if url.endswith("/consistency-groups") and method == "POST":
+                requests.append(url)
+                consistency_groups.append(created_group)
+                return 200, created_group
+            if url.endswith("/consistency-groups"):
+                requests.append(url)
+                return 200, consistency_groups
+            if url.endswith("/2A00000003/member-volumes"):
+                requests.append(url)
+                return 200, [{"volumeId": "0200000001", "totalRepositoryCapacity": "42949672960", "repositoryVolume": "3600000001"}]
+            if url.endswith("/member-volumes/batch"):
+                requests.append(url)
+                return 200, {}
+            return base_request(url, method, data, **kwargs)
+
+        def required_changes(snapshot):
+            if snapshot.type == "group":
+                return True, {"create_group": {"alert_threshold_pct": 75, "maximum_snapshots": 32, "reserve_capacity_full_policy": "purgepit",
+                                               "rollback_priority": "medium"}, "add_volumes": {}}
+            return get_required_changes(snapshot)
+
+        with self._set_args({"state": "present", "type": "pit", "groups": [{"group_name": "group3", "type": "group", "volumes": [{"volume": "volume1"}]},
+                                                                           {"group_name": "group3", "pit_name": "pit1"}]}):
+            snapshot = self._get_snapshot_object()
+            with mock.patch.object(NetAppESeriesSnapshot, "get_required_changes", autospec=True, side_effect=required_changes):
+                with mock.patch(self.REQ_FUNC, side_effect=request), mock.patch(self.CACHE_OBJ, self._get_cache()):
+                    with self.assertRaisesRegex(AnsibleExitJson, "2 of 2 snapshot groups required changes.") as result:
+                        snapshot.apply()
+
+        self.assertEqual([(group["group_name"], group["type"], group["changed"]) for group in result.exception.args[0]["groups"]],
+                         [("group3", "group", True), ("group3", "pit", True)])
+        self.assertTrue("storage-systems/1/consistency-groups/2A00000003/snapshots" in requests)
+        self.assertEqual(len([request for request in requests if request == "storage-systems/1/consistency-groups"]), 3)
+
+    def test_apply_groups_fail(self):
+        """Verify a failed groups entry is reported without preventing the remaining entries from being applied."""
+        requests = []
+        with self._set_args({"state": "present", "type": "pit",
+                             "groups": [{"group_name": "group1"}, {"group_name": "group3"}, {"group_name": "group2", "pit_timestamp": "bad"}]}):
+            snapshot = self._get_snapshot_object()
+            with mock.patch(self.REQ_FUNC, side_effect=self._request(requests)), mock.patch(self.CACHE_OBJ, self._get_cache()):
+                with self.assertRaisesRegex(AnsibleFailJson, r"Failed to apply changes to 2 of 3 snapshot groups. Groups \[group3, group2\]"):
+                    snapshot.apply()
+
+        self.assertEqual([request for request in requests if request.endswith("/snapshots")], ["storage-systems/1/consistency-groups/2A00000001/snapshots"])
+
+        # Unexpected errors from concurrent entries must be reported rather than lost.
+        apply_changes = NetAppESeriesSnapshot.apply_changes
+
+        def changes(snapshot, group_changes):
+            if snapshot.group_name == "group2":
+                raise KeyError("pitRef")
+            return apply_changes(snapshot, group_changes)
+
+        for groups in [[{"group_name": "group1"}, {"group_name": "group2"}], [{"group_name": "group2"}]]:
+            with self._set_args({"state": "present", "type": "pit", "groups": groups}):
+                snapshot = self._get_snapshot_object()
+                with mock.patch.object(NetAppESeriesSnapshot, "apply_changes", autospec=True, side_effect=changes):
+                    with mock.patch(self.REQ_FUNC, side_effect=self._request([])), mock.patch(self.CACHE_OBJ, self._get_cache()):
+                        with self.assertRaisesRegex(AnsibleFailJson, r"Failed to apply changes to 1 of %s snapshot groups. Groups \[group2\]"
+                                                                     % len(groups)) as result:
+                            snapshot.apply()
+
+            self.assertEqual([(group["group_name"], group.get("failed", False)) for group in result.exception.args[0]["groups"]],
+                             [(group["group_name"], group["group_name"] == "group2") for group in groups])
+
+    def test_get_unused_pit_key_pass(self):
+        """Verify unused point-in-time image metadata is determined from a single retrieval of the key-values and snapshot images."""
+        requests = []
+        with self._set_args({"state": "absent", "group_name": "group1"}):
+            snapshot = self._get_snapshot_object()
+            with mock.patch(self.REQ_FUNC, side_effect=self._request(requests)):
+                self.assertEqual(snapshot.get_unused_pit_key(), ["ansible|group1|pit0", "ansible|group2|pit1"])
+                self.assertEqual(snapshot.get_pit_images_metadata(), {"1600000000": {"key": "ansible|group1|pit1", "name": "pit1", "description": "daily"},
+                                                                      "1500000000": {"key": "ansible|group1|pit0", "name": "pit0", "description": "daily"}})
+        self.assertEqual(requests, ["storage-systems/1/snapshot-images", "key-values"])
+
+        with self._set_args({"state": "absent", "group_name": "group1", "cleanup_metadata": False}):
+            snapshot = self._get_snapshot_object()
+            with mock.patch(self.REQ_FUNC, side_effect=self._request([])):
+                self.assertEqual(snapshot.get_unused_pit_key(), [])
+
+    def test_apply_metadata_pass(self):
+        """Verify unused and malformed point-in-time image metadata is removed."""
+        options_list = [({}, ["ansible|group1|pit0", "ansible|group2|pit1", "ansible|group2|pit2"]),
+                        ({"group_name": "group2"}, ["ansible|group2|pit1", "ansible|group2|pit2"])]
+
+        for options, expected_keys in options_list:
+            requests = []
+            args = {"state": "absent", "type": "metadata"}
+            args.update(options)
+            with self._set_args(args):
+                snapshot = self._get_snapshot_object()
+                with mock.patch(self.REQ_FUNC, side_effect=self._request(requests)):
+                    with self.assertRaisesRegex(AnsibleExitJson, "%s point-in-time image metadata entries removed." % len(expected_keys)) as result:
+                        snapshot.apply()
+
+            self.assertEqual(result.exception.args[0]["deleted_metadata_keys"], expected_keys)
+            self.assertEqual(sorted(request for request in requests if request.startswith("key-values/")), ["key-values/%s" % key for key in expected_keys])
+
+    def test_apply_metadata_fail(self):
+        """Verify invalid metadata options and metadata failures are reported."""
+        with self._set_args({"state": "present", "type": "metadata"}):
+            with self.assertRaisesRegex(AnsibleFailJson, "Point-in-time image metadata can only be removed"):
+                self._get_snapshot_object()
+
+        def request(url, method="GET", data=None, **kwargs):
+            if url.startswith("key-values/"):
+                raise Exception()
+            return self._request([])(url, method, data, **kwargs)
+
+        with self._set_args({"state": "absent", "type": "metadata"}):
+            snapshot = self._get_snapshot_object()
+            with mock.patch(self.REQ_FUNC, side_effect=request):
+                with self.assertRaisesRegex(AnsibleFailJson, r"Failed to purge unused point-in-time image metadata! Keys \[ansible\|group1\|pit0, "):
+                    snapshot.apply()
+
+        with self._set_args({"state": "present", "type": "pit", "cleanup_metadata": False,
+                             "groups": [{"group_name": "group1", "pit_name": "pit2"}, {"group_name": "group2"}]}):
+            snapshot = self._get_snapshot_object()
+            with mock.patch(self.REQ_FUNC, side_effect=request), mock.patch(self.CACHE_OBJ, self._get_cache()):
+                with self.assertRaisesRegex(AnsibleFailJson, r"Failed to apply changes to 1 of 2 snapshot groups. Groups \[group1\]") as result:
+                    snapshot.apply()
+
+        self.assertEqual([group["msg"] for group in result.exception.args[0]["groups"]][0].split(" Error")[0],
+                         "Failed to create metadata for snapshot images! Group [group1]. Array [1].")
+
+    def test_remove_pit_images_pass(self):
+        """Verify point-in-time images are removed oldest first and the removal time is reported."""
+        requests = []
+        with self._set_args({"state": "absent", "type": "pit", "group_name": "group1", "pit_name": "pit3"}):
+            snapshot = self._get_snapshot_object()
+            snapshot.get_consistency_group = lambda: {"consistency_group_id": "2A00000001"}
+            snapshot.get_pit_images_by_timestamp = lambda: dict((timestamp, {"sequence_number": str(timestamp)}) for timestamp in [5, 3, 1, 4, 2])
+            snapshot.update_pit_metadata = lambda entries: {}
+            with mock.patch(self.REQ_FUNC, side_effect=lambda url, method="GET", data=None, **kwargs: requests.append(url) or (200, {})):
+                snapshot.remove_pit_images({"sequence_number": "3"})
+
+        self.assertEqual(requests, ["storage-systems/1/consistency-groups/2A00000001/snapshots/%s" % number for number in [1, 2, 3]])
+        self.assertTrue("remove_pit_images" in snapshot.timings)
+
+    def test_remove_pit_images_fail(self):
+        """Verify point-in-time image removal stops at the first failure since newer images cannot be removed before it."""
+        requests = []
+
+        def request(url, method="GET", data=None, **kwargs):
+            requests.append(url)
+            if url.endswith("/2"):
+                raise Exception()
+            return 200, {}
+
+        with self._set_args({"state": "absent", "type": "pit", "group_name": "group1", "pit_name": "pit3"}):
+            snapshot = self._get_snapshot_object()
+            snapshot.get_consistency_group = lambda: {"consistency_group_id": "2A00000001"}
+            snapshot.get_pit_images_by_timestamp = lambda: dict((timestamp, {"sequence_number": str(timestamp)}) for timestamp in [1, 2, 3])
+            with mock.patch(self.REQ_FUNC, side_effect=request):
+                with self.assertRaisesRegex(AnsibleFailJson, r"Failed to remove consistency group snapshot images! Removed \[1 of 3\]. Sequence number \[2\]."):
+                    snapshot.remove_pit_images({"sequence_number": "3"})
+
+        self.assertEqual(len(requests), 2)
+
+    def test_map_view_fail(self):
+        """Verify every snapshot volume mapping is attempted and the failures are reported together."""
+        requests = []
+
+        def request(url, method="GET", data=None, **kwargs):
+            requests.append(data["mappableObjectId"])
+            if data["mappableObjectId"] != "0200000001":
+                raise Exception("mapping failed")
+            return 200, {}
+
+        map_requests = [{"mappableObjectId": "0200000001", "lun": 1, "targetId": "8400000001"},
+                        {"mappableObjectId": "0200000002", "lun": 2, "targetId": "8400000001"}]
+        with self._set_args({"state": "present", "type": "view", "group_name": "group1", "view_name": "view1", "pit_name": "pit1"}):
+            snapshot = self._get_snapshot_object()
+            snapshot.get_all_hosts_and_hostgroups_by_id = lambda: {"8400000001": {"name": "host1"}}
+            with mock.patch(self.REQ_FUNC, side_effect=request):
+                with self.assertRaisesRegex(AnsibleFailJson, r"Failed to map 1 of 2 snapshot volumes! .*Snapshot volume \[volume2\]. Target \[host1\]"):
+                    snapshot.map_view(map_requests)
+
+        self.assertEqual(sorted(requests), ["0200000001", "0200000002"])
+        self.assertTrue("map_view" in snapshot.timings)
+
+    def test_create_view_fail(self):
+        """Verify snapshot volume mapping failures are reported as such rather than as a view creation failure."""
+        def request(url, method="GET", data=None, **kwargs):
+            if url.endswith("/volume-mappings"):
+                raise Exception("mapping failed")
+            return 200, {}
+
+        volumes = {"volume1": {"snapshot_volume_writable": False, "snapshot_volume_validate": False, "snapshot_volume_host": "host1",
+                               "snapshot_volume_lun": 1}}
+        with self._set_args({"state": "present", "type": "view", "group_name": "group1", "view_name": "view1", "pit_name": "pit1"}):
+            snapshot = self._get_snapshot_object()
+            snapshot.volumes = volumes
+            snapshot.get_consistency_group = lambda: {"consistency_group_id": "2A00000001"}
+            snapshot.get_consistency_group_view = lambda: {"snapshot_volumes": [{"id": "3900000001", "name": "view1_volume1", "baseVol": "0200000001"}]}
+            snapshot.get_all_hosts_and_hostgroups_by_name = lambda: {"host1": {"id": "8400000001"}}
+            with mock.patch(self.REQ_FUNC, side_effect=request):
+                with self.assertRaisesRegex(AnsibleFailJson, r"'msg': 'Failed to map 1 of 1 snapshot volumes! View \[view1\]") as result:
+                    snapshot.create_view({"name": "view1", "sequence_number": "1", "volumes": volumes,
+                                          "images": [{"id": "3400000001", "base_volume_name": "volume1"}]})
+
+        self.assertNotIn("Failed to create consistency group snapshot volumes", result.exception.args[0]["msg"])
+
+    def test_is_concurrent_group_pass(self):
+        """Verify point-in-time image removals never run alongside another entry for the same consistency group."""
+        with self._set_args({"state": "present", "type": "pit",
+                             "groups": [{"group_name": "group1"}, {"group_name": "group2", "state": "absent", "pit_name": "pit1"},
+                                        {"group_name": "group1", "state": "absent", "pit_name": "pit1"}, {"group_name": "group2", "type": "group",
+                                                                                                          "state": "absent"}]}):
+            snapshot = self._get_snapshot_object()
+            groups = [snapshot.get_bulk_entry_args(entry) for entry in snapshot.group_entries]
+
+        self.assertTrue(snapshot.is_concurrent_group(groups[1], groups[:1]))
+        self.assertFalse(snapshot.is_concurrent_group(groups[2], groups[:2]))
+        self.assertTrue(snapshot.is_concurrent_group(groups[2], []))
+        self.assertFalse(snapshot.is_concurrent_group(groups[3], []))
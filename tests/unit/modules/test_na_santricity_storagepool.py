@@ -722,3 +722,66 @@ class StoragePoolTest(ModuleTestCase):
                     storagepool.secure_storage_pool = lambda check_mode: False
                     storagepool.set_reserve_drive_count = lambda check_mode: True
                     storagepool.apply()
+
+    def _request_counter(self, storage_pool):
+        """Create a request side effect that answers storage pool requests and counts the requests made for each path."""
+        request_counts = {}
+
+        def request(path, **kwargs):
+            path = path.split("?")[0]
+            request_counts.update({path: request_counts.get(path, 0) + 1})
+            if path == "storage-systems/1/storage-pools":
+                return 200, [storage_pool]
+            if path == "storage-systems/1/drives":
+                return 200, self.DRIVES_DATA
+            if path == "storage-systems/1/symbol/getSystemAttributeDefaults":
+                return 200, {"defaults": {"diskPoolDefaultAttributes": {"minimumDriveCount": 11}}}
+            if path == "storage-systems/1/symbol/getDiskPoolExpansionCandidates":
+                return 200, self.EXPANSION_DDP_DRIVE_DATA
+            return 200, {}
+
+        return request, request_counts
+
+    def test_apply_request_count(self):
+        """Verify storage system information is only requested once per apply unless the storage system is changed."""
+        storage_pool = dict(self.STORAGE_POOL_DATA[0])
+        storage_pool.update({"volumeGroupData": {"diskPoolData": {"reconstructionReservedDriveCount": 2,
+                                                                  "poolUtilizationWarningThreshold": 0,
+                                                                  "poolUtilizationCriticalThreshold": 85}}})
+
+        # Present storage pool with no changes
+        request, request_counts = self._request_counter(storage_pool)
+        with patch(self.NETAPP_REQUEST_FUNC, side_effect=request):
+            storagepool = self._initialize_dummy_instance({"state": "present", "name": "pool", "erase_secured_drives": False,
+                                                           "criteria_drive_count": "14", "raid_level": "raidDiskPool"})
+            with self.assertRaisesRegex(AnsibleExitJson, "'changed': False"):
+                storagepool.apply()
+        self.assertEqual(request_counts, {"storage-systems/1/symbol/getSystemAttributeDefaults": 1,
+                                          "storage-systems/1/storage-pools": 1,
+                                          "storage-systems/1/drives": 1})
+
+        # Expand present storage pool in check mode
+        request, request_counts = self._request_counter(storage_pool)
+        with patch(self.NETAPP_REQUEST_FUNC, side_effect=request):
+            storagepool = self._initialize_dummy_instance({"state": "present", "name": "pool", "erase_secured_drives": False,
+                                                           "criteria_drive_count": "20", "raid_level": "raidDiskPool"})
+            storagepool.module.check_mode = True
+            with self.assertRaisesRegex(AnsibleExitJson, "'changed': True"):
+                storagepool.apply()
+        self.assertEqual(request_counts, {"storage-systems/1/symbol/getSystemAttributeDefaults": 1,
+                                          "storage-systems/1/storage-pools": 1,
+                                          "storage-systems/1/drives": 1,
+                                          "storage-systems/1/symbol/getDiskPoolExpansionCandidates": 1})
+
+        # Expand present storage pool which invalidates the storage pool information
+        request, request_counts = self._request_counter(storage_pool)
+        with patch(self.NETAPP_REQUEST_FUNC, side_effect=request):
+            storagepool = self._initialize_dummy_instance({"state": "present", "name": "pool", "erase_secured_drives": False,
+                                                           "criteria_drive_count": "20", "raid_level": "raidDiskPool"})
+            with self.assertRaisesRegex(AnsibleExitJson, "'changed': True"):
+                storagepool.apply()
+        self.assertEqual(request_counts, {"storage-systems/1/symbol/getSystemAttributeDefaults": 1,
+                                          "storage-systems/1/storage-pools": 2,
+                                          "storage-systems/1/drives": 1,
+                                          "storage-systems/1/symbol/getDiskPoolExpansionCandidates": 1,
+                                          "storage-systems/1/symbol/startDiskPoolExpansion": 1})
@@ -37,7 +37,7 @@ class AsupTest(ModuleTestCase):
                    "protocol": "udp",
                    "components": ["auditLog"]}
         with self._set_args(initial):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 syslog = NetAppESeriesSyslog()
 
             with self.assertRaisesRegex(AnsibleFailJson, r"We failed to send test message!"):
@@ -59,7 +59,7 @@ class AsupTest(ModuleTestCase):
                      "components": [{"type": "auditLog"}]}]
 
         with self._set_args(initial):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 syslog = NetAppESeriesSyslog()
 
             with mock.patch(self.REQ_FUNC, side_effect=[(200, expected), (200, None)]):
@@ -81,7 +81,7 @@ class AsupTest(ModuleTestCase):
                      "components": [{"type": "auditLog"}]}]
 
         with self._set_args(initial):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 syslog = NetAppESeriesSyslog()
 
             with mock.patch(self.REQ_FUNC, side_effect=[(200, expected), (200, None)]):
@@ -103,7 +103,7 @@ class AsupTest(ModuleTestCase):
                      "components": [{"type": "auditLog"}]}]
 
         with self._set_args(initial):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 syslog = NetAppESeriesSyslog()
 
             with mock.patch(self.REQ_FUNC, side_effect=[(200, expected), (200, dict(id=1234))]):
@@ -125,7 +125,7 @@ class AsupTest(ModuleTestCase):
                      "components": [{"type": "auditLog"}]}]
 
         with self._set_args(initial):
-            with mock.patch(self.BASE_REQ_FUNC, side_effect=[(200, {"version": "04.00.00.00"}), (200, {"runningAsProxy": False})]):
+            with mock.patch(self.BASE_REQ_FUNC, return_value=(200, {"version": "04.00.00.00", "runningAsProxy": False})):
                 syslog = NetAppESeriesSyslog()
 
             with mock.patch(self.REQ_FUNC, side_effect=[(200, expected), (200, dict(id=1234))]):
@@ -7,8 +7,9 @@ import unittest
 from contextlib import contextmanager
 from ansible.module_utils.testing import patch_module_args
 from ansible_collections.netapp_eseries.santricity.plugins.modules.na_santricity_volume import NetAppESeriesVolume
+from ansible_collections.netapp_eseries.santricity.plugins.module_utils.santricity_operations import NetAppESeriesLongLivedOperations
 from ansible_collections.community.internal_test_tools.tests.unit.plugins.modules.utils import (
-    AnsibleFailJson, ModuleTestCase
+    AnsibleExitJson, AnsibleFailJson, ModuleTestCase
 )
 from ansible_collections.community.internal_test_tools.tests.unit.compat import mock
 
@@ -350,6 +351,19 @@ class NetAppESeriesVolumeTest(ModuleTestCase):
                                                                 (200, self.GET_LONG_LIVED_OPERATION_RESPONSE[3])]):
                     volume_object.wait_for_volume_action()
 
+    def tests_wait_for_volume_operations_pass(self):
+        """Ensure the operations of many volumes are polled together with an adaptive interval."""
+        with self._set_args({"state": "present", "name": "NewVolume", "storage_pool_name": "employee_data_storage_pool", "size": 100}):
+            volume_object = NetAppESeriesVolume()
+            operations = NetAppESeriesLongLivedOperations(volume_object)
+            operations.watch("volume1", {"id": "02000000600A098000A4B9D1000037315D494C6F"})
+            operations.watch("volume2", {"id": "02000000600A098000A4B28D00003D2C5D494C87"})
+            with mock.patch(self.SLEEP_FUNC, return_value=None) as sleep:
+                with mock.patch(self.REQUEST_FUNC, side_effect=[(200, response) for response in self.GET_LONG_LIVED_OPERATION_RESPONSE]) as request:
+                    self.assertEqual(operations.wait(), [])
+            self.assertEqual(request.call_count, 4)
+            self.assertEqual([call[0][0] for call in sleep.call_args_list], [5, 60, 60, 60])
+
     def tests_wait_for_volume_action_fail(self):
         """Ensure wait_for_volume_action throws the expected exceptions."""
         with self._set_args({"state": "present", "name": "NewVolume", "storage_pool_name": "employee_data_storage_pool", "size": 100,
@@ -906,3 +920,68 @@ class NetAppESeriesVolumeTest(ModuleTestCase):
             with self.assertRaisesRegex(AnsibleFailJson, "Failed to delete thin volume."):
                 with mock.patch(self.REQUEST_FUNC, return_value=Exception()):
                     volume_object.delete_volume()
+
+    def _bulk_request(self, calls):
+        """Simulate the storage array for bulk volume requests, recording each request in calls."""
+        created = []
+
+        def request(path, method="GET", data=None, **kwargs):
+            calls.append((method, path))
+            if method == "GET" and path.endswith("/volumes"):
+                return 200, self.VOLUME_GET_RESPONSE + created
+            if method == "GET" and path.endswith("/thin-volumes"):
+                return 200, self.THIN_VOLUME_RESPONSE
+            if method == "GET" and path.endswith("/storage-pools"):
+                return 200, self.STORAGE_POOL_GET_RESPONSE
+            if method == "POST" and path.endswith("/volumes"):
+                created.append({"name": data["name"], "id": "02%s" % data["name"], "segmentSize": data["segSize"] * 1024,
+                                "capacity": str(data["size"]), "thinProvisioned": False, "flashCached": False,
+                                "preferredManager": "070000000000000000000001", "metadata": [],
+                                "cacheSettings": {"readCacheEnable": True, "writeCacheEnable": True, "mirrorEnable": True,
+                                                  "readAheadMultiplier": 1, "cwob": False}})
+            return 200, {}
+        return request
+
+    def test_apply_volumes_pass(self):
+        """Verify bulk volumes are converged with a single retrieval of the storage array information."""
+        calls = []
+        with self._set_args({"storage_pool_name": "employee_data_storage_pool", "size": 10, "max_workers": 2,
+                             "volumes": [{"name": "NewVolume1"}, {"name": "NewVolume2", "size": 20},
+                                         {"name": "Matthew", "state": "absent"}, {"name": "NotAVolume", "state": "absent"}]}):
+            volume_object = NetAppESeriesVolume()
+            with mock.patch(self.REQUEST_FUNC, side_effect=self._bulk_request(calls)):
+                with self.assertRaisesRegex(AnsibleExitJson, "'msg': '3 of 4 volumes required changes.'.*'changed': True"):
+                    volume_object.apply()
+
+        self.assertEqual(len([call for call in calls if call == ("GET", "storage-systems/1/storage-pools")]), 1)
+        self.assertEqual(len([call for call in calls if call == ("GET", "storage-systems/1/volumes")]), 2)
+        self.assertEqual(len([call for call in calls if call == ("POST", "storage-systems/1/volumes")]), 2)
+        self.assertEqual(len([call for call in calls if call[0] == "DELETE"]), 1)
+
+    def test_apply_volumes_check_mode_pass(self):
+        """Verify bulk volumes report their required changes in check mode."""
+        calls = []
+        with self._set_args({"storage_pool_name": "employee_data_storage_pool", "size": 10, "_ansible_check_mode": True,
+                             "volumes": [{"name": "NewVolume1"}, {"name": "NotAVolume", "state": "absent"}]}):
+            volume_object = NetAppESeriesVolume()
+            with mock.patch(self.REQUEST_FUNC, side_effect=self._bulk_request(calls)):
+                with self.assertRaisesRegex(AnsibleExitJson, "Volume \\[NewVolume1\\] requires changes.*Volume \\[NotAVolume\\] does not exist"):
+                    volume_object.apply()
+        self.assertFalse([call for call in calls if call[0] != "GET"])
+
+    def test_apply_volumes_fail(self):
+        """Verify a failure for one volume is reported without preventing the remaining volumes from being applied."""
+        calls = []
+        with self._set_args({"size": 10, "volumes": [{"name": "NewVolume1", "storage_pool_name": "employee_data_storage_pool"},
+                                                     {"name": "NewVolume2", "storage_pool_name": "NotAStoragePool"},
+                                                     {"name": "NewVolume3"}]}):
+            volume_object = NetAppESeriesVolume()
+            with mock.patch(self.REQUEST_FUNC, side_effect=self._bulk_request(calls)):
+                with self.assertRaisesRegex(AnsibleFailJson, "Failed to apply changes to 2 of 3 volumes. Volumes \\[NewVolume2, NewVolume3\\]"):
+                    volume_object.apply()
+        self.assertEqual(len([call for call in calls if call == ("POST", "storage-systems/1/volumes")]), 1)
+
+        with self._set_args({"storage_pool_name": "pool", "size": 10, "volumes": [{"name": "vol"}, {"name": "vol"}]}):
+            volume_object = NetAppESeriesVolume()
+            with self.assertRaisesRegex(AnsibleFailJson, "Volume names must be unique."):
+                volume_object.apply()